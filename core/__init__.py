@@ -15,6 +15,11 @@ from .agents import (
     MessageRecord
 )
 from .tags import SessionTagLockManager, FocusCooldownManager
+from .screen_diff import ScreenSnapshot, ScreenDelta, diff_screens
+from .pattern_matcher import PatternMatcher
+from .completion import IdleTracker, wait_for_sessions_idle
+from .delivery import DeliveryJob, DeliveryOutcome, deliver_fanout
+from .write_queue import WriteQueue
 from .profiles import (
     ProfileManager,
     TeamProfile,
@@ -157,6 +162,7 @@ from .flows import (
     FlowManager,
     ListenerInfo,
     ListenerRegistry,
+    PatternSubscription,
     # Decorators
     start,
     listen,
@@ -270,6 +276,19 @@ __all__ = [
     'ExpectTimeout',
     'ExpectError',
     'ExpectTimeoutError',
+    # Screen snapshots and deltas
+    'ScreenSnapshot',
+    'ScreenDelta',
+    'diff_screens',
+    'PatternMatcher',
+    # Completion signals
+    'IdleTracker',
+    'wait_for_sessions_idle',
+    # Fan-out delivery
+    'DeliveryJob',
+    'DeliveryOutcome',
+    'deliver_fanout',
+    'WriteQueue',
     # Agent management
     'Agent',
     'Team',
@@ -403,6 +422,7 @@ __all__ = [
     'FlowManager',
     'ListenerInfo',
     'ListenerRegistry',
+    'PatternSubscription',
     'start',
     'listen',
     'router',
@@ -3,10 +3,11 @@
 import hashlib
 import json
 import os
+import threading
 from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +17,47 @@ from utils.otel import trace_operation, add_span_attributes, add_span_event
 if TYPE_CHECKING:
     from .tags import SessionTagLockManager
 
+# messages.jsonl is rewritten down to the retained history once it holds
+# this many times more records than max_message_history
+MESSAGE_COMPACTION_FACTOR = 2
+
+# Bytes read per step when reading messages.jsonl backwards
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _read_tail_lines(path: Path, count: int) -> Tuple[List[str], bool]:
+    """Read the last non-empty lines of a file without reading all of it.
+
+    Args:
+        path: File to read
+        count: Maximum number of lines to return
+
+    Returns:
+        (lines, complete): up to count lines, oldest first, and whether the
+        whole file was read (so the lines are all the file holds)
+    """
+    if count <= 0:
+        return [], path.stat().st_size == 0
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0:
+            step = min(_TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            # One extra newline guarantees the earliest kept line is whole
+            if data.count(b"\n") > count:
+                break
+    pieces = data.split(b"\n")
+    if pos > 0:
+        # The first piece may be a partial line cut by the block boundary
+        pieces = pieces[1:]
+    lines = [piece.decode("utf-8") for piece in pieces if piece.strip()]
+    complete = pos == 0 and len(lines) <= count
+    return lines[-count:], complete
+
 
 class Agent(BaseModel):
     """Represents a Claude agent tied to a terminal session."""
@@ -101,6 +143,26 @@ class AgentRegistry:
         self._teams: Dict[str, Team] = {}
         self._message_history: deque = deque(maxlen=max_message_history)
 
+        # content_hash -> recipient -> number of retained records naming that
+        # recipient, kept in step with _message_history as records are
+        # appended and evicted
+        self._sent_index: Dict[str, Dict[str, int]] = {}
+
+        # Records currently in messages.jsonl, and the background thread that
+        # rewrites it down to the retained history. _messages_lock serializes
+        # appends with the rewrite.
+        self._message_file_records = 0
+        self._messages_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        # Secondary indexes over _agents and _teams. Every method that changes
+        # an agent's session, teams or role, or a team's parent, updates them
+        # in the same step. Values are dicts used as insertion-ordered sets.
+        self._agents_by_session: Dict[str, Dict[str, None]] = {}
+        self._team_members: Dict[str, Dict[str, None]] = {}
+        self._agents_by_role: Dict[SessionRole, Dict[str, None]] = {}
+        self._child_teams: Dict[str, Dict[str, None]] = {}
+
         # Active session tracking
         self._active_session: Optional[str] = None
         self.lock_manager = lock_manager
@@ -132,14 +194,64 @@ class AgentRegistry:
                         team = Team(**data)
                         self._teams[team.name] = team
 
-        # Load recent messages for deduplication
+        self._rebuild_indexes()
+
+        # Load recent messages for deduplication, reading only as much of
+        # the end of the file as the history can hold
         if self.messages_file.exists():
-            with open(self.messages_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        record = MessageRecord(**data)
-                        self._message_history.append(record)
+            lines, complete = _read_tail_lines(
+                self.messages_file, self._message_history.maxlen
+            )
+            for line in lines:
+                self._message_history.append(MessageRecord(**json.loads(line)))
+            self._rebuild_message_index()
+            # An incomplete read means older records remain to be dropped
+            self._message_file_records = (
+                len(lines) if complete else self._compaction_threshold
+            )
+            self._maybe_compact_messages()
+
+    # ==================== Secondary Indexes ====================
+
+    @staticmethod
+    def _index_add(index: Dict, key, name: str) -> None:
+        index.setdefault(key, {})[name] = None
+
+    @staticmethod
+    def _index_discard(index: Dict, key, name: str) -> None:
+        members = index.get(key)
+        if members is not None:
+            members.pop(name, None)
+            if not members:
+                del index[key]
+
+    def _index_agent(self, agent: Agent) -> None:
+        """Add an agent to the session, team and role indexes."""
+        self._index_add(self._agents_by_session, agent.session_id, agent.name)
+        for team in agent.teams:
+            self._index_add(self._team_members, team, agent.name)
+        if agent.role is not None:
+            self._index_add(self._agents_by_role, agent.role, agent.name)
+
+    def _unindex_agent(self, agent: Agent) -> None:
+        """Remove an agent from the session, team and role indexes."""
+        self._index_discard(self._agents_by_session, agent.session_id, agent.name)
+        for team in agent.teams:
+            self._index_discard(self._team_members, team, agent.name)
+        if agent.role is not None:
+            self._index_discard(self._agents_by_role, agent.role, agent.name)
+
+    def _rebuild_indexes(self) -> None:
+        """Recompute every secondary index from _agents and _teams."""
+        self._agents_by_session = {}
+        self._team_members = {}
+        self._agents_by_role = {}
+        self._child_teams = {}
+        for agent in self._agents.values():
+            self._index_agent(agent)
+        for team in self._teams.values():
+            if team.parent_team:
+                self._index_add(self._child_teams, team.parent_team, team.name)
 
     def _save_agents(self) -> None:
         """Persist all agents to JSONL file."""
@@ -153,11 +265,70 @@ class AgentRegistry:
             for team in self._teams.values():
                 f.write(team.model_dump_json() + '\n')
 
-    def _append_message(self, record: MessageRecord) -> None:
-        """Append a message record to history and file."""
-        self._message_history.append(record)
-        with open(self.messages_file, 'a') as f:
-            f.write(record.model_dump_json() + '\n')
+    def _append_messages(self, records: List[MessageRecord]) -> None:
+        """Append message records to history and file in one write."""
+        with self._messages_lock:
+            history = self._message_history
+            for record in records:
+                if len(history) == history.maxlen:
+                    self._unindex_message(history[0])
+                history.append(record)
+                self._index_message(record)
+            with open(self.messages_file, 'a') as f:
+                f.write("".join(record.model_dump_json() + '\n' for record in records))
+            self._message_file_records += len(records)
+        self._maybe_compact_messages()
+
+    # ==================== Message History Compaction ====================
+
+    @property
+    def _compaction_threshold(self) -> int:
+        return max(1, self._message_history.maxlen * MESSAGE_COMPACTION_FACTOR)
+
+    def _maybe_compact_messages(self) -> None:
+        """Start a background compaction if messages.jsonl has grown enough."""
+        if self._message_file_records < self._compaction_threshold:
+            return
+        with self._messages_lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            self._compaction_thread = threading.Thread(
+                target=self.compact_messages,
+                name="iterm-mcp-message-compaction",
+                daemon=True,
+            )
+            self._compaction_thread.start()
+
+    def compact_messages(self) -> int:
+        """Rewrite messages.jsonl to hold only the retained message history.
+
+        Runs on a background thread once the file reaches
+        MESSAGE_COMPACTION_FACTOR times max_message_history records; it can
+        also be called directly.
+
+        Returns:
+            Number of records left in the file
+        """
+        with self._messages_lock:
+            records = list(self._message_history)
+            data = "".join(record.model_dump_json() + '\n' for record in records)
+            tmp_path = self.messages_file.with_name(self.messages_file.name + ".tmp")
+            try:
+                with open(tmp_path, 'w') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.messages_file)
+            except OSError:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                raise
+            self._message_file_records = len(records)
+            return len(records)
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Block until a running background compaction has finished."""
+        thread = self._compaction_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
 
     # ==================== Agent Management ====================
 
@@ -191,11 +362,15 @@ class AgentRegistry:
         agent = Agent(
             name=name,
             session_id=session_id,
-            teams=teams or [],
+            teams=list(dict.fromkeys(teams or [])),
             metadata=metadata or {},
             role=role,
         )
+        previous = self._agents.get(name)
+        if previous is not None:
+            self._unindex_agent(previous)
         self._agents[name] = agent
+        self._index_agent(agent)
         self._save_agents()
 
         add_span_event("agent_registered", {
@@ -210,11 +385,11 @@ class AgentRegistry:
         return self._agents.get(name)
 
     def get_agent_by_session(self, session_id: str) -> Optional[Agent]:
-        """Get agent by session ID."""
-        for agent in self._agents.values():
-            if agent.session_id == session_id:
-                return agent
-        return None
+        """Get agent by session ID (the earliest registered, if several share it)."""
+        names = self._agents_by_session.get(session_id)
+        if not names:
+            return None
+        return self._agents[next(iter(names))]
 
     @trace_operation("agent_registry.remove_agent")
     def remove_agent(self, name: str) -> bool:
@@ -222,7 +397,7 @@ class AgentRegistry:
         add_span_attributes(agent_name=name)
 
         if name in self._agents:
-            del self._agents[name]
+            self._unindex_agent(self._agents.pop(name))
             self._save_agents()
             if self.lock_manager:
                 self.lock_manager.release_locks_by_agent(name)
@@ -236,13 +411,14 @@ class AgentRegistry:
         """List all agents, optionally filtered by team."""
         if team is None:
             return list(self._agents.values())
-        return [a for a in self._agents.values() if team in a.teams]
+        return [self._agents[name] for name in self._team_members.get(team, ())]
 
     def assign_to_team(self, agent_name: str, team_name: str) -> bool:
         """Add agent to a team. Returns True if successful."""
         agent = self._agents.get(agent_name)
         if agent and team_name not in agent.teams:
             agent.teams.append(team_name)
+            self._index_add(self._team_members, team_name, agent_name)
             self._save_agents()
             return True
         return False
@@ -252,6 +428,7 @@ class AgentRegistry:
         agent = self._agents.get(agent_name)
         if agent and team_name in agent.teams:
             agent.teams.remove(team_name)
+            self._index_discard(self._team_members, team_name, agent_name)
             self._save_agents()
             return True
         return False
@@ -260,14 +437,18 @@ class AgentRegistry:
         """Set or clear the role for an agent. Returns True if successful."""
         agent = self._agents.get(agent_name)
         if agent:
+            if agent.role is not None:
+                self._index_discard(self._agents_by_role, agent.role, agent_name)
             agent.role = role
+            if role is not None:
+                self._index_add(self._agents_by_role, role, agent_name)
             self._save_agents()
             return True
         return False
 
     def get_agents_by_role(self, role: SessionRole) -> List[Agent]:
         """Get all agents with a specific role."""
-        return [a for a in self._agents.values() if a.role == role]
+        return [self._agents[name] for name in self._agents_by_role.get(role, ())]
 
     # ==================== Team Management ====================
 
@@ -295,7 +476,12 @@ class AgentRegistry:
         )
 
         team = Team(name=name, description=description, parent_team=parent_team)
+        previous = self._teams.get(name)
+        if previous is not None and previous.parent_team:
+            self._index_discard(self._child_teams, previous.parent_team, name)
         self._teams[name] = team
+        if parent_team:
+            self._index_add(self._child_teams, parent_team, name)
         self._save_teams()
 
         add_span_event("team_created", {"team_name": name})
@@ -312,14 +498,14 @@ class AgentRegistry:
         add_span_attributes(team_name=name)
 
         if name in self._teams:
-            del self._teams[name]
+            team = self._teams.pop(name)
+            if team.parent_team:
+                self._index_discard(self._child_teams, team.parent_team, name)
             self._save_teams()
-            # Also remove team from all agents
-            affected_agents = []
-            for agent in self._agents.values():
-                if name in agent.teams:
-                    agent.teams.remove(name)
-                    affected_agents.append(agent.name)
+            # Also remove team from its members
+            affected_agents = list(self._team_members.pop(name, ()))
+            for agent_name in affected_agents:
+                self._agents[agent_name].teams.remove(name)
             self._save_agents()
 
             add_span_event("team_removed", {
@@ -337,7 +523,7 @@ class AgentRegistry:
 
     def get_child_teams(self, parent_name: str) -> List[Team]:
         """Get all teams that have the specified parent."""
-        return [t for t in self._teams.values() if t.parent_team == parent_name]
+        return [self._teams[name] for name in self._child_teams.get(parent_name, ())]
 
     def get_team_hierarchy(self, team_name: str) -> List[str]:
         """Get team hierarchy from root to specified team.
@@ -382,6 +568,30 @@ class AgentRegistry:
         """Create a hash of message content."""
         return hashlib.sha256(content.encode()).hexdigest()
 
+    def _index_message(self, record: MessageRecord) -> None:
+        recipients = self._sent_index.setdefault(record.content_hash, {})
+        for recipient in record.recipients:
+            recipients[recipient] = recipients.get(recipient, 0) + 1
+
+    def _unindex_message(self, record: MessageRecord) -> None:
+        recipients = self._sent_index.get(record.content_hash)
+        if recipients is None:
+            return
+        for recipient in record.recipients:
+            remaining = recipients.get(recipient, 0) - 1
+            if remaining > 0:
+                recipients[recipient] = remaining
+            else:
+                recipients.pop(recipient, None)
+        if not recipients:
+            del self._sent_index[record.content_hash]
+
+    def _rebuild_message_index(self) -> None:
+        """Recompute the dedup index from _message_history."""
+        self._sent_index = {}
+        for record in self._message_history:
+            self._index_message(record)
+
     def was_message_sent(self, content: str, recipient: str) -> bool:
         """Check if this exact message was already sent to this recipient.
 
@@ -393,11 +603,7 @@ class AgentRegistry:
             True if message was previously sent to this recipient
         """
         content_hash = self._hash_message(content)
-
-        for record in self._message_history:
-            if record.content_hash == content_hash and recipient in record.recipients:
-                return True
-        return False
+        return recipient in self._sent_index.get(content_hash, {})
 
     def record_message_sent(self, content: str, recipients: List[str]) -> None:
         """Record that a message was sent to recipients.
@@ -406,11 +612,22 @@ class AgentRegistry:
             content: Message content
             recipients: List of agent names that received the message
         """
-        record = MessageRecord(
-            content_hash=self._hash_message(content),
-            recipients=recipients
-        )
-        self._append_message(record)
+        self.record_messages_sent({content: recipients})
+
+    def record_messages_sent(self, deliveries: Dict[str, List[str]]) -> None:
+        """Record several sent messages with a single write to messages.jsonl.
+
+        Args:
+            deliveries: Mapping of message content to the agent names that
+                received it
+        """
+        records = [
+            MessageRecord(content_hash=self._hash_message(content), recipients=recipients)
+            for content, recipients in deliveries.items()
+            if recipients
+        ]
+        if records:
+            self._append_messages(records)
 
     def filter_unsent_recipients(self, content: str, recipients: List[str]) -> List[str]:
         """Filter recipients to only those who haven't received this message.
@@ -422,13 +639,7 @@ class AgentRegistry:
         Returns:
             List of agent names who haven't received this message
         """
-        content_hash = self._hash_message(content)
-        already_received: Set[str] = set()
-
-        for record in self._message_history:
-            if record.content_hash == content_hash:
-                already_received.update(record.recipients)
-
+        already_received = self._sent_index.get(self._hash_message(content), {})
         return [r for r in recipients if r not in already_received]
 
     def get_recent_messages(self, limit: int = 10) -> List[Dict[str, str]]:
@@ -646,6 +857,9 @@ class AgentRegistry:
                 )
                 self._message_history.append(record)
 
+            self._rebuild_indexes()
+            self._rebuild_message_index()
+
             # Persist restored state to files
             self._save_agents()
             self._save_teams()
@@ -658,6 +872,8 @@ class AgentRegistry:
             self._message_history.clear()
             self._message_history.extend(old_message_history)
             self._active_session = old_active_session
+            self._rebuild_indexes()
+            self._rebuild_message_index()
             raise
 
     def get_state_summary(self) -> Dict:
@@ -9,18 +9,31 @@ Key features:
 - FileCheckpointer for local development
 - SQLiteCheckpointer for production use
 - Session and agent state serialization
+- Incremental storage: a checkpoint is a manifest of content hashes, and
+  each session state, agent set and team set is stored once as a
+  compressed chunk shared by every checkpoint that contains it
+- Background writes: CheckpointManager snapshots state in the calling
+  task and serializes, compresses and stores it on a worker thread
 """
 
+import asyncio
+import copy
+import hashlib
 import json
 import logging
 import os
 import sqlite3
+import threading
+import time
 import uuid
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol, Union, runtime_checkable
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Protocol, Tuple, Union, runtime_checkable
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class SessionState(BaseModel):
@@ -86,6 +99,110 @@ class Checkpoint(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+# Marks manifests of chunked checkpoints; older checkpoints are stored whole
+CHECKPOINT_MANIFEST_FORMAT = "chunked-1"
+
+# zlib level for checkpoint chunks
+CHECKPOINT_COMPRESSION_LEVEL = 6
+
+# Chunk hashes bound per SQLite IN (...) query, below SQLITE_MAX_VARIABLE_NUMBER
+CHECKPOINT_CHUNK_QUERY_BATCH = 500
+
+# Recent write latencies CheckpointWriter keeps for its percentiles
+CHECKPOINT_LATENCY_SAMPLES = 256
+
+_AGENT_SET = TypeAdapter(Dict[str, AgentState])
+_TEAM_SET = TypeAdapter(Dict[str, TeamState])
+
+
+def _hash_chunk(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _split_checkpoint(checkpoint: Checkpoint) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """Split a checkpoint into a manifest and content-addressed chunks.
+
+    Every session state, the agent set, the team set and the rest of the
+    registry become separate JSON chunks, so a part that did not change
+    since the last checkpoint hashes to a chunk already stored.
+
+    Returns:
+        The manifest and the uncompressed chunks keyed by SHA-256
+    """
+    chunks: Dict[str, bytes] = {}
+
+    def add(raw: bytes) -> str:
+        digest = _hash_chunk(raw)
+        chunks[digest] = raw
+        return digest
+
+    manifest = checkpoint.model_dump(mode="json", exclude={"sessions", "registry"})
+    manifest["format"] = CHECKPOINT_MANIFEST_FORMAT
+    manifest["sessions"] = {
+        sid: add(state.model_dump_json().encode())
+        for sid, state in checkpoint.sessions.items()
+    }
+    registry = checkpoint.registry
+    if registry is not None:
+        manifest["registry"] = {
+            "agents": add(_AGENT_SET.dump_json(registry.agents)),
+            "teams": add(_TEAM_SET.dump_json(registry.teams)),
+            "state": add(registry.model_dump_json(exclude={"agents", "teams"}).encode()),
+        }
+    else:
+        manifest["registry"] = None
+    return manifest, chunks
+
+
+def _is_manifest(data: Dict[str, Any]) -> bool:
+    return data.get("format") == CHECKPOINT_MANIFEST_FORMAT
+
+
+def _manifest_chunks(manifest: Dict[str, Any]) -> List[str]:
+    """Distinct chunk hashes a manifest refers to."""
+    digests = set(manifest["sessions"].values())
+    if manifest["registry"] is not None:
+        digests.update(manifest["registry"].values())
+    return sorted(digests)
+
+
+def _assemble_checkpoint(
+    manifest: Dict[str, Any],
+    read_chunk: Callable[[str], bytes]
+) -> Checkpoint:
+    """Rebuild a checkpoint from its manifest.
+
+    Args:
+        manifest: Manifest from _split_checkpoint
+        read_chunk: Returns the compressed chunk stored under a hash
+
+    Raises:
+        ValueError: If a chunk does not match its hash
+    """
+    def load(digest: str) -> bytes:
+        raw = zlib.decompress(read_chunk(digest))
+        if _hash_chunk(raw) != digest:
+            raise ValueError(f"Checkpoint chunk {digest} is corrupt")
+        return raw
+
+    registry = None
+    if manifest["registry"] is not None:
+        chunks = manifest["registry"]
+        registry = RegistryState.model_validate_json(load(chunks["state"]))
+        registry.agents = _AGENT_SET.validate_json(load(chunks["agents"]))
+        registry.teams = _TEAM_SET.validate_json(load(chunks["teams"]))
+
+    data = {key: value for key, value in manifest.items() if key not in ("format", "sessions", "registry")}
+    return Checkpoint.model_validate({
+        **data,
+        "sessions": {
+            sid: SessionState.model_validate_json(load(digest))
+            for sid, digest in manifest["sessions"].items()
+        },
+        "registry": registry,
+    })
+
+
 @runtime_checkable
 class Checkpointer(Protocol):
     """Protocol for checkpoint storage backends.
@@ -158,12 +275,17 @@ class Checkpointer(Protocol):
 class FileCheckpointer:
     """File-based checkpointer for local development.
 
-    Stores checkpoints as JSON files in a directory structure.
-    Good for development and debugging, not recommended for production.
-
-    Note: This implementation is NOT thread-safe. Index updates and file
-    operations are not protected by locks. Use only in single-threaded
-    contexts or wrap with external synchronization for concurrent access.
+    Stores each checkpoint as a JSON manifest that refers to compressed,
+    content-addressed chunk files under chunks/. A chunk is written once
+    and shared by every checkpoint containing it; chunk reference counts
+    are rebuilt from the manifests at startup. Good for development and
+    debugging, not recommended for production.
+
+    File I/O runs on worker threads: write() on CheckpointWriter's, the
+    async methods on the default executor. A lock serializes index and
+    reference count updates but is not held while chunks and manifests
+    are written or read. Separate instances sharing a directory are not
+    coordinated.
     """
 
     def __init__(self, checkpoint_dir: Optional[str] = None):
@@ -179,9 +301,14 @@ class FileCheckpointer:
         self.checkpoint_dir = Path(checkpoint_dir)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
 
+        self.chunk_dir = self.checkpoint_dir / "chunks"
+
         # Index file for quick lookups
         self.index_file = self.checkpoint_dir / "index.json"
         self._index: Dict[str, Dict[str, Any]] = {}
+        self._refcounts: Counter = Counter()
+        self._lock = threading.RLock()
+        self._writes_in_flight = 0
         self._load_index()
 
     def _load_index(self) -> None:
@@ -192,42 +319,110 @@ class FileCheckpointer:
                     self._index = json.load(f)
             except (json.JSONDecodeError, IOError):
                 self._index = {}
+        self._refcounts = Counter()
+        for checkpoint_id in self._index:
+            self._refcounts.update(self._read_manifest_chunks(checkpoint_id))
+
+    def _read_manifest_chunks(self, checkpoint_id: str) -> List[str]:
+        """Chunk hashes of a stored checkpoint; empty for whole checkpoints."""
+        try:
+            with open(self._get_checkpoint_path(checkpoint_id), 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return []
+        return _manifest_chunks(data) if _is_manifest(data) else []
 
     def _save_index(self) -> None:
         """Save the checkpoint index to disk."""
+        # Compact dumps() takes the C encoder; the index grows with every checkpoint
         with open(self.index_file, 'w') as f:
-            json.dump(self._index, f, indent=2, default=str)
+            f.write(json.dumps(self._index, default=str))
 
     def _get_checkpoint_path(self, checkpoint_id: str) -> Path:
         """Get the file path for a checkpoint."""
         return self.checkpoint_dir / f"{checkpoint_id}.json"
 
+    def _get_chunk_path(self, digest: str) -> Path:
+        """Get the file path for a chunk."""
+        return self.chunk_dir / digest[:2] / digest
+
+    def _write_chunk(self, digest: str, raw: bytes) -> None:
+        """Store a chunk unless it is already on disk."""
+        chunk_path = self._get_chunk_path(digest)
+        if chunk_path.exists():
+            return
+        chunk_path.parent.mkdir(parents=True, exist_ok=True)
+        # Written under a temporary name so a chunk file is always complete
+        tmp_path = chunk_path.with_suffix(".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(raw, CHECKPOINT_COMPRESSION_LEVEL))
+        os.replace(tmp_path, chunk_path)
+
+    def _read_chunk(self, digest: str) -> bytes:
+        with open(self._get_chunk_path(digest), 'rb') as f:
+            return f.read()
+
+    def _release(self, digests: Iterable[str]) -> None:
+        """Drop one reference to each chunk, removing unreferenced ones (lock held)."""
+        for digest in digests:
+            self._refcounts[digest] -= 1
+            if self._refcounts[digest] <= 0:
+                del self._refcounts[digest]
+                self._get_chunk_path(digest).unlink(missing_ok=True)
+
     async def save(self, checkpoint: Checkpoint) -> str:
         """Save a checkpoint to disk.
 
+        Only chunks not already stored are written.
+
         Args:
             checkpoint: The checkpoint to save
 
         Returns:
             The checkpoint ID
         """
-        checkpoint_path = self._get_checkpoint_path(checkpoint.checkpoint_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.write, checkpoint)
 
-        # Serialize checkpoint to JSON
-        checkpoint_data = checkpoint.model_dump(mode='json')
-
-        with open(checkpoint_path, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2, default=str)
+    def write(self, checkpoint: Checkpoint) -> str:
+        """Blocking form of save(), safe to call from a worker thread."""
+        checkpoint_path = self._get_checkpoint_path(checkpoint.checkpoint_id)
+        manifest, chunks = _split_checkpoint(checkpoint)
+        digests = _manifest_chunks(manifest)
+
+        with self._lock:
+            # Referencing the chunks up front keeps a concurrent delete from
+            # removing them before the manifest is in place
+            new_digests = [digest for digest in chunks if not self._refcounts[digest]]
+            self._refcounts.update(digests)
+            # Saving under an existing ID replaces that checkpoint
+            replacing = checkpoint.checkpoint_id in self._index
+            self._writes_in_flight += 1
 
-        # Update index
-        session_ids = list(checkpoint.sessions.keys())
-        self._index[checkpoint.checkpoint_id] = {
-            "created_at": checkpoint.created_at.isoformat(),
-            "trigger": checkpoint.trigger,
-            "session_ids": session_ids,
-            "has_registry": checkpoint.registry is not None
-        }
-        self._save_index()
+        try:
+            previous_chunks = (
+                self._read_manifest_chunks(checkpoint.checkpoint_id) if replacing else []
+            )
+            for digest in new_digests:
+                self._write_chunk(digest, chunks[digest])
+            with open(checkpoint_path, 'w') as f:
+                f.write(json.dumps(manifest, default=str))
+        except BaseException:
+            with self._lock:
+                self._writes_in_flight -= 1
+                self._release(digests)
+            raise
+
+        with self._lock:
+            self._writes_in_flight -= 1
+            self._release(previous_chunks)
+            self._index[checkpoint.checkpoint_id] = {
+                "created_at": checkpoint.created_at.isoformat(),
+                "trigger": checkpoint.trigger,
+                "session_ids": list(checkpoint.sessions.keys()),
+                "has_registry": checkpoint.registry is not None
+            }
+            self._save_index()
 
         return checkpoint.checkpoint_id
 
@@ -240,6 +435,10 @@ class FileCheckpointer:
         Returns:
             The checkpoint if found, None otherwise
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._load, checkpoint_id)
+
+    def _load(self, checkpoint_id: str) -> Optional[Checkpoint]:
         checkpoint_path = self._get_checkpoint_path(checkpoint_id)
 
         if not checkpoint_path.exists():
@@ -249,6 +448,8 @@ class FileCheckpointer:
         try:
             with open(checkpoint_path, 'r') as f:
                 data = json.load(f)
+            if _is_manifest(data):
+                return _assemble_checkpoint(data, self._read_chunk)
             return Checkpoint.model_validate(data)
         except json.JSONDecodeError as e:
             logger.warning(f"Failed to parse checkpoint {checkpoint_id}: {e}")
@@ -275,8 +476,10 @@ class FileCheckpointer:
             List of checkpoint metadata dicts
         """
         results = []
+        with self._lock:
+            entries = list(self._index.items())
 
-        for cp_id, meta in self._index.items():
+        for cp_id, meta in entries:
             # Filter by session if specified
             if session_id and session_id not in meta.get("session_ids", []):
                 continue
@@ -303,11 +506,21 @@ class FileCheckpointer:
         Returns:
             True if deleted, False if not found
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._delete, checkpoint_id)
+
+    def _delete(self, checkpoint_id: str) -> bool:
         checkpoint_path = self._get_checkpoint_path(checkpoint_id)
 
         if not checkpoint_path.exists():
             return False
 
+        chunks = self._read_manifest_chunks(checkpoint_id)
+        with self._lock:
+            return self._remove(checkpoint_id, checkpoint_path, chunks)
+
+    def _remove(self, checkpoint_id: str, checkpoint_path: Path, chunks: List[str]) -> bool:
+        """Drop a checkpoint from the index and disk (lock held)."""
         # Preserve current index entry so we can roll back on failure
         previous_meta = self._index.get(checkpoint_id)
 
@@ -320,6 +533,7 @@ class FileCheckpointer:
             # Then remove the file from disk
             checkpoint_path.unlink()
 
+            self._release(chunks)
             return True
         except IOError:
             # Attempt to roll back index changes if something failed
@@ -386,14 +600,43 @@ class FileCheckpointer:
                 if await self.delete(cp["checkpoint_id"]):
                     deleted_count += 1
 
+        await asyncio.get_running_loop().run_in_executor(None, self.collect_garbage)
         return deleted_count
 
+    def collect_garbage(self) -> int:
+        """Remove chunk files no checkpoint refers to.
+
+        Deleting a checkpoint already removes the chunks only it used;
+        this also catches chunks left behind by an interrupted save.
+
+        Returns:
+            Number of chunk files removed
+        """
+        removed = 0
+        if not self.chunk_dir.exists():
+            return removed
+        for chunk_path in list(self.chunk_dir.glob("*/*")):
+            # Checked under the lock, as a write may reference the chunk meanwhile
+            with self._lock:
+                if chunk_path.suffix == ".tmp":
+                    # Belongs to a write in progress unless none is
+                    if self._writes_in_flight:
+                        continue
+                elif self._refcounts[chunk_path.name]:
+                    continue
+                chunk_path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
 
 class SQLiteCheckpointer:
     """SQLite-based checkpointer for production use.
 
     Provides efficient storage and querying of checkpoints using SQLite.
-    Suitable for production deployments with many checkpoints.
+    Suitable for production deployments with many checkpoints. The
+    checkpoints table holds manifests; chunks live in checkpoint_chunks
+    with a reference count, and unreferenced chunks are removed when
+    checkpoints are deleted or cleaned up.
     """
 
     def __init__(self, db_path: Optional[str] = None):
@@ -431,6 +674,13 @@ class SQLiteCheckpointer:
                     FOREIGN KEY (checkpoint_id) REFERENCES checkpoints(checkpoint_id) ON DELETE CASCADE
                 )
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoint_chunks (
+                    hash TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    refcount INTEGER NOT NULL DEFAULT 0
+                )
+            """)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_checkpoints_created_at
                 ON checkpoints(created_at DESC)
@@ -441,18 +691,108 @@ class SQLiteCheckpointer:
             """)
             conn.commit()
 
+    @staticmethod
+    def _select_chunks(
+        conn: sqlite3.Connection,
+        columns: str,
+        digests: List[str]
+    ) -> List[Tuple[Any, ...]]:
+        """Rows of checkpoint_chunks whose hash is in digests."""
+        rows: List[Tuple[Any, ...]] = []
+        for start in range(0, len(digests), CHECKPOINT_CHUNK_QUERY_BATCH):
+            batch = digests[start:start + CHECKPOINT_CHUNK_QUERY_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(conn.execute(
+                f"SELECT {columns} FROM checkpoint_chunks WHERE hash IN ({placeholders})",
+                batch
+            ))
+        return rows
+
+    @staticmethod
+    def _release(conn: sqlite3.Connection, checkpoint_ids: List[str]) -> List[str]:
+        """Drop the chunk references of checkpoints.
+
+        Returns:
+            Hashes whose reference count was decremented
+        """
+        released: List[str] = []
+        for checkpoint_id in checkpoint_ids:
+            row = conn.execute(
+                "SELECT data FROM checkpoints WHERE checkpoint_id = ?",
+                (checkpoint_id,)
+            ).fetchone()
+            if row is None:
+                continue
+            data = json.loads(row[0])
+            if _is_manifest(data):
+                released.extend(_manifest_chunks(data))
+        conn.executemany(
+            "UPDATE checkpoint_chunks SET refcount = refcount - 1 WHERE hash = ?",
+            [(digest,) for digest in released]
+        )
+        return released
+
+    def _delete_checkpoints(self, conn: sqlite3.Connection, checkpoint_ids: List[str]) -> int:
+        """Delete checkpoints and the chunks only they referred to."""
+        released = self._release(conn, checkpoint_ids)
+        deleted = 0
+        for checkpoint_id in checkpoint_ids:
+            cursor = conn.execute(
+                "DELETE FROM checkpoints WHERE checkpoint_id = ?",
+                (checkpoint_id,)
+            )
+            deleted += cursor.rowcount
+            conn.execute(
+                "DELETE FROM checkpoint_sessions WHERE checkpoint_id = ?",
+                (checkpoint_id,)
+            )
+        conn.executemany(
+            "DELETE FROM checkpoint_chunks WHERE hash = ? AND refcount <= 0",
+            [(digest,) for digest in set(released)]
+        )
+        return deleted
+
     async def save(self, checkpoint: Checkpoint) -> str:
         """Save a checkpoint to SQLite.
 
+        Only chunks not already stored are compressed and inserted.
+
         Args:
             checkpoint: The checkpoint to save
 
         Returns:
             The checkpoint ID
         """
-        checkpoint_data = checkpoint.model_dump_json()
+        return self.write(checkpoint)
+
+    def write(self, checkpoint: Checkpoint) -> str:
+        """Blocking form of save(), safe to call from a worker thread.
+
+        Each call opens its own connection, so no lock is needed.
+        """
+        manifest, chunks = _split_checkpoint(checkpoint)
+        checkpoint_data = json.dumps(manifest, default=str)
 
         with sqlite3.connect(self.db_path) as conn:
+            # Saving under an existing ID replaces that checkpoint
+            released = self._release(conn, [checkpoint.checkpoint_id])
+            stored = {row[0] for row in self._select_chunks(conn, "hash", list(chunks))}
+            conn.executemany(
+                "INSERT INTO checkpoint_chunks (hash, data) VALUES (?, ?)",
+                [
+                    (digest, zlib.compress(raw, CHECKPOINT_COMPRESSION_LEVEL))
+                    for digest, raw in chunks.items() if digest not in stored
+                ]
+            )
+            conn.executemany(
+                "UPDATE checkpoint_chunks SET refcount = refcount + 1 WHERE hash = ?",
+                [(digest,) for digest in _manifest_chunks(manifest)]
+            )
+            conn.executemany(
+                "DELETE FROM checkpoint_chunks WHERE hash = ? AND refcount <= 0",
+                [(digest,) for digest in set(released)]
+            )
+
             conn.execute("""
                 INSERT OR REPLACE INTO checkpoints
                 (checkpoint_id, created_at, version, trigger, data)
@@ -502,6 +842,15 @@ class SQLiteCheckpointer:
             logger = logging.getLogger(__name__)
             try:
                 data = json.loads(row[0])
+                if _is_manifest(data):
+                    stored = dict(self._select_chunks(conn, "hash, data", _manifest_chunks(data)))
+
+                    def read_chunk(digest: str) -> bytes:
+                        if digest not in stored:
+                            raise ValueError(f"Checkpoint chunk {digest} is missing")
+                        return stored[digest]
+
+                    return _assemble_checkpoint(data, read_chunk)
                 return Checkpoint.model_validate(data)
             except json.JSONDecodeError as e:
                 logger.warning(f"Failed to parse checkpoint {checkpoint_id}: {e}")
@@ -570,12 +919,9 @@ class SQLiteCheckpointer:
             True if deleted, False if not found
         """
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM checkpoints WHERE checkpoint_id = ?",
-                (checkpoint_id,)
-            )
+            deleted = self._delete_checkpoints(conn, [checkpoint_id])
             conn.commit()
-            return cursor.rowcount > 0
+            return deleted > 0
 
     async def get_latest(self, session_id: Optional[str] = None) -> Optional[Checkpoint]:
         """Get the most recent checkpoint.
@@ -600,6 +946,9 @@ class SQLiteCheckpointer:
     ) -> int:
         """Clean up old checkpoints to manage storage.
 
+        Chunks left without references are removed in the same
+        transaction.
+
         Args:
             max_age_days: Delete checkpoints older than this
             max_count: Keep at most this many checkpoints
@@ -615,31 +964,176 @@ class SQLiteCheckpointer:
         with sqlite3.connect(self.db_path) as conn:
             # Delete by age
             cursor = conn.execute(
-                "DELETE FROM checkpoints WHERE created_at < ?",
+                "SELECT checkpoint_id FROM checkpoints WHERE created_at < ?",
                 (cutoff_date.isoformat(),)
             )
-            deleted_count += cursor.rowcount
+            deleted_count += self._delete_checkpoints(conn, [row[0] for row in cursor.fetchall()])
 
             # Delete oldest if over count limit
             cursor = conn.execute("""
-                DELETE FROM checkpoints WHERE checkpoint_id IN (
-                    SELECT checkpoint_id FROM checkpoints
-                    ORDER BY created_at DESC
-                    LIMIT -1 OFFSET ?
-                )
+                SELECT checkpoint_id FROM checkpoints
+                ORDER BY created_at DESC
+                LIMIT -1 OFFSET ?
             """, (max_count,))
-            deleted_count += cursor.rowcount
+            deleted_count += self._delete_checkpoints(conn, [row[0] for row in cursor.fetchall()])
+
+            # Any chunk left without references
+            conn.execute("""
+                DELETE FROM checkpoint_chunks WHERE refcount <= 0
+            """)
 
             conn.commit()
 
         return deleted_count
 
 
+def _snapshot_checkpoint(
+    sessions: Optional[Dict[str, SessionState]],
+    registry: Optional[RegistryState],
+    trigger: str,
+    metadata: Optional[Dict[str, Any]]
+) -> Checkpoint:
+    """Capture state for a checkpoint without serializing it.
+
+    Everything is deep-copied, so the checkpoint shares no dicts or lists
+    with the caller's objects while the writer thread serializes it.
+    Strings and other immutable values are shared, so the copy costs
+    little next to serializing.
+    """
+    return Checkpoint(
+        sessions={sid: state.model_copy(deep=True) for sid, state in (sessions or {}).items()},
+        registry=registry.model_copy(deep=True) if registry is not None else None,
+        trigger=trigger,
+        metadata=copy.deepcopy(metadata or {})
+    )
+
+
+class CheckpointWriter:
+    """Persists checkpoints on a dedicated worker thread.
+
+    Serializing, compressing and writing run on the thread, off the event
+    loop. Checkpoints passed to schedule() coalesce: while one is being
+    written, only the newest waiting checkpoint is kept and older ones are
+    dropped unwritten. write() waits for its own checkpoint and also
+    supersedes a waiting one. Checkpointers without a blocking write()
+    method are saved on the event loop instead.
+    """
+
+    def __init__(self, checkpointer: Checkpointer):
+        """Initialize the writer.
+
+        Args:
+            checkpointer: Storage backend checkpoints are written to
+        """
+        self.checkpointer = checkpointer
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint-writer")
+        self._pending: Optional[Checkpoint] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=CHECKPOINT_LATENCY_SAMPLES)
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Checkpoints being written or waiting to be written."""
+        return self._in_flight + (self._pending is not None)
+
+    async def _persist(self, checkpoint: Checkpoint) -> str:
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            write = getattr(self.checkpointer, "write", None)
+            if write is None:
+                checkpoint_id = await self.checkpointer.save(checkpoint)
+            else:
+                loop = asyncio.get_running_loop()
+                checkpoint_id = await loop.run_in_executor(self._executor, write, checkpoint)
+        except Exception as e:
+            self.failed += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._in_flight -= 1
+        self._latencies.append(time.perf_counter() - start)
+        self.written += 1
+        return checkpoint_id
+
+    async def _drain(self) -> None:
+        logger = logging.getLogger(__name__)
+        while self._pending is not None:
+            checkpoint, self._pending = self._pending, None
+            try:
+                await self._persist(checkpoint)
+            except Exception as e:
+                logger.warning(f"Failed to write checkpoint {checkpoint.checkpoint_id}: {e}")
+
+    def schedule(self, checkpoint: Checkpoint) -> None:
+        """Queue a checkpoint for writing and return immediately."""
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = checkpoint
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def write(self, checkpoint: Checkpoint) -> str:
+        """Write a checkpoint on the worker thread and wait for it.
+
+        Raises:
+            Exception: Whatever the checkpointer raised
+        """
+        if self._pending is not None:
+            # The waiting checkpoint is older than this one
+            self._pending = None
+            self.coalesced += 1
+        return await self._persist(checkpoint)
+
+    async def flush(self) -> None:
+        """Wait until every scheduled checkpoint has been written."""
+        while self._drain_task is not None and not self._drain_task.done():
+            await asyncio.shield(self._drain_task)
+
+    async def close(self) -> None:
+        """Flush, then stop the worker thread."""
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, outcome counts and write latency in milliseconds."""
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 3)
+
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "pending": self._pending is not None,
+            "written": self.written,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "last_error": self.last_error,
+            "write_latency_ms": {
+                "last": round(self._latencies[-1] * 1000, 3) if self._latencies else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": percentile(1.0),
+            },
+        }
+
+
 class CheckpointManager:
     """High-level manager for checkpointing operations.
 
     Provides a unified interface for creating, loading, and managing
-    checkpoints across sessions and agents.
+    checkpoints across sessions and agents. Checkpoints are written by a
+    CheckpointWriter, off the event loop; schedule_checkpoint() returns
+    without waiting for the write. Call flush() or close() before shutdown
+    so scheduled checkpoints are not lost.
     """
 
     def __init__(
@@ -660,6 +1154,7 @@ class CheckpointManager:
         self.checkpoint_interval = checkpoint_interval
         self._operation_count = 0
         self._last_checkpoint_id: Optional[str] = None
+        self.writer = CheckpointWriter(self.checkpointer)
 
     async def create_checkpoint(
         self,
@@ -670,6 +1165,9 @@ class CheckpointManager:
     ) -> Checkpoint:
         """Create and save a new checkpoint.
 
+        The checkpoint is written on the writer thread; this returns once
+        it is stored.
+
         Args:
             sessions: Session states to include
             registry: Registry state to include
@@ -679,19 +1177,56 @@ class CheckpointManager:
         Returns:
             The created checkpoint
         """
-        checkpoint = Checkpoint(
-            sessions=sessions or {},
-            registry=registry,
-            trigger=trigger,
-            metadata=metadata or {}
-        )
+        checkpoint = _snapshot_checkpoint(sessions, registry, trigger, metadata)
+
+        await self.writer.write(checkpoint)
+        self._last_checkpoint_id = checkpoint.checkpoint_id
+        self._operation_count = 0
+
+        return checkpoint
+
+    async def schedule_checkpoint(
+        self,
+        sessions: Optional[Dict[str, "SessionState"]] = None,
+        registry: Optional["RegistryState"] = None,
+        trigger: str = "auto",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Checkpoint:
+        """Snapshot state now and write the checkpoint in the background.
+
+        Meant for auto-checkpoints: only the snapshot happens in the
+        calling task. If an earlier scheduled checkpoint is still waiting,
+        this one replaces it.
 
-        await self.checkpointer.save(checkpoint)
+        Args:
+            sessions: Session states to include
+            registry: Registry state to include
+            trigger: What triggered this checkpoint
+            metadata: Additional metadata
+
+        Returns:
+            The checkpoint that will be written
+        """
+        checkpoint = _snapshot_checkpoint(sessions, registry, trigger, metadata)
+
+        self.writer.schedule(checkpoint)
         self._last_checkpoint_id = checkpoint.checkpoint_id
         self._operation_count = 0
 
         return checkpoint
 
+    async def flush(self) -> None:
+        """Wait until scheduled checkpoints are written."""
+        await self.writer.flush()
+
+    async def close(self) -> None:
+        """Flush scheduled checkpoints and stop the writer thread."""
+        await self.writer.close()
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Checkpoint write latency and queue depth."""
+        return self.writer.stats()
+
     async def restore_checkpoint(
         self,
         checkpoint_id: Optional[str] = None
@@ -705,6 +1240,8 @@ class CheckpointManager:
         Returns:
             The restored checkpoint, or None if not found
         """
+        # Scheduled checkpoints become visible once written
+        await self.writer.flush()
         if checkpoint_id:
             return await self.checkpointer.load(checkpoint_id)
         return await self.checkpointer.get_latest()
@@ -735,6 +1272,7 @@ class CheckpointManager:
         Returns:
             List of checkpoint metadata
         """
+        await self.writer.flush()
         return await self.checkpointer.list_checkpoints(
             session_id=session_id,
             limit=limit
@@ -749,6 +1287,7 @@ class CheckpointManager:
         Returns:
             True if deleted
         """
+        await self.writer.flush()
         return await self.checkpointer.delete(checkpoint_id)
 
     @property
@@ -0,0 +1,176 @@
+"""Completion signals: knowing when a session has gone idle without polling.
+
+An IdleTracker is fed by whatever notifications a session can provide
+(screen updates, shell-integration prompts, input being sent) and wakes its
+waiters as soon as the session looks idle. While nothing happens, waiters
+sleep on a future and make no iTerm2 API calls.
+
+A session is considered idle when a shell prompt has been shown since the
+last input, or, without shell integration, when it is not processing and
+its screen has been quiet for a short period.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Literal, Optional, Set
+
+_logger = logging.getLogger(__name__)
+
+# How long the screen must stay unchanged before a session counts as idle
+IDLE_QUIET_SECONDS = 0.5
+
+# is_processing has no change notification, so it is re-read at this interval
+# (growing by IDLE_RECHECK_BACKOFF) while it reports a running process
+IDLE_RECHECK_MAX_SECONDS = 2.0
+IDLE_RECHECK_BACKOFF = 1.5
+
+
+class IdleTracker:
+    """Tracks activity on one session and wakes waiters when it goes idle."""
+
+    def __init__(self, quiet_period: float = IDLE_QUIET_SECONDS):
+        """Initialize the tracker.
+
+        Args:
+            quiet_period: Seconds without screen activity that count as idle
+        """
+        self.quiet_period = quiet_period
+        # time.monotonic() of the last screen change, prompt event or input
+        self.last_activity = float("-inf")
+        # True while a shell prompt is showing (requires shell integration)
+        self.at_prompt = False
+        self._waiters: Set[asyncio.Future] = set()
+
+    def _wake(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    def note_activity(self) -> None:
+        """Record that the screen changed."""
+        self.last_activity = time.monotonic()
+        self._wake()
+
+    def note_input(self) -> None:
+        """Record that input was sent, so an earlier prompt no longer counts."""
+        self.at_prompt = False
+        self.note_activity()
+
+    def note_command_start(self) -> None:
+        """Record a shell-integration command start."""
+        self.at_prompt = False
+        self.note_activity()
+
+    def note_prompt(self) -> None:
+        """Record a shell-integration prompt or command end."""
+        self.at_prompt = True
+        self.note_activity()
+
+    def check(self, is_processing: Callable[[], bool]) -> Optional[float]:
+        """Decide whether the session is idle now.
+
+        Args:
+            is_processing: Returns True while the session runs a process
+
+        Returns:
+            None if idle, otherwise the seconds until the quiet period would
+            end (0 if the session is processing)
+        """
+        if self.at_prompt:
+            return None
+        if is_processing():
+            return 0.0
+        quiet_for = time.monotonic() - self.last_activity
+        if quiet_for >= self.quiet_period:
+            return None
+        return self.quiet_period - quiet_for
+
+    async def wait_idle(
+        self,
+        timeout: float,
+        is_processing: Callable[[], bool] = lambda: False
+    ) -> bool:
+        """Wait until the session is idle or the timeout expires.
+
+        Args:
+            timeout: Maximum seconds to wait
+            is_processing: Returns True while the session runs a process
+
+        Returns:
+            True if the session went idle, False on timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout
+        recheck = self.quiet_period
+        while True:
+            until_quiet = self.check(is_processing)
+            if until_quiet is None:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            if until_quiet > 0:
+                delay = until_quiet
+                recheck = self.quiet_period
+            else:
+                delay = recheck
+                recheck = min(recheck * IDLE_RECHECK_BACKOFF, IDLE_RECHECK_MAX_SECONDS)
+
+            waiter = loop.create_future()
+            self._waiters.add(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout=min(delay, remaining))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiters.discard(waiter)
+
+
+async def wait_for_sessions_idle(
+    sessions: Iterable,
+    timeout: float,
+    mode: Literal["all", "any"] = "all"
+) -> Dict[str, bool]:
+    """Wait for several sessions to go idle.
+
+    Args:
+        sessions: Objects with an id and an async wait_until_idle(timeout)
+            method, such as ItermSession
+        timeout: Maximum seconds to wait
+        mode: "all" waits for every session, "any" returns once one is idle
+
+    Returns:
+        Mapping of session ID to whether that session went idle. In "any"
+        mode, sessions that were still busy when the first one finished are
+        reported as False.
+    """
+    sessions = list(sessions)
+    results = {session.id: False for session in sessions}
+    tasks = {
+        asyncio.ensure_future(session.wait_until_idle(timeout)): session.id
+        for session in sessions
+    }
+    pending: Set[asyncio.Future] = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished: List[str] = []
+            for task in done:
+                session_id = tasks[task]
+                try:
+                    results[session_id] = task.result()
+                except Exception as e:
+                    _logger.error(f"Error waiting for session {session_id}: {e}")
+                if results[session_id]:
+                    finished.append(session_id)
+            if mode == "any" and finished:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return results
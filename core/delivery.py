@@ -0,0 +1,88 @@
+"""Concurrent fan-out delivery of messages to sessions.
+
+Deliveries to different sessions run concurrently, up to a bound, while
+deliveries to the same session run one after another in the order they
+were queued, so a pane never sees its messages interleaved or reordered.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Sessions written to at the same time by one fan-out
+DELIVERY_MAX_CONCURRENCY = 16
+
+
+@dataclass
+class DeliveryJob:
+    """One message to deliver to one agent's session."""
+
+    agent: str
+    session: Any
+    message: str
+    message_type: str = "broadcast"
+
+
+@dataclass
+class DeliveryOutcome:
+    """Result of one delivery.
+
+    latency_seconds runs from the start of the fan-out until this delivery
+    finished, so it includes time spent queued behind other deliveries.
+    """
+
+    job: DeliveryJob
+    delivered: bool
+    latency_seconds: float
+    error: Optional[str] = None
+
+
+async def deliver_fanout(
+    jobs: List[DeliveryJob],
+    send: Callable[[DeliveryJob], Awaitable[None]],
+    max_concurrency: int = DELIVERY_MAX_CONCURRENCY
+) -> List[DeliveryOutcome]:
+    """Deliver jobs concurrently across sessions and in order within each.
+
+    A failed delivery is reported in its outcome and does not stop the
+    others, including later jobs for the same session.
+
+    Args:
+        jobs: Deliveries in the order they should reach each session
+        send: Coroutine function that performs one delivery
+        max_concurrency: Maximum number of sessions written to at once
+
+    Returns:
+        One outcome per job, in the order of jobs
+    """
+    queues: Dict[str, List[int]] = {}
+    for index, job in enumerate(jobs):
+        queues.setdefault(job.session.id, []).append(index)
+
+    outcomes: List[Optional[DeliveryOutcome]] = [None] * len(jobs)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    start = time.monotonic()
+
+    async def drain(indexes: List[int]) -> None:
+        async with semaphore:
+            for index in indexes:
+                job = jobs[index]
+                error = None
+                try:
+                    await send(job)
+                except Exception as e:
+                    _logger.error(f"Error delivering to {job.agent} ({job.session.id}): {e}")
+                    error = str(e)
+                outcomes[index] = DeliveryOutcome(
+                    job=job,
+                    delivered=error is None,
+                    latency_seconds=time.monotonic() - start,
+                    error=error,
+                )
+
+    await asyncio.gather(*(drain(indexes) for indexes in queues.values()))
+    return outcomes
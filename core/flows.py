@@ -50,6 +50,8 @@ from typing import (
     TypeVar,
 )
 
+from .pattern_matcher import MATCH_OVERLAP_CHARS, PatternMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,6 +96,15 @@ class EventResult:
     routed_to: Optional[str] = None
 
 
+@dataclass
+class PatternSubscription:
+    """A terminal output pattern and what to do when it matches."""
+
+    pattern: re.Pattern
+    callback: Callable[[str, Any], Awaitable[None]]
+    event_name: Optional[str] = None
+
+
 # ============================================================================
 # LISTENER REGISTRY
 # ============================================================================
@@ -222,8 +233,11 @@ class EventBus:
         self._event_queue: asyncio.Queue[Event] = asyncio.Queue()
         self._process_task: Optional[asyncio.Task] = None
         self._flow_instances: Dict[str, "Flow"] = {}
-        # Terminal output pattern subscriptions
-        self._pattern_subscriptions: Dict[str, List[Callable]] = defaultdict(list)
+        # Terminal output pattern subscriptions, matched in one pass per output
+        self._pattern_matcher = PatternMatcher()
+        self._pattern_subscriptions: Dict[str, PatternSubscription] = {}
+        # Recent output per session, re-scanned as context for the next chunk
+        self._output_tails: Dict[str, str] = {}
 
     async def start(self) -> None:
         """Start the event processing loop."""
@@ -516,27 +530,43 @@ class EventBus:
 
         Returns:
             Subscription ID
+
+        Raises:
+            re.error: If the pattern does not compile
         """
         subscription_id = str(uuid.uuid4())
-
-        async def wrapper(text: str) -> bool:
-            """Returns True if pattern matched, False otherwise."""
-            match = re.search(pattern, text)
-            if match:
-                await callback(match.group(0), match)
-                if event_name:
-                    await self.trigger(
-                        event_name,
-                        payload={"text": text, "match": match.group(0)},
-                        source="pattern_subscription"
-                    )
-                return True
-            return False
-
-        self._pattern_subscriptions[subscription_id].append(wrapper)
+        compiled = self._pattern_matcher.add(subscription_id, pattern)
+        self._pattern_subscriptions[subscription_id] = PatternSubscription(
+            pattern=compiled,
+            callback=callback,
+            event_name=event_name
+        )
         self._logger.info(f"Registered pattern subscription: {pattern}")
         return subscription_id
 
+    async def unsubscribe_from_pattern(self, subscription_id: str) -> bool:
+        """Remove a pattern subscription.
+
+        Args:
+            subscription_id: ID returned by subscribe_to_pattern
+
+        Returns:
+            True if the subscription existed
+        """
+        self._pattern_matcher.remove(subscription_id)
+        removed = self._pattern_subscriptions.pop(subscription_id, None) is not None
+        if not self._pattern_subscriptions:
+            # Tails are only kept as match context for subscriptions
+            self._output_tails.clear()
+        return removed
+
+    def forget_session(self, session_id: str) -> None:
+        """Drop the output kept as match context for a session.
+
+        Call when the session closes or stops routing output here.
+        """
+        self._output_tails.pop(session_id, None)
+
     async def process_terminal_output(
         self,
         session_id: str,
@@ -544,17 +574,54 @@ class EventBus:
     ) -> List[str]:
         """Process terminal output against pattern subscriptions.
 
+        All subscriptions are matched in a single scan of the new output, so
+        anchors such as ^ bind at the start of the chunk. The boundary with
+        the session's previous output is scanned again with the end of that
+        output as context, so a match may also span two chunks; only matches
+        reaching into the new output count.
+
         Returns list of triggered subscription IDs.
         """
+        if not self._pattern_subscriptions:
+            return []
+
+        tail = self._output_tails.get(session_id, "")
+        context = f"{tail}\n" if tail else ""
+        self._output_tails[session_id] = (context + output[-MATCH_OVERLAP_CHARS:])[-MATCH_OVERLAP_CHARS:]
+
+        own = dict(self._pattern_matcher.search_all(output))
+        spanning = []
+        if context:
+            boundary = context + output[:MATCH_OVERLAP_CHARS]
+            spanning = self._pattern_matcher.search_all(boundary, min_end=len(context))
+        # A match within the chunk itself wins over one using the context
+        matches = [(sub_id, own.pop(sub_id, match)) for sub_id, match in spanning]
+        matches.extend(own.items())
+        if not matches:
+            return []
+
+        async def notify(sub_id: str, match: re.Match) -> None:
+            subscription = self._pattern_subscriptions.get(sub_id)
+            if subscription is None:
+                return
+            await subscription.callback(match.group(0), match)
+            if subscription.event_name:
+                await self.trigger(
+                    subscription.event_name,
+                    payload={"text": output, "match": match.group(0)},
+                    source="pattern_subscription"
+                )
+
+        results = await asyncio.gather(
+            *(notify(sub_id, match) for sub_id, match in matches),
+            return_exceptions=True
+        )
         triggered = []
-        for sub_id, callbacks in self._pattern_subscriptions.items():
-            for callback in callbacks:
-                try:
-                    matched = await callback(output)
-                    if matched:
-                        triggered.append(sub_id)
-                except Exception as e:
-                    self._logger.error(f"Pattern callback error: {e}")
+        for (sub_id, _), result in zip(matches, results):
+            if isinstance(result, Exception):
+                self._logger.error(f"Pattern callback error: {result}")
+            else:
+                triggered.append(sub_id)
         return triggered
 
     async def clear(self) -> None:
@@ -564,6 +631,8 @@ class EventBus:
             self._history.clear()
         self._flow_instances.clear()
         self._pattern_subscriptions.clear()
+        self._pattern_matcher = PatternMatcher()
+        self._output_tails.clear()
 
 
 # Global event bus instance
@@ -4,7 +4,8 @@ This module provides the iTerm2 Python API integration for monitoring
 session path variables and applying visual styling based on repo configuration.
 
 Uses iTerm2's VariableMonitor to detect path changes and EachSessionOnceMonitor
-to automatically handle new sessions.
+to automatically handle new sessions. When given an ItermTerminal, path changes
+are also pushed into each ItermSession's cwd cache.
 
 Key iTerm2 variables used:
 - `path` - Current working directory
@@ -19,6 +20,9 @@ from typing import Any, Callable, Coroutine, Dict, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     import iterm2
 
+    from .session import ItermSession
+    from .terminal import ItermTerminal
+
 from .agent_hooks import (
     AgentHookManager,
     HookActionResult,
@@ -33,7 +37,9 @@ class PathMonitor:
     """Monitors iTerm2 session path variables for directory changes.
 
     Uses iTerm2's VariableMonitor to detect when the `path` variable changes,
-    then triggers agent hooks for team assignment and styling.
+    then triggers agent hooks for team assignment and styling. With a
+    terminal, each change is also pushed to the session's cwd cache so
+    ItermSession.get_cwd makes no API calls.
     """
 
     def __init__(
@@ -41,6 +47,7 @@ class PathMonitor:
         connection: "iterm2.Connection",
         hook_manager: Optional[AgentHookManager] = None,
         on_style_change: Optional[Callable[[str, SessionStyle], Coroutine[Any, Any, None]]] = None,
+        terminal: Optional["ItermTerminal"] = None,
     ):
         """Initialize the PathMonitor.
 
@@ -48,14 +55,19 @@ class PathMonitor:
             connection: Active iTerm2 connection.
             hook_manager: AgentHookManager instance. Uses global if not provided.
             on_style_change: Callback when styling should be applied.
+            terminal: Terminal whose sessions receive cwd updates.
         """
         self.connection = connection
         self.hook_manager = hook_manager or get_agent_hook_manager()
         self.on_style_change = on_style_change
+        self.terminal = terminal
 
         # Track active monitoring tasks per session
         self._monitor_tasks: Dict[str, asyncio.Task] = {}
 
+        # Sessions this monitor is feeding cwd updates to
+        self._fed_sessions: Dict[str, "ItermSession"] = {}
+
         # Track if monitoring is active
         self._is_running = False
 
@@ -78,6 +90,12 @@ class PathMonitor:
                     "path",
                     session_id
                 ) as mon:
+                    # The monitor only reports changes, so seed the cwd cache
+                    session = self._session_for(session_id)
+                    if session is not None:
+                        current = await session.session.async_get_variable("path")
+                        if current:
+                            session.push_cwd(current)
                     while self._is_running:
                         new_path = await mon.async_get()
                         await self._handle_path_change(session_id, new_path)
@@ -85,6 +103,10 @@ class PathMonitor:
                 logger.debug(f"Path monitor cancelled for session {session_id}")
             except Exception as e:
                 logger.error(f"Error monitoring session {session_id}: {e}")
+            finally:
+                session = self._fed_sessions.pop(session_id, None)
+                if session is not None:
+                    session.detach_cwd_feed()
 
         async def on_session(session_id: str) -> None:
             """Called once per session (existing and new)."""
@@ -131,6 +153,10 @@ class PathMonitor:
         """
         logger.debug(f"Path changed in {session_id}: {new_path}")
 
+        session = self._session_for(session_id)
+        if session is not None and new_path:
+            session.push_cwd(new_path)
+
         # Get agent name if registered
         agent_name = await self._get_agent_name(session_id)
 
@@ -157,6 +183,27 @@ class PathMonitor:
 
         return result
 
+    def _session_for(self, session_id: str) -> Optional["ItermSession"]:
+        """Get the terminal's session wrapper, attaching this monitor as its cwd feed.
+
+        Panes the terminal has not indexed yet are looked up again on the
+        next path change.
+
+        Args:
+            session_id: The iTerm session ID.
+
+        Returns:
+            The ItermSession if the terminal knows it, None otherwise.
+        """
+        session = self._fed_sessions.get(session_id)
+        if session is not None or self.terminal is None:
+            return session
+        session = self.terminal.sessions.get(session_id)
+        if session is not None:
+            session.attach_cwd_feed()
+            self._fed_sessions[session_id] = session
+        return session
+
     async def _get_agent_name(self, session_id: str) -> Optional[str]:
         """Get the agent name for a session if registered.
 
@@ -11,14 +11,52 @@ Based on patterns from:
 """
 
 import asyncio
+import bisect
 import json
+import logging
 import os
+import re
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol, Tuple, Union, runtime_checkable
+from typing import (
+    Any, Awaitable, Callable, Dict, List, Literal, Optional, Protocol, Sequence, Tuple, Union,
+    runtime_checkable,
+)
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .memory_index import MemoryVectorIndex, memory_text
+
+_logger = logging.getLogger("iterm-mcp-memory")
+
+# Seconds between background retention sweeps
+RETENTION_SWEEP_INTERVAL_SECONDS = 60.0
+
+# Most memories one sweep pass removes; a backlog is worked off in passes
+RETENTION_SWEEP_BATCH = 200
+
+# search modes: "text" (substring or FTS5), "vector" (similarity), "hybrid" (both)
+SearchMode = Literal["text", "vector", "hybrid"]
+
+# Weight of the vector score in hybrid ranking; the text score gets the rest
+HYBRID_VECTOR_WEIGHT = 0.5
+
+# Candidates each ranking contributes to hybrid search, per requested result
+HYBRID_CANDIDATE_FACTOR = 3
+
+# FileMemoryStore rewrites its snapshot once the operation log is larger
+# than both this many bytes and the snapshot times FILE_LOG_COMPACT_RATIO
+FILE_LOG_COMPACT_MIN_BYTES = 1024 * 1024
+FILE_LOG_COMPACT_RATIO = 1.0
+
+# Pattern for safe namespace and key characters
+# Allows alphanumeric, underscore, hyphen, and dot
+SAFE_MEMORY_PATTERN = re.compile(r'^[a-zA-Z0-9_\-\.]+$')
 
 
 class Memory(BaseModel):
@@ -55,6 +93,46 @@ class MemorySearchResult(BaseModel):
     )
 
 
+class RetentionPolicy(BaseModel):
+    """Retention rules for a namespace.
+
+    A policy also covers child namespaces that have no policy of their own.
+    Quotas are enforced for each namespace separately: when one holds more
+    than max_entries memories or max_bytes of serialized data, the least
+    recently (lru) or least frequently (lfu) retrieved memories go first.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    ttl_seconds: Optional[float] = Field(
+        default=None, gt=0,
+        description="Expire memories this many seconds after they were last written"
+    )
+    max_entries: Optional[int] = Field(
+        default=None, gt=0,
+        description="Maximum memories kept per namespace"
+    )
+    max_bytes: Optional[int] = Field(
+        default=None, gt=0,
+        description="Maximum serialized bytes (key, value, metadata) kept per namespace"
+    )
+    eviction: Literal["lru", "lfu"] = Field(
+        default="lru",
+        description="Which memories quotas evict first"
+    )
+
+    @property
+    def has_quota(self) -> bool:
+        """Whether the policy limits entries or bytes."""
+        return self.max_entries is not None or self.max_bytes is not None
+
+    def overage(self, entries: int, size: int) -> Tuple[int, int]:
+        """How many entries and bytes a namespace holds beyond its quotas."""
+        over_entries = max(0, entries - self.max_entries) if self.max_entries is not None else 0
+        over_bytes = max(0, size - self.max_bytes) if self.max_bytes is not None else 0
+        return over_entries, over_bytes
+
+
 @runtime_checkable
 class MemoryStore(Protocol):
     """Protocol for memory store implementations.
@@ -101,7 +179,8 @@ class MemoryStore(Protocol):
         self,
         namespace: Tuple[str, ...],
         query: str,
-        limit: int = 10
+        limit: int = 10,
+        mode: SearchMode = "text"
     ) -> List[MemorySearchResult]:
         """Search for memories matching a query.
 
@@ -109,6 +188,7 @@ class MemoryStore(Protocol):
             namespace: Hierarchical namespace tuple (can be partial for broader search)
             query: Search query string
             limit: Maximum number of results to return
+            mode: "text" matching, "vector" similarity or "hybrid" of both
 
         Returns:
             List of MemorySearchResult sorted by relevance
@@ -159,29 +239,396 @@ class MemoryStore(Protocol):
         """
         ...
 
+    async def store_many(
+        self,
+        namespace: Tuple[str, ...],
+        items: Sequence[Dict[str, Any]]
+    ) -> int:
+        """Store several values in one transaction.
+
+        Args:
+            namespace: Hierarchical namespace tuple
+            items: Dicts with "key", "value" and optional "metadata"
+
+        Returns:
+            Number of memories stored
+        """
+        ...
+
+    async def retrieve_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> Dict[str, Memory]:
+        """Retrieve several memories by key.
+
+        Args:
+            namespace: Hierarchical namespace tuple
+            keys: The keys to retrieve
+
+        Returns:
+            Found memories keyed by key; missing keys are absent
+        """
+        ...
+
+    async def delete_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> int:
+        """Delete several memories in one transaction.
+
+        Args:
+            namespace: Hierarchical namespace tuple
+            keys: The keys to delete
+
+        Returns:
+            Number of memories deleted
+        """
+        ...
+
+    async def export_jsonl(
+        self,
+        path: Union[str, Path],
+        namespace: Optional[Tuple[str, ...]] = None
+    ) -> int:
+        """Stream a namespace and its children to a JSONL file.
+
+        Args:
+            path: File to write, one memory per line
+            namespace: Namespace to export; everything if None or empty
+
+        Returns:
+            Number of memories exported
+        """
+        ...
+
+    async def import_jsonl(self, path: Union[str, Path]) -> int:
+        """Load memories from a JSONL export, keeping their timestamps.
+
+        Args:
+            path: File written by export_jsonl
+
+        Returns:
+            Number of memories imported
+        """
+        ...
+
+
+def _normalize_items(items: Sequence[Dict[str, Any]]) -> List[Tuple[str, Any, Dict[str, Any]]]:
+    """Validate store_many items into (key, value, metadata) tuples."""
+    normalized = []
+    for index, item in enumerate(items):
+        if "key" not in item or "value" not in item:
+            raise ValueError(f"Item {index} needs both 'key' and 'value'")
+        normalized.append((item["key"], item["value"], item.get("metadata") or {}))
+    return normalized
+
+
+def _in_namespace(ns_key: str, root: Optional[str]) -> bool:
+    """Whether a namespace key is root itself or one of its children."""
+    return root is None or ns_key == root or ns_key.startswith(root + "/")
+
+
+def _export_line(
+    namespace: Tuple[str, ...],
+    key: str,
+    value: Any,
+    timestamp: str,
+    metadata: Dict[str, Any]
+) -> str:
+    """Format one memory as a JSONL export line."""
+    return json.dumps({
+        "namespace": list(namespace),
+        "key": key,
+        "value": value,
+        "timestamp": timestamp,
+        "metadata": metadata,
+    }, default=str) + "\n"
+
+
+def validate_namespace(namespace: List[str]) -> None:
+    """Validate namespace parts contain only safe characters.
+
+    Args:
+        namespace: List of namespace parts
+
+    Raises:
+        ValueError: If any part contains invalid characters
+    """
+    if not namespace:
+        return  # Empty namespace is valid (root)
+
+    for part in namespace:
+        if not part:
+            raise ValueError("Namespace parts cannot be empty strings")
+        if not SAFE_MEMORY_PATTERN.match(part):
+            raise ValueError(
+                f"Invalid namespace part '{part}': only alphanumeric, underscore, hyphen, and dot allowed"
+            )
+
+
+def validate_key(key: str) -> None:
+    """Validate key contains only safe characters.
+
+    Args:
+        key: The memory key
+
+    Raises:
+        ValueError: If key contains invalid characters
+    """
+    if not key:
+        raise ValueError("Key cannot be empty")
+    if not SAFE_MEMORY_PATTERN.match(key):
+        raise ValueError(
+            f"Invalid key '{key}': only alphanumeric, underscore, hyphen, and dot allowed"
+        )
+
+
+def _parse_export_line(
+    line: str,
+    line_number: int
+) -> Tuple[Tuple[str, ...], str, Any, str, Dict[str, Any]]:
+    """Parse a JSONL export line into (namespace, key, value, timestamp, metadata)."""
+    try:
+        record = json.loads(line)
+        namespace = tuple(record["namespace"])
+        key = record["key"]
+        value = record["value"]
+        validate_namespace(list(namespace))
+        validate_key(key)
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid memory export at line {line_number}: {e}") from e
+    timestamp = record.get("timestamp") or datetime.now(timezone.utc).isoformat()
+    return namespace, key, value, timestamp, record.get("metadata") or {}
+
+
+def _serialized_size(key: str, value_json: str, metadata_json: str) -> int:
+    """Bytes a memory counts against a max_bytes quota."""
+    return len(key.encode()) + len(value_json.encode()) + len(metadata_json.encode())
+
+
+def _select_victims(
+    candidates: Sequence[Tuple[str, int]],
+    over_entries: int,
+    over_bytes: int,
+    limit: int
+) -> List[str]:
+    """Take (key, size) candidates in eviction order until back under quota."""
+    victims: List[str] = []
+    for key, size in candidates:
+        if len(victims) >= limit or (over_entries <= 0 and over_bytes <= 0):
+            break
+        victims.append(key)
+        over_entries -= 1
+        over_bytes -= size
+    return victims
+
+
+def _fuse_rankings(
+    vector_results: List[MemorySearchResult],
+    text_results: List[MemorySearchResult],
+    limit: int
+) -> List[MemorySearchResult]:
+    """Blend vector and text rankings by their max-normalized scores."""
+    blended: Dict[Tuple[Tuple[str, ...], str], MemorySearchResult] = {}
+    for results, weight in (
+        (vector_results, HYBRID_VECTOR_WEIGHT),
+        (text_results, 1.0 - HYBRID_VECTOR_WEIGHT),
+    ):
+        top = max((r.score for r in results), default=0.0)
+        if top <= 0:
+            continue
+        for result in results:
+            ident = (result.memory.namespace, result.memory.key)
+            score = weight * result.score / top
+            existing = blended.get(ident)
+            if existing is None:
+                blended[ident] = result.model_copy(update={"score": score})
+            else:
+                existing.score += score
+                existing.match_context = existing.match_context or result.match_context
+    ranked = sorted(blended.values(), key=lambda r: r.score, reverse=True)
+    return ranked[:limit]
+
+
+EvictionListener = Callable[[str, List[str]], None]
+
+
+class _Retention:
+    """Retention policies, eviction counters and the sweeper of one store.
+
+    The store supplies sweep_namespace(ns_key, policy, budget), which removes
+    at most budget memories from one namespace and returns the expired and
+    evicted keys. Passes resume after the last namespace they finished, so
+    a large backlog is removed a batch at a time across all namespaces.
+    """
+
+    def __init__(
+        self,
+        sweep_namespace: Callable[[str, RetentionPolicy, int], Awaitable[Tuple[List[str], List[str]]]]
+    ):
+        self.policies: Dict[str, RetentionPolicy] = {}
+        self.evictions: Dict[str, Dict[str, int]] = {}
+        self._sweep_namespace = sweep_namespace
+        self._listeners: List[EvictionListener] = []
+        self._cursor: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def set_policy(self, ns_key: str, policy: Optional[RetentionPolicy]) -> None:
+        if policy is None:
+            self.policies.pop(ns_key, None)
+        else:
+            self.policies[ns_key] = policy
+
+    def policy_for(self, ns_key: str) -> Optional[RetentionPolicy]:
+        """The namespace's policy, else its nearest ancestor's."""
+        if not self.policies:
+            return None
+        policy = self.policies.get(ns_key)
+        if policy is not None:
+            return policy
+        parts = ns_key.split("/")
+        for end in range(len(parts) - 1, 0, -1):
+            policy = self.policies.get("/".join(parts[:end]))
+            if policy is not None:
+                return policy
+        return self.policies.get("/")
+
+    def tracks_access(self, ns_key: str) -> bool:
+        """Whether retrieves in the namespace feed a quota's eviction order."""
+        policy = self.policy_for(ns_key)
+        return policy is not None and policy.has_quota
+
+    def is_expired(self, ns_key: str, timestamp: datetime) -> bool:
+        policy = self.policy_for(ns_key)
+        if policy is None or policy.ttl_seconds is None:
+            return False
+        return timestamp.timestamp() < time.time() - policy.ttl_seconds
+
+    @staticmethod
+    def ttl_cutoff(policy: RetentionPolicy) -> float:
+        """Memories written before this epoch time have expired."""
+        return time.time() - policy.ttl_seconds
+
+    def add_listener(self, listener: EvictionListener) -> None:
+        self._listeners.append(listener)
+
+    async def sweep(self, namespaces: Sequence[str], budget: int) -> int:
+        """Apply policies to namespaces, removing at most budget memories."""
+        governed = sorted(ns_key for ns_key in namespaces if self.policy_for(ns_key) is not None)
+        if self._cursor is not None:
+            start = bisect.bisect_right(governed, self._cursor)
+            governed = governed[start:] + governed[:start]
+
+        removed = 0
+        for ns_key in governed:
+            policy = self.policy_for(ns_key)
+            expired, evicted = await self._sweep_namespace(ns_key, policy, budget - removed)
+            self._record(ns_key, expired, evicted)
+            removed += len(expired) + len(evicted)
+            if removed >= budget:
+                # The namespace may have more to remove; resume with it
+                break
+            self._cursor = ns_key
+        return removed
+
+    def _record(self, ns_key: str, expired: List[str], evicted: List[str]) -> None:
+        if not expired and not evicted:
+            return
+        counts = self.evictions.setdefault(ns_key, {"expired": 0, "evicted": 0})
+        counts["expired"] += len(expired)
+        counts["evicted"] += len(evicted)
+        for listener in self._listeners:
+            listener(ns_key, expired + evicted)
+
+    def start(self, sweep: Callable[[int], Awaitable[int]], interval: float) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(sweep, interval))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self, sweep: Callable[[int], Awaitable[int]], interval: float) -> None:
+        while True:
+            try:
+                removed = await sweep(RETENTION_SWEEP_BATCH)
+            except Exception as e:
+                _logger.error(f"Memory retention sweep failed: {e}")
+                removed = 0
+            # Work off a backlog batch by batch, yielding to other tasks
+            await asyncio.sleep(0 if removed >= RETENTION_SWEEP_BATCH else interval)
+
+    def stats(self, usage: Dict[str, Tuple[int, int]]) -> Dict[str, Any]:
+        """Per-namespace size and removals, given {ns_key: (entries, bytes)}."""
+        namespace_usage: Dict[str, Dict[str, int]] = {}
+        for ns_key in sorted(set(usage) | set(self.evictions)):
+            entries, size = usage.get(ns_key, (0, 0))
+            counts = self.evictions.get(ns_key, {})
+            namespace_usage[ns_key] = {
+                "entries": entries,
+                "bytes": size,
+                "expired": counts.get("expired", 0),
+                "evicted": counts.get("evicted", 0),
+            }
+        return {
+            "namespace_usage": namespace_usage,
+            "retention": {
+                "policies": {
+                    ns_key: policy.model_dump(exclude_none=True)
+                    for ns_key, policy in sorted(self.policies.items())
+                },
+                "expired": sum(c["expired"] for c in self.evictions.values()),
+                "evicted": sum(c["evicted"] for c in self.evictions.values()),
+                "sweeper_running": self._task is not None and not self._task.done(),
+            },
+        }
+
 
 class FileMemoryStore:
     """JSON file-based memory store for development and simple use cases.
 
-    Stores memories in a JSON file with namespace-based organization.
+    Stores memories in a JSON snapshot plus an append-only operation log
+    (file_path + ".log"). Each write appends one line to the log, so its
+    cost depends on the entry size rather than the store size. Once the
+    log outgrows the snapshot, the snapshot is rewritten through a
+    temporary file and the log is emptied. Loading replays the log onto
+    the snapshot and discards a torn last line, so a crash at any point
+    loses at most the write in progress.
+
     Suitable for development and single-agent scenarios. Not recommended
-    for production with high concurrency.
+    for production with high concurrency. Retention policies are kept in
+    memory only and must be set again after a restart; access history is
+    saved with the next snapshot.
     """
 
     def __init__(self, file_path: Optional[str] = None):
         """Initialize the file-based memory store.
 
         Args:
-            file_path: Path to the JSON file. Defaults to ~/.iterm-mcp/memories.json
+            file_path: Path to the JSON snapshot. Defaults to ~/.iterm-mcp/memories.json
         """
         if file_path is None:
             file_path = os.path.expanduser("~/.iterm-mcp/memories.json")
 
         self.file_path = Path(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.file_path.with_name(self.file_path.name + ".log")
 
         self._lock = asyncio.Lock()
         self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._retention = _Retention(self._sweep_namespace)
+        # Built on the first vector or hybrid search, then kept up to date
+        self._vectors: Optional[MemoryVectorIndex] = None
+        self._snapshot_bytes = 0
+        self._log_bytes = 0
+        self.compactions = 0
         self._load()
 
     def _namespace_key(self, namespace: Tuple[str, ...]) -> str:
@@ -189,20 +636,119 @@ class FileMemoryStore:
         return "/".join(namespace) if namespace else "/"
 
     def _load(self) -> None:
-        """Load memories from file."""
+        """Load the snapshot, then replay the operation log onto it."""
+        self._data = {}
         if self.file_path.exists():
             try:
                 with open(self.file_path, 'r') as f:
                     self._data = json.load(f)
+                self._snapshot_bytes = self.file_path.stat().st_size
             except (json.JSONDecodeError, IOError):
                 self._data = {}
-        else:
-            self._data = {}
 
-    def _save(self) -> None:
-        """Save memories to file."""
-        with open(self.file_path, 'w') as f:
-            json.dump(self._data, f, indent=2, default=str)
+        if not self.log_path.exists():
+            return
+        valid_bytes = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    # A line without its newline was cut off mid-append
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    break
+                valid_bytes += len(line)
+        if valid_bytes < self.log_path.stat().st_size:
+            # Drop the torn tail so later appends start on a clean line
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_bytes)
+        self._log_bytes = valid_bytes
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        """Apply one logged operation to the in-memory data."""
+        kind = op["op"]
+        if kind == "put":
+            for ns_key, record in op["entries"]:
+                self._data.setdefault(ns_key, {})[record["key"]] = record
+        elif kind == "delete":
+            for ns_key, key in op["entries"]:
+                memories = self._data.get(ns_key)
+                if memories is not None:
+                    memories.pop(key, None)
+                    # Remove empty namespaces
+                    if not memories:
+                        del self._data[ns_key]
+        elif kind == "clear":
+            self._data.pop(op["ns"], None)
+        else:
+            raise ValueError(f"Unknown memory log operation: {kind}")
+
+    async def _write(self, op: Dict[str, Any]) -> None:
+        """Apply an operation, log it, and compact if the log outgrew the snapshot."""
+        self._apply(op)
+        self._append(op)
+        if self._log_bytes > max(FILE_LOG_COMPACT_MIN_BYTES, self._snapshot_bytes * FILE_LOG_COMPACT_RATIO):
+            await self._compact()
+
+    def _append(self, op: Dict[str, Any]) -> None:
+        line = (json.dumps(op, default=str) + "\n").encode()
+        with open(self.log_path, "ab") as f:
+            f.write(line)
+        self._log_bytes += len(line)
+
+    async def _compact(self) -> None:
+        """Rewrite the snapshot on the default executor.
+
+        Callers hold the store lock, so the data cannot change while the
+        worker thread serializes it.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_snapshot)
+
+    def _write_snapshot(self) -> None:
+        """Write the whole store as a new snapshot and empty the log."""
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._data, f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+        # A crash before the log is emptied replays operations the new
+        # snapshot already contains, which leaves the same data
+        with open(self.log_path, "wb"):
+            pass
+        self._snapshot_bytes = self.file_path.stat().st_size
+        self._log_bytes = 0
+        self.compactions += 1
+
+    @staticmethod
+    def _record(
+        namespace: Tuple[str, ...],
+        key: str,
+        value: Any,
+        timestamp: str,
+        metadata: Dict[str, Any],
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build a stored entry, keeping the access history of the one it replaces."""
+        record = {
+            "key": key,
+            "value": value,
+            "timestamp": timestamp,
+            "metadata": metadata,
+            "namespace": list(namespace)
+        }
+        if previous is not None and "access_count" in previous:
+            record["access_count"] = previous["access_count"]
+            record["last_access"] = previous["last_access"]
+        return record
+
+    def _live(self, ns_key: str, data: Optional[Dict[str, Any]]) -> bool:
+        """Whether an entry exists and has not outlived its namespace's TTL."""
+        return data is not None and not self._retention.is_expired(
+            ns_key, datetime.fromisoformat(data["timestamp"])
+        )
 
     async def store(
         self,
@@ -214,17 +760,17 @@ class FileMemoryStore:
         """Store a value in the memory store."""
         async with self._lock:
             ns_key = self._namespace_key(namespace)
-            if ns_key not in self._data:
-                self._data[ns_key] = {}
-
-            self._data[ns_key][key] = {
-                "key": key,
-                "value": value,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "metadata": metadata or {},
-                "namespace": list(namespace)
-            }
-            self._save()
+            record = self._record(
+                namespace,
+                key,
+                value,
+                datetime.now(timezone.utc).isoformat(),
+                metadata or {},
+                self._data.get(ns_key, {}).get(key)
+            )
+            await self._write({"op": "put", "entries": [[ns_key, record]]})
+            if self._vectors is not None:
+                self._vectors.upsert(ns_key, key, memory_text(key, value, metadata))
 
     async def retrieve(
         self,
@@ -234,8 +780,9 @@ class FileMemoryStore:
         """Retrieve a specific memory by key."""
         async with self._lock:
             ns_key = self._namespace_key(namespace)
-            if ns_key in self._data and key in self._data[ns_key]:
-                data = self._data[ns_key][key]
+            data = self._data.get(ns_key, {}).get(key)
+            if self._live(ns_key, data):
+                self._touch(ns_key, data)
                 return Memory(
                     key=data["key"],
                     value=data["value"],
@@ -249,63 +796,138 @@ class FileMemoryStore:
         self,
         namespace: Tuple[str, ...],
         query: str,
-        limit: int = 10
+        limit: int = 10,
+        mode: SearchMode = "text"
     ) -> List[MemorySearchResult]:
-        """Search for memories matching a query (simple substring match)."""
+        """Search for memories matching a query.
+
+        "text" is a simple substring match, "vector" ranks by similarity in
+        the vector index and "hybrid" blends the two rankings.
+        """
         async with self._lock:
-            results: List[MemorySearchResult] = []
-            query_lower = query.lower()
-            ns_prefix = self._namespace_key(namespace)
+            if mode == "text":
+                return self._search_text(namespace, query, limit)
+            if mode == "vector":
+                index = await self._vector_index()
+                return self._search_vector(index, namespace, query, limit)
+            if mode == "hybrid":
+                index = await self._vector_index()
+                candidates = limit * HYBRID_CANDIDATE_FACTOR
+                return _fuse_rankings(
+                    self._search_vector(index, namespace, query, candidates),
+                    self._search_text(namespace, query, candidates),
+                    limit
+                )
+            raise ValueError(f"Unknown search mode: {mode}")
 
-            for ns_key, memories in self._data.items():
-                # Check if namespace matches prefix
-                if not ns_key.startswith(ns_prefix):
+    async def _vector_index(self) -> MemoryVectorIndex:
+        """The vector index, built from the loaded memories on first use.
+
+        Built on a worker thread; the caller holds the lock, so no write
+        lands between reading the memories and installing the index.
+        """
+        if self._vectors is None:
+            loop = asyncio.get_running_loop()
+            self._vectors = await loop.run_in_executor(None, self._build_vector_index)
+        return self._vectors
+
+    def _build_vector_index(self) -> MemoryVectorIndex:
+        index = MemoryVectorIndex()
+        index.upsert_many(
+            (ns_key, key, memory_text(key, data["value"], data.get("metadata")))
+            for ns_key, memories in self._data.items()
+            for key, data in memories.items()
+        )
+        return index
+
+    def _search_vector(
+        self,
+        index: MemoryVectorIndex,
+        namespace: Tuple[str, ...],
+        query: str,
+        limit: int
+    ) -> List[MemorySearchResult]:
+        """Rank memories by vector similarity (caller holds the lock)."""
+        ns_prefix = self._namespace_key(namespace) if namespace else None
+        results: List[MemorySearchResult] = []
+        for ns_key, key, score in index.search(query, ns_prefix, limit):
+            data = self._data.get(ns_key, {}).get(key)
+            if self._live(ns_key, data):
+                results.append(MemorySearchResult(
+                    memory=Memory(
+                        key=data["key"],
+                        value=data["value"],
+                        timestamp=datetime.fromisoformat(data["timestamp"]),
+                        metadata=data.get("metadata", {}),
+                        namespace=tuple(data.get("namespace", []))
+                    ),
+                    score=score
+                ))
+        return results
+
+    def _search_text(
+        self,
+        namespace: Tuple[str, ...],
+        query: str,
+        limit: int
+    ) -> List[MemorySearchResult]:
+        """Substring search over keys, values and metadata (caller holds the lock)."""
+        results: List[MemorySearchResult] = []
+        query_lower = query.lower()
+        ns_prefix = self._namespace_key(namespace)
+
+        for ns_key, memories in self._data.items():
+            # Check if namespace matches prefix
+            if not ns_key.startswith(ns_prefix):
+                continue
+
+            for key, data in memories.items():
+                if not self._live(ns_key, data):
                     continue
 
-                for key, data in memories.items():
-                    # Search in key, value (if string), and metadata
-                    score = 0.0
-                    match_context = None
-
-                    # Check key
-                    if query_lower in key.lower():
-                        score = max(score, 0.8)
-                        match_context = f"Key: {key}"
-
-                    # Check value (convert to string for searching)
-                    value_str = json.dumps(data["value"]) if not isinstance(data["value"], str) else data["value"]
-                    if query_lower in value_str.lower():
-                        score = max(score, 1.0)
-                        # Extract context around match
-                        idx = value_str.lower().find(query_lower)
-                        start = max(0, idx - 30)
-                        end = min(len(value_str), idx + len(query) + 30)
-                        match_context = f"...{value_str[start:end]}..."
-
-                    # Check metadata
-                    metadata_str = json.dumps(data.get("metadata", {}))
-                    if query_lower in metadata_str.lower():
-                        score = max(score, 0.6)
-                        if match_context is None:
-                            match_context = f"Metadata match"
-
-                    if score > 0:
-                        memory = Memory(
-                            key=data["key"],
-                            value=data["value"],
-                            timestamp=datetime.fromisoformat(data["timestamp"]),
-                            metadata=data.get("metadata", {}),
-                            namespace=tuple(data.get("namespace", []))
-                        )
-                        results.append(MemorySearchResult(
-                            memory=memory,
-                            score=score,
-                            match_context=match_context
-                        ))
+                # Search in key, value (if string), and metadata
+                score = 0.0
+                match_context = None
+
+                # Check key
+                if query_lower in key.lower():
+                    score = max(score, 0.8)
+                    match_context = f"Key: {key}"
+
+                # Check value (convert to string for searching)
+                value_str = json.dumps(data["value"]) if not isinstance(data["value"], str) else data["value"]
+                if query_lower in value_str.lower():
+                    score = max(score, 1.0)
+                    # Extract context around match
+                    idx = value_str.lower().find(query_lower)
+                    start = max(0, idx - 30)
+                    end = min(len(value_str), idx + len(query) + 30)
+                    match_context = f"...{value_str[start:end]}..."
+
+                # Check metadata
+                metadata_str = json.dumps(data.get("metadata", {}))
+                if query_lower in metadata_str.lower():
+                    score = max(score, 0.6)
+                    if match_context is None:
+                        match_context = f"Metadata match"
+
+                if score > 0:
+                    memory = Memory(
+                        key=data["key"],
+                        value=data["value"],
+                        timestamp=datetime.fromisoformat(data["timestamp"]),
+                        metadata=data.get("metadata", {}),
+                        namespace=tuple(data.get("namespace", []))
+                    )
+                    results.append(MemorySearchResult(
+                        memory=memory,
+                        score=score,
+                        match_context=match_context
+                    ))
 
-            # Sort by score (descending) and limit
-            results.sort(key=lambda x: x.score, reverse=True)
-            return results[:limit]
+        # Sort by score (descending) and limit
+        results.sort(key=lambda x: x.score, reverse=True)
+        return results[:limit]
 
     async def list_keys(
         self,
@@ -327,11 +949,9 @@ class FileMemoryStore:
         async with self._lock:
             ns_key = self._namespace_key(namespace)
             if ns_key in self._data and key in self._data[ns_key]:
-                del self._data[ns_key][key]
-                # Remove empty namespaces
-                if not self._data[ns_key]:
-                    del self._data[ns_key]
-                self._save()
+                await self._write({"op": "delete", "entries": [[ns_key, key]]})
+                if self._vectors is not None:
+                    self._vectors.remove(ns_key, key)
                 return True
             return False
 
@@ -355,6 +975,119 @@ class FileMemoryStore:
 
             return namespaces
 
+    async def store_many(
+        self,
+        namespace: Tuple[str, ...],
+        items: Sequence[Dict[str, Any]]
+    ) -> int:
+        """Store several values with a single log append."""
+        entries = _normalize_items(items)
+        if not entries:
+            return 0
+        async with self._lock:
+            ns_key = self._namespace_key(namespace)
+            memories = self._data.get(ns_key, {})
+            timestamp = datetime.now(timezone.utc).isoformat()
+            await self._write({"op": "put", "entries": [
+                [ns_key, self._record(namespace, key, value, timestamp, metadata, memories.get(key))]
+                for key, value, metadata in entries
+            ]})
+            if self._vectors is not None:
+                self._vectors.upsert_many(
+                    (ns_key, key, memory_text(key, value, metadata))
+                    for key, value, metadata in entries
+                )
+            return len(entries)
+
+    async def retrieve_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> Dict[str, Memory]:
+        """Retrieve several memories by key."""
+        async with self._lock:
+            ns_key = self._namespace_key(namespace)
+            memories = self._data.get(ns_key, {})
+            found: Dict[str, Memory] = {}
+            for key in keys:
+                data = memories.get(key)
+                if self._live(ns_key, data):
+                    self._touch(ns_key, data)
+                    found[key] = Memory(
+                        key=data["key"],
+                        value=data["value"],
+                        timestamp=datetime.fromisoformat(data["timestamp"]),
+                        metadata=data.get("metadata", {}),
+                        namespace=tuple(data.get("namespace", []))
+                    )
+            return found
+
+    async def delete_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> int:
+        """Delete several memories with a single log append."""
+        async with self._lock:
+            ns_key = self._namespace_key(namespace)
+            memories = self._data.get(ns_key, {})
+            present = [key for key in dict.fromkeys(keys) if key in memories]
+            if not present:
+                return 0
+            await self._write({"op": "delete", "entries": [[ns_key, key] for key in present]})
+            if self._vectors is not None:
+                for key in present:
+                    self._vectors.remove(ns_key, key)
+            return len(present)
+
+    async def export_jsonl(
+        self,
+        path: Union[str, Path],
+        namespace: Optional[Tuple[str, ...]] = None
+    ) -> int:
+        """Write a namespace and its children to a JSONL file."""
+        path = Path(path).expanduser()
+        tmp_path = path.with_name(path.name + ".tmp")
+        root = self._namespace_key(namespace) if namespace else None
+        count = 0
+        async with self._lock:
+            with open(tmp_path, "w") as f:
+                for ns_key, memories in self._data.items():
+                    if not _in_namespace(ns_key, root):
+                        continue
+                    for data in memories.values():
+                        f.write(_export_line(
+                            tuple(data.get("namespace", [])),
+                            data["key"],
+                            data["value"],
+                            data["timestamp"],
+                            data.get("metadata", {})
+                        ))
+                        count += 1
+            os.replace(tmp_path, path)
+        return count
+
+    async def import_jsonl(self, path: Union[str, Path]) -> int:
+        """Load memories from a JSONL export with a single log append."""
+        path = Path(path).expanduser()
+        records = []
+        with open(path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    records.append(_parse_export_line(line, line_number))
+
+        async with self._lock:
+            if records:
+                entries = []
+                for namespace, key, value, timestamp, metadata in records:
+                    ns_key = self._namespace_key(namespace)
+                    previous = self._data.get(ns_key, {}).get(key)
+                    entries.append([ns_key, self._record(namespace, key, value, timestamp, metadata, previous)])
+                await self._write({"op": "put", "entries": entries})
+                # Rebuilt on the next vector search
+                self._vectors = None
+        return len(records)
+
     async def clear_namespace(
         self,
         namespace: Tuple[str, ...]
@@ -371,8 +1104,9 @@ class FileMemoryStore:
             ns_key = self._namespace_key(namespace)
             if ns_key in self._data:
                 count = len(self._data[ns_key])
-                del self._data[ns_key]
-                self._save()
+                await self._write({"op": "clear", "ns": ns_key})
+                if self._vectors is not None:
+                    self._vectors.remove_namespace(ns_key)
                 return count
             return 0
 
@@ -393,20 +1127,157 @@ class FileMemoryStore:
                 reverse=True
             )[:10]
 
-            return {
+            usage = {
+                ns_key: (
+                    len(memories),
+                    sum(
+                        _serialized_size(data["key"], json.dumps(data["value"]), json.dumps(data.get("metadata", {})))
+                        for data in memories.values()
+                    )
+                )
+                for ns_key, memories in self._data.items()
+            }
+
+            stats = {
                 "total_memories": total_memories,
                 "total_namespaces": total_namespaces,
                 "top_namespaces": top_namespaces,
-                "file_path": str(self.file_path)
+                "file_path": str(self.file_path),
+                "log_bytes": self._log_bytes,
+                "compactions": self.compactions,
+                "vector_index": (
+                    {"built": True, **self._vectors.stats()} if self._vectors is not None
+                    else {"built": False}
+                ),
             }
+            stats.update(self._retention.stats(usage))
+            return stats
+
+    # -- Retention --------------------------------------------------------------
+
+    async def set_retention_policy(
+        self,
+        namespace: Tuple[str, ...],
+        policy: Optional[RetentionPolicy]
+    ) -> None:
+        """Set the retention policy of a namespace and its children.
+
+        Args:
+            namespace: The namespace the policy applies to
+            policy: The policy, or None to remove it
+        """
+        self._retention.set_policy(self._namespace_key(namespace), policy)
+
+    def get_retention_policy(self, namespace: Tuple[str, ...]) -> Optional[RetentionPolicy]:
+        """Get the policy in effect for a namespace (its own or an ancestor's)."""
+        return self._retention.policy_for(self._namespace_key(namespace))
+
+    def add_eviction_listener(self, listener: EvictionListener) -> None:
+        """Call listener(ns_key, keys) after the sweeper removes memories."""
+        self._retention.add_listener(listener)
+
+    def is_expired(self, memory: Memory) -> bool:
+        """Whether a memory has outlived its namespace's TTL."""
+        return self._retention.is_expired(self._namespace_key(memory.namespace), memory.timestamp)
+
+    def touch(self, namespace: Tuple[str, ...], key: str) -> None:
+        """Record a read that did not reach the store (e.g. a cache hit)."""
+        ns_key = self._namespace_key(namespace)
+        data = self._data.get(ns_key, {}).get(key)
+        if data is not None:
+            self._touch(ns_key, data)
+
+    def _touch(self, ns_key: str, data: Dict[str, Any]) -> None:
+        # Saved with the next write; only quotas use the access history
+        if self._retention.tracks_access(ns_key):
+            data["last_access"] = time.time()
+            data["access_count"] = data.get("access_count", 0) + 1
+
+    async def _sweep_namespace(
+        self,
+        ns_key: str,
+        policy: RetentionPolicy,
+        budget: int
+    ) -> Tuple[List[str], List[str]]:
+        """Remove up to budget expired or over-quota memories from a namespace."""
+        async with self._lock:
+            memories = self._data.get(ns_key)
+            if not memories:
+                return [], []
+
+            expired: List[str] = []
+            if policy.ttl_seconds is not None:
+                cutoff = _Retention.ttl_cutoff(policy)
+                for key, data in memories.items():
+                    if len(expired) >= budget:
+                        break
+                    if datetime.fromisoformat(data["timestamp"]).timestamp() < cutoff:
+                        expired.append(key)
+
+            evicted: List[str] = []
+            if policy.has_quota and len(expired) < budget:
+                gone = set(expired)
+                memories = {key: data for key, data in memories.items() if key not in gone}
+                sizes = {
+                    key: _serialized_size(key, json.dumps(data["value"]), json.dumps(data.get("metadata", {})))
+                    for key, data in memories.items()
+                }
+                over_entries, over_bytes = policy.overage(len(memories), sum(sizes.values()))
+                if over_entries or over_bytes:
+                    def recency(key: str) -> float:
+                        data = memories[key]
+                        written = datetime.fromisoformat(data["timestamp"]).timestamp()
+                        return max(data.get("last_access", 0.0), written)
+
+                    if policy.eviction == "lfu":
+                        order = sorted(
+                            memories,
+                            key=lambda k: (memories[k].get("access_count", 0), recency(k))
+                        )
+                    else:
+                        order = sorted(memories, key=recency)
+                    evicted = _select_victims(
+                        [(key, sizes[key]) for key in order],
+                        over_entries,
+                        over_bytes,
+                        budget - len(expired)
+                    )
+
+            if expired or evicted:
+                await self._write({"op": "delete", "entries": [[ns_key, key] for key in expired + evicted]})
+                if self._vectors is not None:
+                    for key in expired + evicted:
+                        self._vectors.remove(ns_key, key)
+            return expired, evicted
+
+    async def sweep(self, max_removals: int = RETENTION_SWEEP_BATCH) -> int:
+        """Run one incremental retention pass.
+
+        Args:
+            max_removals: Most memories to remove in this pass
+
+        Returns:
+            Number of memories expired or evicted
+        """
+        return await self._retention.sweep(list(self._data), max_removals)
+
+    def start_sweeper(self, interval: float = RETENTION_SWEEP_INTERVAL_SECONDS) -> None:
+        """Enforce retention policies in a background task."""
+        self._retention.start(self.sweep, interval)
+
+    async def stop_sweeper(self) -> None:
+        """Stop the background sweeper, if running."""
+        await self._retention.stop()
 
     async def close(self) -> None:
         """Close the memory store and release any resources.
 
-        For FileMemoryStore, this saves any pending changes.
+        For FileMemoryStore, this stops the sweeper and compacts the log
+        into a fresh snapshot, which also saves access history.
         """
+        await self.stop_sweeper()
         async with self._lock:
-            self._save()
+            await self._compact()
 
     async def __aenter__(self) -> "FileMemoryStore":
         """Async context manager entry."""
@@ -417,19 +1288,239 @@ class FileMemoryStore:
         await self.close()
 
 
+# Pooled read connections (and reader threads) per SQLite store
+SQLITE_READ_CONNECTIONS = 4
+
+# Prepared statements cached per SQLite connection
+SQLITE_STATEMENT_CACHE_SIZE = 128
+
+# Row changes between FTS5 'optimize' merges of the search index
+FTS_OPTIMIZE_INTERVAL = 1000
+
+# Parameters: namespace, key, value, timestamp, metadata, last_access. A
+# write counts as an access; access_count is kept across overwrites.
+_SQL_UPSERT = """
+    INSERT INTO memories (namespace, key, value, timestamp, metadata, size, last_access)
+    VALUES (
+        ?1, ?2, ?3, ?4, ?5,
+        length(CAST(?2 AS BLOB)) + length(CAST(?3 AS BLOB)) + length(CAST(?5 AS BLOB)),
+        ?6
+    )
+    ON CONFLICT(namespace, key) DO UPDATE SET
+        value = excluded.value,
+        timestamp = excluded.timestamp,
+        metadata = excluded.metadata,
+        size = excluded.size,
+        last_access = excluded.last_access
+"""
+
+_SQL_RETRIEVE = """
+    SELECT namespace, key, value, timestamp, metadata
+    FROM memories
+    WHERE namespace = ? AND key = ?
+"""
+
+_SQL_SEARCH_FTS = """
+    SELECT
+        m.namespace,
+        m.key,
+        m.value,
+        m.timestamp,
+        m.metadata,
+        bm25(memories_fts) as score,
+        snippet(memories_fts, 1, '<b>', '</b>', '...', 32) as match_context
+    FROM memories_fts
+    JOIN memories m ON memories_fts.rowid = m.id
+    WHERE memories_fts MATCH ?
+    AND m.namespace LIKE ?
+    ORDER BY bm25(memories_fts)
+    LIMIT ?
+"""
+
+_SQL_SEARCH_LIKE = """
+    SELECT namespace, key, value, timestamp, metadata
+    FROM memories
+    WHERE namespace LIKE ?
+    AND (key LIKE ? OR value LIKE ? OR metadata LIKE ?)
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+_SQL_LIST_KEYS = """
+    SELECT key FROM memories
+    WHERE namespace = ?
+    ORDER BY key
+"""
+
+_SQL_DELETE = """
+    DELETE FROM memories
+    WHERE namespace = ? AND key = ?
+"""
+
+_SQL_CLEAR_NAMESPACE = """
+    DELETE FROM memories
+    WHERE namespace = ?
+"""
+
+_SQL_FTS_OPTIMIZE = "INSERT INTO memories_fts(memories_fts) VALUES('optimize')"
+
+_SQL_EXPORT_ALL = """
+    SELECT namespace, key, value, timestamp, metadata
+    FROM memories
+    ORDER BY namespace, key
+"""
+
+_SQL_EXPORT_NAMESPACE = """
+    SELECT namespace, key, value, timestamp, metadata
+    FROM memories
+    WHERE namespace = ? OR substr(namespace, 1, ?) = ?
+    ORDER BY namespace, key
+"""
+
+# Keys bound per IN (...) query in retrieve_many, below SQLite's variable limit
+SQLITE_MAX_BATCH_KEYS = 500
+
+# Re-index only when indexed columns change, not on access bookkeeping
+_SQL_CREATE_UPDATE_TRIGGER = """
+    CREATE TRIGGER memories_au AFTER UPDATE OF key, value, metadata, namespace ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, key, value, metadata, namespace)
+        VALUES ('delete', old.id, old.key, old.value, old.metadata, old.namespace);
+        INSERT INTO memories_fts(rowid, key, value, metadata, namespace)
+        VALUES (new.id, new.key, new.value, new.metadata, new.namespace);
+    END
+"""
+
+_SQL_RECORD_ACCESS = """
+    UPDATE memories
+    SET last_access = MAX(COALESCE(last_access, 0), ?), access_count = access_count + ?
+    WHERE namespace = ? AND key = ?
+"""
+
+_SQL_NAMESPACES = "SELECT DISTINCT namespace FROM memories"
+
+_SQL_VECTOR_SOURCE = "SELECT namespace, key, value, metadata FROM memories"
+
+_SQL_EXPIRED_KEYS = """
+    SELECT key FROM memories
+    WHERE namespace = ? AND timestamp < ?
+    LIMIT ?
+"""
+
+_SQL_NAMESPACE_USAGE = """
+    SELECT COUNT(*), COALESCE(SUM(size), 0) FROM memories
+    WHERE namespace = ?
+"""
+
+_SQL_EVICTION_ORDER = {
+    "lru": "COALESCE(last_access, 0), id",
+    "lfu": "access_count, COALESCE(last_access, 0), id",
+}
+
+_SQL_SAVE_POLICY = """
+    INSERT INTO memory_retention (namespace, policy) VALUES (?, ?)
+    ON CONFLICT(namespace) DO UPDATE SET policy = excluded.policy
+"""
+
+
+class _SQLitePool:
+    """Executor-backed SQLite connections with concurrent readers and one writer.
+
+    Every worker thread owns a single connection, opened on first use in WAL
+    mode with synchronous=NORMAL, so readers do not block each other or the
+    writer. All writes run on the one writer thread, one transaction per call.
+    Blocking SQLite work never runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        readers: int = SQLITE_READ_CONNECTIONS,
+        on_write: Optional[Callable[[sqlite3.Connection], None]] = None
+    ):
+        """Initialize the pool.
+
+        Args:
+            db_path: Path to the SQLite database
+            readers: Number of concurrent read connections
+            on_write: Called on the writer thread after each committed write
+        """
+        self.db_path = db_path
+        self._on_write = on_write
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="memory-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-write")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection configured for pooled use."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE_SIZE
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Get the calling worker thread's connection, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self.connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _run_read(self, fn: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        return fn(self._thread_connection(), *args)
+
+    def _run_write(self, fn: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        conn = self._thread_connection()
+        with conn:
+            result = fn(conn, *args)
+        if self._on_write is not None:
+            self._on_write(conn)
+        return result
+
+    async def read(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(connection, *args) on a reader thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, self._run_read, fn, args)
+
+    async def write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(connection, *args) in a transaction on the writer thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, self._run_write, fn, args)
+
+    def close(self) -> None:
+        """Wait for queued work, then close every connection."""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+
 class SQLiteMemoryStore:
     """SQLite-based memory store with FTS5 full-text search.
 
     Provides production-ready storage with efficient full-text search
     capabilities. Recommended for multi-agent scenarios and production use.
+    Queries run on a pool of executor threads (see _SQLitePool), so reads
+    proceed concurrently and never block the event loop.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, readers: int = SQLITE_READ_CONNECTIONS):
         """Initialize the SQLite memory store.
 
         Args:
             db_path: Path to the SQLite database. Defaults to
                      ITERM_MCP_MEMORY_DB_PATH env var or ~/.iterm-mcp/memories.db
+            readers: Number of concurrent read connections
         """
         if db_path is None:
             db_path = os.environ.get(
@@ -440,12 +1531,21 @@ class SQLiteMemoryStore:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self._lock = asyncio.Lock()
+        self._pool = _SQLitePool(self.db_path, readers=readers, on_write=self._maintain_fts)
+        self._changes_at_optimize = 0
+        self.fts_optimizations = 0
+        self._retention = _Retention(self._sweep_namespace)
+        # (namespace, key) -> [last access, reads] not yet written to the database
+        self._access: Dict[Tuple[str, str], List[float]] = {}
+        # Built on the first vector or hybrid search, then updated by the
+        # writer thread in the same calls that change the table
+        self._vectors: Optional[MemoryVectorIndex] = None
         self._init_db()
 
     def _init_db(self) -> None:
         """Initialize the database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        conn = self._pool.connect()
+        try:
             cursor = conn.cursor()
 
             # Main memories table
@@ -457,16 +1557,43 @@ class SQLiteMemoryStore:
                     value TEXT NOT NULL,
                     timestamp TEXT NOT NULL,
                     metadata TEXT DEFAULT '{}',
+                    size INTEGER NOT NULL DEFAULT 0,
+                    last_access REAL,
+                    access_count INTEGER NOT NULL DEFAULT 0,
                     UNIQUE(namespace, key)
                 )
             """)
 
+            # Retention bookkeeping, added to databases created before it
+            cursor.execute("PRAGMA table_info(memories)")
+            columns = {col[1] for col in cursor.fetchall()}
+            backfill_sizes = "size" not in columns
+            if backfill_sizes:
+                cursor.execute("ALTER TABLE memories ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            if "last_access" not in columns:
+                cursor.execute("ALTER TABLE memories ADD COLUMN last_access REAL")
+            if "access_count" not in columns:
+                cursor.execute("ALTER TABLE memories ADD COLUMN access_count INTEGER NOT NULL DEFAULT 0")
+
             # Create index on namespace for efficient prefix queries
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_memories_namespace
                 ON memories(namespace)
             """)
 
+            # TTL sweeps scan one namespace's oldest writes
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_memories_namespace_timestamp
+                ON memories(namespace, timestamp)
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS memory_retention (
+                    namespace TEXT PRIMARY KEY,
+                    policy TEXT NOT NULL
+                )
+            """)
+
             # Check if FTS5 table exists and has correct schema
             cursor.execute("""
                 SELECT name FROM sqlite_master
@@ -474,9 +1601,11 @@ class SQLiteMemoryStore:
             """)
             fts_exists = cursor.fetchone() is not None
 
-            # Check if we need to recreate FTS5 (if schema changed)
+            # Check if we need to recreate FTS5 (if schema changed). Column
+            # names match the memories table because the index reads its
+            # content from there; older standalone tables used other names.
             needs_recreate = False
-            expected_columns = {'key', 'value_text', 'metadata_text', 'namespace'}
+            expected_columns = {'key', 'value', 'metadata', 'namespace'}
             if fts_exists:
                 # Check column names to detect schema mismatch
                 cursor.execute("PRAGMA table_info(memories_fts)")
@@ -496,49 +1625,77 @@ class SQLiteMemoryStore:
                 fts_exists = False
 
             if not fts_exists:
-                # FTS5 virtual table for full-text search
-                # Using contentless FTS5 table that stores its own data
+                # External-content FTS5 table: the index stores only tokens
+                # and reads column values from memories when needed
                 cursor.execute("""
                     CREATE VIRTUAL TABLE memories_fts USING fts5(
                         key,
-                        value_text,
-                        metadata_text,
-                        namespace
+                        value,
+                        metadata,
+                        namespace,
+                        content='memories',
+                        content_rowid='id'
                     )
                 """)
 
-                # Triggers to keep FTS in sync with main table
-                # For standalone FTS5 tables (not using content= option),
-                # we use standard DELETE and INSERT operations
+                # Triggers to keep FTS in sync with main table. External
+                # content tables remove rows with the special 'delete'
+                # command, which needs the old column values.
                 cursor.execute("""
                     CREATE TRIGGER memories_ai AFTER INSERT ON memories BEGIN
-                        INSERT INTO memories_fts(rowid, key, value_text, metadata_text, namespace)
+                        INSERT INTO memories_fts(rowid, key, value, metadata, namespace)
                         VALUES (new.id, new.key, new.value, new.metadata, new.namespace);
                     END
                 """)
 
                 cursor.execute("""
                     CREATE TRIGGER memories_ad AFTER DELETE ON memories BEGIN
-                        DELETE FROM memories_fts WHERE rowid = old.id;
+                        INSERT INTO memories_fts(memories_fts, rowid, key, value, metadata, namespace)
+                        VALUES ('delete', old.id, old.key, old.value, old.metadata, old.namespace);
                     END
                 """)
 
+                cursor.execute(_SQL_CREATE_UPDATE_TRIGGER)
+
+                # Build the FTS index from existing data (for migration)
+                cursor.execute("INSERT INTO memories_fts(memories_fts) VALUES('rebuild')")
+            else:
+                # Older update triggers fired on every column
                 cursor.execute("""
-                    CREATE TRIGGER memories_au AFTER UPDATE ON memories BEGIN
-                        DELETE FROM memories_fts WHERE rowid = old.id;
-                        INSERT INTO memories_fts(rowid, key, value_text, metadata_text, namespace)
-                        VALUES (new.id, new.key, new.value, new.metadata, new.namespace);
-                    END
+                    SELECT sql FROM sqlite_master
+                    WHERE type='trigger' AND name='memories_au'
                 """)
+                row = cursor.fetchone()
+                if row is None or "UPDATE OF" not in row[0]:
+                    cursor.execute("DROP TRIGGER IF EXISTS memories_au")
+                    cursor.execute(_SQL_CREATE_UPDATE_TRIGGER)
 
-                # Rebuild FTS index from existing data (for migration)
+            if backfill_sizes:
                 cursor.execute("""
-                    INSERT INTO memories_fts(rowid, key, value_text, metadata_text, namespace)
-                    SELECT id, key, value, metadata, namespace FROM memories
+                    UPDATE memories
+                    SET size = length(CAST(key AS BLOB)) + length(CAST(value AS BLOB))
+                        + length(CAST(metadata AS BLOB))
                 """)
 
             conn.commit()
 
+            for ns_key, policy_json in cursor.execute("SELECT namespace, policy FROM memory_retention"):
+                self._retention.set_policy(ns_key, RetentionPolicy.model_validate_json(policy_json))
+        finally:
+            conn.close()
+
+    def _maintain_fts(self, conn: sqlite3.Connection) -> None:
+        """Merge FTS index segments once enough rows have changed.
+
+        Runs on the writer thread after each committed write.
+        """
+        if conn.total_changes - self._changes_at_optimize < FTS_OPTIMIZE_INTERVAL:
+            return
+        with conn:
+            conn.execute(_SQL_FTS_OPTIMIZE)
+        self._changes_at_optimize = conn.total_changes
+        self.fts_optimizations += 1
+
     def _namespace_key(self, namespace: Tuple[str, ...]) -> str:
         """Convert namespace tuple to string key."""
         return "/".join(namespace) if namespace else "/"
@@ -549,6 +1706,16 @@ class SQLiteMemoryStore:
             return ()
         return tuple(ns_key.split("/"))
 
+    def _row_to_memory(self, row: Tuple[Any, ...]) -> Memory:
+        """Build a Memory from a (namespace, key, value, timestamp, metadata) row."""
+        return Memory(
+            key=row[1],
+            value=json.loads(row[2]),
+            timestamp=datetime.fromisoformat(row[3]),
+            metadata=json.loads(row[4]),
+            namespace=self._parse_namespace(row[0])
+        )
+
     async def store(
         self,
         namespace: Tuple[str, ...],
@@ -557,23 +1724,17 @@ class SQLiteMemoryStore:
         metadata: Optional[Dict[str, Any]] = None
     ) -> None:
         """Store a value in the memory store."""
-        async with self._lock:
-            ns_key = self._namespace_key(namespace)
-            value_json = json.dumps(value)
-            metadata_json = json.dumps(metadata or {})
-            timestamp = datetime.now(timezone.utc).isoformat()
+        ns_key = self._namespace_key(namespace)
+        value_json = json.dumps(value)
+        metadata_json = json.dumps(metadata or {})
+        timestamp = datetime.now(timezone.utc).isoformat()
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO memories (namespace, key, value, timestamp, metadata)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT(namespace, key) DO UPDATE SET
-                        value = excluded.value,
-                        timestamp = excluded.timestamp,
-                        metadata = excluded.metadata
-                """, (ns_key, key, value_json, timestamp, metadata_json))
-                conn.commit()
+        def upsert(conn: sqlite3.Connection) -> None:
+            conn.execute(_SQL_UPSERT, (ns_key, key, value_json, timestamp, metadata_json, time.time()))
+            if self._vectors is not None:
+                self._vectors.upsert(ns_key, key, memory_text(key, value, metadata))
+
+        await self._pool.write(upsert)
 
     async def retrieve(
         self,
@@ -581,135 +1742,160 @@ class SQLiteMemoryStore:
         key: str
     ) -> Optional[Memory]:
         """Retrieve a specific memory by key."""
-        async with self._lock:
-            ns_key = self._namespace_key(namespace)
+        ns_key = self._namespace_key(namespace)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT namespace, key, value, timestamp, metadata
-                    FROM memories
-                    WHERE namespace = ? AND key = ?
-                """, (ns_key, key))
+        def fetch(conn: sqlite3.Connection) -> Optional[Tuple[Any, ...]]:
+            return conn.execute(_SQL_RETRIEVE, (ns_key, key)).fetchone()
 
-                row = cursor.fetchone()
-                if row:
-                    return Memory(
-                        key=row[1],
-                        value=json.loads(row[2]),
-                        timestamp=datetime.fromisoformat(row[3]),
-                        metadata=json.loads(row[4]),
-                        namespace=self._parse_namespace(row[0])
-                    )
-                return None
+        row = await self._pool.read(fetch)
+        if not row:
+            return None
+        memory = self._row_to_memory(row)
+        if self._retention.is_expired(ns_key, memory.timestamp):
+            return None
+        self._touch(ns_key, key)
+        return memory
 
     async def search(
         self,
         namespace: Tuple[str, ...],
         query: str,
-        limit: int = 10
+        limit: int = 10,
+        mode: SearchMode = "text"
     ) -> List[MemorySearchResult]:
-        """Search for memories using FTS5 full-text search.
+        """Search for memories.
 
-        Falls back to LIKE-based search if FTS5 query fails (e.g., due to
-        special characters that can't be properly escaped).
+        "text" uses FTS5 full-text search, "vector" ranks by similarity in
+        the vector index and "hybrid" blends the vector ranking with BM25.
         """
-        async with self._lock:
-            ns_prefix = self._namespace_key(namespace)
+        if mode == "text":
+            results = await self._search_text(namespace, query, limit)
+        elif mode == "vector":
+            results = await self._search_vector(namespace, query, limit)
+        elif mode == "hybrid":
+            candidates = limit * HYBRID_CANDIDATE_FACTOR
+            vector_results, text_results = await asyncio.gather(
+                self._search_vector(namespace, query, candidates),
+                self._search_text(namespace, query, candidates)
+            )
+            results = _fuse_rankings(vector_results, text_results, limit)
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        if self._retention.policies:
+            results = [r for r in results if not self.is_expired(r.memory)]
+        return results
+
+    async def _vector_index(self) -> MemoryVectorIndex:
+        """The vector index, built from the table on first use.
+
+        Built on the writer thread so no write lands between reading the
+        table and installing the index.
+        """
+        if self._vectors is not None:
+            return self._vectors
+
+        def build(conn: sqlite3.Connection) -> MemoryVectorIndex:
+            if self._vectors is None:
+                index = MemoryVectorIndex()
+                index.upsert_many(
+                    (row[0], row[1], memory_text(row[1], json.loads(row[2]), json.loads(row[3])))
+                    for row in conn.execute(_SQL_VECTOR_SOURCE)
+                )
+                self._vectors = index
+            return self._vectors
+
+        return await self._pool.write(build)
+
+    async def _search_vector(
+        self,
+        namespace: Tuple[str, ...],
+        query: str,
+        limit: int
+    ) -> List[MemorySearchResult]:
+        """Rank memories by vector similarity on a reader thread."""
+        index = await self._vector_index()
+        ns_prefix = self._namespace_key(namespace) if namespace else None
+
+        def run_search(conn: sqlite3.Connection) -> List[MemorySearchResult]:
             results: List[MemorySearchResult] = []
+            for ns_key, key, score in index.search(query, ns_prefix, limit):
+                row = conn.execute(_SQL_RETRIEVE, (ns_key, key)).fetchone()
+                if row:
+                    results.append(MemorySearchResult(memory=self._row_to_memory(row), score=score))
+            return results
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        return await self._pool.read(run_search)
 
-                try:
-                    # Use FTS5 search with BM25 ranking
-                    # Escape special FTS5 characters (double quotes)
-                    escaped_query = query.replace('"', '""')
-
-                    # Search in FTS table and join with main table for full data
-                    # Filter by namespace using SQL WHERE clause (not in FTS5 MATCH)
-                    # to avoid issues with special characters like / in namespace
-                    cursor.execute("""
-                        SELECT
-                            m.namespace,
-                            m.key,
-                            m.value,
-                            m.timestamp,
-                            m.metadata,
-                            bm25(memories_fts) as score,
-                            snippet(memories_fts, 1, '<b>', '</b>', '...', 32) as match_context
-                        FROM memories_fts
-                        JOIN memories m ON memories_fts.rowid = m.id
-                        WHERE memories_fts MATCH ?
-                        AND m.namespace LIKE ?
-                        ORDER BY bm25(memories_fts)
-                        LIMIT ?
-                    """, (f'"{escaped_query}"', f'{ns_prefix}%', limit))
-
-                    for row in cursor.fetchall():
-                        memory = Memory(
-                            key=row[1],
-                            value=json.loads(row[2]),
-                            timestamp=datetime.fromisoformat(row[3]),
-                            metadata=json.loads(row[4]),
-                            namespace=self._parse_namespace(row[0])
-                        )
-                        # Convert BM25 score (negative, lower is better) to 0-1 range
-                        bm25_score = row[5]
-                        normalized_score = 1.0 / (1.0 + abs(bm25_score))
-
-                        results.append(MemorySearchResult(
-                            memory=memory,
-                            score=normalized_score,
-                            match_context=row[6]
-                        ))
+    async def _search_text(
+        self,
+        namespace: Tuple[str, ...],
+        query: str,
+        limit: int
+    ) -> List[MemorySearchResult]:
+        """Search for memories using FTS5 full-text search.
 
-                except sqlite3.OperationalError:
-                    # FTS5 query failed, fall back to LIKE-based search
-                    like_pattern = f'%{query}%'
-                    cursor.execute("""
-                        SELECT namespace, key, value, timestamp, metadata
-                        FROM memories
-                        WHERE namespace LIKE ?
-                        AND (key LIKE ? OR value LIKE ? OR metadata LIKE ?)
-                        ORDER BY timestamp DESC
-                        LIMIT ?
-                    """, (f'{ns_prefix}%', like_pattern, like_pattern, like_pattern, limit))
-
-                    for row in cursor.fetchall():
-                        memory = Memory(
-                            key=row[1],
-                            value=json.loads(row[2]),
-                            timestamp=datetime.fromisoformat(row[3]),
-                            metadata=json.loads(row[4]),
-                            namespace=self._parse_namespace(row[0])
-                        )
-                        # LIKE search doesn't have relevance scoring, use 0.5
-                        results.append(MemorySearchResult(
-                            memory=memory,
-                            score=0.5,
-                            match_context=None
-                        ))
+        Falls back to LIKE-based search if FTS5 query fails (e.g., due to
+        special characters that can't be properly escaped).
+        """
+        ns_prefix = self._namespace_key(namespace)
+
+        def run_search(conn: sqlite3.Connection) -> List[MemorySearchResult]:
+            results: List[MemorySearchResult] = []
+            try:
+                # Use FTS5 search with BM25 ranking
+                # Escape special FTS5 characters (double quotes)
+                escaped_query = query.replace('"', '""')
+
+                # Search in FTS table and join with main table for full data
+                # Filter by namespace using SQL WHERE clause (not in FTS5 MATCH)
+                # to avoid issues with special characters like / in namespace
+                rows = conn.execute(
+                    _SQL_SEARCH_FTS, (f'"{escaped_query}"', f'{ns_prefix}%', limit)
+                ).fetchall()
+
+                for row in rows:
+                    # Convert BM25 score (negative, lower is better) to 0-1 range
+                    bm25_score = row[5]
+                    normalized_score = 1.0 / (1.0 + abs(bm25_score))
+
+                    results.append(MemorySearchResult(
+                        memory=self._row_to_memory(row),
+                        score=normalized_score,
+                        match_context=row[6]
+                    ))
+
+            except sqlite3.OperationalError:
+                # FTS5 query failed, fall back to LIKE-based search
+                like_pattern = f'%{query}%'
+                rows = conn.execute(
+                    _SQL_SEARCH_LIKE,
+                    (f'{ns_prefix}%', like_pattern, like_pattern, like_pattern, limit)
+                ).fetchall()
+
+                for row in rows:
+                    # LIKE search doesn't have relevance scoring, use 0.5
+                    results.append(MemorySearchResult(
+                        memory=self._row_to_memory(row),
+                        score=0.5,
+                        match_context=None
+                    ))
 
             return results
 
+        return await self._pool.read(run_search)
+
     async def list_keys(
         self,
         namespace: Tuple[str, ...]
     ) -> List[str]:
         """List all keys in a namespace."""
-        async with self._lock:
-            ns_key = self._namespace_key(namespace)
+        ns_key = self._namespace_key(namespace)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT key FROM memories
-                    WHERE namespace = ?
-                    ORDER BY key
-                """, (ns_key,))
+        def fetch(conn: sqlite3.Connection) -> List[str]:
+            return [row[0] for row in conn.execute(_SQL_LIST_KEYS, (ns_key,))]
 
-                return [row[0] for row in cursor.fetchall()]
+        return await self._pool.read(fetch)
 
     async def delete(
         self,
@@ -717,42 +1903,184 @@ class SQLiteMemoryStore:
         key: str
     ) -> bool:
         """Delete a memory by key."""
-        async with self._lock:
-            ns_key = self._namespace_key(namespace)
+        ns_key = self._namespace_key(namespace)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    DELETE FROM memories
-                    WHERE namespace = ? AND key = ?
-                """, (ns_key, key))
-                conn.commit()
-                return cursor.rowcount > 0
+        def remove(conn: sqlite3.Connection) -> bool:
+            if self._vectors is not None:
+                self._vectors.remove(ns_key, key)
+            return conn.execute(_SQL_DELETE, (ns_key, key)).rowcount > 0
+
+        return await self._pool.write(remove)
 
     async def list_namespaces(
         self,
         prefix: Optional[Tuple[str, ...]] = None
     ) -> List[Tuple[str, ...]]:
         """List all namespaces, optionally filtered by prefix."""
-        async with self._lock:
-            prefix_key = self._namespace_key(prefix) if prefix else ""
+        prefix_key = self._namespace_key(prefix) if prefix else ""
+
+        def fetch(conn: sqlite3.Connection) -> List[str]:
+            if prefix_key:
+                cursor = conn.execute("""
+                    SELECT DISTINCT namespace FROM memories
+                    WHERE namespace LIKE ?
+                    ORDER BY namespace
+                """, (f'{prefix_key}%',))
+            else:
+                cursor = conn.execute("""
+                    SELECT DISTINCT namespace FROM memories
+                    ORDER BY namespace
+                """)
+            return [row[0] for row in cursor]
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        return [self._parse_namespace(ns_key) for ns_key in await self._pool.read(fetch)]
 
-                if prefix_key:
-                    cursor.execute("""
-                        SELECT DISTINCT namespace FROM memories
-                        WHERE namespace LIKE ?
-                        ORDER BY namespace
-                    """, (f'{prefix_key}%',))
-                else:
-                    cursor.execute("""
-                        SELECT DISTINCT namespace FROM memories
-                        ORDER BY namespace
-                    """)
+    async def store_many(
+        self,
+        namespace: Tuple[str, ...],
+        items: Sequence[Dict[str, Any]]
+    ) -> int:
+        """Store several values in one transaction."""
+        ns_key = self._namespace_key(namespace)
+        timestamp = datetime.now(timezone.utc).isoformat()
+        now = time.time()
+        entries = _normalize_items(items)
+        rows = [
+            (ns_key, key, json.dumps(value), timestamp, json.dumps(metadata), now)
+            for key, value, metadata in entries
+        ]
+
+        def upsert_all(conn: sqlite3.Connection) -> int:
+            conn.executemany(_SQL_UPSERT, rows)
+            if self._vectors is not None:
+                self._vectors.upsert_many(
+                    (ns_key, key, memory_text(key, value, metadata))
+                    for key, value, metadata in entries
+                )
+            return len(rows)
 
-                return [self._parse_namespace(row[0]) for row in cursor.fetchall()]
+        return await self._pool.write(upsert_all)
+
+    async def retrieve_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> Dict[str, Memory]:
+        """Retrieve several memories by key."""
+        ns_key = self._namespace_key(namespace)
+        unique_keys = list(dict.fromkeys(keys))
+
+        def fetch(conn: sqlite3.Connection) -> List[Tuple[Any, ...]]:
+            rows: List[Tuple[Any, ...]] = []
+            for start in range(0, len(unique_keys), SQLITE_MAX_BATCH_KEYS):
+                chunk = unique_keys[start:start + SQLITE_MAX_BATCH_KEYS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(conn.execute(f"""
+                    SELECT namespace, key, value, timestamp, metadata
+                    FROM memories
+                    WHERE namespace = ? AND key IN ({placeholders})
+                """, (ns_key, *chunk)))
+            return rows
+
+        found: Dict[str, Memory] = {}
+        for row in await self._pool.read(fetch):
+            memory = self._row_to_memory(row)
+            if not self._retention.is_expired(ns_key, memory.timestamp):
+                self._touch(ns_key, memory.key)
+                found[memory.key] = memory
+        return found
+
+    async def delete_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> int:
+        """Delete several memories in one transaction."""
+        ns_key = self._namespace_key(namespace)
+        params = [(ns_key, key) for key in dict.fromkeys(keys)]
+
+        def remove_all(conn: sqlite3.Connection) -> int:
+            if self._vectors is not None:
+                for _, key in params:
+                    self._vectors.remove(ns_key, key)
+            return conn.executemany(_SQL_DELETE, params).rowcount
+
+        return await self._pool.write(remove_all)
+
+    async def export_jsonl(
+        self,
+        path: Union[str, Path],
+        namespace: Optional[Tuple[str, ...]] = None
+    ) -> int:
+        """Stream a namespace and its children to a JSONL file.
+
+        Rows are written as the cursor yields them, so exports of any size
+        run in constant memory on a reader thread.
+        """
+        path = Path(path).expanduser()
+        tmp_path = path.with_name(path.name + ".tmp")
+        root = self._namespace_key(namespace) if namespace else None
+
+        def dump(conn: sqlite3.Connection) -> int:
+            if root is None:
+                cursor = conn.execute(_SQL_EXPORT_ALL)
+            else:
+                child_prefix = root + "/"
+                cursor = conn.execute(
+                    _SQL_EXPORT_NAMESPACE, (root, len(child_prefix), child_prefix)
+                )
+            count = 0
+            with open(tmp_path, "w") as f:
+                for row in cursor:
+                    f.write(_export_line(
+                        self._parse_namespace(row[0]),
+                        row[1],
+                        json.loads(row[2]),
+                        row[3],
+                        json.loads(row[4])
+                    ))
+                    count += 1
+            os.replace(tmp_path, path)
+            return count
+
+        return await self._pool.read(dump)
+
+    async def import_jsonl(self, path: Union[str, Path]) -> int:
+        """Load memories from a JSONL export in one transaction.
+
+        Lines are parsed as SQLite consumes them, so imports of any size
+        run in constant memory on the writer thread. A malformed line rolls
+        back the whole import.
+        """
+        path = Path(path).expanduser()
+
+        def load(conn: sqlite3.Connection) -> int:
+            count = 0
+            now = time.time()
+
+            def rows():
+                nonlocal count
+                with open(path, "r") as f:
+                    for line_number, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        namespace, key, value, timestamp, metadata = _parse_export_line(line, line_number)
+                        count += 1
+                        yield (
+                            self._namespace_key(namespace),
+                            key,
+                            json.dumps(value),
+                            timestamp,
+                            json.dumps(metadata),
+                            now
+                        )
+
+            conn.executemany(_SQL_UPSERT, rows())
+            # Rebuilt on the next vector search
+            self._vectors = None
+            return count
+
+        return await self._pool.write(load)
 
     async def clear_namespace(
         self,
@@ -766,17 +2094,14 @@ class SQLiteMemoryStore:
         Returns:
             Number of memories deleted
         """
-        async with self._lock:
-            ns_key = self._namespace_key(namespace)
+        ns_key = self._namespace_key(namespace)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    DELETE FROM memories
-                    WHERE namespace = ?
-                """, (ns_key,))
-                conn.commit()
-                return cursor.rowcount
+        def clear(conn: sqlite3.Connection) -> int:
+            if self._vectors is not None:
+                self._vectors.remove_namespace(ns_key)
+            return conn.execute(_SQL_CLEAR_NAMESPACE, (ns_key,)).rowcount
+
+        return await self._pool.write(clear)
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the memory store.
@@ -784,45 +2109,194 @@ class SQLiteMemoryStore:
         Returns:
             Dictionary with stats (total memories, namespaces, etc.)
         """
-        async with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+        def fetch(conn: sqlite3.Connection) -> Dict[str, Any]:
+            cursor = conn.cursor()
 
-                cursor.execute("SELECT COUNT(*) FROM memories")
-                total_memories = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM memories")
+            total_memories = cursor.fetchone()[0]
 
-                cursor.execute("SELECT COUNT(DISTINCT namespace) FROM memories")
-                total_namespaces = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(DISTINCT namespace) FROM memories")
+            total_namespaces = cursor.fetchone()[0]
 
-                cursor.execute("""
-                    SELECT namespace, COUNT(*) as count
-                    FROM memories
-                    GROUP BY namespace
-                    ORDER BY count DESC
-                    LIMIT 10
-                """)
-                top_namespaces = [
-                    {"namespace": row[0], "count": row[1]}
-                    for row in cursor.fetchall()
-                ]
-
-                return {
-                    "total_memories": total_memories,
-                    "total_namespaces": total_namespaces,
-                    "top_namespaces": top_namespaces,
-                    "db_path": str(self.db_path)
-                }
+            cursor.execute("""
+                SELECT namespace, COUNT(*) as count
+                FROM memories
+                GROUP BY namespace
+                ORDER BY count DESC
+                LIMIT 10
+            """)
+            top_namespaces = [
+                {"namespace": row[0], "count": row[1]}
+                for row in cursor.fetchall()
+            ]
+
+            cursor.execute("""
+                SELECT namespace, COUNT(*), COALESCE(SUM(size), 0)
+                FROM memories
+                GROUP BY namespace
+            """)
+            usage = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+            stats = {
+                "total_memories": total_memories,
+                "total_namespaces": total_namespaces,
+                "top_namespaces": top_namespaces,
+                "db_path": str(self.db_path),
+                "fts_optimizations": self.fts_optimizations,
+                "vector_index": (
+                    {"built": True, **self._vectors.stats()} if self._vectors is not None
+                    else {"built": False}
+                ),
+            }
+            stats.update(self._retention.stats(usage))
+            return stats
+
+        return await self._pool.read(fetch)
+
+    # -- Retention --------------------------------------------------------------
+
+    async def set_retention_policy(
+        self,
+        namespace: Tuple[str, ...],
+        policy: Optional[RetentionPolicy]
+    ) -> None:
+        """Set (and persist) the retention policy of a namespace and its children.
+
+        Args:
+            namespace: The namespace the policy applies to
+            policy: The policy, or None to remove it
+        """
+        ns_key = self._namespace_key(namespace)
+
+        def save(conn: sqlite3.Connection) -> None:
+            if policy is None:
+                conn.execute("DELETE FROM memory_retention WHERE namespace = ?", (ns_key,))
+            else:
+                conn.execute(_SQL_SAVE_POLICY, (ns_key, policy.model_dump_json()))
+
+        await self._pool.write(save)
+        self._retention.set_policy(ns_key, policy)
+
+    def get_retention_policy(self, namespace: Tuple[str, ...]) -> Optional[RetentionPolicy]:
+        """Get the policy in effect for a namespace (its own or an ancestor's)."""
+        return self._retention.policy_for(self._namespace_key(namespace))
+
+    def add_eviction_listener(self, listener: EvictionListener) -> None:
+        """Call listener(ns_key, keys) after the sweeper removes memories."""
+        self._retention.add_listener(listener)
+
+    def is_expired(self, memory: Memory) -> bool:
+        """Whether a memory has outlived its namespace's TTL."""
+        return self._retention.is_expired(self._namespace_key(memory.namespace), memory.timestamp)
+
+    def touch(self, namespace: Tuple[str, ...], key: str) -> None:
+        """Record a read that did not reach the store (e.g. a cache hit)."""
+        self._touch(self._namespace_key(namespace), key)
+
+    def _touch(self, ns_key: str, key: str) -> None:
+        # Buffered so reads stay reads; written out by the next sweep
+        if self._retention.tracks_access(ns_key):
+            access = self._access.setdefault((ns_key, key), [0.0, 0])
+            access[0] = time.time()
+            access[1] += 1
+
+    async def _flush_access(self) -> None:
+        """Write buffered access times and counts."""
+        if not self._access:
+            return
+        pending, self._access = self._access, {}
+        params = [(last, count, ns_key, key) for (ns_key, key), (last, count) in pending.items()]
+
+        def record(conn: sqlite3.Connection) -> None:
+            conn.executemany(_SQL_RECORD_ACCESS, params)
+
+        await self._pool.write(record)
+
+    async def _sweep_namespace(
+        self,
+        ns_key: str,
+        policy: RetentionPolicy,
+        budget: int
+    ) -> Tuple[List[str], List[str]]:
+        """Remove up to budget expired or over-quota memories in one transaction."""
+        cutoff = None
+        if policy.ttl_seconds is not None:
+            cutoff = datetime.fromtimestamp(_Retention.ttl_cutoff(policy), timezone.utc).isoformat()
+
+        def apply(conn: sqlite3.Connection) -> Tuple[List[str], List[str]]:
+            expired: List[str] = []
+            if cutoff is not None:
+                expired = [row[0] for row in conn.execute(_SQL_EXPIRED_KEYS, (ns_key, cutoff, budget))]
+                conn.executemany(_SQL_DELETE, [(ns_key, key) for key in expired])
+
+            evicted: List[str] = []
+            remaining = budget - len(expired)
+            if policy.has_quota and remaining > 0:
+                entries, size = conn.execute(_SQL_NAMESPACE_USAGE, (ns_key,)).fetchone()
+                over_entries, over_bytes = policy.overage(entries, size)
+                if over_entries or over_bytes:
+                    candidates = conn.execute(f"""
+                        SELECT key, size FROM memories
+                        WHERE namespace = ?
+                        ORDER BY {_SQL_EVICTION_ORDER[policy.eviction]}
+                        LIMIT ?
+                    """, (ns_key, remaining)).fetchall()
+                    evicted = _select_victims(candidates, over_entries, over_bytes, remaining)
+                    conn.executemany(_SQL_DELETE, [(ns_key, key) for key in evicted])
+            if self._vectors is not None:
+                for key in expired + evicted:
+                    self._vectors.remove(ns_key, key)
+            return expired, evicted
+
+        return await self._pool.write(apply)
+
+    async def sweep(self, max_removals: int = RETENTION_SWEEP_BATCH) -> int:
+        """Run one incremental retention pass.
+
+        Writes buffered access history first, then removes at most
+        max_removals memories, one namespace per transaction.
+
+        Args:
+            max_removals: Most memories to remove in this pass
+
+        Returns:
+            Number of memories expired or evicted
+        """
+        await self._flush_access()
+        if not self._retention.policies:
+            return 0
+
+        def fetch(conn: sqlite3.Connection) -> List[str]:
+            return [row[0] for row in conn.execute(_SQL_NAMESPACES)]
+
+        return await self._retention.sweep(await self._pool.read(fetch), max_removals)
+
+    def start_sweeper(self, interval: float = RETENTION_SWEEP_INTERVAL_SECONDS) -> None:
+        """Enforce retention policies in a background task."""
+        self._retention.start(self.sweep, interval)
+
+    async def stop_sweeper(self) -> None:
+        """Stop the background sweeper, if running."""
+        await self._retention.stop()
 
     async def close(self) -> None:
         """Close the memory store and release any resources.
 
-        Note: SQLite connections are opened and closed per-operation using
-        context managers, so this method is mainly for consistency with
-        other store implementations and for explicit cleanup signaling.
+        Stops the sweeper, writes buffered access history, waits for queued
+        queries, merges the FTS index and closes the pooled connections.
+        The store cannot be used afterwards.
         """
-        # SQLite connections are managed per-operation, no persistent
-        # connection to close. This method exists for API consistency.
-        pass
+        def optimize(conn: sqlite3.Connection) -> None:
+            conn.execute(_SQL_FTS_OPTIMIZE)
+
+        await self.stop_sweeper()
+        try:
+            await self._flush_access()
+            await self._pool.write(optimize)
+        except RuntimeError:
+            # Already closed
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._pool.close)
 
     async def __aenter__(self) -> "SQLiteMemoryStore":
         """Async context manager entry."""
@@ -833,23 +2307,378 @@ class SQLiteMemoryStore:
         await self.close()
 
 
+# Default bounds for CachedMemoryStore
+MEMORY_CACHE_MAX_ENTRIES = 2048
+MEMORY_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Rough per-entry overhead added to the serialized size of cached values
+_CACHE_ENTRY_OVERHEAD = 256
+
+
+def _estimate_memory_size(memory: Optional[Memory]) -> int:
+    """Approximate the bytes a cached Memory occupies."""
+    if memory is None:
+        return _CACHE_ENTRY_OVERHEAD
+    payload = json.dumps([memory.value, memory.metadata], default=str)
+    return len(payload) + len(memory.key) + _CACHE_ENTRY_OVERHEAD
+
+
+class CachedMemoryStore:
+    """In-process LRU read-through cache in front of any memory store.
+
+    Caches retrieve results (including misses) per key and search results
+    per (namespace prefix, query, limit), bounded together by entry count
+    and approximate bytes. Writes and deletes drop the affected keys and
+    bump a generation counter for every prefix of the written namespace, so
+    cached searches that could include it are no longer served.
+
+    Hits still count as reads for the backend's eviction order and are
+    checked against its TTLs, and memories the backend's sweeper removes are
+    dropped from the cache. Cached Memory objects are shared between callers
+    and must not be modified.
+    """
+
+    def __init__(
+        self,
+        store: Union[FileMemoryStore, SQLiteMemoryStore],
+        max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        max_bytes: int = MEMORY_CACHE_MAX_BYTES
+    ):
+        """Initialize the cache.
+
+        Args:
+            store: The memory store to wrap
+            max_entries: Maximum number of cached retrieve and search results
+            max_bytes: Maximum approximate size of the cached results
+        """
+        self.backend = store
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # ("get", ns_key, key) or ("search", prefix, query, limit, mode) -> (value, size, generation)
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, int, int]]" = OrderedDict()
+        self._keys_by_namespace: Dict[str, set] = {}
+        self._bytes = 0
+
+        # Bumped for each string prefix of a written namespace
+        self._generations: Dict[str, int] = {}
+        # Bumped by writes whose namespaces are not known up front (imports)
+        self._epoch = 0
+        # Bumped by every write; retrieves racing a write are not cached
+        self._writes = 0
+
+        self.cache_stats: Dict[str, int] = {
+            "retrieve_hits": 0,
+            "retrieve_misses": 0,
+            "search_hits": 0,
+            "search_misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+        store.add_eviction_listener(self._on_backend_eviction)
+
+    def __getattr__(self, name: str) -> Any:
+        # Backend-specific attributes (db_path, file_path, ...) pass through
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    @staticmethod
+    def _namespace_key(namespace: Tuple[str, ...]) -> str:
+        """Convert namespace tuple to string key (same form as the stores)."""
+        return "/".join(namespace) if namespace else "/"
+
+    def _search_generation(self, prefix: str) -> int:
+        return self._generations.get(prefix, 0) + self._epoch
+
+    # -- LRU bookkeeping ----------------------------------------------------
+
+    def _get(self, cache_key: Tuple[Any, ...]) -> Tuple[bool, Any]:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return False, None
+        if cache_key[0] == "search" and entry[2] != self._search_generation(cache_key[1]):
+            self._discard(cache_key)
+            return False, None
+        self._entries.move_to_end(cache_key)
+        return True, entry[0]
+
+    def _put(self, cache_key: Tuple[Any, ...], value: Any, size: int, generation: int = 0) -> None:
+        if size > self.max_bytes:
+            return
+        self._discard(cache_key)
+        self._entries[cache_key] = (value, size, generation)
+        self._bytes += size
+        if cache_key[0] == "get":
+            self._keys_by_namespace.setdefault(cache_key[1], set()).add(cache_key[2])
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.cache_stats["evictions"] += 1
+
+    def _discard(self, cache_key: Tuple[Any, ...]) -> bool:
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        if cache_key[0] == "get":
+            keys = self._keys_by_namespace.get(cache_key[1])
+            if keys is not None:
+                keys.discard(cache_key[2])
+                if not keys:
+                    del self._keys_by_namespace[cache_key[1]]
+        return True
+
+    def _invalidate(self, ns_key: str, keys: Optional[Sequence[str]] = None) -> None:
+        """Drop cached keys (all of the namespace if keys is None) and stale searches."""
+        self._writes += 1
+        if keys is None:
+            keys = list(self._keys_by_namespace.get(ns_key, ()))
+        for key in keys:
+            if self._discard(("get", ns_key, key)):
+                self.cache_stats["invalidations"] += 1
+        for end in range(len(ns_key) + 1):
+            prefix = ns_key[:end]
+            self._generations[prefix] = self._generations.get(prefix, 0) + 1
+
+    def _on_backend_eviction(self, ns_key: str, keys: List[str]) -> None:
+        self._invalidate(ns_key, keys)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached result."""
+        self._writes += 1
+        self._epoch += 1
+        self.cache_stats["invalidations"] += len(self._entries)
+        self._entries.clear()
+        self._keys_by_namespace.clear()
+        self._bytes = 0
+
+    # -- Reads ----------------------------------------------------------------
+
+    async def retrieve(
+        self,
+        namespace: Tuple[str, ...],
+        key: str
+    ) -> Optional[Memory]:
+        """Retrieve a memory, serving repeated reads from the cache."""
+        ns_key = self._namespace_key(namespace)
+        hit, memory = self._get(("get", ns_key, key))
+        if hit and memory is not None and self.backend.is_expired(memory):
+            self._discard(("get", ns_key, key))
+            hit = False
+        if hit:
+            self.cache_stats["retrieve_hits"] += 1
+            if memory is not None:
+                self.backend.touch(namespace, key)
+            return memory
+        self.cache_stats["retrieve_misses"] += 1
+
+        writes = self._writes
+        memory = await self.backend.retrieve(namespace, key)
+        if writes == self._writes:
+            self._put(("get", ns_key, key), memory, _estimate_memory_size(memory))
+        return memory
+
+    async def retrieve_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> Dict[str, Memory]:
+        """Retrieve several memories, fetching only the keys not cached."""
+        ns_key = self._namespace_key(namespace)
+        found: Dict[str, Memory] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            hit, memory = self._get(("get", ns_key, key))
+            if hit and memory is not None and self.backend.is_expired(memory):
+                self._discard(("get", ns_key, key))
+                hit = False
+            if hit:
+                self.cache_stats["retrieve_hits"] += 1
+                if memory is not None:
+                    self.backend.touch(namespace, key)
+                    found[key] = memory
+            else:
+                self.cache_stats["retrieve_misses"] += 1
+                missing.append(key)
+
+        if missing:
+            writes = self._writes
+            fetched = await self.backend.retrieve_many(namespace, missing)
+            if writes == self._writes:
+                for key in missing:
+                    memory = fetched.get(key)
+                    self._put(("get", ns_key, key), memory, _estimate_memory_size(memory))
+            found.update(fetched)
+        return found
+
+    async def search(
+        self,
+        namespace: Tuple[str, ...],
+        query: str,
+        limit: int = 10,
+        mode: SearchMode = "text"
+    ) -> List[MemorySearchResult]:
+        """Search for memories, serving repeated queries from the cache."""
+        # An empty namespace can match everything, so any write invalidates it
+        prefix = self._namespace_key(namespace) if namespace else ""
+        cache_key = ("search", prefix, query, limit, mode)
+        hit, results = self._get(cache_key)
+        if hit:
+            self.cache_stats["search_hits"] += 1
+            return [r for r in results if not self.backend.is_expired(r.memory)]
+        self.cache_stats["search_misses"] += 1
+
+        generation = self._search_generation(prefix)
+        results = await self.backend.search(namespace, query, limit, mode)
+        size = sum(_estimate_memory_size(r.memory) for r in results) + _CACHE_ENTRY_OVERHEAD
+        # A write during the search leaves the entry stale on arrival
+        self._put(cache_key, list(results), size, generation)
+        return results
+
+    async def list_keys(self, namespace: Tuple[str, ...]) -> List[str]:
+        """List all keys in a namespace (not cached)."""
+        return await self.backend.list_keys(namespace)
+
+    async def list_namespaces(
+        self,
+        prefix: Optional[Tuple[str, ...]] = None
+    ) -> List[Tuple[str, ...]]:
+        """List namespaces (not cached)."""
+        return await self.backend.list_namespaces(prefix)
+
+    async def export_jsonl(
+        self,
+        path: Union[str, Path],
+        namespace: Optional[Tuple[str, ...]] = None
+    ) -> int:
+        """Export a namespace subtree to JSONL (not cached)."""
+        return await self.backend.export_jsonl(path, namespace)
+
+    # -- Writes -----------------------------------------------------------------
+
+    async def store(
+        self,
+        namespace: Tuple[str, ...],
+        key: str,
+        value: Any,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Store a value and drop cached results it affects."""
+        try:
+            await self.backend.store(namespace, key, value, metadata)
+        finally:
+            self._invalidate(self._namespace_key(namespace), [key])
+
+    async def store_many(
+        self,
+        namespace: Tuple[str, ...],
+        items: Sequence[Dict[str, Any]]
+    ) -> int:
+        """Store several values and drop cached results they affect."""
+        try:
+            return await self.backend.store_many(namespace, items)
+        finally:
+            keys = [item["key"] for item in items if "key" in item]
+            self._invalidate(self._namespace_key(namespace), keys)
+
+    async def delete(self, namespace: Tuple[str, ...], key: str) -> bool:
+        """Delete a memory and drop cached results it affects."""
+        try:
+            return await self.backend.delete(namespace, key)
+        finally:
+            self._invalidate(self._namespace_key(namespace), [key])
+
+    async def delete_many(
+        self,
+        namespace: Tuple[str, ...],
+        keys: Sequence[str]
+    ) -> int:
+        """Delete several memories and drop cached results they affect."""
+        try:
+            return await self.backend.delete_many(namespace, keys)
+        finally:
+            self._invalidate(self._namespace_key(namespace), list(keys))
+
+    async def clear_namespace(self, namespace: Tuple[str, ...]) -> int:
+        """Clear a namespace and drop every cached result for it."""
+        try:
+            return await self.backend.clear_namespace(namespace)
+        finally:
+            self._invalidate(self._namespace_key(namespace))
+
+    async def import_jsonl(self, path: Union[str, Path]) -> int:
+        """Import a JSONL export; the namespaces are unknown, so drop everything."""
+        try:
+            return await self.backend.import_jsonl(path)
+        finally:
+            self.invalidate_all()
+
+    # -- Lifecycle ----------------------------------------------------------------
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Cache hit rates and occupancy."""
+        stats: Dict[str, Any] = dict(self.cache_stats)
+        for kind in ("retrieve", "search"):
+            lookups = stats[f"{kind}_hits"] + stats[f"{kind}_misses"]
+            stats[f"{kind}_hit_rate"] = round(stats[f"{kind}_hits"] / lookups, 4) if lookups else 0.0
+        stats.update({
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        })
+        return stats
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get the wrapped store's statistics plus cache statistics."""
+        stats = await self.backend.get_stats()
+        stats["cache"] = self.get_cache_stats()
+        return stats
+
+    async def close(self) -> None:
+        """Drop the cache and close the wrapped store."""
+        self.invalidate_all()
+        await self.backend.close()
+
+    async def __aenter__(self) -> "CachedMemoryStore":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit."""
+        await self.close()
+
+
 # Factory function to get the appropriate store
 def get_memory_store(
     store_type: str = "sqlite",
+    cache: bool = False,
+    cache_max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+    cache_max_bytes: int = MEMORY_CACHE_MAX_BYTES,
     **kwargs: Any
-) -> Union[FileMemoryStore, SQLiteMemoryStore]:
+) -> Union[FileMemoryStore, SQLiteMemoryStore, CachedMemoryStore]:
     """Get a memory store instance.
 
     Args:
         store_type: "file" for FileMemoryStore, "sqlite" for SQLiteMemoryStore
+        cache: Wrap the store in a CachedMemoryStore
+        cache_max_entries: Maximum cached results when cache is True
+        cache_max_bytes: Maximum approximate cache size when cache is True
         **kwargs: Additional arguments passed to the store constructor
 
     Returns:
         A MemoryStore implementation
     """
     if store_type == "file":
-        return FileMemoryStore(**kwargs)
+        store: Union[FileMemoryStore, SQLiteMemoryStore] = FileMemoryStore(**kwargs)
     elif store_type == "sqlite":
-        return SQLiteMemoryStore(**kwargs)
+        store = SQLiteMemoryStore(**kwargs)
     else:
         raise ValueError(f"Unknown store type: {store_type}")
+
+    if cache:
+        return CachedMemoryStore(store, max_entries=cache_max_entries, max_bytes=cache_max_bytes)
+    return store
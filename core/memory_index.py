@@ -0,0 +1,283 @@
+"""Offline vector index for similarity search over agent memories.
+
+Memories are embedded with a deterministic hashed n-gram vectorizer: word
+unigrams and character trigrams are hashed into a fixed number of signed
+buckets, weighted by sublinear term frequency and L2-normalized. Nothing is
+downloaded and the same text always gets the same vector, so the index can
+be rebuilt from the memory table at any time.
+
+Vectors live in one contiguous float32 NumPy matrix. A query is weighted by
+inverse document frequency, and top-k is a single matrix-vector product
+followed by argpartition, so search cost is linear in the number of
+memories with no Python loop over them.
+
+NumPy is optional; install with: pip install iterm-mcp[vector]
+"""
+
+import json
+import re
+import threading
+import zlib
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Hash buckets per vector; 100k memories take 100 MB of float32 at 256
+VECTOR_DIMENSIONS = 256
+
+# Rows allocated when the matrix first grows; capacity doubles after that
+VECTOR_INITIAL_CAPACITY = 1024
+
+# Texts vectorized together when indexing many memories
+VECTOR_BATCH_SIZE = 1024
+
+# Distinct words whose hashed features are remembered
+_WORD_FEATURE_CACHE_SIZE = 65536
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def memory_text(key: str, value: Any, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """The text a memory is embedded from (key, value and metadata)."""
+    value_text = value if isinstance(value, str) else json.dumps(value, default=str)
+    metadata_text = json.dumps(metadata, default=str) if metadata else ""
+    return f"{key} {value_text} {metadata_text}"
+
+
+@lru_cache(maxsize=_WORD_FEATURE_CACHE_SIZE)
+def _word_features(word: str, dimensions: int) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Signed hash buckets of a word and its character trigrams."""
+    padded = f"<{word}>"
+    grams = [f"w:{word}"] + [padded[i:i + 3] for i in range(len(padded) - 2)]
+    buckets = []
+    signs = []
+    for gram in grams:
+        h = zlib.crc32(gram.encode())
+        # Low bits pick the bucket, the top bit the sign, so collisions
+        # tend to cancel instead of adding up
+        buckets.append(h % dimensions)
+        signs.append(-1.0 if h & 0x80000000 else 1.0)
+    return tuple(buckets), tuple(signs)
+
+
+class HashingVectorizer:
+    """Deterministic hashed word and character-trigram vectorizer."""
+
+    def __init__(self, dimensions: int = VECTOR_DIMENSIONS):
+        """Initialize the vectorizer.
+
+        Args:
+            dimensions: Number of hash buckets per vector
+        """
+        self.dimensions = dimensions
+
+    def vectors(self, texts: Sequence[str]) -> "np.ndarray":
+        """Sublinear-TF vectors of texts as L2-normalized float32 rows.
+
+        Only tokenizing runs per text in Python; counting, weighting and
+        normalizing run once for the whole batch.
+        """
+        buckets: List[int] = []
+        signs: List[float] = []
+        lengths: List[int] = []
+        for text in texts:
+            start = len(buckets)
+            for word in _WORD_RE.findall(text.lower()):
+                word_buckets, word_signs = _word_features(word, self.dimensions)
+                buckets.extend(word_buckets)
+                signs.extend(word_signs)
+            lengths.append(len(buckets) - start)
+
+        count = len(texts)
+        rows = np.repeat(np.arange(count), lengths)
+        cells = rows * self.dimensions + np.asarray(buckets, dtype=np.intp)
+        counts = np.bincount(cells, weights=signs, minlength=count * self.dimensions)
+        counts = counts.reshape(count, self.dimensions)
+
+        magnitude = np.abs(counts)
+        weights = np.sign(counts) * (1.0 + np.log(np.maximum(magnitude, 1.0)))
+        norms = np.linalg.norm(weights, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (weights / norms).astype(np.float32)
+
+    def vector(self, text: str) -> "np.ndarray":
+        """Dense float32 vector of text."""
+        return self.vectors([text])[0]
+
+
+class MemoryVectorIndex:
+    """In-memory vector index keyed by (namespace key, memory key).
+
+    Rows are packed at the front of the matrix: deleting a memory moves the
+    last row into its slot, so the live rows stay contiguous. All methods
+    are thread-safe.
+    """
+
+    def __init__(self, dimensions: int = VECTOR_DIMENSIONS):
+        """Initialize an empty index.
+
+        Args:
+            dimensions: Number of hash buckets per vector
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Vector search requires NumPy: pip install iterm-mcp[vector]")
+
+        self.vectorizer = HashingVectorizer(dimensions)
+        self.dimensions = dimensions
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        # Number of memories each bucket is non-zero in, for IDF weighting
+        self._document_frequency = np.zeros(dimensions, dtype=np.float32)
+        self._ids: List[Tuple[str, str]] = []
+        self._rows: Dict[Tuple[str, str], int] = {}
+        self._namespace_of_row = np.zeros(0, dtype=np.int32)
+        self._namespace_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for vectors."""
+        return self._matrix.nbytes
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, VECTOR_INITIAL_CAPACITY)
+        matrix = np.zeros((new_capacity, self.dimensions), dtype=np.float32)
+        matrix[:len(self._ids)] = self._matrix[:len(self._ids)]
+        namespaces = np.zeros(new_capacity, dtype=np.int32)
+        namespaces[:len(self._ids)] = self._namespace_of_row[:len(self._ids)]
+        self._matrix, self._namespace_of_row = matrix, namespaces
+
+    def _set_row(self, row: int, vector: "np.ndarray") -> None:
+        self._document_frequency -= self._matrix[row] != 0
+        self._matrix[row] = vector
+        self._document_frequency += vector != 0
+
+    def _upsert(self, ns_key: str, key: str, vector: "np.ndarray") -> None:
+        row = self._rows.get((ns_key, key))
+        if row is None:
+            row = len(self._ids)
+            self._ensure_capacity(row + 1)
+            self._ids.append((ns_key, key))
+            self._rows[(ns_key, key)] = row
+            self._namespace_of_row[row] = self._namespace_ids.setdefault(ns_key, len(self._namespace_ids))
+        self._set_row(row, vector)
+
+    def _remove(self, ns_key: str, key: str) -> bool:
+        row = self._rows.pop((ns_key, key), None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        self._document_frequency -= self._matrix[row] != 0
+        if row != last:
+            moved = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._namespace_of_row[row] = self._namespace_of_row[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+        self._matrix[last] = 0
+        self._ids.pop()
+        return True
+
+    def upsert(self, ns_key: str, key: str, text: str) -> None:
+        """Add or replace the vector of a memory."""
+        vector = self.vectorizer.vector(text)
+        with self._lock:
+            self._upsert(ns_key, key, vector)
+
+    def upsert_many(self, entries: Iterable[Tuple[str, str, str]]) -> int:
+        """Add or replace (ns_key, key, text) entries; returns how many."""
+        count = 0
+        entries = iter(entries)
+        while True:
+            batch = list(islice(entries, VECTOR_BATCH_SIZE))
+            if not batch:
+                return count
+            vectors = self.vectorizer.vectors([text for _, _, text in batch])
+            with self._lock:
+                self._ensure_capacity(len(self._ids) + len(batch))
+                for (ns_key, key, _), vector in zip(batch, vectors):
+                    self._upsert(ns_key, key, vector)
+            count += len(batch)
+
+    def remove(self, ns_key: str, key: str) -> bool:
+        """Remove a memory's vector; returns whether it was indexed."""
+        with self._lock:
+            return self._remove(ns_key, key)
+
+    def remove_namespace(self, ns_key: str) -> int:
+        """Remove every vector in exactly this namespace."""
+        with self._lock:
+            keys = [key for ns, key in self._ids if ns == ns_key]
+            for key in keys:
+                self._remove(ns_key, key)
+            return len(keys)
+
+    def _namespace_mask(self, ns_prefix: Optional[str], rows: int) -> Optional["np.ndarray"]:
+        """Rows whose namespace starts with ns_prefix; None means all rows."""
+        if not ns_prefix:
+            return None
+        matching = [ns_id for ns, ns_id in self._namespace_ids.items() if ns.startswith(ns_prefix)]
+        return np.isin(self._namespace_of_row[:rows], matching)
+
+    def search(
+        self,
+        query: str,
+        ns_prefix: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Tuple[str, str, float]]:
+        """Find the memories most similar to a query.
+
+        Args:
+            query: Free text
+            ns_prefix: Only search namespaces whose key starts with this
+            limit: Maximum number of results
+
+        Returns:
+            (ns_key, key, cosine score) tuples, best first; only positive scores
+        """
+        query_vector = self.vectorizer.vector(query)
+        if not query_vector.any() or limit <= 0:
+            return []
+
+        with self._lock:
+            rows = len(self._ids)
+            if not rows:
+                return []
+            # Weight the query by IDF so rare n-grams count for more
+            idf = np.log((1.0 + rows) / (1.0 + self._document_frequency)) + 1.0
+            query_vector *= idf.astype(np.float32)
+            query_vector /= np.linalg.norm(query_vector)
+
+            scores = self._matrix[:rows] @ query_vector
+            mask = self._namespace_mask(ns_prefix, rows)
+            if mask is not None:
+                scores[~mask] = -np.inf
+
+            k = min(limit, rows)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                (*self._ids[row], float(scores[row]))
+                for row in top if scores[row] > 0
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the index."""
+        with self._lock:
+            return {
+                "entries": len(self._ids),
+                "dimensions": self.dimensions,
+                "bytes": self.nbytes,
+            }
@@ -207,7 +207,11 @@ class WriteToSessionsRequest(BaseModel):
     )
     parallel: bool = Field(
         default=True,
-        description="Execute sends in parallel (True) or sequentially (False)"
+        description=(
+            "Check and send each pane's messages concurrently (True) or one "
+            "after another (False). Writes to a pane are always delivered in "
+            "order, and different panes are always written in parallel."
+        )
     )
     skip_duplicates: bool = Field(
         default=True,
@@ -387,6 +391,10 @@ class CascadeResult(BaseModel):
         default=None,
         description="Reason if skipped (e.g., 'duplicate', 'condition_not_met')"
     )
+    latency_ms: Optional[float] = Field(
+        default=None,
+        description="Milliseconds from the start of the cascade until this delivery finished"
+    )
 
 
 class CascadeMessageResponse(BaseModel):
@@ -395,6 +403,10 @@ class CascadeMessageResponse(BaseModel):
     results: List[CascadeResult] = Field(..., description="Delivery results")
     delivered_count: int = Field(..., description="Number of messages delivered")
     skipped_count: int = Field(..., description="Number of messages skipped")
+    elapsed_ms: Optional[float] = Field(
+        default=None,
+        description="Milliseconds taken by the whole cascade"
+    )
 
 
 class RegisterAgentRequest(BaseModel):
@@ -604,6 +616,29 @@ class WaitResult(BaseModel):
     )
 
 
+class WaitForAgentsRequest(BaseModel):
+    """Request to wait for several agents at once."""
+
+    agents: List[str] = Field(..., min_length=1, description="Agent names to wait for")
+    mode: Literal["all", "any"] = Field(
+        default="all",
+        description="'all' waits for every agent, 'any' returns when the first goes idle"
+    )
+    wait_up_to: int = Field(default=30, ge=1, le=600, description="Max seconds to wait")
+    return_output: bool = Field(default=True, description="Include recent output per agent")
+    summary_on_timeout: bool = Field(default=True, description="Generate progress summaries for busy agents")
+
+
+class WaitForAgentsResult(BaseModel):
+    """Result of waiting for several agents."""
+
+    mode: Literal["all", "any"] = Field(..., description="Wait mode used")
+    completed: bool = Field(..., description="True if the wait condition was met")
+    timed_out: bool = Field(..., description="True if wait_up_to was exceeded")
+    elapsed_seconds: float = Field(..., description="How long we waited")
+    results: List[WaitResult] = Field(default_factory=list, description="Per-agent results")
+
+
 # ============================================================================
 # MANAGER AGENT MODELS (MCP API)
 # ============================================================================
@@ -989,7 +1024,8 @@ class ListSessionsResponse(BaseModel):
 
 MemoryOperationType = Literal[
     "store", "retrieve", "search", "list_keys",
-    "list_namespaces", "delete", "clear", "stats"
+    "list_namespaces", "delete", "clear", "stats",
+    "store_many", "retrieve_many", "delete_many", "export", "import", "set_retention"
 ]
 
 
@@ -999,17 +1035,28 @@ class ManageMemoryRequest(BaseModel):
     Operations:
     - store: Save a value (requires namespace, key, value; optional metadata)
     - retrieve: Get a value (requires namespace, key)
-    - search: Full-text search (requires namespace, query; optional limit)
+    - search: Full-text search (requires namespace, query; optional limit, search_mode)
     - list_keys: List all keys (requires namespace)
     - list_namespaces: List namespaces (optional prefix as namespace)
     - delete: Delete a key (requires namespace, key)
     - clear: Clear namespace (requires namespace, confirm=True)
     - stats: Get statistics (no params required)
+    - store_many: Save several values in one transaction (requires namespace, items)
+    - retrieve_many: Get several values (requires namespace, keys)
+    - delete_many: Delete several keys in one transaction (requires namespace, keys)
+    - export: Write a namespace and its children to a JSONL file (requires path;
+      optional namespace, all namespaces if omitted)
+    - import: Load memories from a JSONL export (requires path)
+    - set_retention: Set a namespace's TTL, quotas and eviction order (requires
+      namespace; retention, or omit it to remove the policy)
     """
 
     operation: MemoryOperationType = Field(
         ...,
-        description="Operation: store, retrieve, search, list_keys, list_namespaces, delete, clear, stats"
+        description=(
+            "Operation: store, retrieve, search, list_keys, list_namespaces, delete, clear, stats, "
+            "store_many, retrieve_many, delete_many, export, import, set_retention"
+        )
     )
     namespace: Optional[List[str]] = Field(
         default=None,
@@ -1035,10 +1082,36 @@ class ManageMemoryRequest(BaseModel):
         default=10,
         description="Max results for search operation"
     )
+    search_mode: Literal["text", "vector", "hybrid"] = Field(
+        default="text",
+        description=(
+            "Search ranking: text (full-text match), vector (similar wording, needs NumPy) "
+            "or hybrid (both blended)"
+        )
+    )
     confirm: bool = Field(
         default=False,
         description="Confirmation for clear operation (must be True to clear)"
     )
+    items: Optional[List[Dict[str, Any]]] = Field(
+        default=None,
+        description="Entries with key, value and optional metadata (for store_many)"
+    )
+    keys: Optional[List[str]] = Field(
+        default=None,
+        description="Keys within the namespace (for retrieve_many, delete_many)"
+    )
+    path: Optional[str] = Field(
+        default=None,
+        description="JSONL file path (for export, import)"
+    )
+    retention: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description=(
+            "Retention policy for set_retention: ttl_seconds, max_entries, max_bytes, "
+            "eviction ('lru' or 'lfu')"
+        )
+    )
 
 
 class ManageMemoryResponse(BaseModel):
@@ -0,0 +1,236 @@
+"""Single-pass matching of many regular expressions against terminal output.
+
+Patterns are combined into one alternation of named groups, so output that
+matches none of them costs one scan however many patterns are registered.
+Only when the combined scan finds something are the individual patterns
+consulted, to report exactly which ones matched with their own match objects.
+
+Output is scanned incrementally: callers pass the offset where new text
+begins, minus a small overlap window so that matches spanning the boundary
+between old and new output are still found.
+"""
+
+import re
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from .screen_diff import detect_scroll
+
+# Characters of already-scanned output re-scanned as context for new output
+MATCH_OVERLAP_CHARS = 256
+
+# Flags every str pattern carries; patterns with any others are kept separate
+_DEFAULT_FLAGS = re.compile("").flags
+
+# Backreferences would point at the wrong group once patterns are combined
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+def _search_ending_after(
+    pattern: re.Pattern,
+    text: str,
+    pos: int,
+    min_end: int
+) -> Optional[re.Match]:
+    """Find the leftmost match starting at or after pos that ends after min_end."""
+    while pos <= len(text):
+        match = pattern.search(text, pos)
+        if match is None or match.end() > min_end:
+            return match
+        pos = match.start() + 1
+    return None
+
+
+def rescan_offset(
+    previous: str,
+    current: str,
+    overlap: int = MATCH_OVERLAP_CHARS
+) -> int:
+    """Offset in current from which a search finds every match on new text.
+
+    The two texts are compared line by line, allowing for output that
+    scrolled, to find the first line of current that was not in previous.
+
+    Args:
+        previous: Text that was already searched
+        current: Text about to be searched
+        overlap: Characters before the first new line to include as context
+
+    Returns:
+        Offset to pass as pos to re.Pattern.search (0 for a full scan)
+    """
+    if not previous:
+        return 0
+    old_lines = previous.split("\n")
+    new_lines = current.split("\n")
+    old_hashes = [hash(line) for line in old_lines]
+    new_hashes = [hash(line) for line in new_lines]
+
+    shift = detect_scroll(old_hashes, new_hashes)
+    common = max(0, min(len(old_hashes) - shift, len(new_hashes)))
+    row = next(
+        (i for i in range(common) if new_hashes[i] != old_hashes[i + shift]),
+        common
+    )
+    offset = sum(len(line) + 1 for line in new_lines[:row])
+    return max(0, min(offset, len(current)) - overlap)
+
+
+class PatternMatcher:
+    """A keyed set of regular expressions searched together.
+
+    Patterns keep the order they were added in, which is also their priority
+    for search(). Patterns with flags, named groups or backreferences cannot
+    share the combined alternation and are searched on their own.
+    """
+
+    def __init__(self):
+        self._patterns: Dict[Hashable, re.Pattern] = {}
+        self._combined: Optional[re.Pattern] = None
+        self._group_keys: Dict[str, Hashable] = {}
+        self._standalone: List[Hashable] = []
+        self._stale = False
+        self.scans = 0
+        self.prefilter_skips = 0
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._patterns
+
+    def add(self, key: Hashable, pattern: Union[str, re.Pattern]) -> re.Pattern:
+        """Add or replace a pattern.
+
+        Args:
+            key: Identifier reported when the pattern matches
+            pattern: Regex string or compiled pattern
+
+        Returns:
+            The compiled pattern
+
+        Raises:
+            re.error: If a string pattern does not compile
+        """
+        compiled = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+        self._patterns.pop(key, None)
+        self._patterns[key] = compiled
+        self._stale = True
+        return compiled
+
+    def remove(self, key: Hashable) -> bool:
+        """Remove a pattern, returning False if the key was unknown."""
+        if self._patterns.pop(key, None) is None:
+            return False
+        self._stale = True
+        return True
+
+    def pattern(self, key: Hashable) -> re.Pattern:
+        """The compiled pattern registered under key."""
+        return self._patterns[key]
+
+    @staticmethod
+    def _combinable(pattern: re.Pattern) -> bool:
+        return (
+            isinstance(pattern.pattern, str)
+            and pattern.flags == _DEFAULT_FLAGS
+            and not pattern.groupindex
+            and not _BACKREFERENCE.search(pattern.pattern)
+        )
+
+    def _rebuild(self) -> None:
+        """Recompile the combined alternation after patterns changed."""
+        self._stale = False
+        self._combined = None
+        self._group_keys = {}
+        self._standalone = []
+
+        parts = []
+        for key, compiled in self._patterns.items():
+            if self._combinable(compiled):
+                name = f"_m{len(parts)}"
+                parts.append(f"(?P<{name}>{compiled.pattern})")
+                self._group_keys[name] = key
+            else:
+                self._standalone.append(key)
+
+        if parts:
+            try:
+                self._combined = re.compile("|".join(parts))
+            except re.error:
+                self._group_keys = {}
+                self._standalone = list(self._patterns)
+
+    def search(self, text: str, pos: int = 0) -> Optional[Tuple[Hashable, re.Match]]:
+        """Find the highest-priority pattern that matches text.
+
+        Args:
+            text: Text to search
+            pos: Offset to start searching at (anchors still see the whole text)
+
+        Returns:
+            (key, match) for the earliest-added matching pattern, or None
+        """
+        if self._stale:
+            self._rebuild()
+        self.scans += 1
+
+        hit_key: Optional[Hashable] = None
+        if self._combined is not None:
+            combined = self._combined.search(text, pos)
+            if combined is not None:
+                hit_key = self._group_keys[combined.lastgroup]
+
+        if hit_key is None:
+            # Nothing in the alternation matches anywhere
+            if not self._standalone:
+                self.prefilter_skips += 1
+                return None
+            candidates = self._standalone
+        else:
+            # A pattern added earlier may still match further along the text
+            candidates = list(self._patterns)
+            candidates = candidates[:candidates.index(hit_key) + 1]
+
+        for key in candidates:
+            match = self._patterns[key].search(text, pos)
+            if match is not None:
+                return key, match
+        return None
+
+    def search_all(
+        self,
+        text: str,
+        pos: int = 0,
+        min_end: int = 0
+    ) -> List[Tuple[Hashable, re.Match]]:
+        """Find every pattern that matches text.
+
+        Args:
+            text: Text to search
+            pos: Offset to start searching at
+            min_end: Only report matches ending after this offset, so text
+                before it serves as context without matching again
+
+        Returns:
+            (key, match) for each matching pattern, in priority order
+        """
+        if self._stale:
+            self._rebuild()
+        self.scans += 1
+
+        if self._combined is not None and _search_ending_after(
+            self._combined, text, pos, min_end
+        ) is not None:
+            candidates = list(self._patterns)
+        elif self._standalone:
+            candidates = self._standalone
+        else:
+            self.prefilter_skips += 1
+            return []
+
+        results = []
+        for key in candidates:
+            match = _search_ending_after(self._patterns[key], text, pos, min_end)
+            if match is not None:
+                results.append((key, match))
+        return results
@@ -0,0 +1,181 @@
+"""Line-level diffing of terminal screen captures.
+
+Screens are compared through per-line hashes. Before comparing, the diff looks
+for a vertical shift between the two captures, so output that scrolled the
+screen shows up as a few appended lines instead of a rewritten screen.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# How many non-blank lines of the new screen are tried as scroll anchors
+SCROLL_ANCHOR_LINES = 3
+
+# Upper bound on candidate shifts scored per diff
+MAX_SCROLL_CANDIDATES = 8
+
+_BLANK_HASH = hash("")
+
+
+@dataclass(frozen=True)
+class ScreenSnapshot:
+    """Immutable capture of a session's screen.
+
+    Attributes:
+        version: Per-session counter that increases whenever the content changes
+        lines: Every screen line as returned by iTerm2, including empty ones
+        captured_at: time.monotonic() when the screen was fetched
+    """
+    version: int
+    lines: Tuple[str, ...]
+    captured_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was captured."""
+        return time.monotonic() - self.captured_at
+
+    @cached_property
+    def hashes(self) -> Tuple[int, ...]:
+        """Per-line hashes, computed once per snapshot."""
+        return tuple(hash(line) for line in self.lines)
+
+    def text(self, max_lines: Optional[int] = None) -> str:
+        """Render the first max_lines screen lines, skipping empty ones."""
+        lines = self.lines if max_lines is None else self.lines[:max_lines]
+        return "\n".join(line for line in lines if line)
+
+
+@dataclass(frozen=True)
+class ScreenDelta:
+    """What changed between two screen snapshots.
+
+    Attributes:
+        from_version: Version of the older snapshot (0 if there was none)
+        to_version: Version of the newer snapshot
+        scrolled: Number of lines that scrolled off the top of the screen
+        changed: (row, text) for rows rewritten in place, rows in the new screen
+        appended: Rows below the end of the shifted old screen, starting at
+            row appended_at of the new screen
+        appended_at: Row of the new screen where appended begins
+    """
+    from_version: int
+    to_version: int
+    scrolled: int = 0
+    changed: Tuple[Tuple[int, str], ...] = ()
+    appended: Tuple[str, ...] = ()
+    appended_at: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        """True if the screen did not change."""
+        return not self.scrolled and not self.changed and not self.appended
+
+    @property
+    def lines(self) -> Tuple[str, ...]:
+        """Non-empty changed and appended lines, in screen order."""
+        changed = tuple(text for _, text in self.changed if text)
+        return changed + tuple(text for text in self.appended if text)
+
+    @property
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Half-open (start, end) row ranges of the new screen that changed."""
+        rows = [row for row, _ in self.changed]
+        rows.extend(range(self.appended_at, self.appended_at + len(self.appended)))
+        ranges: List[Tuple[int, int]] = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row:
+                ranges[-1] = (ranges[-1][0], row + 1)
+            else:
+                ranges.append((row, row + 1))
+        return ranges
+
+    def text(self) -> str:
+        """The new output as text, skipping empty lines."""
+        return "\n".join(self.lines)
+
+
+def _count_matches(old: Sequence[int], new: Sequence[int], shift: int) -> int:
+    """Count non-blank rows that line up when old is shifted up by shift rows."""
+    overlap = min(len(old) - shift, len(new))
+    return sum(
+        1 for i in range(overlap)
+        if new[i] == old[i + shift] and new[i] != _BLANK_HASH
+    )
+
+
+def detect_scroll(old: Sequence[int], new: Sequence[int]) -> int:
+    """Estimate how many rows the screen scrolled between two captures.
+
+    Candidate shifts come from where the first few non-blank rows of the new
+    screen appear in the old one. The candidate that lines up the most
+    non-blank rows wins, provided it beats not shifting at all.
+
+    Args:
+        old: Per-line hashes of the older screen
+        new: Per-line hashes of the newer screen
+
+    Returns:
+        Number of rows scrolled off the top (0 if no scroll was detected)
+    """
+    positions: Dict[int, List[int]] = {}
+    for row, line_hash in enumerate(old):
+        if line_hash != _BLANK_HASH:
+            positions.setdefault(line_hash, []).append(row)
+
+    candidates: List[int] = []
+    anchors = 0
+    for row, line_hash in enumerate(new):
+        if line_hash == _BLANK_HASH:
+            continue
+        for old_row in positions.get(line_hash, ()):
+            shift = old_row - row
+            if shift > 0 and shift not in candidates:
+                candidates.append(shift)
+        anchors += 1
+        if anchors >= SCROLL_ANCHOR_LINES or len(candidates) >= MAX_SCROLL_CANDIDATES:
+            break
+
+    best_shift = 0
+    best_matches = _count_matches(old, new, 0)
+    for shift in candidates[:MAX_SCROLL_CANDIDATES]:
+        matches = _count_matches(old, new, shift)
+        if matches > best_matches:
+            best_shift, best_matches = shift, matches
+    return best_shift
+
+
+def diff_screens(old: Optional[ScreenSnapshot], new: ScreenSnapshot) -> ScreenDelta:
+    """Compute the delta from one screen snapshot to a later one.
+
+    Args:
+        old: The previously seen snapshot, or None to treat every line as new
+        new: The current snapshot
+
+    Returns:
+        The delta; empty if the screens are identical
+    """
+    if old is None:
+        return ScreenDelta(from_version=0, to_version=new.version, appended=new.lines)
+    if old.version == new.version or old.hashes == new.hashes:
+        return ScreenDelta(from_version=old.version, to_version=new.version)
+
+    old_hashes, new_hashes = old.hashes, new.hashes
+    shift = detect_scroll(old_hashes, new_hashes)
+    overlap = max(0, min(len(old_hashes) - shift, len(new_hashes)))
+
+    changed = tuple(
+        (row, new.lines[row])
+        for row in range(overlap)
+        if new_hashes[row] != old_hashes[row + shift]
+    )
+    return ScreenDelta(
+        from_version=old.version,
+        to_version=new.version,
+        scrolled=shift,
+        changed=changed,
+        appended=new.lines[overlap:],
+        appended_at=overlap,
+    )
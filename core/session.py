@@ -2,6 +2,7 @@
 
 import asyncio
 import base64
+import contextlib
 import logging
 import os
 import re
@@ -9,11 +10,15 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple, Union, Callable, Literal
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union, Callable, Literal
 
 import iterm2
 
 from utils.logging import ItermSessionLogger
+from .completion import IdleTracker
+from .pattern_matcher import PatternMatcher, rescan_offset
+from .screen_diff import ScreenDelta, ScreenSnapshot, diff_screens
+from .write_queue import WriteQueue
 from utils.otel import trace_operation, add_span_attributes, add_span_event
 
 
@@ -23,6 +28,37 @@ _logger = logging.getLogger("iterm-mcp-session")
 # Cache time-to-live for CWD in seconds
 CWD_CACHE_TTL_SECONDS = 30
 
+# Prompt patterns parse_prompt_cwd tries on each line, most specific first
+PROMPT_CWD_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # hostname :: ~/path 123 » or (env) hostname :: ~/path 123 »
+    # (common pattern for oh-my-zsh and similar prompts)
+    r"(?:\([^)]+\)\s+)?\w+\s+::\s+([~/][^\s]+)\s+\d+\s*»",
+    # Starship git prompt: ~/path on branch ⇣⇡ *? ── (with status line)
+    r"^([~/][^\s]+)\s+on\s+[^\s]+\s*(?:⇣|⇡|\*|\?|!|\d)*\s*─",
+    # Git prompt: ~/path on branch (simple)
+    r"^([~/][^\s]+)\s+on\s+\S+",
+    # Claude Code header: ▘▘ ▝▝  ~/path
+    r"▝▝\s+([~/][^\s]+)",
+    # Standard PS1: user@host:~/path$
+    r"@[^:]+:([~/][^\s$]+)\$",
+    # Simple: ~/path followed by prompt char
+    r"^([~/][^\s]+)\s*(?:»|>|❯|\$)\s*$",
+    # Path in brackets [/path/to/dir]
+    r"\[(/[^\]]+)\]",
+    # Absolute path at start (fallback)
+    r"^(/Users/[^\s]+?)(?:\s|$)",
+))
+
+# How long a fetched screen snapshot is shared with other readers
+SCREEN_SNAPSHOT_TTL_SECONDS = 0.1
+
+# Adaptive polling used when screen streaming is unavailable
+MONITOR_POLL_MAX_INTERVAL_SECONDS = 2.0
+MONITOR_POLL_BACKOFF = 1.5
+
+# The context watcher unsubscribes once nothing has asked for it this long
+CONTEXT_WATCH_IDLE_SECONDS = 300.0
+
 
 @dataclass
 class ExpectResult:
@@ -120,6 +156,59 @@ MAX_DELAY_SECONDS = 3.0  # Maximum 3 second delay for very large pastes
 LARGE_PASTE_THRESHOLD = 1000  # Characters above which we add extra delay
 EXTRA_LARGE_PASTE_THRESHOLD = 5000  # Characters above which we add even more delay
 
+# Commands at least this long go through the paste pipeline: they are sent in
+# chunks inside a bracketed paste, and Enter waits until the screen shows the
+# terminal consumed them, with calculate_text_delay() as the fallback
+PASTE_PIPELINE_THRESHOLD = LARGE_PASTE_THRESHOLD
+PASTE_CHUNK_CHARS = 4096
+PASTE_POLL_INTERVAL_SECONDS = 0.02
+# A screen that changed after the paste and then held still this long counts
+# as consumed (for apps that show a placeholder instead of echoing the text)
+PASTE_SETTLE_SECONDS = 0.1
+# Upper bound on the wait while the screen keeps changing
+PASTE_CONFIRM_MAX_SECONDS = 10.0
+# Characters from the end of the payload looked for in the echo
+PASTE_ECHO_TAIL_CHARS = 24
+
+BRACKETED_PASTE_START = "\x1b[200~"
+BRACKETED_PASTE_END = "\x1b[201~"
+
+# Bracketed-paste markers are typed literally by programs that have not
+# enabled bracketed paste mode; set ITERM_MCP_BRACKETED_PASTE=0 to send
+# pipelined pastes as plain chunks instead
+BRACKETED_PASTE_ENABLED = os.environ.get(
+    "ITERM_MCP_BRACKETED_PASTE", "1"
+).lower() in ("true", "1", "yes")
+
+
+class ScreenUpdates:
+    """One consumer's subscription to a session's shared screen-update feed.
+
+    Notifications that arrive while the consumer is busy are coalesced into
+    one, as with a ScreenStreamer that is not being read.
+    """
+
+    def __init__(self):
+        self._event = asyncio.Event()
+        self._error: Optional[Exception] = None
+
+    def notify(self, error: Optional[Exception] = None) -> None:
+        """Wake the consumer, failing its next read if error is given."""
+        if error is not None:
+            self._error = error
+        self._event.set()
+
+    async def async_get(self) -> None:
+        """Wait for the next screen update.
+
+        Raises:
+            Exception: Whatever stopped the underlying ScreenStreamer
+        """
+        await self._event.wait()
+        self._event.clear()
+        if self._error is not None:
+            raise self._error
+
 
 def calculate_text_delay(text: str) -> float:
     """Calculate appropriate delay before sending Enter based on text length.
@@ -206,6 +295,7 @@ class ItermSession:
         
         # Generate or use persistent ID
         self._persistent_id = persistent_id or str(uuid.uuid4())
+        self._created_at = datetime.now(timezone.utc)
         
         # Default number of lines to retrieve
         self._max_lines = max_lines
@@ -214,16 +304,72 @@ class ItermSession:
         self._monitoring = False
         self._monitor_task = None
         self._monitor_callbacks = []
+        self._delta_callbacks = set()
+        self._monitor_mode: Optional[str] = None
+        self._screen_activity: Optional[asyncio.Event] = None
         self._last_screen_update = time.time()
 
+        # One ScreenStreamer shared by every consumer (see screen_updates)
+        self._screen_subscribers: Set[ScreenUpdates] = set()
+        self._screen_feed_task: Optional[asyncio.Task] = None
+        self.monitor_stats: Dict[str, int] = {
+            "notifications": 0,
+            "polls": 0,
+            "deliveries": 0,
+        }
+
         # Suspension state
         self._suspended = False
         self._suspended_at: Optional[datetime] = None
         self._suspended_by: Optional[str] = None
 
-        # CWD tracking
+        # CWD tracking; pushed values stay valid while a feed is attached
         self._cached_cwd: Optional[str] = None
         self._cwd_updated_at: float = 0
+        self._cwd_feeds = 0
+        self._cwd_pushed = False
+        self.cwd_stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "pushes": 0,
+            "prompt_parses": 0,
+        }
+
+        # Listing context kept fresh in the background (see watch_context)
+        self._context_task: Optional[asyncio.Task] = None
+        self._context_dirty = True
+        self._context_used_at = 0.0
+        self._last_message: Optional[str] = None
+        self._last_message_version: Optional[int] = None
+
+        # Shared screen snapshot cache (see get_screen_snapshot)
+        self._snapshot: Optional[ScreenSnapshot] = None
+        self._snapshot_fetch: Optional[asyncio.Task] = None
+        self._snapshot_fetch_seq = 0
+        self._snapshot_stored_seq = 0
+        self._snapshot_invalidated_seq = 0
+        self._logged_snapshot: Optional[ScreenSnapshot] = None
+        self.snapshot_stats: Dict[str, int] = {
+            "fetches": 0,
+            "cache_hits": 0,
+            "shared_fetches": 0,
+        }
+
+        # Completion signals (see wait_until_idle)
+        self.idle_tracker = IdleTracker()
+        self._signal_task: Optional[asyncio.Task] = None
+        self._signal_waiters = 0
+
+        # Every write to the pane goes through this queue (see submit_text)
+        self.write_queue = WriteQueue(lambda text: self.session.async_send_text(text))
+
+        # Paste pipeline for long commands (see _paste_and_confirm)
+        self.bracketed_paste = BRACKETED_PASTE_ENABLED
+        self.paste_stats: Dict[str, int] = {
+            "pastes": 0,
+            "confirmed": 0,
+            "fallbacks": 0,
+        }
     
     @property
     def id(self) -> str:
@@ -352,7 +498,8 @@ class ItermSession:
             suspended_duration = (datetime.now(timezone.utc) - self._suspended_at).total_seconds()
 
         # Send 'fg' to resume
-        await self.session.async_send_text("fg\n")
+        await self.write_queue.submit_text("fg\n")
+        self.invalidate_screen_snapshot()
 
         self._suspended = False
         self._suspended_at = None
@@ -387,6 +534,43 @@ class ItermSession:
         if self.logger:
             self.logger.log_session_renamed(name)
     
+    def sync_name(self) -> bool:
+        """Adopt the pane's current name if it was renamed outside this wrapper.
+
+        Returns:
+            True if the cached name changed
+        """
+        live_name = self.session.name
+        if not isinstance(live_name, str) or not live_name or live_name == self._name:
+            return False
+        self._name = live_name
+        if self.logger:
+            self.logger.log_session_renamed(live_name)
+        return True
+
+    def submit_text(self, text: str, execute: bool = True) -> asyncio.Future:
+        """Queue text for the session without waiting for it to be sent.
+
+        Writes to one session are sent one at a time in the order they were
+        queued, so a command's text and its Enter are never split by another
+        write. Adjacent writes that do not press Enter are sent together.
+
+        Args:
+            text: The text to send
+            execute: Whether to execute the text as a command by sending Enter
+
+        Returns:
+            Future resolved once the keystrokes have been accepted
+        """
+        # Strip any trailing newlines/carriage returns to avoid double execution
+        clean_text = text.rstrip("\r\n")
+        if execute:
+            future = self.write_queue.submit(lambda: self._type_and_enter(clean_text))
+        else:
+            future = self.write_queue.submit_text(clean_text)
+        future.add_done_callback(lambda f: self._after_write(f, clean_text))
+        return future
+
     @trace_operation("session.send_text")
     async def send_text(self, text: str, execute: bool = True) -> None:
         """Send text to the session.
@@ -402,25 +586,157 @@ class ItermSession:
             execute=execute,
         )
 
-        # Strip any trailing newlines/carriage returns to avoid double execution
         clean_text = text.rstrip("\r\n")
+        await self.submit_text(clean_text, execute=execute)
 
-        # Send the text first
-        await self.session.async_send_text(clean_text)
+        add_span_event("text_sent", {"text_length": len(clean_text), "executed": execute})
+
+    async def _type_and_enter(self, text: str) -> None:
+        """Send text then Enter. Runs in the write queue's writer task."""
+        if len(text) >= PASTE_PIPELINE_THRESHOLD:
+            await self._paste_and_confirm(text)
+        else:
+            await self.session.async_send_text(text)
 
-        # Send Enter/Return key to execute if requested
-        if execute:
             # Wait for iTerm to process the text before sending Enter
             # Delay scales with text length to handle large pastes
-            delay = calculate_text_delay(clean_text)
+            delay = calculate_text_delay(text)
             await asyncio.sleep(delay)
-            await self.session.async_send_text("\r")
+        await self.session.async_send_text("\r")
 
-        # Log the command
-        if self.logger:
-            self.logger.log_command(clean_text)
+    async def _paste_and_confirm(self, text: str) -> bool:
+        """Paste a long payload and wait until the terminal has consumed it.
 
-        add_span_event("text_sent", {"text_length": len(clean_text), "executed": execute})
+        The payload is sent in PASTE_CHUNK_CHARS chunks, inside a bracketed
+        paste unless disabled. The screen is then polled through the snapshot
+        cache. Consumption is confirmed when the end of the payload is echoed,
+        or when the screen changed and then settled. If the screen shows
+        nothing within calculate_text_delay(text), that fixed delay is used
+        as before.
+
+        Args:
+            text: Payload to paste, without the trailing Enter
+
+        Returns:
+            True if consumption was seen on screen, False on fallback
+        """
+        self.paste_stats["pastes"] += 1
+        fallback_delay = calculate_text_delay(text)
+        try:
+            before: Optional[ScreenSnapshot] = await self.get_screen_snapshot(max_age=0)
+        except Exception as e:
+            _logger.debug(f"Paste confirmation unavailable for {self.id}: {e}")
+            before = None
+
+        if self.bracketed_paste:
+            await self.session.async_send_text(BRACKETED_PASTE_START)
+        for start in range(0, len(text), PASTE_CHUNK_CHARS):
+            await self.session.async_send_text(text[start:start + PASTE_CHUNK_CHARS])
+        if self.bracketed_paste:
+            await self.session.async_send_text(BRACKETED_PASTE_END)
+
+        sent_at = time.monotonic()
+        confirmed = False
+        if before is not None:
+            confirmed = await self._wait_for_paste(text, before.version, sent_at, fallback_delay)
+        else:
+            await asyncio.sleep(fallback_delay)
+
+        self.paste_stats["confirmed" if confirmed else "fallbacks"] += 1
+        add_span_event("paste_pipeline", {
+            "text_length": len(text),
+            "confirmed": confirmed,
+            "wait_seconds": time.monotonic() - sent_at,
+        })
+        return confirmed
+
+    async def _wait_for_paste(
+        self,
+        text: str,
+        version: int,
+        sent_at: float,
+        fallback_delay: float
+    ) -> bool:
+        """Poll the screen until a paste is echoed or settles (see _paste_and_confirm)."""
+        last_line = next((line for line in reversed(text.splitlines()) if line.strip()), "")
+        tail = last_line.strip()[-PASTE_ECHO_TAIL_CHARS:]
+        changed_at: Optional[float] = None
+
+        while True:
+            await asyncio.sleep(PASTE_POLL_INTERVAL_SECONDS)
+            try:
+                snapshot = await self.get_screen_snapshot(max_age=0)
+            except Exception as e:
+                _logger.debug(f"Paste confirmation failed for {self.id}: {e}")
+                await asyncio.sleep(max(0.0, fallback_delay - (time.monotonic() - sent_at)))
+                return False
+
+            now = time.monotonic()
+            if snapshot.version != version:
+                version = snapshot.version
+                changed_at = now
+                # Long lines wrap across rows, so match against the rows joined
+                if tail and tail in "".join(snapshot.lines):
+                    return True
+            elif changed_at is not None and now - changed_at >= PASTE_SETTLE_SECONDS:
+                return True
+
+            waited = now - sent_at
+            if changed_at is None and waited >= fallback_delay:
+                return False
+            if waited >= PASTE_CONFIRM_MAX_SECONDS:
+                return False
+
+    def _after_write(self, future: asyncio.Future, command: Optional[str] = None) -> None:
+        """Done callback for queued writes: invalidate the snapshot and log."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.invalidate_screen_snapshot()
+        if self.logger and command is not None:
+            self.logger.log_command(command)
+
+    @staticmethod
+    def _command_text(command: str, use_encoding: Union[bool, Literal["auto"]]) -> Tuple[str, bool]:
+        """Text to type for a command, and whether it was base64-encoded."""
+        should_encode = (
+            use_encoding is True or
+            (use_encoding == "auto" and needs_base64_encoding(command))
+        )
+        if not should_encode:
+            # Direct sending - command is sent as-is (default behavior)
+            return command, False
+
+        # Encode the command to avoid quote/special character issues
+        # The command goes in as plain text, gets encoded, sent, decoded, and executed
+        encoded = base64.b64encode(command.encode('utf-8')).decode('ascii')
+
+        # Wrap in a one-liner that decodes and executes
+        # Using 'eval "$(echo ... | base64 -d)"' ensures proper shell parsing
+        # Note: base64 output is safe (only contains A-Z, a-z, 0-9, +, /, =)
+        # so no shell escaping of the encoded string is needed
+        return f'eval "$(echo {encoded} | base64 -d)"', True
+
+    def submit_command(
+        self,
+        command: str,
+        use_encoding: Union[bool, Literal["auto"]] = False
+    ) -> asyncio.Future:
+        """Queue a command without waiting for it to be sent.
+
+        Args:
+            command: The command to execute (raw, unencoded)
+            use_encoding: Encoding mode, as for execute_command()
+
+        Returns:
+            Future resolved once the command and its Enter have been accepted
+        """
+        # Strip any trailing newlines/carriage returns from input
+        clean_command = command.rstrip("\r\n")
+        text_sent, _ = self._command_text(clean_command, use_encoding)
+        future = self.write_queue.submit(lambda: self._type_and_enter(text_sent))
+        # Log the original command (not the encoded wrapper)
+        future.add_done_callback(lambda f: self._after_write(f, clean_command))
+        return future
 
     @trace_operation("session.execute_command")
     async def execute_command(
@@ -454,55 +770,134 @@ class ItermSession:
             use_encoding=str(use_encoding),
         )
 
-        # Strip any trailing newlines/carriage returns from input
         clean_command = command.rstrip("\r\n")
+        await self.submit_command(clean_command, use_encoding=use_encoding)
 
-        # Determine if we should encode
-        should_encode = (
-            use_encoding is True or
-            (use_encoding == "auto" and needs_base64_encoding(clean_command))
-        )
+        add_span_event("command_executed", {
+            "command_length": len(clean_command),
+            "encoded": self._command_text(clean_command, use_encoding)[1],
+        })
 
-        if should_encode:
-            # Encode the command to avoid quote/special character issues
-            # The command goes in as plain text, gets encoded, sent, decoded, and executed
-            encoded = base64.b64encode(clean_command.encode('utf-8')).decode('ascii')
+    @property
+    def screen_snapshot(self) -> Optional[ScreenSnapshot]:
+        """The most recently fetched screen snapshot, if any."""
+        return self._snapshot
 
-            # Wrap in a one-liner that decodes and executes
-            # Using 'eval "$(echo ... | base64 -d)"' ensures proper shell parsing
-            # Note: base64 output is safe (only contains A-Z, a-z, 0-9, +, /, =)
-            # so no shell escaping of the encoded string is needed
-            wrapper = f'eval "$(echo {encoded} | base64 -d)"'
+    def invalidate_screen_snapshot(self) -> None:
+        """Mark the cached snapshot stale after input was sent.
 
-            # Send the wrapper command
-            await self.session.async_send_text(wrapper)
-            text_sent = wrapper
+        The snapshot is kept for version comparisons, but the next reader
+        fetches again instead of joining a fetch that started before the input.
+        Fetches already in flight may still store what they read, but their
+        snapshot is marked stale so it is never served from the cache.
+        """
+        self._snapshot_invalidated_seq = self._snapshot_fetch_seq
+        if self._snapshot is not None:
+            self._snapshot = ScreenSnapshot(
+                version=self._snapshot.version,
+                lines=self._snapshot.lines,
+                captured_at=float("-inf"),
+            )
+        self._snapshot_fetch = None
+        if self._screen_activity is not None:
+            self._screen_activity.set()
+        self.idle_tracker.note_input()
+
+    async def get_screen_snapshot(
+        self,
+        max_age: float = SCREEN_SNAPSHOT_TTL_SECONDS,
+        newer_than: Optional[int] = None
+    ) -> ScreenSnapshot:
+        """Get a snapshot of the screen, sharing fetches between readers.
+
+        A cached snapshot younger than max_age is returned without an API call.
+        Otherwise one fetch is made and every concurrent reader awaits it.
+
+        Args:
+            max_age: Maximum acceptable snapshot age in seconds
+            newer_than: If given, the cache is only used when its version is
+                greater than this; otherwise the screen is fetched again. The
+                result may still carry the same version if nothing changed.
+
+        Returns:
+            The screen snapshot
+        """
+        cached = self._snapshot
+        if (
+            cached is not None
+            and cached.age <= max_age
+            and (newer_than is None or cached.version > newer_than)
+        ):
+            self.snapshot_stats["cache_hits"] += 1
+            return cached
+
+        fetch = self._snapshot_fetch
+        if fetch is None or fetch.done():
+            # Numbered when scheduled so invalidation sees fetches not yet started
+            self._snapshot_fetch_seq += 1
+            fetch = asyncio.ensure_future(
+                self._fetch_screen_snapshot(self._snapshot_fetch_seq)
+            )
+            # Retrieve failures so abandoned fetches do not warn
+            fetch.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._snapshot_fetch = fetch
         else:
-            # Direct sending - command is sent as-is (default behavior)
-            await self.session.async_send_text(clean_command)
-            text_sent = clean_command
+            self.snapshot_stats["shared_fetches"] += 1
 
-        # Wait for iTerm to process the text before sending Enter
-        # Delay scales with text length to handle large pastes
-        delay = calculate_text_delay(text_sent)
-        await asyncio.sleep(delay)
-        await self.session.async_send_text("\r")
+        # Shield so one cancelled reader does not cancel the shared fetch
+        return await asyncio.shield(fetch)
 
-        # Log the original command (not the encoded wrapper)
-        if self.logger:
-            self.logger.log_command(clean_command)
+    async def _fetch_screen_snapshot(self, seq: int) -> ScreenSnapshot:
+        """Fetch the screen from iTerm2 and update the cached snapshot."""
+        task = asyncio.current_task()
+        try:
+            self.snapshot_stats["fetches"] += 1
+            contents = await self.session.async_get_screen_contents()
+            lines = tuple(
+                contents.line(i).string for i in range(contents.number_of_lines)
+            )
 
-        add_span_event("command_executed", {
-            "command_length": len(clean_command),
-            "encoded": should_encode,
-        })
+            # A fetch that started earlier must not replace a newer snapshot
+            if seq < self._snapshot_stored_seq and self._snapshot is not None:
+                return self._snapshot
+
+            previous = self._snapshot
+            if previous is None:
+                version = 1
+            elif previous.lines == lines:
+                version = previous.version
+            else:
+                version = previous.version + 1
+                self.idle_tracker.note_activity()
+
+            # Content read before the last invalidation predates the input
+            stale = seq <= self._snapshot_invalidated_seq
+            snapshot = ScreenSnapshot(
+                version=version,
+                lines=lines,
+                captured_at=float("-inf") if stale else time.monotonic(),
+            )
+            self._snapshot = snapshot
+            self._snapshot_stored_seq = seq
+            return snapshot
+        finally:
+            if self._snapshot_fetch is task:
+                self._snapshot_fetch = None
 
     @trace_operation("session.get_screen_contents")
-    async def get_screen_contents(self, max_lines: Optional[int] = None) -> str:
+    async def get_screen_contents(
+        self,
+        max_lines: Optional[int] = None,
+        max_age: float = SCREEN_SNAPSHOT_TTL_SECONDS
+    ) -> str:
         """Get the contents of the session's screen.
 
+        Served from the shared snapshot cache, so readers within the
+        freshness window do not each make an iTerm2 API call.
+
         Args:
             max_lines: Maximum number of lines to retrieve (defaults to session's max_lines)
+            max_age: Maximum acceptable snapshot age in seconds
 
         Returns:
             The text contents of the screen
@@ -513,30 +908,20 @@ class ItermSession:
             requested_max_lines=max_lines if max_lines is not None else self._max_lines,
         )
 
-        contents = await self.session.async_get_screen_contents()
-        lines = []
+        snapshot = await self.get_screen_snapshot(max_age=max_age)
 
         # Use instance default if not specified
         if max_lines is None:
             max_lines = self._max_lines
 
-        max_lines = min(max_lines, contents.number_of_lines)
+        output = snapshot.text(max_lines)
 
-        for i in range(max_lines):
-            line = contents.line(i)
-            line_text = line.string
-            if line_text:
-                lines.append(line_text)
-
-        output = "\n".join(lines)
-
-        # Log the output
-        if self.logger:
-            self.logger.log_output(output)
+        # Log only the lines that are new since the last logged snapshot
+        self._log_screen_delta(snapshot)
 
         add_span_event("screen_contents_retrieved", {
-            "lines_retrieved": len(lines),
-            "total_lines_available": contents.number_of_lines,
+            "snapshot_version": snapshot.version,
+            "total_lines_available": len(snapshot.lines),
             "output_length": len(output),
         })
 
@@ -563,7 +948,8 @@ class ItermSession:
         code = ord(character) - 64
         control_sequence = chr(code)
 
-        await self.session.async_send_text(control_sequence)
+        await self.write_queue.submit_text(control_sequence)
+        self.invalidate_screen_snapshot()
 
         # Log the control character
         if self.logger:
@@ -608,7 +994,8 @@ class ItermSession:
             raise ValueError(f"Unknown special key: {key}. Supported keys: {', '.join(key_map.keys())}")
 
         sequence = key_map[key]
-        await self.session.async_send_text(sequence)
+        await self.write_queue.submit_text(sequence)
+        self.invalidate_screen_snapshot()
 
         # Log the special key
         if self.logger:
@@ -618,103 +1005,130 @@ class ItermSession:
     
     async def clear_screen(self) -> None:
         """Clear the screen."""
-        await self.session.async_send_text("\u001b[2J\u001b[H")  # ANSI clear screen
+        await self.write_queue.submit_text("\u001b[2J\u001b[H")  # ANSI clear screen
+        self.invalidate_screen_snapshot()
         
         # Log the clear action
         if self.logger:
             self.logger.log_custom_event("CLEAR_SCREEN", "Screen cleared")
             
-    async def start_monitoring(self, update_interval: float = 0.5) -> None:
+    @contextlib.asynccontextmanager
+    async def screen_updates(self) -> AsyncIterator[ScreenUpdates]:
+        """Subscribe to screen-update notifications.
+
+        All subscribers share one iTerm2 ScreenStreamer, opened with the
+        first subscription and closed with the last, so monitoring,
+        completion waits and the context watcher cost one subscription
+        between them. If the streamer fails, every subscriber's next
+        async_get() raises the error.
+        """
+        updates = ScreenUpdates()
+        self._screen_subscribers.add(updates)
+        if self._screen_feed_task is None or self._screen_feed_task.done():
+            self._screen_feed_task = asyncio.create_task(self._feed_screen_updates())
+        try:
+            yield updates
+        finally:
+            self._screen_subscribers.discard(updates)
+            if not self._screen_subscribers and self._screen_feed_task is not None:
+                task, self._screen_feed_task = self._screen_feed_task, None
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def _feed_screen_updates(self) -> None:
+        """Fan one ScreenStreamer out to every screen_updates() subscriber."""
+        try:
+            async with self.session.get_screen_streamer(want_contents=False) as streamer:
+                while True:
+                    await streamer.async_get()
+                    for updates in list(self._screen_subscribers):
+                        updates.notify()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            for updates in list(self._screen_subscribers):
+                updates.notify(e)
+
+    async def start_monitoring(
+        self,
+        update_interval: float = 0.5,
+        mode: Literal["auto", "stream", "poll"] = "auto"
+    ) -> None:
         """Start monitoring the screen for changes.
-        
+
         This allows real-time capture of terminal output without requiring explicit
-        calls to get_screen_contents(). Uses polling-based approach as a fallback
-        since subscription-based approach may have WebSocket issues.
-        
+        calls to get_screen_contents(). Monitor callbacks receive only the lines
+        that changed since the previous update.
+
+        In "stream" mode the screen is read only when iTerm2 sends a screen-update
+        notification. In "poll" mode the screen is polled at an adaptive interval
+        that backs off while the session is idle and tightens after activity.
+        "auto" streams and falls back to polling if the subscription fails.
+
         Args:
-            update_interval: How often to check for updates (in seconds)
+            update_interval: Shortest delay between polls, and how long a stream
+                waits for output to settle before a catch-up read
+            mode: Monitoring strategy ("auto", "stream" or "poll")
         """
         if self._monitoring:
             return
 
         # Initialize monitoring state, but only set to True once we confirm task is running
         _logger.info(f"Setting up monitoring for session {self.id} ({self._name})")
-        
-        async def monitor_screen_polling():
-            """Polling-based screen monitoring as a fallback approach."""
+
+        async def monitor_screen():
+            """Run the streaming monitor, falling back to polling if needed."""
             try:
-                _logger.info(f"Starting polling-based screen monitoring for session {self.id}")
-                
+                _logger.info(f"Starting {mode} screen monitoring for session {self.id}")
+
                 if self.logger:
-                    self.logger.log_custom_event("MONITORING_STARTED", "Polling-based screen monitoring started")
-                
+                    self.logger.log_custom_event("MONITORING_STARTED", f"Screen monitoring started (mode={mode})")
+
                 # Use a ready event to signal when monitoring is fully initialized
                 monitoring_initialized.set()
-                
-                last_content = await self.get_screen_contents()
-                
-                while self._monitoring:
+
+                last = await self.get_screen_snapshot(max_age=0)
+
+                if mode != "poll":
                     try:
-                        # Get current content
-                        current_content = await self.get_screen_contents()
-                        
-                        # Check if content has changed
-                        if current_content != last_content:
-                            # Process the content through any registered callbacks
-                            callback_tasks = []
-                            for callback in self._monitor_callbacks:
-                                # Run each callback in a separate task to prevent blocking
-                                try:
-                                    # Create and track all callback tasks
-                                    task = asyncio.create_task(callback(current_content))
-                                    callback_tasks.append(task)
-                                except Exception as callback_error:
-                                    _logger.error(f"Error in callback: {str(callback_error)}")
-                            
-                            # Wait for all callbacks to complete
-                            if callback_tasks:
-                                await asyncio.gather(*callback_tasks, return_exceptions=True)
-                            
-                            # Update last content and timestamp
-                            last_content = current_content
-                            self._last_screen_update = time.time()
-                        
-                        # Sleep to prevent excessive CPU usage
-                        await asyncio.sleep(update_interval)
-                    except Exception as poll_error:
-                        # Special handling for SESSION_NOT_FOUND - expected when session is closed
-                        if "SESSION_NOT_FOUND" in str(poll_error):
-                            if self._monitoring:
-                                # Only log at debug level since this is expected during cleanup
-                                _logger.debug(f"Session no longer available during monitoring (likely closed): {self.id}")
-                                # Signal to exit the monitoring loop
-                                self._monitoring = False
-                                return
-                        else:
-                            # Log any other errors as actual errors
-                            _logger.error(f"Error in polling loop: {str(poll_error)}")
-                        await asyncio.sleep(update_interval)
+                        last = await self._stream_screen(last, update_interval)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as stream_error:
+                        if mode == "stream" or "SESSION_NOT_FOUND" in str(stream_error):
+                            raise
+                        _logger.warning(
+                            f"Screen streaming unavailable for session {self.id}, "
+                            f"falling back to polling: {stream_error}"
+                        )
+
+                if self._monitoring:
+                    await self._poll_screen(last, update_interval)
             except asyncio.CancelledError:
-                _logger.info(f"Polling monitor task cancelled for session {self.id}")
+                _logger.info(f"Monitor task cancelled for session {self.id}")
             except Exception as e:
-                _logger.error(f"Fatal error in polling monitor: {str(e)}")
-                if self.logger:
-                    self.logger.log_custom_event("MONITORING_ERROR", f"Error in screen monitoring: {str(e)}")
+                if "SESSION_NOT_FOUND" in str(e):
+                    # Expected when the session is closed while monitored
+                    _logger.debug(f"Session no longer available during monitoring (likely closed): {self.id}")
+                else:
+                    _logger.error(f"Fatal error in screen monitor: {str(e)}")
+                    if self.logger:
+                        self.logger.log_custom_event("MONITORING_ERROR", f"Error in screen monitoring: {str(e)}")
             finally:
                 self._monitoring = False
+                self._monitor_mode = None
                 if self.logger:
                     self.logger.log_custom_event("MONITORING_STOPPED", "Screen monitoring stopped")
-        
+
         # Create an event to signal when monitoring is fully initialized
         monitoring_initialized = asyncio.Event()
-        
+        self._screen_activity = asyncio.Event()
+
         # Start monitoring flag
         self._monitoring = True
-        
-        # Use polling-based approach instead of subscription-based approach
-        # to avoid WebSocket frame errors
-        self._monitor_task = asyncio.create_task(monitor_screen_polling())
-        
+
+        self._monitor_task = asyncio.create_task(monitor_screen())
+
         # Wait for the monitoring to be properly initialized before returning
         try:
             await asyncio.wait_for(monitoring_initialized.wait(), timeout=3.0)
@@ -727,7 +1141,154 @@ class ItermSession:
                 self._monitor_task.cancel()
             self._monitor_task = None
             raise RuntimeError("Timeout waiting for monitoring to initialize")
-        
+
+    async def _stream_screen(self, last: ScreenSnapshot, settle_interval: float) -> ScreenSnapshot:
+        """Deliver screen changes driven by iTerm2 screen-update notifications.
+
+        The streamer drops notifications that arrive while we are reading the
+        screen, so after every change one catch-up read is made once output
+        has been quiet for settle_interval.
+
+        Args:
+            last: Snapshot the next changes are compared against
+            settle_interval: Quiet period before the catch-up read
+
+        Returns:
+            The last delivered snapshot once monitoring stops
+        """
+        async with self.screen_updates() as updates:
+            self._monitor_mode = "stream"
+            # Catch up on anything that changed before the subscription
+            catch_up = True
+            while self._monitoring:
+                try:
+                    await asyncio.wait_for(
+                        updates.async_get(),
+                        timeout=settle_interval if catch_up else None
+                    )
+                    self.monitor_stats["notifications"] += 1
+                except asyncio.TimeoutError:
+                    pass
+
+                current = await self.get_screen_snapshot(newer_than=last.version)
+                catch_up = await self._deliver_screen_changes(last, current)
+                last = current
+        return last
+
+    async def _poll_screen(self, last: ScreenSnapshot, min_interval: float) -> None:
+        """Deliver screen changes by polling at an adaptive interval.
+
+        The interval grows by MONITOR_POLL_BACKOFF while nothing changes, up to
+        MONITOR_POLL_MAX_INTERVAL_SECONDS, and drops back to min_interval as soon
+        as the screen changes or input is sent to the session.
+
+        Args:
+            last: Snapshot the next changes are compared against
+            min_interval: Shortest delay between polls
+        """
+        self._monitor_mode = "poll"
+        max_interval = max(min_interval, MONITOR_POLL_MAX_INTERVAL_SECONDS)
+        interval = min_interval
+        while self._monitoring:
+            try:
+                input_sent = await self._wait_for_screen_activity(interval)
+                if not self._monitoring:
+                    return
+
+                self.monitor_stats["polls"] += 1
+                current = await self.get_screen_snapshot(max_age=min_interval)
+                changed = await self._deliver_screen_changes(last, current)
+                last = current
+
+                if changed or input_sent:
+                    interval = min_interval
+                else:
+                    interval = min(interval * MONITOR_POLL_BACKOFF, max_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as poll_error:
+                # SESSION_NOT_FOUND is expected once the session is closed
+                if "SESSION_NOT_FOUND" in str(poll_error):
+                    raise
+                _logger.error(f"Error in polling loop: {str(poll_error)}")
+                await asyncio.sleep(interval)
+
+    async def _wait_for_screen_activity(self, timeout: float) -> bool:
+        """Sleep for up to timeout seconds, waking early when input is sent.
+
+        Returns:
+            True if input was sent to the session while waiting
+        """
+        activity = self._screen_activity
+        if activity is None:
+            await asyncio.sleep(timeout)
+            return False
+        try:
+            await asyncio.wait_for(activity.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        activity.clear()
+        return True
+
+    def _log_screen_delta(self, snapshot: ScreenSnapshot) -> Optional[ScreenDelta]:
+        """Append the output that is new since the last logged snapshot to the log.
+
+        Args:
+            snapshot: The snapshot just read
+
+        Returns:
+            The logged delta, or None if the snapshot was already logged
+        """
+        if not self.logger:
+            return None
+        logged = self._logged_snapshot
+        if logged is not None and snapshot.version <= logged.version:
+            return None
+
+        delta = diff_screens(logged, snapshot)
+        self._logged_snapshot = snapshot
+        if delta.lines:
+            self.logger.log_output(delta.text())
+        return delta
+
+    async def _deliver_screen_changes(self, previous: ScreenSnapshot, current: ScreenSnapshot) -> bool:
+        """Pass what changed between two snapshots to the monitor callbacks.
+
+        Args:
+            previous: The snapshot already delivered
+            current: The newly read snapshot
+
+        Returns:
+            True if the screen changed
+        """
+        delta = diff_screens(previous, current)
+        if delta.is_empty:
+            return False
+
+        self._last_screen_update = time.time()
+        self.monitor_stats["deliveries"] += 1
+        self._log_screen_delta(current)
+        if not delta.lines:
+            # Only scrolling or blanked lines (e.g. a clear); nothing to report
+            return True
+
+        changed_text = delta.text()
+
+        # Process the changes through any registered callbacks
+        callback_tasks = []
+        for callback in self._monitor_callbacks:
+            # Run each callback in a separate task to prevent blocking
+            try:
+                payload = delta if callback in self._delta_callbacks else changed_text
+                callback_tasks.append(asyncio.create_task(callback(payload)))
+            except Exception as callback_error:
+                _logger.error(f"Error in callback: {str(callback_error)}")
+
+        # Wait for all callbacks to complete
+        if callback_tasks:
+            await asyncio.gather(*callback_tasks, return_exceptions=True)
+        return True
+
     async def stop_monitoring(self) -> None:
         """Stop monitoring the screen for changes and ensure callbacks are completed."""
         if not self._monitoring or not self._monitor_task:
@@ -759,14 +1320,115 @@ class ItermSession:
         self._monitor_task = None
         _logger.info(f"Monitoring stopped for session {self.id}")
         
-    def add_monitor_callback(self, callback: Callable[[str], None]) -> None:
+    async def wait_until_idle(self, timeout: float) -> bool:
+        """Wait until the session finishes what it is doing.
+
+        Driven by screen-update and shell-integration prompt notifications
+        rather than polling: the wait costs no screen reads while nothing
+        happens and returns as soon as a prompt appears, or, without shell
+        integration, once the session is not processing and its screen has
+        been quiet for IDLE_QUIET_SECONDS.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the session went idle, False on timeout
+        """
+        self._signal_waiters += 1
+        if self._signal_task is None or self._signal_task.done():
+            self._signal_task = asyncio.create_task(self._watch_completion_signals())
+        try:
+            # A change since the last read counts as activity
+            await self.get_screen_snapshot(max_age=0)
+            return await self.idle_tracker.wait_idle(
+                timeout, is_processing=lambda: self.is_processing
+            )
+        finally:
+            self._signal_waiters -= 1
+            if self._signal_waiters == 0 and self._signal_task is not None:
+                # Release the notification subscriptions before returning
+                task, self._signal_task = self._signal_task, None
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def _watch_completion_signals(self) -> None:
+        """Feed iTerm2 notifications to idle_tracker while someone is waiting."""
+        await asyncio.gather(self._watch_screen_updates(), self._watch_prompts())
+
+    async def _watch_screen_updates(self) -> None:
+        """Record screen updates, polling adaptively if streaming is unavailable."""
+        try:
+            async with self.screen_updates() as updates:
+                while True:
+                    await updates.async_get()
+                    self.idle_tracker.note_activity()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if "SESSION_NOT_FOUND" in str(e):
+                return
+            _logger.debug(f"Screen streaming unavailable for session {self.id}, polling: {e}")
+
+        # Snapshot fetches note changes on the tracker themselves
+        interval = self.idle_tracker.quiet_period
+        while True:
+            seen = self.idle_tracker.last_activity
+            await asyncio.sleep(interval)
+            try:
+                await self.get_screen_snapshot(max_age=interval)
+            except Exception as e:
+                _logger.debug(f"Stopped polling session {self.id} for activity: {e}")
+                return
+            if self.idle_tracker.last_activity != seen:
+                interval = self.idle_tracker.quiet_period
+            else:
+                interval = min(interval * MONITOR_POLL_BACKOFF, MONITOR_POLL_MAX_INTERVAL_SECONDS)
+
+    async def _watch_prompts(self) -> None:
+        """Record shell-integration prompt and command notifications."""
+        connection = getattr(self.session, "connection", None)
+        if connection is None:
+            return
+        Mode = iterm2.PromptMonitor.Mode
+        try:
+            try:
+                monitor = iterm2.PromptMonitor(
+                    connection, self.id,
+                    modes=[Mode.PROMPT, Mode.COMMAND_START, Mode.COMMAND_END]
+                )
+            except iterm2.capabilities.AppVersionTooOld:
+                monitor = iterm2.PromptMonitor(connection, self.id)
+            async with monitor:
+                while True:
+                    mode, _ = await monitor.async_get()
+                    if mode == Mode.COMMAND_START:
+                        self.idle_tracker.note_command_start()
+                    else:
+                        self.idle_tracker.note_prompt()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _logger.debug(f"Prompt notifications unavailable for session {self.id}: {e}")
+
+    def add_monitor_callback(
+        self,
+        callback: Callable[[Any], Any],
+        want_delta: bool = False
+    ) -> None:
         """Add a callback to be called when the screen changes.
         
         Args:
-            callback: A function that takes the screen content as a string
+            callback: A coroutine function that takes the new and changed
+                screen lines as a string
+            want_delta: Pass the ScreenDelta to the callback instead of text
         """
         if callback not in self._monitor_callbacks:
             self._monitor_callbacks.append(callback)
+        if want_delta:
+            self._delta_callbacks.add(callback)
+        else:
+            self._delta_callbacks.discard(callback)
             
     def remove_monitor_callback(self, callback: Callable[[str], None]) -> None:
         """Remove a previously registered callback.
@@ -776,6 +1438,7 @@ class ItermSession:
         """
         if callback in self._monitor_callbacks:
             self._monitor_callbacks.remove(callback)
+        self._delta_callbacks.discard(callback)
             
     @property
     def is_monitoring(self) -> bool:
@@ -790,7 +1453,12 @@ class ItermSession:
             not self._monitor_task.done()
         )
         return monitoring_active
-        
+
+    @property
+    def monitor_mode(self) -> Optional[str]:
+        """The active monitoring strategy ("stream" or "poll"), if any."""
+        return self._monitor_mode
+
     @property
     def last_update_time(self) -> float:
         """Get the timestamp of the last screen update."""
@@ -806,6 +1474,28 @@ class ItermSession:
         self._cached_cwd = cwd
         self._cwd_updated_at = time.time()
 
+    @property
+    def has_cwd_feed(self) -> bool:
+        """Whether a path-variable subscription is pushing cwd changes."""
+        return self._cwd_feeds > 0
+
+    def attach_cwd_feed(self) -> None:
+        """Register a subscription that will push cwd changes via push_cwd."""
+        self._cwd_feeds += 1
+
+    def detach_cwd_feed(self) -> None:
+        """Unregister a cwd subscription; the cache expires again once none remain."""
+        self._cwd_feeds = max(0, self._cwd_feeds - 1)
+        if self._cwd_feeds == 0:
+            self._cwd_pushed = False
+
+    def push_cwd(self, cwd: str) -> None:
+        """Record a cwd reported by an attached path-variable subscription."""
+        self.update_cwd_cache(cwd)
+        self.cwd_stats["pushes"] += 1
+        if self._cwd_feeds:
+            self._cwd_pushed = True
+
     def parse_prompt_cwd(self, screen_content: str) -> Optional[str]:
         """Parse CWD from terminal prompt.
 
@@ -817,34 +1507,13 @@ class ItermSession:
         Returns:
             Extracted CWD path or None if not found
         """
-        # Patterns to try (most specific first)
-        patterns = [
-            # hostname :: ~/path 123 » or (env) hostname :: ~/path 123 »
-            # (common pattern for oh-my-zsh and similar prompts)
-            r"(?:\([^)]+\)\s+)?\w+\s+::\s+([~/][^\s]+)\s+\d+\s*»",
-            # Starship git prompt: ~/path on branch ⇣⇡ *? ── (with status line)
-            r"^([~/][^\s]+)\s+on\s+[^\s]+\s*(?:⇣|⇡|\*|\?|!|\d)*\s*─",
-            # Git prompt: ~/path on branch (simple)
-            r"^([~/][^\s]+)\s+on\s+\S+",
-            # Claude Code header: ▘▘ ▝▝  ~/path
-            r"▝▝\s+([~/][^\s]+)",
-            # Standard PS1: user@host:~/path$
-            r"@[^:]+:([~/][^\s$]+)\$",
-            # Simple: ~/path followed by prompt char
-            r"^([~/][^\s]+)\s*(?:»|>|❯|\$)\s*$",
-            # Path in brackets [/path/to/dir]
-            r"\[(/[^\]]+)\]",
-            # Absolute path at start (fallback)
-            r"^(/Users/[^\s]+?)(?:\s|$)",
-        ]
-
         # Get last few lines of content
         lines = screen_content.strip().split('\n')
         recent_lines = lines[-10:] if len(lines) > 10 else lines
 
         for line in reversed(recent_lines):
-            for pattern in patterns:
-                match = re.search(pattern, line)
+            for pattern in PROMPT_CWD_PATTERNS:
+                match = pattern.search(line)
                 if match:
                     cwd = match.group(1)
                     # Expand ~ to full path
@@ -866,10 +1535,16 @@ class ItermSession:
         Returns:
             Current working directory path or None
         """
-        # If we have a recent cached value and not forcing refresh, use it
+        # If we have a recent cached value and not forcing refresh, use it.
+        # Values pushed by an attached feed do not expire.
         if not force_refresh and self._cached_cwd:
-            if time.time() - self._cwd_updated_at < CWD_CACHE_TTL_SECONDS:
+            if (
+                (self._cwd_pushed and self._cwd_feeds)
+                or time.time() - self._cwd_updated_at < CWD_CACHE_TTL_SECONDS
+            ):
+                self.cwd_stats["hits"] += 1
                 return self._cached_cwd
+        self.cwd_stats["misses"] += 1
 
         # Try iTerm2's native API first (requires shell integration)
         try:
@@ -883,6 +1558,7 @@ class ItermSession:
         # Fallback: parse from terminal prompt
         try:
             screen_content = await self.get_screen_contents(max_lines=20)
+            self.cwd_stats["prompt_parses"] += 1
             parsed_cwd = self.parse_prompt_cwd(screen_content)
             if parsed_cwd:
                 self.update_cwd_cache(parsed_cwd)
@@ -893,6 +1569,139 @@ class ItermSession:
         # Return cached value even if stale
         return self._cached_cwd
 
+    @property
+    def is_watching_context(self) -> bool:
+        """Whether the background context watcher is running."""
+        return self._context_task is not None and not self._context_task.done()
+
+    def watch_context(self) -> None:
+        """Keep cwd and last-message state fresh from iTerm2 notifications.
+
+        A variable monitor pushes `path` changes into the cwd cache, and the
+        session's shared screen_updates() feed marks the last message stale,
+        so get_cwd and get_last_message make no API calls while nothing
+        changes. If another cwd feed (such as PathMonitor) is already
+        attached, no second path subscription is opened. Calling this again
+        while the watcher is running only renews it; the watcher stops once
+        this has not been called for CONTEXT_WATCH_IDLE_SECONDS, so only
+        sessions that are still being listed keep their subscriptions.
+        """
+        self._context_used_at = time.monotonic()
+        if self.is_watching_context:
+            return
+        self._context_dirty = True
+        self._context_task = asyncio.create_task(self._watch_context())
+
+    async def stop_watching_context(self) -> None:
+        """Stop the background context watcher, if running."""
+        task, self._context_task = self._context_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _watch_context(self) -> None:
+        """Run the path and screen watchers until either gives up or the lease lapses."""
+        tasks = [
+            asyncio.ensure_future(self._watch_screen_changes()),
+            asyncio.ensure_future(self._expire_context_watch()),
+        ]
+        if not self.has_cwd_feed:
+            tasks.append(asyncio.ensure_future(self._watch_path_variable()))
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _expire_context_watch(self) -> None:
+        """Return once watch_context() has not been called for CONTEXT_WATCH_IDLE_SECONDS."""
+        while True:
+            remaining = self._context_used_at + CONTEXT_WATCH_IDLE_SECONDS - time.monotonic()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    async def _watch_path_variable(self) -> None:
+        """Push `path` variable changes into the cwd cache."""
+        connection = getattr(self.session, "connection", None)
+        if connection is None:
+            return
+        self.attach_cwd_feed()
+        try:
+            async with iterm2.VariableMonitor(
+                connection, iterm2.VariableScopes.SESSION, "path", self.id
+            ) as mon:
+                # The monitor only reports changes, so seed the current value
+                cwd = await self.session.async_get_variable("path")
+                while True:
+                    if cwd:
+                        self.push_cwd(cwd)
+                    cwd = await mon.async_get()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _logger.debug(f"Path notifications unavailable for session {self.id}: {e}")
+        finally:
+            self.detach_cwd_feed()
+
+    async def _watch_screen_changes(self) -> None:
+        """Mark the last message stale whenever the screen changes."""
+        try:
+            async with self.screen_updates() as updates:
+                while True:
+                    await updates.async_get()
+                    self._context_dirty = True
+                    self._last_screen_update = time.time()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _logger.debug(f"Screen notifications unavailable for session {self.id}: {e}")
+
+    async def get_last_message(
+        self,
+        extract: Callable[[str], Optional[str]],
+        max_lines: int = 15
+    ) -> Optional[str]:
+        """Get the last message shown on screen, reusing the cached value.
+
+        While the context watcher is running, the cached value is returned
+        until the screen changes. Otherwise the shared snapshot cache is read
+        and extract only runs again when the snapshot version has changed.
+
+        Args:
+            extract: Function that picks the message out of the screen text;
+                callers must always pass the same one
+            max_lines: Number of screen lines passed to extract
+
+        Returns:
+            The extracted message or None
+        """
+        if (
+            self.is_watching_context
+            and not self._context_dirty
+            and self._last_message_version is not None
+        ):
+            return self._last_message
+
+        # A watched session only gets here after a screen change, so the
+        # cached snapshot is known to be stale
+        max_age = 0 if self.is_watching_context else SCREEN_SNAPSHOT_TTL_SECONDS
+
+        # Clear the flag first so changes that arrive mid-fetch are not lost
+        self._context_dirty = False
+        try:
+            snapshot = await self.get_screen_snapshot(max_age=max_age)
+        except Exception:
+            self._context_dirty = True
+            raise
+        self._log_screen_delta(snapshot)
+
+        if snapshot.version != self._last_message_version:
+            self._last_message = extract(snapshot.text(max_lines))
+            self._last_message_version = snapshot.version
+        return self._last_message
+
     async def set_background_color(self, red: int, green: int, blue: int, alpha: int = 255) -> None:
         """Set the background color of the session.
 
@@ -994,7 +1803,7 @@ class ItermSession:
             "max_lines": self._max_lines,
             "is_monitoring": self._monitoring,
             "last_screen_update": self._last_screen_update,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": self._created_at.isoformat(),
             "last_command": last_command,
             "last_output": last_output,
             "metadata": {}
@@ -1109,8 +1918,8 @@ class ItermSession:
         if not patterns:
             raise ValueError("patterns list cannot be empty")
 
-        # Separate patterns from timeout marker
-        regex_patterns: List[Tuple[int, re.Pattern]] = []
+        # Separate patterns from timeout marker; the matcher is keyed by list index
+        matcher = PatternMatcher()
         timeout_marker: Optional[Tuple[int, ExpectTimeout]] = None
 
         for i, pattern in enumerate(patterns):
@@ -1120,12 +1929,9 @@ class ItermSession:
                 else:
                     timeout_marker = (i, pattern)
                     timeout = pattern.seconds  # Override timeout
-            elif isinstance(pattern, re.Pattern):
-                regex_patterns.append((i, pattern))
-            elif isinstance(pattern, str):
+            elif isinstance(pattern, (str, re.Pattern)):
                 try:
-                    compiled = re.compile(pattern)
-                    regex_patterns.append((i, compiled))
+                    matcher.add(i, pattern)
                 except re.error as e:
                     raise ValueError(f"Invalid regex pattern at index {i}: {e}")
             else:
@@ -1134,7 +1940,7 @@ class ItermSession:
                     f"Expected str, re.Pattern, or ExpectTimeout"
                 )
 
-        if not regex_patterns:
+        if not len(matcher):
             raise ValueError("patterns list must contain at least one regex pattern")
 
         # Determine search window
@@ -1147,7 +1953,7 @@ class ItermSession:
         accumulated_output = ""
 
         _logger.debug(
-            f"expect() started: {len(regex_patterns)} patterns, "
+            f"expect() started: {len(matcher)} patterns, "
             f"timeout={timeout}s, poll={poll_interval}s"
         )
 
@@ -1209,34 +2015,37 @@ class ItermSession:
 
                 # Check for new content
                 if current_output != last_output:
+                    # Text that was already searched cannot match on its own,
+                    # so only the changed lines (plus some context) are scanned
+                    scan_from = rescan_offset(last_output, current_output)
                     accumulated_output = current_output
                     last_output = current_output
 
-                    # Check each pattern against the current output
-                    for idx, pattern in regex_patterns:
-                        match = pattern.search(current_output)
-                        if match:
-                            matched_text = match.group(0)
-                            before_text = current_output[:match.start()]
+                    found = matcher.search(current_output, scan_from)
+                    if found:
+                        idx, match = found
+                        pattern = matcher.pattern(idx)
+                        matched_text = match.group(0)
+                        before_text = current_output[:match.start()]
 
-                            _logger.debug(
-                                f"expect() matched pattern {idx}: {pattern.pattern!r}"
-                            )
-                            if self.logger:
-                                self.logger.log_custom_event(
-                                    "EXPECT_MATCH",
-                                    f"Pattern matched: {pattern.pattern!r}"
-                                )
-
-                            return ExpectResult(
-                                matched_pattern=pattern,
-                                match_index=idx,
-                                output=current_output,
-                                matched_text=matched_text,
-                                before=before_text,
-                                match=match
+                        _logger.debug(
+                            f"expect() matched pattern {idx}: {pattern.pattern!r}"
+                        )
+                        if self.logger:
+                            self.logger.log_custom_event(
+                                "EXPECT_MATCH",
+                                f"Pattern matched: {pattern.pattern!r}"
                             )
 
+                        return ExpectResult(
+                            matched_pattern=pattern,
+                            match_index=idx,
+                            output=current_output,
+                            matched_text=matched_text,
+                            before=before_text,
+                            match=match
+                        )
+
                 # Wait before next poll (don't overshoot timeout)
                 remaining = timeout - (time.time() - start_time)
                 await asyncio.sleep(min(poll_interval, max(0.01, remaining)))
@@ -1,14 +1,112 @@
 """Terminal management for iTerm2 integration."""
 
 import asyncio
+import logging
 import os
-from typing import Dict, List, Optional, Tuple, Union, Any, Literal
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union, Any, Literal
 
 import iterm2
 
 from .session import ItermSession
 from utils.logging import ItermLogManager, ItermSessionLogger
 
+
+# Logger for terminal module
+_logger = logging.getLogger("iterm-terminal")
+
+
+class SessionIndex:
+    """In-memory index of ItermSession wrappers.
+
+    Keeps O(1) maps by session ID, name and persistent ID. Wrappers are kept
+    for the lifetime of their pane so monitor tasks, the CWD cache and the
+    session logger survive across lookups; the index only changes when panes
+    are added or evicted.
+    """
+
+    def __init__(self) -> None:
+        self.by_id: Dict[str, ItermSession] = {}
+        self._id_by_name: Dict[str, str] = {}
+        self._id_by_persistent_id: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self.by_id
+
+    def __iter__(self) -> Iterator[ItermSession]:
+        return iter(list(self.by_id.values()))
+
+    def add(self, session: ItermSession) -> None:
+        """Add or replace a session wrapper.
+
+        Args:
+            session: The wrapper to index
+        """
+        previous = self.by_id.get(session.id)
+        if previous is not None and previous is not session:
+            self._unlink(previous)
+        self.by_id[session.id] = session
+        # First session wins for duplicate names, matching a linear scan
+        self._id_by_name.setdefault(session.name, session.id)
+        self._id_by_persistent_id[session.persistent_id] = session.id
+
+    def remove(self, session_id: str) -> Optional[ItermSession]:
+        """Remove a session wrapper from the index.
+
+        Args:
+            session_id: The ID of the session to remove
+
+        Returns:
+            The removed wrapper, or None if it was not indexed
+        """
+        session = self.by_id.pop(session_id, None)
+        if session is not None:
+            self._unlink(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[ItermSession]:
+        """Get a wrapper by session ID."""
+        return self.by_id.get(session_id)
+
+    def get_by_name(self, name: str) -> Optional[ItermSession]:
+        """Get the first wrapper with the given name.
+
+        Wrappers can be renamed after they are indexed, so a stale entry is
+        detected and the name map is rebuilt from the indexed wrappers.
+        """
+        session = self.by_id.get(self._id_by_name.get(name, ""))
+        if session is not None and session.name == name:
+            return session
+        self._rebuild_names()
+        return self.by_id.get(self._id_by_name.get(name, ""))
+
+    def get_by_persistent_id(self, persistent_id: str) -> Optional[ItermSession]:
+        """Get a wrapper by persistent ID."""
+        return self.by_id.get(self._id_by_persistent_id.get(persistent_id, ""))
+
+    def replace(self, sessions: Dict[str, ItermSession]) -> None:
+        """Replace the whole index with the given ID → wrapper mapping."""
+        self.by_id = {}
+        self._id_by_name = {}
+        self._id_by_persistent_id = {}
+        for session in sessions.values():
+            self.add(session)
+
+    def _unlink(self, session: ItermSession) -> None:
+        if self._id_by_persistent_id.get(session.persistent_id) == session.id:
+            del self._id_by_persistent_id[session.persistent_id]
+        if self._id_by_name.get(session.name) == session.id:
+            self._rebuild_names()
+
+    def _rebuild_names(self) -> None:
+        names: Dict[str, str] = {}
+        for session in self.by_id.values():
+            names.setdefault(session.name, session.id)
+        self._id_by_name = names
+
+
 class ItermTerminal:
     """Manages an iTerm2 terminal with multiple sessions (panes)."""
     
@@ -31,8 +129,16 @@ class ItermTerminal:
         """
         self.connection = connection
         self.app = None
-        self.sessions: Dict[str, ItermSession] = {}
         self.default_max_lines = default_max_lines
+
+        # Incremental session index, kept fresh by layout notifications
+        self._index = SessionIndex()
+        self._index_dirty = True
+        # Sessions created here that the app has not reported yet
+        self._pending_ids: Set[str] = set()
+        self._watch_tasks: List[asyncio.Task] = []
+        # Called with the ID of each evicted pane (see add_eviction_callback)
+        self._eviction_callbacks: List[Callable[[str], None]] = []
         
         # Initialize logging if enabled
         self.enable_logging = enable_logging
@@ -42,55 +148,208 @@ class ItermTerminal:
                 default_max_lines=default_max_lines,
                 max_snapshot_lines=max_snapshot_lines
             )
+
+    @property
+    def sessions(self) -> Dict[str, ItermSession]:
+        """Indexed sessions keyed by session ID."""
+        return self._index.by_id
+
+    @sessions.setter
+    def sessions(self, sessions: Dict[str, ItermSession]) -> None:
+        self._index.replace(sessions)
+
+    @property
+    def is_watching(self) -> bool:
+        """Whether layout notifications are keeping the index fresh."""
+        return bool(self._watch_tasks) and all(
+            not task.done() for task in self._watch_tasks
+        )
         
     async def initialize(self) -> None:
         """Initialize the connection to iTerm2."""
         self.app = await iterm2.async_get_app(self.connection)
         await self._refresh_sessions()
+        self.start_session_watchers()
+
+    def start_session_watchers(self) -> None:
+        """Subscribe to layout and session lifecycle notifications.
+
+        Layout-change and new-session notifications mark the index stale so
+        the next lookup reconciles it; terminations evict the pane directly.
+        Until the watchers are running, every lookup reconciles the index.
+        """
+        if self.is_watching:
+            return
+
+        async def watch_layout() -> None:
+            async with iterm2.LayoutChangeMonitor(self.connection) as mon:
+                while True:
+                    await mon.async_get()
+                    self._index_dirty = True
+
+        async def watch_new_sessions() -> None:
+            async with iterm2.NewSessionMonitor(self.connection) as mon:
+                while True:
+                    await mon.async_get()
+                    self._index_dirty = True
+
+        async def watch_terminations() -> None:
+            async with iterm2.SessionTerminationMonitor(self.connection) as mon:
+                while True:
+                    session_id = await mon.async_get()
+                    await self._evict_session(session_id)
+                    self._index_dirty = True
+
+        async def run(name: str, watcher) -> None:
+            try:
+                await watcher()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Without notifications the index falls back to reconciling
+                # on every lookup, so this is not fatal
+                _logger.warning(f"Session watcher '{name}' stopped: {e}")
+                self._index_dirty = True
+
+        self._watch_tasks = [
+            asyncio.create_task(run("layout", watch_layout)),
+            asyncio.create_task(run("new_session", watch_new_sessions)),
+            asyncio.create_task(run("terminate_session", watch_terminations)),
+        ]
+
+    async def shutdown(self) -> None:
+        """Stop background watchers, including per-session context watchers, and flush logs."""
+        tasks, self._watch_tasks = self._watch_tasks, []
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._index_dirty = True
+
+        await asyncio.gather(*(
+            session.stop_watching_context() for session in self._index
+        ))
+
+        if self.enable_logging and hasattr(self, "log_manager"):
+            self.log_manager.flush()
+
+    def _iter_app_sessions(self) -> Iterator[iterm2.Session]:
+        """Yield every iTerm2 session in the app's current layout."""
+        for window in self.app.windows:
+            for tab in window.tabs:
+                yield from tab.sessions
+
+    def _find_persistent_id(self, session_id: str) -> Optional[str]:
+        """Look up the persistent ID registered for a session ID."""
+        if self.enable_logging and hasattr(self, "log_manager"):
+            return self.log_manager.find_persistent_id(session_id)
+        return None
+
+    def _attach_logger(self, iterm_session: ItermSession) -> None:
+        """Attach a session logger when logging is enabled."""
+        if self.enable_logging and hasattr(self, "log_manager"):
+            session_logger = self.log_manager.get_session_logger(
+                session_id=iterm_session.id,
+                session_name=iterm_session.name,
+                persistent_id=iterm_session.persistent_id
+            )
+            iterm_session.set_logger(session_logger)
+
+    def _track_session(self, iterm_session: ItermSession) -> None:
+        """Index a session created by this terminal."""
+        self._index.add(iterm_session)
+        self._pending_ids.add(iterm_session.id)
+
+    def add_eviction_callback(self, callback: Callable[[str], None]) -> None:
+        """Call callback with the session ID whenever a pane is evicted.
+
+        Lets components that keep per-session state drop it when the pane
+        closes.
+        """
+        if callback not in self._eviction_callbacks:
+            self._eviction_callbacks.append(callback)
+
+    async def _evict_session(self, session_id: str) -> Optional[ItermSession]:
+        """Remove a pane that no longer exists and release its resources."""
+        self._pending_ids.discard(session_id)
+        session = self._index.remove(session_id)
+        if session is None:
+            return None
+
+        if session.is_monitoring:
+            await session.stop_monitoring()
+        await session.stop_watching_context()
+
+        if self.enable_logging and hasattr(self, "log_manager"):
+            self.log_manager.remove_session_logger(session_id)
+
+        for callback in self._eviction_callbacks:
+            try:
+                callback(session_id)
+            except Exception as e:
+                _logger.error(f"Error in eviction callback for session {session_id}: {e}")
+
+        return session
     
     async def _refresh_sessions(self) -> None:
-        """Refresh the list of available sessions."""
+        """Reconcile the session index with the app's current layout.
+
+        Existing wrappers are kept; only panes that appeared are wrapped and
+        only panes that disappeared are evicted. The app object keeps its own
+        layout current from notifications, so this makes no API calls.
+        """
         if not self.app:
             raise RuntimeError("Terminal not initialized")
-        
-        # Clear existing sessions
-        self.sessions = {}
-        
-        # Get all windows
-        windows = self.app.windows
-        
-        # Loop through all windows and tabs to find all sessions
-        for window in windows:
-            tabs = window.tabs
-            for tab in tabs:
-                tab_sessions = tab.sessions
-                for session in tab_sessions:
-                    # Check if we have a persistent ID for this session
-                    persistent_id = None
-                    if self.enable_logging and hasattr(self, "log_manager"):
-                        # Search persistent sessions for this session ID
-                        for p_id, details in self.log_manager.persistent_sessions.items():
-                            if details.get("session_id") == session.session_id:
-                                persistent_id = p_id
-                                break
-                    
-                    # Create a new ItermSession with logger and add to the dictionary
-                    iterm_session = ItermSession(
-                        session=session,
-                        persistent_id=persistent_id,
-                        max_lines=self.default_max_lines
-                    )
-                    
-                    # Add logger if logging is enabled
-                    if self.enable_logging and hasattr(self, "log_manager"):
-                        session_logger = self.log_manager.get_session_logger(
-                            session_id=iterm_session.id,
-                            session_name=iterm_session.name,
-                            persistent_id=iterm_session.persistent_id
-                        )
-                        iterm_session.set_logger(session_logger)
-                    
-                    self.sessions[iterm_session.id] = iterm_session
+
+        # Clear the flag first so notifications that arrive mid-reconcile
+        # are not lost
+        self._index_dirty = False
+
+        live_ids: Set[str] = set()
+        for session in self._iter_app_sessions():
+            session_id = session.session_id
+            live_ids.add(session_id)
+
+            indexed = self._index.get(session_id)
+            if indexed is not None:
+                self._pending_ids.discard(session_id)
+                # Panes can be renamed in iTerm without going through us
+                indexed.sync_name()
+                continue
+
+            # Create a new ItermSession with logger and add to the index
+            iterm_session = ItermSession(
+                session=session,
+                persistent_id=self._find_persistent_id(session_id),
+                max_lines=self.default_max_lines
+            )
+            self._attach_logger(iterm_session)
+            self._index.add(iterm_session)
+
+        # Evict panes that are gone, keeping ones we just created that the
+        # app has not reported yet
+        for session_id in list(self._index.by_id):
+            if session_id not in live_ids and session_id not in self._pending_ids:
+                await self._evict_session(session_id)
+
+    async def _ensure_fresh(self) -> None:
+        """Reconcile the index if a notification marked it stale."""
+        if self._index_dirty or not self.is_watching:
+            await self._refresh_sessions()
+
+    async def _lookup(self, find) -> Optional[ItermSession]:
+        """Run an index lookup, reconciling once on a miss.
+
+        A miss may just mean the notification for a new pane has not been
+        delivered yet, so one reconcile is attempted before giving up.
+        """
+        await self._ensure_fresh()
+        session = find()
+        if session is None and self.app is not None:
+            await self._refresh_sessions()
+            session = find()
+        return session
     
     async def get_sessions(self) -> List[ItermSession]:
         """Get all available sessions.
@@ -98,7 +357,7 @@ class ItermTerminal:
         Returns:
             List of session objects
         """
-        await self._refresh_sessions()
+        await self._ensure_fresh()
         return list(self.sessions.values())
     
     async def get_session_by_id(self, session_id: str) -> Optional[ItermSession]:
@@ -110,11 +369,12 @@ class ItermTerminal:
         Returns:
             The session if found, None otherwise
         """
-        await self._refresh_sessions()
-        return self.sessions.get(session_id)
+        return await self._lookup(lambda: self._index.get(session_id))
     
     async def get_session_by_name(self, name: str) -> Optional[ItermSession]:
         """Get a session by its name.
+
+        A miss reconciles once, which also picks up panes renamed in iTerm.
         
         Args:
             name: The name of the session
@@ -122,11 +382,7 @@ class ItermTerminal:
         Returns:
             The first session with the given name if found, None otherwise
         """
-        await self._refresh_sessions()
-        for session in self.sessions.values():
-            if session.name == name:
-                return session
-        return None
+        return await self._lookup(lambda: self._index.get_by_name(name))
         
     async def get_session_by_persistent_id(self, persistent_id: str) -> Optional[ItermSession]:
         """Get a session by its persistent ID.
@@ -137,23 +393,19 @@ class ItermTerminal:
         Returns:
             The session with the given persistent ID if found, None otherwise
         """
-        # Find the session ID from persistent ID
-        if self.enable_logging and hasattr(self, "log_manager"):
-            session_info = self.log_manager.get_persistent_session(persistent_id)
-            if session_info:
-                session_id = session_info.get("session_id")
-                if session_id:
-                    # Refresh to ensure we have the latest sessions
-                    await self._refresh_sessions()
-                    return self.sessions.get(session_id)
-        
-        # If not found in persistent mapping, try direct search
-        await self._refresh_sessions()
-        for session in self.sessions.values():
-            if session.persistent_id == persistent_id:
+        def find() -> Optional[ItermSession]:
+            session = self._index.get_by_persistent_id(persistent_id)
+            if session is not None:
                 return session
-        
-        return None
+
+            # Fall back to the persistent mapping kept by the log manager
+            if self.enable_logging and hasattr(self, "log_manager"):
+                session_info = self.log_manager.get_persistent_session(persistent_id)
+                if session_info and session_info.get("session_id"):
+                    return self._index.get(session_info["session_id"])
+            return None
+
+        return await self._lookup(find)
 
     async def get_focused_session(self) -> Optional[ItermSession]:
         """Get the currently focused session.
@@ -179,11 +431,8 @@ class ItermTerminal:
         if not iterm_session:
             return None
 
-        # Refresh sessions to ensure we have the latest
-        await self._refresh_sessions()
-
         # Return the matching ItermSession wrapper
-        return self.sessions.get(iterm_session.session_id)
+        return await self.get_session_by_id(iterm_session.session_id)
 
     async def create_window(self, profile: Optional[str] = None) -> ItermSession:
         """Create a new iTerm2 window.
@@ -241,7 +490,7 @@ class ItermTerminal:
                 f"Created new window with session: {session.name} ({session.id}) - Persistent ID: {session.persistent_id}"
             )
         
-        self.sessions[session.id] = session
+        self._track_session(session)
         
         return session
     
@@ -302,7 +551,7 @@ class ItermTerminal:
                 f"Created new tab with session: {session.name} ({session.id}) - Persistent ID: {session.persistent_id}"
             )
         
-        self.sessions[session.id] = session
+        self._track_session(session)
         
         return session
     
@@ -395,7 +644,7 @@ class ItermTerminal:
                 f"Created new {split_type.lower()} split pane: {iterm_session.name} ({iterm_session.id}) - Persistent ID: {iterm_session.persistent_id}"
             )
             
-        self.sessions[iterm_session.id] = iterm_session
+        self._track_session(iterm_session)
 
         return iterm_session
 
@@ -514,7 +763,7 @@ class ItermTerminal:
                 f"Created new split pane ({direction}): {iterm_session.name} ({iterm_session.id}) - Persistent ID: {iterm_session.persistent_id}"
             )
 
-        self.sessions[iterm_session.id] = iterm_session
+        self._track_session(iterm_session)
 
         return iterm_session
 
@@ -554,16 +803,12 @@ class ItermTerminal:
                 "SESSION_CLOSED", 
                 f"Closed session: {session.name} ({session.id})"
             )
-            
-            # Remove the session logger
-            self.log_manager.remove_session_logger(session_id)
         
         # Close the session
         await session.session.async_close()
 
-        # Remove from our sessions dictionary
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        # Drop it from the index and stop its monitors and logger
+        await self._evict_session(session_id)
 
     async def execute_command(
         self,
@@ -644,13 +889,9 @@ class ItermTerminal:
                     # Wait to ensure monitoring is fully started
                     await asyncio.sleep(1)
                     if not session.is_monitoring:
-                        import logging
-                        logger = logging.getLogger("iterm-terminal")
-                        logger.warning(f"Failed to start monitoring for {session_name}")
+                        _logger.warning(f"Failed to start monitoring for {session_name}")
                 except Exception as e:
-                    import logging
-                    logger = logging.getLogger("iterm-terminal")
-                    logger.error(f"Error starting monitoring for {session_name}: {str(e)}")
+                    _logger.error(f"Error starting monitoring for {session_name}: {str(e)}")
                 
             # Execute command if provided
             if command:
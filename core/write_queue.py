@@ -0,0 +1,129 @@
+"""Per-session outbound write queues.
+
+Every write to a pane goes through that pane's WriteQueue, which a single
+writer task drains in submission order. Writes to one pane therefore never
+interleave (a command's text and its trailing Enter stay together), while
+each pane has its own queue and panes proceed in parallel.
+
+Adjacent plain-text writes that do not press Enter are coalesced into one
+send. Submitting returns a future that resolves once the keystrokes have
+been accepted by iTerm2, so callers can queue several writes and await
+them together.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+
+@dataclass
+class _Write:
+    """One queued write: either raw text or an action run in the writer."""
+
+    future: asyncio.Future
+    text: Optional[str] = None
+    action: Optional[Callable[[], Awaitable[None]]] = None
+
+
+class WriteQueue:
+    """Serializes the writes to one session."""
+
+    def __init__(self, send: Callable[[str], Awaitable[None]]):
+        """Initialize the queue.
+
+        Args:
+            send: Coroutine function that sends raw text to the session
+        """
+        self._send = send
+        self._pending: Deque[_Write] = deque()
+        self._writer: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "writes": 0,
+            "sends": 0,
+            "coalesced": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit_text(self, text: str) -> asyncio.Future:
+        """Queue raw text, sent without pressing Enter.
+
+        Returns:
+            Future resolved once the text has been sent
+        """
+        return self._submit(_Write(asyncio.get_running_loop().create_future(), text=text))
+
+    def submit(self, action: Callable[[], Awaitable[None]]) -> asyncio.Future:
+        """Queue an action that performs one or more sends as a unit.
+
+        The action runs in the writer task with nothing else written to the
+        session until it returns, so it should send through raw iTerm2 calls
+        rather than through this queue.
+
+        Returns:
+            Future resolved once the action has completed
+        """
+        return self._submit(_Write(asyncio.get_running_loop().create_future(), action=action))
+
+    def _submit(self, write: _Write) -> asyncio.Future:
+        self.stats["writes"] += 1
+        if self._writer is not None and asyncio.current_task() is self._writer:
+            # Written from inside a queued action: waiting for the queue
+            # would deadlock, and the action already holds the session
+            asyncio.ensure_future(self._perform([write]))
+            return write.future
+
+        self._pending.append(write)
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.ensure_future(self._drain())
+        return write.future
+
+    async def _perform(self, batch: List[_Write]) -> None:
+        """Send one write or a run of coalesced text writes."""
+        self.stats["sends"] += 1
+        self.stats["coalesced"] += len(batch) - 1
+        try:
+            if batch[0].action is not None:
+                await batch[0].action()
+            else:
+                await self._send("".join(write.text for write in batch))
+        except BaseException as e:
+            for write in batch:
+                if not write.future.done():
+                    if isinstance(e, asyncio.CancelledError):
+                        write.future.cancel()
+                    else:
+                        write.future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_result(None)
+
+    async def _drain(self) -> None:
+        """Writer task: send queued writes until the queue is empty."""
+        try:
+            while self._pending:
+                write = self._pending.popleft()
+                if write.future.cancelled():
+                    # The caller gave up before the write started
+                    continue
+                batch = [write]
+                if write.text is not None:
+                    while self._pending and self._pending[0].text is not None:
+                        queued = self._pending.popleft()
+                        if not queued.future.cancelled():
+                            batch.append(queued)
+                await self._perform(batch)
+        finally:
+            # Only reached early if the writer itself was cancelled
+            while self._pending:
+                self._pending.popleft().future.cancel()
+
+    async def join(self) -> None:
+        """Wait until every write queued so far has been sent."""
+        if self._writer is not None and not self._writer.done():
+            await asyncio.wait([self._writer])
@@ -13,15 +13,17 @@ import sys
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import AsyncIterator, Dict, List, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple
 
 import iterm2
 from mcp.server.fastmcp import FastMCP, Context
 
 from core.layouts import LayoutManager, LayoutType
 from core.session import ItermSession
+from core.completion import wait_for_sessions_idle
 from core.terminal import ItermTerminal
-from core.agents import AgentRegistry, CascadingMessage, SendTarget
+from core.agents import Agent, AgentRegistry, CascadingMessage, SendTarget
+from core.delivery import DeliveryJob, DeliveryOutcome, deliver_fanout
 from utils.telemetry import TelemetryEmitter
 from utils.otel import (
     init_tracing,
@@ -54,7 +56,13 @@ from core.service_hooks import (
     ServiceHookManager,
     get_service_hook_manager,
 )
-from core.memory import SQLiteMemoryStore
+from core.memory import (
+    CachedMemoryStore,
+    RetentionPolicy,
+    get_memory_store,
+    validate_key,
+    validate_namespace,
+)
 from core.dashboard import start_dashboard
 from core.models import (
     SessionTarget,
@@ -90,6 +98,8 @@ from core.models import (
     GetNotificationsResponse,
     # Wait for agent models
     WaitForAgentRequest,
+    WaitForAgentsRequest,
+    WaitForAgentsResult,
     WaitResult,
     # Manager models
     CreateManagerRequest,
@@ -178,7 +188,7 @@ _manager_registry: Optional[ManagerRegistry] = None
 _event_bus: Optional[EventBus] = None
 _flow_manager: Optional[FlowManager] = None
 _role_manager: Optional[RoleManager] = None
-_memory_store: Optional[SQLiteMemoryStore] = None
+_memory_store: Optional[CachedMemoryStore] = None
 
 
 # ============================================================================
@@ -309,6 +319,7 @@ async def iterm_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     agent_registry = None
     event_bus = None
     flow_manager = None
+    memory_store = None
 
     try:
         # Initialize iTerm2 connection
@@ -397,6 +408,8 @@ async def iterm_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         event_bus = get_event_bus()
         flow_manager = get_flow_manager()
         await event_bus.start()
+        # Drop pattern-matching context for panes that close
+        terminal.add_eviction_callback(event_bus.forget_session)
         logger.info("Event bus and flow manager initialized successfully")
 
         # Initialize role manager
@@ -406,8 +419,9 @@ async def iterm_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
 
         # Initialize memory store
         logger.info("Initializing memory store...")
-        memory_store = SQLiteMemoryStore()
-        logger.info("Memory store initialized successfully (SQLite with FTS5)")
+        memory_store = get_memory_store("sqlite", cache=True)
+        memory_store.start_sweeper()
+        logger.info("Memory store initialized successfully (SQLite with FTS5, LRU read cache)")
 
         # Set global references for resources
         global _terminal, _logger, _agent_registry, _telemetry, _notification_manager
@@ -467,6 +481,12 @@ async def iterm_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         if event_bus:
             await event_bus.stop()
 
+        if terminal:
+            await terminal.shutdown()
+
+        if memory_store:
+            await memory_store.close()
+
         # Shutdown OpenTelemetry tracing
         shutdown_tracing()
         logger.info("OpenTelemetry tracing shutdown completed")
@@ -851,7 +871,8 @@ async def execute_write_request(
     active_agent = agent_registry.get_active_agent()
     requesting_agent = write_request.requesting_agent or (active_agent.name if active_agent else None)
 
-    async def send_to_session(session: ItermSession, message: SessionMessage) -> WriteResult:
+    async def check_message(session: ItermSession, message: SessionMessage) -> WriteResult:
+        """Run the lock, condition and duplicate checks for one write."""
         result = WriteResult(session_id=session.id, session_name=session.name)
 
         if lock_manager:
@@ -882,26 +903,52 @@ async def execute_write_request(
                 result.skipped_reason = "duplicate"
                 return result
 
-        try:
-            if message.execute:
-                await session.execute_command(message.content, use_encoding=message.use_encoding)
-            else:
-                await session.send_text(message.content, execute=False)
+        return result
 
+    def submit_message(session: ItermSession, message: SessionMessage) -> asyncio.Future:
+        """Queue one write on the session without waiting for it."""
+        if message.execute:
+            return session.submit_command(message.content, use_encoding=message.use_encoding)
+        return session.submit_text(message.content, execute=False)
+
+    async def finish_message(
+        session: ItermSession,
+        message: SessionMessage,
+        result: WriteResult,
+        sent: asyncio.Future,
+    ) -> WriteResult:
+        """Wait for a queued write and record it."""
+        try:
+            await sent
+            agent = agent_registry.get_agent_by_session(session.id)
             if agent:
                 agent_registry.record_message_sent(message.content, [agent.name])
             result.success = True
         except Exception as exc:
             result.error = str(exc)
-
         return result
 
-    tasks: List[Any] = []
+    async def send_to_session(session: ItermSession, message: SessionMessage) -> WriteResult:
+        result = await check_message(session, message)
+        if result.skipped:
+            return result
+        try:
+            sent = submit_message(session, message)
+        except Exception as exc:
+            result.error = str(exc)
+            return result
+        return await finish_message(session, message, result, sent)
+
+    # Writes to one pane are serialized by its write queue, so panes never
+    # wait on each other. Without parallel, each pane also finishes one
+    # message (including its condition and duplicate checks) before the next.
+    slots: List[Optional[WriteResult]] = []
+    per_session: Dict[str, List[Tuple[int, ItermSession, SessionMessage]]] = {}
 
     for message in write_request.messages:
         sessions = await resolve_target_sessions(terminal, agent_registry, message.targets)
         if not sessions:
-            results.append(
+            slots.append(
                 WriteResult(
                     session_id="",
                     session_name=None,
@@ -912,14 +959,38 @@ async def execute_write_request(
             continue
 
         for session in sessions:
-            if write_request.parallel:
-                tasks.append(send_to_session(session, message))
-            else:
-                results.append(await send_to_session(session, message))
-
-    if write_request.parallel and tasks:
-        for response in await asyncio.gather(*tasks):
-            results.append(response)
+            per_session.setdefault(session.id, []).append((len(slots), session, message))
+            slots.append(None)
+
+    async def send_in_order(queued: List[Tuple[int, ItermSession, SessionMessage]]) -> None:
+        for slot, session, message in queued:
+            slots[slot] = await send_to_session(session, message)
+
+    if write_request.parallel:
+        # Checks run concurrently, but every write is queued here in request
+        # order, so two messages to the same pane arrive in the order given
+        queued = sorted(
+            (item for items in per_session.values() for item in items),
+            key=lambda item: item[0],
+        )
+        checked = await asyncio.gather(*(
+            check_message(session, message) for _, session, message in queued
+        ))
+        pending = []
+        for (slot, session, message), result in zip(queued, checked):
+            slots[slot] = result
+            if result.skipped:
+                continue
+            try:
+                sent = submit_message(session, message)
+            except Exception as exc:
+                result.error = str(exc)
+                continue
+            pending.append(finish_message(session, message, result, sent))
+        await asyncio.gather(*pending)
+    else:
+        await asyncio.gather(*(send_in_order(queued) for queued in per_session.values()))
+    results.extend(slots)
 
     sent_count = sum(1 for r in results if r.success)
     skipped_count = sum(1 for r in results if r.skipped)
@@ -1008,6 +1079,70 @@ async def execute_read_request(
     return ReadSessionsResponse(outputs=outputs, total_sessions=len(outputs))
 
 
+def _cascade_message_type(cascade: CascadingMessage, agent: Agent, message: str) -> str:
+    """Classify which level of a cascade an agent's message came from."""
+    if cascade.agents.get(agent.name) == message:
+        return "agent"
+    if any(agent.is_member_of(team) and text == message for team, text in cascade.teams.items()):
+        return "team"
+    return "broadcast"
+
+
+async def _run_cascade(
+    terminal: ItermTerminal,
+    agent_registry: AgentRegistry,
+    cascade: CascadingMessage,
+    skip_duplicates: bool,
+    send: Callable[[DeliveryJob], Awaitable[None]],
+) -> Tuple[Dict[str, List[str]], List[Tuple[str, Optional[DeliveryOutcome]]]]:
+    """Resolve a cascade and deliver it concurrently across sessions.
+
+    Sessions are resolved once for the whole cascade, deliveries go through
+    deliver_fanout (concurrent across sessions, in order within a session),
+    and every successful delivery is recorded for deduplication in one batch.
+
+    Returns:
+        (targets, results): recipients per message after duplicate
+        filtering, and (agent name, outcome) per recipient in target order,
+        with outcome None when the agent's session no longer exists
+    """
+    message_targets = agent_registry.resolve_cascade_targets(cascade)
+    sessions = {session.id: session for session in await terminal.get_sessions()}
+
+    targets: Dict[str, List[str]] = {}
+    planned: List[Tuple[str, Optional[DeliveryJob]]] = []
+    for message, agent_names in message_targets.items():
+        if skip_duplicates:
+            agent_names = agent_registry.filter_unsent_recipients(message, agent_names)
+        targets[message] = agent_names
+
+        for agent_name in agent_names:
+            agent = agent_registry.get_agent(agent_name)
+            if not agent:
+                continue
+            session = sessions.get(agent.session_id)
+            job = None
+            if session is not None:
+                job = DeliveryJob(
+                    agent=agent_name,
+                    session=session,
+                    message=message,
+                    message_type=_cascade_message_type(cascade, agent, message),
+                )
+            planned.append((agent_name, job))
+
+    outcomes = iter(await deliver_fanout([job for _, job in planned if job], send))
+    results = [(agent_name, next(outcomes) if job else None) for agent_name, job in planned]
+
+    delivered: Dict[str, List[str]] = {}
+    for _, outcome in results:
+        if outcome is not None and outcome.delivered:
+            delivered.setdefault(outcome.job.message, []).append(outcome.job.agent)
+    agent_registry.record_messages_sent(delivered)
+
+    return targets, results
+
+
 @trace_operation("execute_cascade_request")
 async def execute_cascade_request(
     cascade_request: CascadeMessageRequest,
@@ -1031,62 +1166,51 @@ async def execute_cascade_request(
         agents=cascade_request.agents,
     )
 
-    message_targets = agent_registry.resolve_cascade_targets(cascade)
-    results: List[CascadeResult] = []
-    delivered = 0
-    skipped = 0
-
-    for message, agent_names in message_targets.items():
-        if cascade_request.skip_duplicates:
-            agent_names = agent_registry.filter_unsent_recipients(message, agent_names)
-
-        delivered_agents = []
-        for agent_name in agent_names:
-            agent = agent_registry.get_agent(agent_name)
-            if not agent:
-                continue
-
-            session = await terminal.get_session_by_id(agent.session_id)
-            if not session:
-                results.append(
-                    CascadeResult(
-                        agent=agent_name,
-                        session_id="",
-                        message_type="unknown",
-                        delivered=False,
-                        skipped_reason="session_not_found",
-                    )
-                )
-                skipped += 1
-                continue
-
-            message_type = "broadcast"
-            if cascade_request.agents.get(agent_name, None) == message:
-                message_type = "agent"
-            elif any(agent.is_member_of(team) and cascade_request.teams.get(team) == message for team in cascade_request.teams):
-                message_type = "team"
+    async def send(job: DeliveryJob) -> None:
+        if cascade_request.execute:
+            await job.session.execute_command(job.message)
+        else:
+            await job.session.send_text(job.message, execute=False)
 
-            if cascade_request.execute:
-                await session.execute_command(message)
-            else:
-                await session.send_text(message, execute=False)
+    start = time.monotonic()
+    _, outcomes = await _run_cascade(
+        terminal, agent_registry, cascade, cascade_request.skip_duplicates, send
+    )
+    elapsed_ms = (time.monotonic() - start) * 1000
 
+    results: List[CascadeResult] = []
+    for agent_name, outcome in outcomes:
+        if outcome is None:
             results.append(
                 CascadeResult(
                     agent=agent_name,
-                    session_id=session.id,
-                    message_type=message_type,
-                    delivered=True,
+                    session_id="",
+                    message_type="unknown",
+                    delivered=False,
+                    skipped_reason="session_not_found",
                 )
             )
-            delivered_agents.append(agent_name)
-            delivered += 1
-
-        if delivered_agents:
-            agent_registry.record_message_sent(message, delivered_agents)
+            continue
+        results.append(
+            CascadeResult(
+                agent=agent_name,
+                session_id=outcome.job.session.id,
+                message_type=outcome.job.message_type,
+                delivered=outcome.delivered,
+                skipped_reason=None if outcome.delivered else "send_failed",
+                latency_ms=round(outcome.latency_seconds * 1000, 1),
+            )
+        )
 
-    logger.info(f"Cascade: delivered={delivered}, skipped={skipped}")
-    return CascadeMessageResponse(results=results, delivered_count=delivered, skipped_count=skipped)
+    delivered = sum(1 for result in results if result.delivered)
+    skipped = len(results) - delivered
+    logger.info(f"Cascade: delivered={delivered}, skipped={skipped} in {elapsed_ms:.0f}ms")
+    return CascadeMessageResponse(
+        results=results,
+        delivered_count=delivered,
+        skipped_count=skipped,
+        elapsed_ms=round(elapsed_ms, 1),
+    )
 
 
 # ============================================================================
@@ -1385,6 +1509,47 @@ def _format_compact_session(session_info: SessionInfo) -> str:
     return f"{name}  {agent}  {lock_status}  {tags}"
 
 
+# Maximum number of sessions whose context list_sessions gathers at once
+LIST_SESSIONS_CONCURRENCY = 32
+
+
+async def _gather_session_context(
+    session: ItermSession,
+    want_message: bool,
+    semaphore: asyncio.Semaphore,
+    logger: logging.Logger,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Get a session's cwd and, optionally, its last message for listing.
+
+    Starts the session's context watcher so later listings are served from
+    values kept fresh by iTerm2 notifications instead of API calls.
+
+    Args:
+        session: The session to inspect
+        want_message: Whether to extract the last message from the screen
+        semaphore: Bounds how many sessions are queried concurrently
+        logger: Logger for per-session errors
+
+    Returns:
+        Tuple of (cwd, last_message); either may be None
+    """
+    session.watch_context()
+    session_cwd = None
+    last_message = None
+    async with semaphore:
+        try:
+            session_cwd = await session.get_cwd()
+        except Exception as e:
+            logger.debug(f"Error getting CWD for session {session.id}: {e}")
+
+        if want_message:
+            try:
+                last_message = await session.get_last_message(_extract_last_message, max_lines=15)
+            except Exception as e:
+                logger.debug(f"Error getting screen for session {session.id}: {e}")
+    return session_cwd, last_message
+
+
 @mcp.tool()
 async def list_sessions(
     ctx: Context,
@@ -1451,6 +1616,8 @@ async def list_sessions(
         logger.warning("Tag/lock filtering requested but tag_lock_manager is not available")
         return "Error: Tag and lock filtering requires the tag_lock_manager to be initialized"
 
+    # Stage 1: apply the cheap in-memory filters
+    selected = []
     for session in sessions:
         agent_obj = agent_registry.get_agent_by_session(session.id)
 
@@ -1495,27 +1662,29 @@ async def list_sessions(
             if lock_owner != locked_by:
                 continue
 
-        # Gather extended session context (for grouped format)
-        session_cwd = None
-        last_message = None
+        selected.append((session, agent_obj, session_tags, is_locked, lock_owner, lock_time, pending_requests))
+
+    # Stage 2: gather only the context the chosen format renders. Compact
+    # output shows none of it; grouped output skips the message when asked.
+    full_output = format not in ("grouped", "compact")
+    want_context = format != "compact"
+    want_message = full_output or (format == "grouped" and include_message)
+
+    contexts: List[Tuple[Optional[str], Optional[str]]] = [(None, None)] * len(selected)
+    if want_context:
+        semaphore = asyncio.Semaphore(LIST_SESSIONS_CONCURRENCY)
+        contexts = await asyncio.gather(*(
+            _gather_session_context(entry[0], want_message, semaphore, logger)
+            for entry in selected
+        ))
+
+    # Stage 3: build the SessionInfo records
+    for entry, (session_cwd, last_message) in zip(selected, contexts):
+        session, agent_obj, session_tags, is_locked, lock_owner, lock_time, pending_requests = entry
         last_activity_dt = None
         process_name = None
 
-        # Gather extended info for all formats (can be slow for many sessions)
-        if format in ("grouped", "compact", "full", "json"):
-            try:
-                # Get CWD from session
-                session_cwd = await session.get_cwd()
-            except Exception as e:
-                logger.debug(f"Error getting CWD for session {session.id}: {e}")
-
-            try:
-                # Get screen content for last message
-                screen_content = await session.get_screen_contents(max_lines=15)
-                last_message = _extract_last_message(screen_content)
-            except Exception as e:
-                logger.debug(f"Error getting screen for session {session.id}: {e}")
-
+        if want_context:
             # Convert last_update_time to datetime
             try:
                 last_update = getattr(session, "last_update_time", None)
@@ -2075,45 +2244,47 @@ async def _deliver_cascade(
     """Send a cascading message and return serialized results."""
 
     try:
-        message_targets = agent_registry.resolve_cascade_targets(cascade)
-
-        results = []
-        delivered = 0
-        skipped = 0
+        async def send(job: DeliveryJob) -> None:
+            await job.session.send_text(job.message, execute=execute)
 
-        for message, agent_names in message_targets.items():
-            if skip_duplicates:
-                agent_names = agent_registry.filter_unsent_recipients(message, agent_names)
-
-            actually_delivered = []
-
-            for agent_name in agent_names:
-                agent = agent_registry.get_agent(agent_name)
-                if not agent:
-                    continue
-
-                session = await terminal.get_session_by_id(agent.session_id)
-                if not session:
-                    results.append({
-                        "agent": agent_name,
-                        "delivered": False,
-                        "skipped_reason": "session_not_found"
-                    })
-                    skipped += 1
-                    continue
+        targets, outcomes = await _run_cascade(
+            terminal, agent_registry, cascade, skip_duplicates, send
+        )
 
-                await session.send_text(message, execute=execute)
-                agent_registry.record_message_sent(message, [agent_name])
-                delivered += 1
-                actually_delivered.append(agent_name)
+        delivered_by_message: Dict[str, List[str]] = {}
+        latency_ms: Dict[str, float] = {}
+        failures = []
+        for agent_name, outcome in outcomes:
+            if outcome is None:
+                failures.append({
+                    "agent": agent_name,
+                    "delivered": False,
+                    "skipped_reason": "session_not_found"
+                })
+                continue
+            if not outcome.delivered:
+                failures.append({
+                    "agent": agent_name,
+                    "delivered": False,
+                    "skipped_reason": "send_failed"
+                })
+                continue
+            delivered_by_message.setdefault(outcome.job.message, []).append(agent_name)
+            latency_ms[agent_name] = round(outcome.latency_seconds * 1000, 1)
 
+        results = list(failures)
+        delivered = 0
+        skipped = len(failures)
+        for message, agent_names in targets.items():
+            actually_delivered = delivered_by_message.get(message, [])
+            delivered += len(actually_delivered)
             if not actually_delivered:
                 skipped += len(agent_names)
-
             results.append({
                 "message": message,
                 "targets": agent_names,
-                "delivered": actually_delivered
+                "delivered": actually_delivered,
+                "latency_ms": {name: latency_ms[name] for name in actually_delivered}
             })
 
         logger.info(f"Delivered {delivered} cascading messages ({skipped} skipped)")
@@ -3122,6 +3293,7 @@ async def stop_monitoring_session(
         if hasattr(session, '_event_bus_callback') and session._event_bus_callback:
             session.remove_monitor_callback(session._event_bus_callback)
             session._event_bus_callback = None
+            ctx.request_context.lifespan_context["event_bus"].forget_session(session.id)
 
         await session.stop_monitoring()
         logger.info(f"Stopped monitoring for session: {session.name}")
@@ -3131,6 +3303,75 @@ async def stop_monitoring_session(
         return f"Error: {e}"
 
 
+@mcp.tool()
+async def get_session_history(
+    ctx: Context,
+    session_id: Optional[str] = None,
+    agent: Optional[str] = None,
+    name: Optional[str] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    max_lines: int = 500
+) -> str:
+    """Read a session's archived output by line range or time range.
+
+    Lines are numbered from 0 (the first line of output ever logged for the
+    session). Without a range the newest max_lines lines are returned.
+
+    Args:
+        session_id: Target session ID (optional)
+        agent: Target agent name (optional)
+        name: Target session name (optional)
+        start_line: First line number (inclusive)
+        end_line: Line number to stop before
+        since: Only output received at or after this ISO-8601 time
+        until: Only output received at or before this ISO-8601 time
+        max_lines: Maximum number of lines to return
+    """
+    terminal = ctx.request_context.lifespan_context["terminal"]
+    agent_registry = ctx.request_context.lifespan_context["agent_registry"]
+    logger = ctx.request_context.lifespan_context["logger"]
+
+    try:
+        log_manager = getattr(terminal, "log_manager", None)
+        if log_manager is None:
+            return json.dumps({"error": "Session logging is disabled"}, indent=2)
+
+        sessions = await resolve_session(terminal, agent_registry, session_id, name, agent)
+        if not sessions:
+            return "No matching session found"
+        session = sessions[0]
+
+        lines = await log_manager.read_session_history_async(
+            session.id,
+            start_line=start_line,
+            end_line=end_line,
+            start_time=datetime.fromisoformat(since).timestamp() if since else None,
+            end_time=datetime.fromisoformat(until).timestamp() if until else None,
+            max_lines=max_lines,
+        )
+        if lines is None:
+            return json.dumps({"error": f"No output logged for session {session.name}"}, indent=2)
+
+        return json.dumps({
+            "session_id": session.id,
+            "session_name": session.name,
+            "lines": [
+                {
+                    "line": line.seq,
+                    "timestamp": datetime.fromtimestamp(line.timestamp).isoformat(),
+                    "text": line.text,
+                }
+                for line in lines
+            ],
+        }, indent=2)
+    except Exception as e:
+        logger.error(f"Error reading session history: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
+
+
 # ============================================================================
 # RESOURCES
 # ============================================================================
@@ -3464,6 +3705,73 @@ async def notify(
 # WAIT FOR AGENT TOOLS
 # ============================================================================
 
+async def _build_wait_result(
+    agent_name: str,
+    session: ItermSession,
+    completed: bool,
+    timed_out: bool,
+    elapsed: float,
+    initial_output: str,
+    return_output: bool,
+    summary_on_timeout: bool,
+    notification_manager: Any,
+) -> WaitResult:
+    """Build the WaitResult for one agent and record a notification.
+
+    An agent that is not completed is reported as timed out only when the
+    deadline expired; otherwise it is still running because the wait ended
+    early, as when another agent finished first in "any" mode.
+    """
+    current_output = await session.get_screen_contents()
+
+    if completed:
+        await notification_manager.add_simple(
+            agent=agent_name,
+            level="success",
+            summary=f"Completed after {int(elapsed)}s",
+        )
+        return WaitResult(
+            agent=agent_name,
+            completed=True,
+            timed_out=False,
+            elapsed_seconds=elapsed,
+            status="idle",
+            output=current_output if return_output else None,
+            summary="Agent completed successfully",
+            can_continue_waiting=False,
+        )
+
+    summary = None
+    if summary_on_timeout:
+        # Generate a simple summary based on output changes
+        if current_output != initial_output:
+            lines = current_output.strip().split('\n')
+            last_lines = lines[-3:] if len(lines) > 3 else lines
+            summary = f"Still running. Last output: {' | '.join(last_lines)}"
+        else:
+            summary = "No output change detected during wait period"
+
+    await notification_manager.add_simple(
+        agent=agent_name,
+        level="info",
+        summary=(
+            f"Wait timed out after {int(elapsed)}s" if timed_out
+            else f"Still running after {int(elapsed)}s"
+        ),
+        context=summary,
+    )
+    return WaitResult(
+        agent=agent_name,
+        completed=False,
+        timed_out=timed_out,
+        elapsed_seconds=elapsed,
+        status="running",
+        output=current_output if return_output else None,
+        summary=summary,
+        can_continue_waiting=True,
+    )
+
+
 @mcp.tool()
 async def wait_for_agent(request: WaitForAgentRequest, ctx: Context) -> str:
     """Wait for an agent to complete or reach idle state.
@@ -3514,82 +3822,23 @@ async def wait_for_agent(request: WaitForAgentRequest, ctx: Context) -> str:
 
         logger.info(f"Waiting up to {req.wait_up_to}s for agent {req.agent}")
 
-        # Capture initial output for comparison
+        # Capture initial output for the timeout summary
         initial_output = await session.get_screen_contents()
 
-        # Poll for completion
+        # Wakes on screen/prompt notifications; no polling while the agent works
         start_time = time.time()
-        poll_interval = 0.5  # Check every 500ms
-        last_output = initial_output
-
-        while True:
-            elapsed = time.time() - start_time
-
-            # Check if timed out
-            if elapsed >= req.wait_up_to:
-                # Timed out - generate summary
-                current_output = await session.get_screen_contents()
-
-                summary = None
-                if req.summary_on_timeout:
-                    # Generate a simple summary based on output changes
-                    if current_output != initial_output:
-                        lines = current_output.strip().split('\n')
-                        last_lines = lines[-3:] if len(lines) > 3 else lines
-                        summary = f"Still running. Last output: {' | '.join(last_lines)}"
-                    else:
-                        summary = "No output change detected during wait period"
-
-                # Add notification
-                await notification_manager.add_simple(
-                    agent=req.agent,
-                    level="info",
-                    summary=f"Wait timed out after {int(elapsed)}s",
-                    context=summary,
-                )
-
-                result = WaitResult(
-                    agent=req.agent,
-                    completed=False,
-                    timed_out=True,
-                    elapsed_seconds=elapsed,
-                    status="running",
-                    output=current_output if req.return_output else None,
-                    summary=summary,
-                    can_continue_waiting=True,
-                )
-                logger.info(f"Wait for {req.agent} timed out after {elapsed:.1f}s")
-                return result.model_dump_json(indent=2)
-
-            # Check if processing has stopped (idle)
-            is_processing = getattr(session, 'is_processing', False)
-            if not is_processing:
-                # Check if output has stabilized
-                current_output = await session.get_screen_contents()
-                if current_output == last_output:
-                    # Agent appears idle
-                    await notification_manager.add_simple(
-                        agent=req.agent,
-                        level="success",
-                        summary=f"Completed after {int(elapsed)}s",
-                    )
+        completed = await session.wait_until_idle(req.wait_up_to)
+        elapsed = time.time() - start_time
 
-                    result = WaitResult(
-                        agent=req.agent,
-                        completed=True,
-                        timed_out=False,
-                        elapsed_seconds=elapsed,
-                        status="idle",
-                        output=current_output if req.return_output else None,
-                        summary="Agent completed successfully",
-                        can_continue_waiting=False,
-                    )
-                    logger.info(f"Agent {req.agent} completed after {elapsed:.1f}s")
-                    return result.model_dump_json(indent=2)
-
-                last_output = current_output
-
-            await asyncio.sleep(poll_interval)
+        result = await _build_wait_result(
+            req.agent, session, completed, not completed, elapsed, initial_output,
+            req.return_output, req.summary_on_timeout, notification_manager,
+        )
+        if completed:
+            logger.info(f"Agent {req.agent} completed after {elapsed:.1f}s")
+        else:
+            logger.info(f"Wait for {req.agent} timed out after {elapsed:.1f}s")
+        return result.model_dump_json(indent=2)
 
     except Exception as e:
         logger.error(f"Error waiting for agent: {e}")
@@ -3604,6 +3853,87 @@ async def wait_for_agent(request: WaitForAgentRequest, ctx: Context) -> str:
         ).model_dump_json(indent=2)
 
 
+@mcp.tool()
+async def wait_for_agents(request: WaitForAgentsRequest, ctx: Context) -> str:
+    """Wait for several agents at once.
+
+    In "all" mode this returns when every agent is idle; in "any" mode it
+    returns as soon as the first one is. Agents still busy at that point are
+    reported as running with their progress, and only an expired deadline
+    sets timed_out.
+
+    Args:
+        request: Agent names, wait mode, timeout and output options
+
+    Returns:
+        WaitForAgentsResult with one WaitResult per agent
+    """
+    terminal = ctx.request_context.lifespan_context["terminal"]
+    agent_registry = ctx.request_context.lifespan_context["agent_registry"]
+    notification_manager = ctx.request_context.lifespan_context["notification_manager"]
+    logger = ctx.request_context.lifespan_context["logger"]
+
+    try:
+        req = ensure_model(WaitForAgentsRequest, request)
+
+        results: Dict[str, WaitResult] = {}
+        sessions: Dict[str, ItermSession] = {}
+        for name in dict.fromkeys(req.agents):
+            agent = agent_registry.get_agent(name)
+            session = await terminal.get_session_by_id(agent.session_id) if agent else None
+            if session is None:
+                what = f"Agent '{name}'" if not agent else f"Session for agent '{name}'"
+                results[name] = WaitResult(
+                    agent=name,
+                    completed=False,
+                    timed_out=False,
+                    elapsed_seconds=0,
+                    status="unknown",
+                    summary=f"{what} not found",
+                    can_continue_waiting=False,
+                )
+            else:
+                sessions[name] = session
+
+        logger.info(
+            f"Waiting up to {req.wait_up_to}s for {req.mode} of {list(sessions)}"
+        )
+        initial_outputs = await asyncio.gather(
+            *(session.get_screen_contents() for session in sessions.values())
+        )
+
+        start_time = time.time()
+        idle = await wait_for_sessions_idle(
+            sessions.values(), req.wait_up_to, mode=req.mode
+        )
+        elapsed = time.time() - start_time
+
+        done = [idle[session.id] for session in sessions.values()]
+        completed = bool(done) and (all(done) if req.mode == "all" else any(done))
+        timed_out = bool(done) and not completed
+
+        built = await asyncio.gather(*(
+            _build_wait_result(
+                name, session, idle[session.id], timed_out, elapsed, initial_output,
+                req.return_output, req.summary_on_timeout, notification_manager,
+            )
+            for (name, session), initial_output in zip(sessions.items(), initial_outputs)
+        ))
+        results.update((result.agent, result) for result in built)
+
+        return WaitForAgentsResult(
+            mode=req.mode,
+            completed=completed,
+            timed_out=timed_out,
+            elapsed_seconds=elapsed,
+            results=[results[name] for name in dict.fromkeys(req.agents)],
+        ).model_dump_json(indent=2)
+
+    except Exception as e:
+        logger.error(f"Error waiting for agents: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
+
+
 # ============================================================================
 # FEEDBACK SYSTEM TOOLS
 # ============================================================================
@@ -4423,18 +4753,9 @@ async def _execute_task_on_worker(
         # Send the command
         await session.send_text(task + "\n")
 
-        # Wait for command to complete with proper timeout
-        # Use a polling approach to check for command completion
+        # Wait for the command to complete, woken by prompt/screen notifications
         wait_time = timeout_seconds if timeout_seconds else 30
-        poll_interval = 0.5
-        elapsed = 0.0
-
-        while elapsed < wait_time:
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-            # Check if session is no longer processing (command completed)
-            if hasattr(session, 'is_processing') and not session.is_processing:
-                break
+        await session.wait_until_idle(wait_time)
 
         # Read output
         output = await session.get_screen_contents(max_lines=100)
@@ -5358,62 +5679,27 @@ async def list_workflow_events(ctx: Context) -> str:
 # MEMORY STORE TOOLS
 # ============================================================================
 
-# Pattern for safe namespace and key characters
-# Allows alphanumeric, underscore, hyphen, and dot
-_SAFE_MEMORY_PATTERN = re.compile(r'^[a-zA-Z0-9_\-\.]+$')
-
-
-def _validate_namespace(namespace: List[str]) -> None:
-    """Validate namespace parts contain only safe characters.
-
-    Args:
-        namespace: List of namespace parts
-
-    Raises:
-        ValueError: If any part contains invalid characters
-    """
-    if not namespace:
-        return  # Empty namespace is valid (root)
-
-    for part in namespace:
-        if not part:
-            raise ValueError("Namespace parts cannot be empty strings")
-        if not _SAFE_MEMORY_PATTERN.match(part):
-            raise ValueError(
-                f"Invalid namespace part '{part}': only alphanumeric, underscore, hyphen, and dot allowed"
-            )
-
-
-def _validate_key(key: str) -> None:
-    """Validate key contains only safe characters.
-
-    Args:
-        key: The memory key
-
-    Raises:
-        ValueError: If key contains invalid characters
-    """
-    if not key:
-        raise ValueError("Key cannot be empty")
-    if not _SAFE_MEMORY_PATTERN.match(key):
-        raise ValueError(
-            f"Invalid key '{key}': only alphanumeric, underscore, hyphen, and dot allowed"
-        )
-
-
 @mcp.tool()
 async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
-    """Unified memory store operations - consolidates 8 memory tools into one.
+    """Unified memory store operations - consolidates the memory tools into one.
 
     Operations:
     - store: Save a value (requires namespace, key, value; optional metadata)
     - retrieve: Get a value (requires namespace, key)
-    - search: Full-text search (requires namespace, query; optional limit)
+    - search: Search memories (requires namespace, query; optional limit, and search_mode
+      text, vector or hybrid)
     - list_keys: List all keys in namespace (requires namespace)
     - list_namespaces: List namespaces (optional namespace as prefix filter)
     - delete: Delete a key (requires namespace, key)
     - clear: Clear namespace (requires namespace, confirm=True)
     - stats: Get store statistics (no params required)
+    - store_many: Save several values in one transaction (requires namespace, items)
+    - retrieve_many: Get several values (requires namespace, keys)
+    - delete_many: Delete several keys in one transaction (requires namespace, keys)
+    - export: Write a namespace and its children to JSONL (requires path; optional namespace)
+    - import: Load memories from a JSONL export (requires path)
+    - set_retention: Set a namespace's TTL, quotas and eviction order (requires namespace;
+      retention with ttl_seconds, max_entries, max_bytes, eviction; omit it to remove)
 
     Args:
         request: ManageMemoryRequest with operation and relevant parameters
@@ -5443,8 +5729,8 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
             if request.value is None:
                 raise ValueError("value is required for store operation")
 
-            _validate_namespace(request.namespace)
-            _validate_key(request.key)
+            validate_namespace(request.namespace)
+            validate_key(request.key)
             ns_tuple = tuple(request.namespace)
             await memory_store_instance.store(ns_tuple, request.key, request.value, request.metadata)
             logger.info(f"Stored memory: {'/'.join(request.namespace)}/{request.key}")
@@ -5467,8 +5753,8 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
             if not request.key:
                 raise ValueError("key is required for retrieve operation")
 
-            _validate_namespace(request.namespace)
-            _validate_key(request.key)
+            validate_namespace(request.namespace)
+            validate_key(request.key)
             ns_tuple = tuple(request.namespace)
             memory = await memory_store_instance.retrieve(ns_tuple, request.key)
 
@@ -5501,10 +5787,15 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
             if not request.query:
                 raise ValueError("query is required for search operation")
 
-            _validate_namespace(request.namespace)
+            validate_namespace(request.namespace)
             ns_tuple = tuple(request.namespace)
-            results = await memory_store_instance.search(ns_tuple, request.query, request.limit)
-            logger.info(f"Memory search '{request.query}' in {'/'.join(request.namespace)}: {len(results)} results")
+            results = await memory_store_instance.search(
+                ns_tuple, request.query, request.limit, request.search_mode
+            )
+            logger.info(
+                f"Memory {request.search_mode} search '{request.query}' in "
+                f"{'/'.join(request.namespace)}: {len(results)} results"
+            )
 
             return ManageMemoryResponse(
                 operation=op,
@@ -5512,6 +5803,7 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
                 data={
                     "query": request.query,
                     "namespace": request.namespace,
+                    "search_mode": request.search_mode,
                     "count": len(results),
                     "results": [
                         {
@@ -5533,7 +5825,7 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
             if not request.namespace:
                 raise ValueError("namespace is required for list_keys operation")
 
-            _validate_namespace(request.namespace)
+            validate_namespace(request.namespace)
             ns_tuple = tuple(request.namespace)
             keys = await memory_store_instance.list_keys(ns_tuple)
             logger.info(f"Listed {len(keys)} keys in namespace {'/'.join(request.namespace)}")
@@ -5547,7 +5839,7 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
         # LIST_NAMESPACES operation
         elif op == "list_namespaces":
             if request.namespace:
-                _validate_namespace(request.namespace)
+                validate_namespace(request.namespace)
             prefix_tuple = tuple(request.namespace) if request.namespace else None
             namespaces = await memory_store_instance.list_namespaces(prefix_tuple)
             logger.info(f"Listed {len(namespaces)} namespaces")
@@ -5569,8 +5861,8 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
             if not request.key:
                 raise ValueError("key is required for delete operation")
 
-            _validate_namespace(request.namespace)
-            _validate_key(request.key)
+            validate_namespace(request.namespace)
+            validate_key(request.key)
             ns_tuple = tuple(request.namespace)
             deleted = await memory_store_instance.delete(ns_tuple, request.key)
 
@@ -5595,7 +5887,7 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
             if not request.namespace:
                 raise ValueError("namespace is required for clear operation")
 
-            _validate_namespace(request.namespace)
+            validate_namespace(request.namespace)
 
             if not request.confirm:
                 return ManageMemoryResponse(
@@ -5615,6 +5907,137 @@ async def manage_memory(request: ManageMemoryRequest, ctx: Context) -> str:
                 data={"cleared": True, "namespace": request.namespace, "deleted_count": count}
             ).model_dump_json(indent=2)
 
+        # STORE_MANY operation
+        elif op == "store_many":
+            if not request.namespace:
+                raise ValueError("namespace is required for store_many operation")
+            if not request.items:
+                raise ValueError("items is required for store_many operation")
+
+            validate_namespace(request.namespace)
+            for item in request.items:
+                validate_key(item.get("key", ""))
+            ns_tuple = tuple(request.namespace)
+            count = await memory_store_instance.store_many(ns_tuple, request.items)
+            logger.info(f"Stored {count} memories in {'/'.join(request.namespace)}")
+
+            return ManageMemoryResponse(
+                operation=op,
+                success=True,
+                data={
+                    "status": "stored",
+                    "namespace": request.namespace,
+                    "count": count,
+                    "keys": [item["key"] for item in request.items]
+                }
+            ).model_dump_json(indent=2)
+
+        # RETRIEVE_MANY operation
+        elif op == "retrieve_many":
+            if not request.namespace:
+                raise ValueError("namespace is required for retrieve_many operation")
+            if not request.keys:
+                raise ValueError("keys is required for retrieve_many operation")
+
+            validate_namespace(request.namespace)
+            for key in request.keys:
+                validate_key(key)
+            ns_tuple = tuple(request.namespace)
+            found = await memory_store_instance.retrieve_many(ns_tuple, request.keys)
+            logger.info(
+                f"Retrieved {len(found)}/{len(request.keys)} memories from {'/'.join(request.namespace)}"
+            )
+
+            return ManageMemoryResponse(
+                operation=op,
+                success=True,
+                data={
+                    "namespace": request.namespace,
+                    "count": len(found),
+                    "memories": [
+                        {
+                            "key": memory.key,
+                            "value": memory.value,
+                            "timestamp": memory.timestamp.isoformat(),
+                            "metadata": memory.metadata,
+                        }
+                        for memory in found.values()
+                    ],
+                    "missing": [key for key in request.keys if key not in found]
+                }
+            ).model_dump_json(indent=2)
+
+        # DELETE_MANY operation
+        elif op == "delete_many":
+            if not request.namespace:
+                raise ValueError("namespace is required for delete_many operation")
+            if not request.keys:
+                raise ValueError("keys is required for delete_many operation")
+
+            validate_namespace(request.namespace)
+            for key in request.keys:
+                validate_key(key)
+            ns_tuple = tuple(request.namespace)
+            count = await memory_store_instance.delete_many(ns_tuple, request.keys)
+            logger.info(f"Deleted {count} memories from {'/'.join(request.namespace)}")
+
+            return ManageMemoryResponse(
+                operation=op,
+                success=True,
+                data={"namespace": request.namespace, "deleted_count": count}
+            ).model_dump_json(indent=2)
+
+        # EXPORT operation
+        elif op == "export":
+            if not request.path:
+                raise ValueError("path is required for export operation")
+
+            if request.namespace:
+                validate_namespace(request.namespace)
+            ns_tuple = tuple(request.namespace) if request.namespace else None
+            count = await memory_store_instance.export_jsonl(request.path, ns_tuple)
+            logger.info(f"Exported {count} memories to {request.path}")
+
+            return ManageMemoryResponse(
+                operation=op,
+                success=True,
+                data={"namespace": request.namespace, "path": request.path, "exported_count": count}
+            ).model_dump_json(indent=2)
+
+        # IMPORT operation
+        elif op == "import":
+            if not request.path:
+                raise ValueError("path is required for import operation")
+
+            count = await memory_store_instance.import_jsonl(request.path)
+            logger.info(f"Imported {count} memories from {request.path}")
+
+            return ManageMemoryResponse(
+                operation=op,
+                success=True,
+                data={"path": request.path, "imported_count": count}
+            ).model_dump_json(indent=2)
+
+        # SET_RETENTION operation
+        elif op == "set_retention":
+            if not request.namespace:
+                raise ValueError("namespace is required for set_retention operation")
+
+            validate_namespace(request.namespace)
+            ns_tuple = tuple(request.namespace)
+            policy = RetentionPolicy(**request.retention) if request.retention else None
+            await memory_store_instance.set_retention_policy(ns_tuple, policy)
+            logger.info(f"Set retention for {'/'.join(request.namespace)}: {policy}")
+
+            return ManageMemoryResponse(
+                operation=op,
+                success=True,
+                data={
+                    "namespace": request.namespace,
+                    "retention": policy.model_dump(exclude_none=True) if policy else None
+                }
+            ).model_dump_json(indent=2)
+
         # STATS operation
         elif op == "stats":
             stats = await memory_store_instance.get_stats()
@@ -131,7 +131,7 @@ class ItermController:
             
             # Display snapshot information for Command session
             if hasattr(self.terminal, "log_manager"):
-                snapshot = self.terminal.log_manager.get_snapshot(command_session.id)
+                snapshot = await self.terminal.log_manager.get_snapshot_async(command_session.id)
                 if snapshot:
                     self.logger.info(f"Command session snapshot sample: {snapshot[:100]}...")
                     
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark AgentRegistry lookups by session, team and role.
+
+Registers increasingly many agents spread over a fixed ratio of teams and
+times the hot-path lookups: get_agent_by_session (one per pane), list_agents
+by team and get_agents_by_role. A linear scan over all agents, as the
+registry did before it kept secondary indexes, is timed alongside for
+comparison. Indexed lookup cost should stay flat as the registry grows.
+
+Usage:
+    python scripts/bench_agent_registry.py [--lookups 10000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.agents import AgentRegistry  # noqa: E402
+from core.models import SessionRole  # noqa: E402
+
+# (agents, teams); 1,000 agents over 100 teams is the reference size
+SIZES = [(100, 10), (1_000, 100), (10_000, 1_000)]
+
+
+def build_registry(data_dir: str, agents: int, teams: int) -> AgentRegistry:
+    """Create a registry with agents spread round-robin over teams and roles."""
+    registry = AgentRegistry(data_dir=data_dir)
+    roles = list(SessionRole)
+    # Bypass per-call persistence so setup does not dominate the run
+    save_agents, registry._save_agents = registry._save_agents, lambda: None
+    for i in range(agents):
+        registry.register_agent(
+            name=f"agent-{i}",
+            session_id=f"session-{i}",
+            teams=[f"team-{i % teams}"],
+            role=roles[i % len(roles)],
+        )
+    registry._save_agents = save_agents
+    return registry
+
+
+def time_per_call(func, args) -> float:
+    """Microseconds per call of func over the given argument list."""
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def bench(agents: int, teams: int, lookups: int) -> dict:
+    """Time indexed and scanning lookups for one registry size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = build_registry(tmp, agents, teams)
+        everyone = registry.list_agents()
+        rng = random.Random(0)
+        sessions = [f"session-{rng.randrange(agents)}" for _ in range(lookups)]
+        team_names = [f"team-{rng.randrange(teams)}" for _ in range(lookups)]
+        roles = [rng.choice(list(SessionRole)) for _ in range(lookups // 10)]
+
+        def scan_session(session_id):
+            return next((a for a in everyone if a.session_id == session_id), None)
+
+        def scan_team(team):
+            return [a for a in everyone if team in a.teams]
+
+        return {
+            "agents": agents,
+            "teams": teams,
+            "session": time_per_call(registry.get_agent_by_session, sessions),
+            "session_scan": time_per_call(scan_session, sessions[:lookups // 10]),
+            "team": time_per_call(lambda t: registry.list_agents(team=t), team_names),
+            "team_scan": time_per_call(scan_team, team_names[:lookups // 10]),
+            "role": time_per_call(registry.get_agents_by_role, roles),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'agents':>8} {'teams':>6} {'session us':>11} {'(scan)':>9} "
+        f"{'team us':>9} {'(scan)':>9} {'role us':>9}"
+    )
+    for agents, teams in SIZES:
+        r = bench(agents, teams, args.lookups)
+        print(
+            f"{r['agents']:>8} {r['teams']:>6} {r['session']:>11.2f} "
+            f"{r['session_scan']:>9.1f} {r['team']:>9.2f} {r['team_scan']:>9.1f} "
+            f"{r['role']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
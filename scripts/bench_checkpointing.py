@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental checkpoint storage.
+
+Builds a workload that looks like auto-checkpointing a busy server: many
+sessions, each holding a screen of output, plus a registry of agents and
+teams. Every checkpoint changes the output of one session. For each
+checkpointer the script reports the mean save and load time and the
+bytes on disk. It compares the bytes against the size the same
+checkpoints take when each is stored as whole pretty-printed JSON, which
+is the format used before chunking.
+
+A second table shows what an auto-checkpoint costs the tool call that
+triggers it. create_checkpoint waits for the write, while
+schedule_checkpoint only snapshots the state. The table also shows the
+longest event-loop stall seen while the checkpoints were written.
+
+Usage:
+    python scripts/bench_checkpointing.py [--sessions 50] [--checkpoints 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.checkpointing import (  # noqa: E402
+    AgentState,
+    Checkpoint,
+    CheckpointManager,
+    FileCheckpointer,
+    RegistryState,
+    SessionState,
+    SQLiteCheckpointer,
+    TeamState,
+)
+
+SCREEN = "\n".join(f"$ make test  # line {i}: ok" for i in range(100))
+
+
+def make_state(sessions: int):
+    """Session states and a registry for the workload."""
+    states = {
+        f"session-{i}": SessionState(
+            session_id=f"session-{i}", persistent_id=f"persist-{i}", name=f"worker-{i}",
+            last_output=SCREEN,
+        )
+        for i in range(sessions)
+    }
+    registry = RegistryState(
+        agents={
+            f"agent-{i}": AgentState(name=f"agent-{i}", session_id=f"session-{i}", teams=["builders"])
+            for i in range(sessions)
+        },
+        teams={"builders": TeamState(name="builders", description="build agents")},
+    )
+    return states, registry
+
+
+def disk_usage(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+async def bench(name: str, checkpointer, root: Path, sessions: int, checkpoints: int) -> None:
+    states, registry = make_state(sessions)
+    whole_bytes = 0
+    saved = []
+    save_seconds = 0.0
+    for i in range(checkpoints):
+        sid = f"session-{i % sessions}"
+        states[sid] = states[sid].model_copy(update={"last_output": f"{SCREEN}\n$ step {i}"})
+        checkpoint = Checkpoint(sessions=dict(states), registry=registry, trigger="auto")
+        start = time.perf_counter()
+        await checkpointer.save(checkpoint)
+        save_seconds += time.perf_counter() - start
+        saved.append(checkpoint.checkpoint_id)
+        whole_bytes += len(json.dumps(checkpoint.model_dump(mode="json"), indent=2))
+    save_ms = save_seconds / checkpoints * 1000
+
+    start = time.perf_counter()
+    for checkpoint_id in saved[-20:]:
+        await checkpointer.load(checkpoint_id)
+    load_ms = (time.perf_counter() - start) / min(20, len(saved)) * 1000
+
+    used = disk_usage(root)
+    print(f"{name:>8} {save_ms:>9.2f} {load_ms:>9.2f} {used / 2**20:>10.1f} "
+          f"{whole_bytes / 2**20:>11.1f} {whole_bytes / used:>7.0f}x")
+
+
+async def watch_loop(stalls: list, stop: asyncio.Event) -> None:
+    """Record the longest gap between scheduled wakeups of the event loop."""
+    tick = 0.001
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(tick)
+        now = time.perf_counter()
+        stalls.append(now - last - tick)
+        last = now
+
+
+async def bench_manager(mode: str, sessions: int, checkpoints: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = CheckpointManager(checkpointer=FileCheckpointer(checkpoint_dir=tmp))
+        states, registry = make_state(sessions)
+        stalls: list = []
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(watch_loop(stalls, stop))
+        call = manager.create_checkpoint if mode == "create" else manager.schedule_checkpoint
+        in_call = []
+        for i in range(checkpoints):
+            sid = f"session-{i % sessions}"
+            states[sid] = states[sid].model_copy(update={"last_output": f"{SCREEN}\n$ step {i}"})
+            start = time.perf_counter()
+            await call(sessions=states, registry=registry, trigger="auto")
+            in_call.append(time.perf_counter() - start)
+            # The operations between auto-checkpoints
+            await asyncio.sleep(0.002)
+        await manager.close()
+        stop.set()
+        await watcher
+
+        stats = manager.get_write_stats()
+        in_call.sort()
+        print(f"{mode:>8} {in_call[len(in_call) // 2] * 1000:>11.2f} {in_call[-1] * 1000:>11.2f} "
+              f"{max(stalls) * 1000:>10.2f} {stats['written']:>8} {stats['coalesced']:>10}")
+
+
+async def main_async(sessions: int, checkpoints: int) -> None:
+    print(f"{'backend':>8} {'save ms':>9} {'load ms':>9} {'disk MiB':>10} {'whole MiB':>11} {'saving':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "file"
+        await bench("file", FileCheckpointer(checkpoint_dir=str(root)), root, sessions, checkpoints)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "sqlite"
+        os.makedirs(root)
+        checkpointer = SQLiteCheckpointer(db_path=str(root / "checkpoints.db"))
+        await bench("sqlite", checkpointer, root, sessions, checkpoints)
+
+    print(f"\n{'call':>8} {'p50 ms':>11} {'max ms':>11} {'stall ms':>10} {'written':>8} {'coalesced':>10}")
+    for mode in ("create", "schedule"):
+        await bench_manager(mode, sessions, checkpoints)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--checkpoints", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.sessions, args.checkpoints))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory store throughput under concurrent manage_memory calls.
+
+Seeds a SQLiteMemoryStore, then issues batches of concurrent manage_memory
+tool calls (the same entry point agents use) in three mixes: all reads
+(retrieve), all writes (store) and a 80/20 read/write mix with searches.
+Reports operations per second and the worst event-loop stall observed
+while the batch ran. The stall shows how long other MCP tools would have
+been blocked; queries run on executor threads, so it should stay near the
+scheduler tick rather than grow with the batch. With --cache the store is
+wrapped in CachedMemoryStore, as the server does, and hit rates are printed.
+
+Usage:
+    python scripts/bench_memory_store.py [--calls 2000] [--concurrency 64] [--cache]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.memory import CachedMemoryStore, SQLiteMemoryStore  # noqa: E402
+from core.models import ManageMemoryRequest  # noqa: E402
+from iterm_mcpy.fastmcp_server import manage_memory  # noqa: E402
+
+NAMESPACES = [["bench", f"team-{i}"] for i in range(8)]
+SEED_KEYS = 1_000
+
+
+def make_context(store) -> SimpleNamespace:
+    """Minimal stand-in for the MCP Context that manage_memory reads."""
+    logger = logging.getLogger("bench-memory")
+    logger.setLevel(logging.WARNING)
+    lifespan = {"memory_store": store, "logger": logger}
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context=lifespan))
+
+
+def make_request(kind: str, rng: random.Random) -> ManageMemoryRequest:
+    """Build one manage_memory request of the given kind."""
+    namespace = rng.choice(NAMESPACES)
+    key = f"fact-{rng.randrange(SEED_KEYS)}"
+    if kind == "store":
+        return ManageMemoryRequest(
+            operation="store", namespace=namespace, key=key,
+            value={"note": f"observation {rng.random()}", "tags": ["bench"]},
+        )
+    if kind == "search":
+        return ManageMemoryRequest(
+            operation="search", namespace=namespace[:1], query="observation", limit=10,
+        )
+    return ManageMemoryRequest(operation="retrieve", namespace=namespace, key=key)
+
+
+async def watch_loop(stalls: list, stop: asyncio.Event) -> None:
+    """Record the longest gap between scheduled wakeups of the event loop."""
+    tick = 0.001
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(tick)
+        now = time.perf_counter()
+        stalls.append(now - last - tick)
+        last = now
+
+
+async def run_mix(ctx, kinds, calls: int, concurrency: int, rng: random.Random) -> dict:
+    """Run calls manage_memory requests with at most concurrency in flight."""
+    requests = [make_request(rng.choice(kinds), rng) for _ in range(calls)]
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def call(request):
+        nonlocal failures
+        async with semaphore:
+            response = json.loads(await manage_memory(request, ctx))
+            if not response["success"]:
+                failures += 1
+
+    stalls: list = []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop(stalls, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(call(r) for r in requests))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await watcher
+    return {
+        "ops": calls / elapsed,
+        "max_stall_ms": max(stalls, default=0.0) * 1000,
+        "failures": failures,
+    }
+
+
+async def bench(calls: int, concurrency: int, cache: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteMemoryStore(db_path=str(Path(tmp) / "bench.db"))
+        if cache:
+            store = CachedMemoryStore(store)
+        for namespace in NAMESPACES:
+            for i in range(SEED_KEYS):
+                await store.store(tuple(namespace), f"fact-{i}", {"note": f"observation {i}"})
+
+        ctx = make_context(store)
+        rng = random.Random(0)
+        mixes = [
+            ("read", ["retrieve"]),
+            ("write", ["store"]),
+            ("mixed", ["retrieve"] * 7 + ["search"] + ["store"] * 2),
+        ]
+        print(f"{'mix':>6} {'ops/s':>9} {'max stall ms':>13} {'failures':>9}")
+        for name, kinds in mixes:
+            r = await run_mix(ctx, kinds, calls, concurrency, rng)
+            print(f"{name:>6} {r['ops']:>9.0f} {r['max_stall_ms']:>13.1f} {r['failures']:>9}")
+        if cache:
+            stats = store.get_cache_stats()
+            print(f"cache: retrieve hit rate {stats['retrieve_hit_rate']:.2f}, "
+                  f"search hit rate {stats['search_hit_rate']:.2f}, "
+                  f"{stats['entries']} entries, {stats['bytes']} bytes")
+        await store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--cache", action="store_true", help="wrap the store in CachedMemoryStore")
+    args = parser.parse_args()
+    asyncio.run(bench(args.calls, args.concurrency, args.cache))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-refresh cost of the persistent-session registry.
+
+Simulates a terminal refresh over a fixed set of live panes (reverse lookup
+plus re-registration of every pane) against registries holding increasingly
+large histories of old sessions. Per-refresh cost should stay flat as the
+history grows, and no file writes should happen for unchanged panes.
+
+Usage:
+    python scripts/bench_persistent_sessions.py [--panes 50] [--refreshes 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.logging import PersistentSessionStore  # noqa: E402
+
+HISTORY_SIZES = [100, 1_000, 10_000, 100_000]
+
+
+def write_history(path: str, size: int) -> None:
+    """Write a registry file with `size` stale sessions."""
+    history = {
+        str(uuid.uuid4()): {
+            "session_id": f"old-{i}",
+            "name": f"old-{i}",
+            "last_seen": "2020-01-01T00:00:00",
+        }
+        for i in range(size)
+    }
+    with open(path, "w") as f:
+        json.dump(history, f)
+
+
+async def bench(history_size: int, panes: int, refreshes: int) -> dict:
+    """Time refreshes against a registry with the given history size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "persistent_sessions.json")
+        write_history(path, history_size)
+        store = PersistentSessionStore(path)
+
+        live = [(f"live-{i}", f"p-live-{i}", f"pane-{i}") for i in range(panes)]
+        for session_id, persistent_id, name in live:
+            store.register(session_id, persistent_id, name)
+        store.flush()
+        writes_before = store.write_count
+
+        start = time.perf_counter()
+        for _ in range(refreshes):
+            for session_id, persistent_id, name in live:
+                found = store.find_persistent_id(session_id) or persistent_id
+                store.register(session_id, found, name)
+        elapsed = time.perf_counter() - start
+
+        return {
+            "history": history_size,
+            "us_per_refresh": elapsed / refreshes * 1e6,
+            "writes": store.write_count - writes_before,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--panes", type=int, default=50)
+    parser.add_argument("--refreshes", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'history':>10} {'us/refresh':>12} {'writes':>8}")
+    for size in HISTORY_SIZES:
+        result = asyncio.run(bench(size, args.panes, args.refreshes))
+        print(
+            f"{result['history']:>10} {result['us_per_refresh']:>12.1f} "
+            f"{result['writes']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory vector search at 100k memories.
+
+Generates synthetic agent notes and measures:
+
+- index: building a MemoryVectorIndex directly, its matrix size, and
+  top-10 query latency with argpartition against a full argsort of the
+  same scores (the cost argpartition avoids)
+- store: a SQLiteMemoryStore holding the same notes, the lazy index build
+  on the first vector search, and per-query latency of text, vector and
+  hybrid search modes
+
+Usage:
+    python scripts/bench_vector_search.py [--memories 100000] [--queries 200]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+
+from core.memory import SQLiteMemoryStore  # noqa: E402
+from core.memory_index import MemoryVectorIndex  # noqa: E402
+
+SUBJECTS = ["deployment", "build", "migration", "test suite", "cache", "pager alert", "rollout", "agent"]
+EVENTS = ["failed", "timed out", "succeeded", "was retried", "was rolled back", "needs review"]
+DETAILS = [
+    "on the staging cluster", "after the dependency bump", "during the nightly run",
+    "because the database was locked", "when the disk filled up", "behind the feature flag",
+]
+QUERIES = [
+    "deploy failures on staging", "database lock timeouts", "rolled back rollouts",
+    "nightly test flakiness", "disk full alerts", "retried migrations",
+]
+NAMESPACES = [("bench", f"team-{i}") for i in range(16)]
+
+
+def make_notes(count: int, rng: random.Random):
+    """Yield (namespace, key, text) synthetic notes."""
+    for i in range(count):
+        text = f"The {rng.choice(SUBJECTS)} {rng.choice(EVENTS)} {rng.choice(DETAILS)} (ticket {rng.randrange(10_000)})"
+        yield NAMESPACES[i % len(NAMESPACES)], f"note-{i}", text
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return statistics.median(ordered) * 1000, ordered[int(len(ordered) * 0.95) - 1] * 1000
+
+
+def bench_index(notes, queries: int, rng: random.Random) -> None:
+    index = MemoryVectorIndex()
+    start = time.perf_counter()
+    index.upsert_many(("/".join(ns), key, text) for ns, key, text in notes)
+    build = time.perf_counter() - start
+    print(f"index build: {len(index)} memories in {build:.1f}s, matrix {index.nbytes / 2**20:.0f} MiB")
+
+    partition, full_sort = [], []
+    matrix = index._matrix[:len(index)]
+    for _ in range(queries):
+        query = rng.choice(QUERIES)
+        start = time.perf_counter()
+        index.search(query, limit=10)
+        partition.append(time.perf_counter() - start)
+
+        query_vector = index.vectorizer.vector(query)
+        start = time.perf_counter()
+        scores = matrix @ query_vector
+        np.argsort(-scores)[:10]
+        full_sort.append(time.perf_counter() - start)
+
+    print("{:>22} {:>9} {:>9}".format("", "p50 ms", "p95 ms"))
+    print("{:>22} {:>9.2f} {:>9.2f}".format("top-10 argpartition", *percentiles(partition)))
+    print("{:>22} {:>9.2f} {:>9.2f}".format("matvec + full argsort", *percentiles(full_sort)))
+
+
+async def bench_store(notes, queries: int, rng: random.Random) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteMemoryStore(db_path=str(Path(tmp) / "bench.db"))
+        start = time.perf_counter()
+        by_namespace = {}
+        for ns, key, text in notes:
+            by_namespace.setdefault(ns, []).append({"key": key, "value": text})
+        for ns, items in by_namespace.items():
+            await store.store_many(ns, items)
+        print(f"\nstore load: {len(notes)} memories in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        await store.search(("bench",), "warm up", mode="vector")
+        print(f"lazy index build on first vector search: {time.perf_counter() - start:.1f}s")
+
+        print("{:>22} {:>9} {:>9} {:>9}".format("mode", "p50 ms", "p95 ms", "hits"))
+        for mode in ("text", "vector", "hybrid"):
+            samples, hits = [], 0
+            for _ in range(queries):
+                query = rng.choice(QUERIES)
+                start = time.perf_counter()
+                results = await store.search(("bench",), query, limit=10, mode=mode)
+                samples.append(time.perf_counter() - start)
+                hits += bool(results)
+            print("{:>22} {:>9.2f} {:>9.2f} {:>8.0%}".format(mode, *percentiles(samples), hits / queries))
+        await store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--memories", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    notes = list(make_notes(args.memories, rng))
+    bench_index(notes, args.queries, rng)
+    asyncio.run(bench_store(notes, args.queries, rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -148,6 +148,7 @@ class TestAdvancedFeatures(unittest.TestCase):
             self.assertTrue(output_found, f"Expected to find '{unique_marker}' in captured output")
             
             # Verify snapshot file exists and contains our test string
+            self.terminal.log_manager.flush()
             self.assertTrue(os.path.exists(self.test_session.logger.snapshot_file),
                           "Snapshot file should exist")
             
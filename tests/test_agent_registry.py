@@ -10,7 +10,9 @@ from core.agents import (
     Team,
     AgentRegistry,
     CascadingMessage,
+    MESSAGE_COMPACTION_FACTOR,
 )
+from core.models import SessionRole
 
 
 class TestAgentModel(unittest.TestCase):
@@ -481,5 +483,160 @@ class TestPersistence(unittest.TestCase):
         self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "messages.jsonl")))
 
 
+class TestMessageHistoryFile(unittest.TestCase):
+    """Test the dedup index and compaction of messages.jsonl."""
+
+    def setUp(self):
+        """Create temporary directory for registry data."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.messages_file = os.path.join(self.temp_dir, "messages.jsonl")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def count_records(self):
+        with open(self.messages_file) as f:
+            return sum(1 for line in f if line.strip())
+
+    def test_evicted_duplicate_keeps_later_record(self):
+        """Test that evicting one record keeps a later record of the same send."""
+        registry = AgentRegistry(data_dir=self.temp_dir, max_message_history=2)
+        registry.record_message_sent("hello", ["agent-1", "agent-2"])
+        registry.record_message_sent("hello", ["agent-1"])
+        registry.record_message_sent("other", ["agent-1"])
+
+        self.assertTrue(registry.was_message_sent("hello", "agent-1"))
+        self.assertFalse(registry.was_message_sent("hello", "agent-2"))
+        self.assertEqual(
+            registry.filter_unsent_recipients("hello", ["agent-1", "agent-2"]),
+            ["agent-2"]
+        )
+
+    def test_reload_reads_retained_tail(self):
+        """Test that a restart keeps only the newest records of a long file."""
+        registry = AgentRegistry(data_dir=self.temp_dir, max_message_history=5)
+        registry._maybe_compact_messages = lambda: None
+        for i in range(50):
+            registry.record_message_sent(f"msg-{i}", ["agent-1"])
+        self.assertEqual(self.count_records(), 50)
+
+        reloaded = AgentRegistry(data_dir=self.temp_dir, max_message_history=5)
+        reloaded.wait_for_compaction(timeout=5)
+
+        self.assertEqual(len(reloaded._message_history), 5)
+        self.assertTrue(reloaded.was_message_sent("msg-49", "agent-1"))
+        self.assertTrue(reloaded.was_message_sent("msg-45", "agent-1"))
+        self.assertFalse(reloaded.was_message_sent("msg-44", "agent-1"))
+        # The long file was compacted in the background on load
+        self.assertEqual(self.count_records(), 5)
+
+    def test_file_is_compacted_as_it_grows(self):
+        """Test that messages.jsonl stays bounded over many sends."""
+        registry = AgentRegistry(data_dir=self.temp_dir, max_message_history=10)
+        for i in range(200):
+            registry.record_message_sent(f"msg-{i}", ["agent-1"])
+            registry.wait_for_compaction(timeout=5)
+
+        self.assertLess(self.count_records(), 10 * MESSAGE_COMPACTION_FACTOR)
+        reloaded = AgentRegistry(data_dir=self.temp_dir, max_message_history=10)
+        self.assertTrue(reloaded.was_message_sent("msg-199", "agent-1"))
+        self.assertFalse(reloaded.was_message_sent("msg-189", "agent-1"))
+
+    def test_load_state_restores_index(self):
+        registry = AgentRegistry(data_dir=self.temp_dir)
+        registry.record_message_sent("hello", ["agent-1"])
+        state = registry.save_state()
+
+        registry.record_message_sent("later", ["agent-1"])
+        registry.load_state(state)
+        self.assertTrue(registry.was_message_sent("hello", "agent-1"))
+        self.assertFalse(registry.was_message_sent("later", "agent-1"))
+
+
+class TestSecondaryIndexes(unittest.TestCase):
+    """Test that session, team and role indexes track every mutation."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry = AgentRegistry(data_dir=self.temp_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def assert_indexes_match_scan(self, registry=None):
+        """Compare indexed lookups with a full scan of the agents."""
+        registry = registry or self.registry
+        agents = registry.list_agents()
+        teams = {team for agent in agents for team in agent.teams}
+        for team in teams | {"nobody"}:
+            self.assertEqual(
+                sorted(a.name for a in registry.list_agents(team=team)),
+                sorted(a.name for a in agents if team in a.teams),
+            )
+        for role in SessionRole:
+            self.assertEqual(
+                sorted(a.name for a in registry.get_agents_by_role(role)),
+                sorted(a.name for a in agents if a.role == role),
+            )
+        for agent in agents:
+            found = registry.get_agent_by_session(agent.session_id)
+            self.assertEqual(found.session_id, agent.session_id)
+
+    def test_mutations_keep_indexes_consistent(self):
+        self.registry.register_agent("a1", "s1", teams=["x", "y"], role=SessionRole.BUILDER)
+        self.registry.register_agent("a2", "s2", teams=["x"])
+        self.registry.assign_to_team("a2", "z")
+        self.registry.remove_from_team("a1", "y")
+        self.registry.set_agent_role("a2", SessionRole.TESTER)
+        self.registry.set_agent_role("a1", None)
+        self.assert_indexes_match_scan()
+
+        # Re-registering moves the agent to a new session and teams
+        self.registry.register_agent("a1", "s9", teams=["z"])
+        self.assertIsNone(self.registry.get_agent_by_session("s1"))
+        self.assertEqual(self.registry.get_agent_by_session("s9").name, "a1")
+        self.assert_indexes_match_scan()
+
+        self.registry.remove_agent("a2")
+        self.assertIsNone(self.registry.get_agent_by_session("s2"))
+        self.assertEqual([a.name for a in self.registry.list_agents(team="z")], ["a1"])
+        self.assert_indexes_match_scan()
+
+    def test_remove_team_updates_members_and_children(self):
+        self.registry.create_team("parent")
+        self.registry.create_team("child", parent_team="parent")
+        self.registry.register_agent("a1", "s1", teams=["child", "other"])
+        self.assertEqual([t.name for t in self.registry.get_child_teams("parent")], ["child"])
+
+        self.registry.remove_team("child")
+        self.assertEqual(self.registry.get_child_teams("parent"), [])
+        self.assertEqual(self.registry.get_agent("a1").teams, ["other"])
+        self.assertEqual(self.registry.list_agents(team="child"), [])
+
+    def test_indexes_rebuilt_on_load(self):
+        self.registry.register_agent("a1", "s1", teams=["x"])
+        self.registry.create_team("x")
+        self.registry.create_team("x-sub", parent_team="x")
+
+        reloaded = AgentRegistry(data_dir=self.temp_dir)
+        self.assertEqual(reloaded.get_agent_by_session("s1").name, "a1")
+        self.assertEqual([t.name for t in reloaded.get_child_teams("x")], ["x-sub"])
+        self.assert_indexes_match_scan(reloaded)
+
+        state = self.registry.save_state()
+        self.registry.register_agent("a2", "s2", teams=["y"])
+        self.registry.load_state(state)
+        self.assertIsNone(self.registry.get_agent_by_session("s2"))
+        self.assert_indexes_match_scan()
+
+    def test_failed_load_state_restores_indexes(self):
+        self.registry.register_agent("a1", "s1", teams=["x"])
+        with self.assertRaises(KeyError):
+            self.registry.load_state({"agents": {"bad": {"name": "bad"}}})
+        self.assertEqual(self.registry.get_agent_by_session("s1").name, "a1")
+        self.assertEqual(len(self.registry.list_agents(team="x")), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
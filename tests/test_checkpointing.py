@@ -3,15 +3,20 @@
 Tests cover:
 - FileCheckpointer save/load/list/delete operations
 - SQLiteCheckpointer save/load/list/delete operations
+- Incremental, content-addressed checkpoint storage
 - CheckpointManager functionality
+- Background checkpoint writes (CheckpointWriter)
 - AgentRegistry save_state/load_state methods
 - Session state serialization patterns
 """
 
 import asyncio
+import json
 import os
 import shutil
+import sqlite3
 import tempfile
+import threading
 import unittest
 from datetime import datetime, timezone
 
@@ -20,6 +25,7 @@ from core.checkpointing import (
     Checkpoint,
     CheckpointManager,
     Checkpointer,
+    CheckpointWriter,
     FileCheckpointer,
     RegistryState,
     SessionState,
@@ -484,6 +490,272 @@ class TestSQLiteCheckpointer(unittest.TestCase):
         asyncio.run(run_test())
 
 
+def make_sessions(count, output="ready"):
+    """Session states for incremental checkpoint tests."""
+    return {
+        f"session-{i}": SessionState(
+            session_id=f"session-{i}",
+            persistent_id=f"persist-{i}",
+            name=f"worker-{i}",
+            last_output=output,
+        )
+        for i in range(count)
+    }
+
+
+def make_registry():
+    """Registry state with agents and teams."""
+    return RegistryState(
+        agents={"agent-1": AgentState(name="agent-1", session_id="session-0", teams=["team-1"])},
+        teams={"team-1": TeamState(name="team-1", description="builders")},
+        active_session="session-0",
+    )
+
+
+class IncrementalCheckpointMixin:
+    """Chunked storage shared by both checkpointers.
+
+    Subclasses provide make_checkpointer() and chunk_count().
+    """
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpointer = self.make_checkpointer()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_roundtrip_preserves_checkpoint(self):
+        """Test that a restored checkpoint equals the saved one."""
+        checkpoint = Checkpoint(
+            sessions=make_sessions(3),
+            registry=make_registry(),
+            trigger="test",
+            metadata={"reason": "roundtrip"},
+        )
+
+        async def run_test():
+            await self.checkpointer.save(checkpoint)
+            loaded = await self.checkpointer.load(checkpoint.checkpoint_id)
+            self.assertEqual(loaded.model_dump(), checkpoint.model_dump())
+
+            empty = Checkpoint()
+            await self.checkpointer.save(empty)
+            loaded = await self.checkpointer.load(empty.checkpoint_id)
+            self.assertEqual(loaded.model_dump(), empty.model_dump())
+
+        asyncio.run(run_test())
+
+    def test_unchanged_parts_are_stored_once(self):
+        """Test that only changed sessions add chunks."""
+        async def run_test():
+            sessions = make_sessions(4)
+            registry = make_registry()
+            await self.checkpointer.save(Checkpoint(sessions=sessions, registry=registry))
+            # 4 sessions plus agents, teams and the rest of the registry
+            self.assertEqual(self.chunk_count(), 7)
+
+            await self.checkpointer.save(Checkpoint(sessions=sessions, registry=registry))
+            self.assertEqual(self.chunk_count(), 7)
+
+            sessions["session-2"] = sessions["session-2"].model_copy(update={"last_output": "done"})
+            latest = Checkpoint(sessions=sessions, registry=registry)
+            await self.checkpointer.save(latest)
+            self.assertEqual(self.chunk_count(), 8)
+
+            loaded = await self.checkpointer.load(latest.checkpoint_id)
+            self.assertEqual(loaded.sessions["session-2"].last_output, "done")
+
+        asyncio.run(run_test())
+
+    def test_delete_keeps_shared_chunks(self):
+        """Test that chunks are removed only when no checkpoint uses them."""
+        async def run_test():
+            sessions = make_sessions(2)
+            registry = make_registry()
+            first = Checkpoint(sessions=sessions, registry=registry)
+            sessions["session-1"] = sessions["session-1"].model_copy(update={"last_output": "done"})
+            second = Checkpoint(sessions=sessions, registry=registry)
+            await self.checkpointer.save(first)
+            await self.checkpointer.save(second)
+            self.assertEqual(self.chunk_count(), 6)
+
+            self.assertTrue(await self.checkpointer.delete(first.checkpoint_id))
+            self.assertEqual(self.chunk_count(), 5)
+            loaded = await self.checkpointer.load(second.checkpoint_id)
+            self.assertEqual(loaded.model_dump(), second.model_dump())
+
+            self.assertTrue(await self.checkpointer.delete(second.checkpoint_id))
+            self.assertEqual(self.chunk_count(), 0)
+
+        asyncio.run(run_test())
+
+    def test_cleanup_collects_unreferenced_chunks(self):
+        """Test that cleanup leaves only chunks of kept checkpoints."""
+        async def run_test():
+            registry = make_registry()
+            for i in range(6):
+                await self.checkpointer.save(Checkpoint(
+                    sessions=make_sessions(2, output=f"step {i}"),
+                    registry=registry,
+                    trigger=f"test-{i}",
+                ))
+            deleted = await self.checkpointer.cleanup_old_checkpoints(max_age_days=365, max_count=2)
+            self.assertEqual(deleted, 4)
+            # Each kept checkpoint has two sessions of its own plus the shared registry
+            self.assertEqual(self.chunk_count(), 2 * 2 + 3)
+
+            for cp in await self.checkpointer.list_checkpoints(limit=10):
+                self.assertIsNotNone(await self.checkpointer.load(cp["checkpoint_id"]))
+
+        asyncio.run(run_test())
+
+    def test_resave_same_id_replaces_chunks(self):
+        """Test that saving under an existing ID releases the old chunks."""
+        async def run_test():
+            checkpoint = Checkpoint(sessions=make_sessions(1, output="old"))
+            await self.checkpointer.save(checkpoint)
+            checkpoint.sessions = make_sessions(1, output="new")
+            await self.checkpointer.save(checkpoint)
+            self.assertEqual(self.chunk_count(), 1)
+
+            loaded = await self.checkpointer.load(checkpoint.checkpoint_id)
+            self.assertEqual(loaded.sessions["session-0"].last_output, "new")
+
+        asyncio.run(run_test())
+
+
+class TestFileCheckpointerIncremental(IncrementalCheckpointMixin, unittest.TestCase):
+    """Chunked storage in FileCheckpointer."""
+
+    def make_checkpointer(self):
+        return FileCheckpointer(checkpoint_dir=self.temp_dir)
+
+    def chunk_count(self):
+        return len(list(self.checkpointer.chunk_dir.glob("*/*")))
+
+    def test_reference_counts_survive_restart(self):
+        """Test that a new instance rebuilds reference counts from the index."""
+        async def run_test():
+            sessions = make_sessions(2)
+            first = Checkpoint(sessions=sessions)
+            second = Checkpoint(sessions=sessions)
+            await self.checkpointer.save(first)
+            await self.checkpointer.save(second)
+
+            checkpointer = FileCheckpointer(checkpoint_dir=self.temp_dir)
+            await checkpointer.delete(first.checkpoint_id)
+            self.assertEqual(self.chunk_count(), 2)
+            self.assertIsNotNone(await checkpointer.load(second.checkpoint_id))
+
+        asyncio.run(run_test())
+
+    def test_loads_legacy_full_checkpoint(self):
+        """Test that checkpoints written whole by older versions still load."""
+        checkpoint = Checkpoint(sessions=make_sessions(1), registry=make_registry())
+
+        async def run_test():
+            with open(os.path.join(self.temp_dir, f"{checkpoint.checkpoint_id}.json"), "w") as f:
+                json.dump(checkpoint.model_dump(mode="json"), f, indent=2)
+            loaded = await self.checkpointer.load(checkpoint.checkpoint_id)
+            self.assertEqual(loaded.model_dump(), checkpoint.model_dump())
+
+        asyncio.run(run_test())
+
+    def test_corrupt_chunk_fails_load(self):
+        """Test that a chunk not matching its hash is not restored."""
+        checkpoint = Checkpoint(sessions=make_sessions(1))
+
+        async def run_test():
+            await self.checkpointer.save(checkpoint)
+            chunk_path = next(self.checkpointer.chunk_dir.glob("*/*"))
+            with open(chunk_path, "r+b") as f:
+                f.seek(8)
+                f.write(b"\x00\x00")
+            self.assertIsNone(await self.checkpointer.load(checkpoint.checkpoint_id))
+
+        asyncio.run(run_test())
+
+    def test_collect_garbage_removes_orphans(self):
+        """Test that chunks from interrupted saves are removed."""
+        async def run_test():
+            await self.checkpointer.save(Checkpoint(sessions=make_sessions(1)))
+            orphan = self.checkpointer.chunk_dir / "ab" / ("ab" + "0" * 62)
+            orphan.parent.mkdir(parents=True, exist_ok=True)
+            orphan.write_bytes(b"partial")
+            orphan.with_suffix(".tmp").write_bytes(b"partial")
+
+            self.assertEqual(self.checkpointer.collect_garbage(), 2)
+            self.assertEqual(self.chunk_count(), 1)
+
+        asyncio.run(run_test())
+
+    def test_reads_do_not_wait_for_a_write(self):
+        """Test that load, list, delete and GC proceed while a write is blocked."""
+        async def run_test():
+            existing = Checkpoint(sessions=make_sessions(1, output="existing"))
+            await self.checkpointer.save(existing)
+
+            gate = threading.Event()
+            write_chunk = self.checkpointer._write_chunk
+
+            def blocked_write_chunk(digest, raw):
+                gate.wait(5)
+                write_chunk(digest, raw)
+
+            self.checkpointer._write_chunk = blocked_write_chunk
+            pending = Checkpoint(sessions=make_sessions(1, output="pending"))
+            writer = threading.Thread(target=self.checkpointer.write, args=(pending,))
+            writer.start()
+            try:
+                loaded = await asyncio.wait_for(self.checkpointer.load(existing.checkpoint_id), 2)
+                self.assertEqual(loaded.sessions["session-0"].last_output, "existing")
+                listed = await asyncio.wait_for(self.checkpointer.list_checkpoints(), 2)
+                self.assertEqual([cp["checkpoint_id"] for cp in listed], [existing.checkpoint_id])
+                self.assertTrue(await asyncio.wait_for(self.checkpointer.delete(existing.checkpoint_id), 2))
+                self.checkpointer.collect_garbage()
+            finally:
+                gate.set()
+                writer.join()
+
+            loaded = await self.checkpointer.load(pending.checkpoint_id)
+            self.assertEqual(loaded.sessions["session-0"].last_output, "pending")
+            self.assertEqual(self.chunk_count(), 1)
+
+        asyncio.run(run_test())
+
+
+class TestSQLiteCheckpointerIncremental(IncrementalCheckpointMixin, unittest.TestCase):
+    """Chunked storage in SQLiteCheckpointer."""
+
+    def make_checkpointer(self):
+        return SQLiteCheckpointer(db_path=os.path.join(self.temp_dir, "checkpoints.db"))
+
+    def chunk_count(self):
+        with sqlite3.connect(self.checkpointer.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM checkpoint_chunks").fetchone()[0]
+
+    def test_loads_legacy_full_checkpoint(self):
+        """Test that checkpoints stored whole by older versions still load and delete."""
+        checkpoint = Checkpoint(sessions=make_sessions(1), registry=make_registry())
+
+        async def run_test():
+            with sqlite3.connect(self.checkpointer.db_path) as conn:
+                conn.execute(
+                    "INSERT INTO checkpoints (checkpoint_id, created_at, version, trigger, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (checkpoint.checkpoint_id, checkpoint.created_at.isoformat(),
+                     checkpoint.version, checkpoint.trigger, checkpoint.model_dump_json())
+                )
+            loaded = await self.checkpointer.load(checkpoint.checkpoint_id)
+            self.assertEqual(loaded.model_dump(), checkpoint.model_dump())
+            self.assertTrue(await self.checkpointer.delete(checkpoint.checkpoint_id))
+
+        asyncio.run(run_test())
+
+
 class TestCheckpointManager(unittest.TestCase):
     """Tests for CheckpointManager."""
 
@@ -611,6 +883,186 @@ class TestCheckpointManager(unittest.TestCase):
         asyncio.run(run_test())
 
 
+class BlockingCheckpointer(FileCheckpointer):
+    """FileCheckpointer whose writes wait for a gate and record their thread."""
+
+    def __init__(self, checkpoint_dir):
+        super().__init__(checkpoint_dir=checkpoint_dir)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.threads = []
+        self.fail = False
+
+    def write(self, checkpoint):
+        self.threads.append(threading.current_thread())
+        self.started.set()
+        self.gate.wait(timeout=5)
+        if self.fail:
+            raise IOError("disk full")
+        return super().write(checkpoint)
+
+
+class AsyncOnlyCheckpointer:
+    """Checkpointer with only the async protocol methods."""
+
+    def __init__(self):
+        self.saved = []
+
+    async def save(self, checkpoint):
+        self.saved.append(checkpoint.checkpoint_id)
+        return checkpoint.checkpoint_id
+
+
+class TestCheckpointWriter(unittest.TestCase):
+    """Tests for background checkpoint writes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.checkpointer = BlockingCheckpointer(self.temp_dir)
+        self.manager = CheckpointManager(checkpointer=self.checkpointer)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.checkpointer.gate.set()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def wait_for_write_to_start(self):
+        while not self.checkpointer.started.is_set():
+            await asyncio.sleep(0.001)
+
+    def test_writes_run_off_the_event_loop(self):
+        """Test that scheduled and explicit checkpoints are written on the worker thread."""
+        async def run_test():
+            scheduled = await self.manager.schedule_checkpoint(sessions=make_sessions(1))
+            await self.manager.flush()
+            await self.manager.create_checkpoint(trigger="manual")
+            await self.manager.close()
+
+            self.assertEqual(len(self.checkpointer.threads), 2)
+            for thread in self.checkpointer.threads:
+                self.assertIsNot(thread, threading.main_thread())
+                self.assertTrue(thread.name.startswith("checkpoint-writer"))
+            self.assertIsNotNone(await self.checkpointer.load(scheduled.checkpoint_id))
+
+        asyncio.run(run_test())
+
+    def test_explicit_checkpoint_supersedes_waiting_one(self):
+        """Test that create_checkpoint drops an older scheduled checkpoint not yet started."""
+        async def run_test():
+            scheduled = await self.manager.schedule_checkpoint(trigger="auto")
+            created = await self.manager.create_checkpoint(trigger="manual")
+            await self.manager.flush()
+
+            listed = [cp["checkpoint_id"] for cp in await self.manager.list_checkpoints()]
+            self.assertEqual(listed, [created.checkpoint_id])
+            self.assertNotEqual(scheduled.checkpoint_id, created.checkpoint_id)
+            self.assertEqual(self.manager.get_write_stats()["coalesced"], 1)
+
+        asyncio.run(run_test())
+
+    def test_schedule_returns_before_write(self):
+        """Test that scheduling does not wait for the checkpointer."""
+        async def run_test():
+            self.checkpointer.gate.clear()
+            checkpoint = await self.manager.schedule_checkpoint(sessions=make_sessions(1))
+            await self.wait_for_write_to_start()
+            self.assertEqual(self.manager.get_write_stats()["queue_depth"], 1)
+            self.assertIsNone(await self.checkpointer.load(checkpoint.checkpoint_id))
+
+            self.checkpointer.gate.set()
+            restored = await self.manager.restore_checkpoint(checkpoint.checkpoint_id)
+            self.assertIsNotNone(restored)
+            self.assertEqual(self.manager.last_checkpoint_id, checkpoint.checkpoint_id)
+
+        asyncio.run(run_test())
+
+    def test_consecutive_requests_coalesce(self):
+        """Test that only the newest waiting checkpoint is written."""
+        async def run_test():
+            self.checkpointer.gate.clear()
+            first = await self.manager.schedule_checkpoint(trigger="auto-0")
+            await self.wait_for_write_to_start()
+            for i in range(1, 5):
+                last = await self.manager.schedule_checkpoint(trigger=f"auto-{i}")
+            stats = self.manager.get_write_stats()
+            self.assertEqual(stats["queue_depth"], 2)
+            self.assertTrue(stats["pending"])
+
+            self.checkpointer.gate.set()
+            await self.manager.flush()
+            stats = self.manager.get_write_stats()
+            self.assertEqual((stats["written"], stats["coalesced"], stats["queue_depth"]), (2, 3, 0))
+            listed = {cp["checkpoint_id"] for cp in await self.manager.list_checkpoints()}
+            self.assertEqual(listed, {first.checkpoint_id, last.checkpoint_id})
+
+        asyncio.run(run_test())
+
+    def test_snapshot_is_isolated_from_later_changes(self):
+        """Test that state changed after scheduling is not written."""
+        async def run_test():
+            sessions = make_sessions(1)
+            registry = make_registry()
+            self.checkpointer.gate.clear()
+            checkpoint = await self.manager.schedule_checkpoint(sessions=sessions, registry=registry)
+
+            sessions["session-0"].name = "renamed"
+            sessions["session-0"].metadata["late"] = True
+            registry.agents["agent-1"].teams.append("team-2")
+            registry.message_history.append({"late": True})
+            sessions["session-1"] = SessionState(session_id="session-1", persistent_id="p", name="late")
+            registry.agents["agent-2"] = AgentState(name="agent-2", session_id="session-1")
+            registry.active_session = "session-1"
+
+            self.checkpointer.gate.set()
+            restored = await self.manager.restore_checkpoint(checkpoint.checkpoint_id)
+            self.assertEqual(list(restored.sessions), ["session-0"])
+            self.assertEqual(restored.sessions["session-0"].name, "worker-0")
+            self.assertNotIn("late", restored.sessions["session-0"].metadata)
+            self.assertEqual(list(restored.registry.agents), ["agent-1"])
+            self.assertEqual(restored.registry.agents["agent-1"].teams, ["team-1"])
+            self.assertEqual(restored.registry.message_history, [])
+            self.assertEqual(restored.registry.active_session, "session-0")
+
+        asyncio.run(run_test())
+
+    def test_failures_are_counted(self):
+        """Test that failed writes are reported without breaking the writer."""
+        async def run_test():
+            self.checkpointer.fail = True
+            await self.manager.schedule_checkpoint()
+            with self.assertLogs("core.checkpointing", level="WARNING"):
+                await self.manager.flush()
+            with self.assertRaises(IOError):
+                await self.manager.create_checkpoint()
+
+            stats = self.manager.get_write_stats()
+            self.assertEqual((stats["failed"], stats["written"]), (2, 0))
+            self.assertIn("disk full", stats["last_error"])
+
+            self.checkpointer.fail = False
+            await self.manager.create_checkpoint()
+            stats = self.manager.get_write_stats()
+            self.assertEqual(stats["written"], 1)
+            self.assertIsNotNone(stats["write_latency_ms"]["p50"])
+
+        asyncio.run(run_test())
+
+    def test_checkpointer_without_blocking_write(self):
+        """Test that protocol-only checkpointers are saved on the loop."""
+        async def run_test():
+            checkpointer = AsyncOnlyCheckpointer()
+            writer = CheckpointWriter(checkpointer)
+            checkpoint = Checkpoint()
+            writer.schedule(checkpoint)
+            await writer.close()
+            self.assertEqual(checkpointer.saved, [checkpoint.checkpoint_id])
+            self.assertEqual(writer.stats()["written"], 1)
+
+        asyncio.run(run_test())
+
+
 class TestAgentRegistryState(unittest.TestCase):
     """Tests for AgentRegistry save_state/load_state methods."""
 
@@ -0,0 +1,181 @@
+"""Tests for notification-driven completion signals."""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from core.completion import IdleTracker, wait_for_sessions_idle
+from core.session import ItermSession
+
+
+class TestIdleTracker(unittest.IsolatedAsyncioTestCase):
+    """Test idle detection on the tracker alone."""
+
+    async def test_quiet_session_is_idle_immediately(self):
+        tracker = IdleTracker(quiet_period=0.2)
+        self.assertTrue(await tracker.wait_idle(timeout=0.01))
+
+    async def test_waits_for_quiet_period(self):
+        tracker = IdleTracker(quiet_period=0.1)
+        tracker.note_activity()
+        start = time.monotonic()
+        self.assertTrue(await tracker.wait_idle(timeout=1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    async def test_activity_extends_wait(self):
+        tracker = IdleTracker(quiet_period=0.1)
+        tracker.note_activity()
+        asyncio.get_running_loop().call_later(0.08, tracker.note_activity)
+        start = time.monotonic()
+        self.assertTrue(await tracker.wait_idle(timeout=1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.17)
+
+    async def test_prompt_wakes_waiter_immediately(self):
+        tracker = IdleTracker(quiet_period=10)
+        tracker.note_input()
+        asyncio.get_running_loop().call_later(0.05, tracker.note_prompt)
+        start = time.monotonic()
+        self.assertTrue(await tracker.wait_idle(timeout=1))
+        self.assertLess(time.monotonic() - start, 0.2)
+
+    async def test_input_clears_prompt(self):
+        tracker = IdleTracker(quiet_period=10)
+        tracker.note_prompt()
+        tracker.note_input()
+        self.assertFalse(await tracker.wait_idle(timeout=0.05))
+
+    async def test_processing_blocks_idle(self):
+        tracker = IdleTracker(quiet_period=0.01)
+        busy = [True]
+        asyncio.get_running_loop().call_later(0.05, busy.clear)
+        self.assertTrue(await tracker.wait_idle(timeout=2, is_processing=lambda: bool(busy)))
+        self.assertFalse(await IdleTracker().wait_idle(timeout=0.05, is_processing=lambda: True))
+
+
+class FakeSession:
+    """Session stand-in that goes idle after a fixed delay."""
+
+    def __init__(self, session_id, delay):
+        self.id = session_id
+        self.delay = delay
+        self.cancelled = False
+
+    async def wait_until_idle(self, timeout):
+        try:
+            await asyncio.sleep(min(self.delay, timeout))
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.delay <= timeout
+
+
+class TestWaitForSessionsIdle(unittest.IsolatedAsyncioTestCase):
+    """Test waiting on several sessions."""
+
+    async def test_wait_all(self):
+        sessions = [FakeSession("a", 0.01), FakeSession("b", 0.05), FakeSession("c", 5)]
+        results = await wait_for_sessions_idle(sessions, timeout=0.2)
+        self.assertEqual(results, {"a": True, "b": True, "c": False})
+
+    async def test_wait_any_cancels_the_rest(self):
+        sessions = [FakeSession("slow", 5), FakeSession("fast", 0.01)]
+        start = time.monotonic()
+        results = await wait_for_sessions_idle(sessions, timeout=5, mode="any")
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(results, {"slow": False, "fast": True})
+        self.assertTrue(sessions[0].cancelled)
+
+
+class FakeScreen:
+    """Minimal stand-in for iterm2.ScreenContents."""
+
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    @property
+    def number_of_lines(self):
+        return len(self._lines)
+
+    def line(self, index):
+        line = MagicMock()
+        line.string = self._lines[index]
+        return line
+
+
+class FakeStreamer:
+    """Stand-in for iterm2.ScreenStreamer driven by a queue of notifications."""
+
+    def __init__(self):
+        self.updates = asyncio.Queue()
+        self.open = False
+
+    async def __aenter__(self):
+        self.open = True
+        return self
+
+    async def __aexit__(self, *exc):
+        self.open = False
+        return False
+
+    async def async_get(self):
+        await self.updates.get()
+
+
+class TestSessionWaitUntilIdle(unittest.IsolatedAsyncioTestCase):
+    """Test ItermSession.wait_until_idle with screen-update notifications."""
+
+    async def asyncSetUp(self):
+        self.screen = ["$ make"]
+        iterm_session = MagicMock()
+        iterm_session.session_id = "session-1"
+        iterm_session.name = "pane"
+        iterm_session.is_processing = False
+        iterm_session.connection = None
+        iterm_session.async_get_screen_contents = AsyncMock(
+            side_effect=lambda: FakeScreen(self.screen)
+        )
+        iterm_session.async_send_text = AsyncMock()
+        self.streamer = FakeStreamer()
+        iterm_session.get_screen_streamer = MagicMock(return_value=self.streamer)
+        self.iterm_session = iterm_session
+        self.session = ItermSession(iterm_session)
+        self.session.idle_tracker.quiet_period = 0.1
+
+    async def test_blocked_waiter_makes_no_reads(self):
+        """Test that waiting on a busy session costs only the baseline read."""
+        self.iterm_session.is_processing = True
+        self.assertFalse(await self.session.wait_until_idle(timeout=0.5))
+        self.assertEqual(self.iterm_session.async_get_screen_contents.await_count, 1)
+        self.assertFalse(self.streamer.open)
+
+    async def test_wakes_after_output_settles(self):
+        self.session.idle_tracker.note_input()
+
+        async def produce_output():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                self.streamer.updates.put_nowait(None)
+
+        producer = asyncio.create_task(produce_output())
+        start = time.monotonic()
+        self.assertTrue(await self.session.wait_until_idle(timeout=2))
+        elapsed = time.monotonic() - start
+        await producer
+
+        # Three updates 50ms apart, then a 100ms quiet period
+        self.assertGreaterEqual(elapsed, 0.24)
+        self.assertLess(elapsed, 0.5)
+
+    async def test_concurrent_waiters_share_subscription(self):
+        self.session.idle_tracker.note_input()
+        results = await asyncio.gather(
+            self.session.wait_until_idle(timeout=1),
+            self.session.wait_until_idle(timeout=1),
+        )
+        self.assertEqual(results, [True, True])
+        self.assertEqual(self.iterm_session.get_screen_streamer.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for concurrent fan-out delivery and cascade messaging."""
+
+import asyncio
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from core.agents import AgentRegistry
+from core.delivery import DeliveryJob, deliver_fanout
+from core.models import CascadeMessageRequest
+
+
+class FakeSession:
+    """Session stand-in that records what it was sent."""
+
+    def __init__(self, session_id, delay=0.05):
+        self.id = session_id
+        self.delay = delay
+        self.received = []
+
+    async def send_text(self, text, execute=True):
+        await asyncio.sleep(self.delay)
+        self.received.append(text)
+
+    async def execute_command(self, command):
+        await self.send_text(command)
+
+
+class TestDeliverFanout(unittest.IsolatedAsyncioTestCase):
+    """Test the delivery engine on its own."""
+
+    async def send(self, job):
+        await job.session.send_text(job.message)
+
+    async def test_sessions_delivered_concurrently(self):
+        sessions = [FakeSession(f"s{i}") for i in range(20)]
+        jobs = [DeliveryJob(agent=f"a{i}", session=s, message="hi") for i, s in enumerate(sessions)]
+
+        start = time.monotonic()
+        outcomes = await deliver_fanout(jobs, self.send)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(all(o.delivered for o in outcomes))
+        self.assertEqual([o.job.agent for o in outcomes], [j.agent for j in jobs])
+
+    async def test_same_session_is_fifo(self):
+        shared = FakeSession("s1", delay=0.01)
+        jobs = [DeliveryJob(agent=f"a{i}", session=shared, message=f"m{i}") for i in range(5)]
+        outcomes = await deliver_fanout(jobs, self.send)
+        self.assertEqual(shared.received, [f"m{i}" for i in range(5)])
+        latencies = [o.latency_seconds for o in outcomes]
+        self.assertEqual(latencies, sorted(latencies))
+
+    async def test_concurrency_is_bounded(self):
+        active = 0
+        peak = 0
+
+        async def send(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        jobs = [DeliveryJob(agent=f"a{i}", session=FakeSession(f"s{i}"), message="x") for i in range(10)]
+        await deliver_fanout(jobs, send, max_concurrency=3)
+        self.assertEqual(peak, 3)
+
+    async def test_failure_does_not_stop_queue(self):
+        shared = FakeSession("s1", delay=0)
+
+        async def send(job):
+            if job.message == "bad":
+                raise RuntimeError("pane closed")
+            await job.session.send_text(job.message)
+
+        jobs = [DeliveryJob(agent=f"a{i}", session=shared, message=m) for i, m in enumerate(["one", "bad", "two"])]
+        outcomes = await deliver_fanout(jobs, send)
+        self.assertEqual([o.delivered for o in outcomes], [True, False, True])
+        self.assertEqual(outcomes[1].error, "pane closed")
+        self.assertEqual(shared.received, ["one", "two"])
+
+
+class TestCascadeDelivery(unittest.IsolatedAsyncioTestCase):
+    """Test execute_cascade_request through the fan-out engine."""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.registry = AgentRegistry(data_dir=self.temp_dir)
+        self.sessions = {}
+        for i in range(10):
+            session = FakeSession(f"session-{i}")
+            self.sessions[session.id] = session
+            self.registry.register_agent(f"agent-{i}", session.id, teams=["workers"])
+        self.registry.register_agent("ghost", "session-gone")
+
+        self.terminal = MagicMock()
+        self.terminal.get_sessions = AsyncMock(return_value=list(self.sessions.values()))
+        self.terminal.get_session_by_id = AsyncMock()
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def test_broadcast_fans_out(self):
+        from iterm_mcpy.fastmcp_server import execute_cascade_request
+
+        self.registry.record_messages_sent = MagicMock(wraps=self.registry.record_messages_sent)
+        request = CascadeMessageRequest(broadcast="sync", agents={"agent-3": "rebase"})
+
+        start = time.monotonic()
+        response = await execute_cascade_request(
+            request, self.terminal, self.registry, MagicMock()
+        )
+        self.assertLess(time.monotonic() - start, 0.4)
+
+        self.assertEqual(response.delivered_count, 10)
+        self.assertEqual(response.skipped_count, 1)
+        by_agent = {r.agent: r for r in response.results}
+        self.assertEqual(by_agent["ghost"].skipped_reason, "session_not_found")
+        self.assertEqual(by_agent["agent-3"].message_type, "agent")
+        self.assertEqual(by_agent["agent-0"].message_type, "broadcast")
+        self.assertIsNotNone(by_agent["agent-0"].latency_ms)
+        self.assertIsNotNone(response.elapsed_ms)
+
+        # Sessions resolved once, dedup recorded in one batch
+        self.terminal.get_sessions.assert_awaited_once()
+        self.terminal.get_session_by_id.assert_not_awaited()
+        self.registry.record_messages_sent.assert_called_once()
+        self.assertTrue(self.registry.was_message_sent("rebase", "agent-3"))
+
+        # Repeating the cascade skips agents that already received it
+        again = await execute_cascade_request(request, self.terminal, self.registry, MagicMock())
+        self.assertEqual(again.delivered_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
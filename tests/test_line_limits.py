@@ -213,6 +213,7 @@ class TestLineLimits(unittest.TestCase):
             
             # Get a snapshot with different line limits
             log_manager = self.terminal.log_manager
+            log_manager.flush()
             # Make sure the snapshot file exists
             self.assertTrue(os.path.exists(self.test_session.logger.snapshot_file))
             
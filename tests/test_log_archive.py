@@ -0,0 +1,204 @@
+"""Tests for the segmented, compressed session output archive."""
+
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.log_archive import ArchivePolicy, SessionLogArchive, prune_archives
+from utils.logging import ItermLogManager
+
+
+def records(start, count, ts=1000.0):
+    """Build (timestamp, text) records, one second apart."""
+    return [(ts + i, f"line {start + i}") for i in range(count)]
+
+
+class TestSessionLogArchive(unittest.TestCase):
+    """Test appends, random-access reads, rotation and retention."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "archive")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_read_range_across_chunks(self):
+        archive = SessionLogArchive(self.path)
+        for start in range(0, 1000, 100):
+            archive.append(start, records(start, 100, ts=1000.0 + start))
+
+        lines = archive.read_range(250, 260)
+        self.assertEqual([line.seq for line in lines], list(range(250, 260)))
+        self.assertEqual(lines[0].text, "line 250")
+        self.assertEqual(lines[0].timestamp, 1250.0)
+        self.assertEqual(archive.next_seq, 1000)
+
+    def test_read_between_times(self):
+        archive = SessionLogArchive(self.path)
+        archive.append(0, records(0, 50, ts=100.0))
+        archive.append(50, records(50, 50, ts=500.0))
+
+        lines = archive.read_between(520.0, 529.0)
+        self.assertEqual([line.text for line in lines], [f"line {i}" for i in range(70, 80)])
+        self.assertEqual(len(archive.read_between(0, 10_000, limit=5)), 5)
+
+    def test_gaps_from_dropped_lines(self):
+        archive = SessionLogArchive(self.path)
+        archive.append(0, records(0, 5))
+        archive.append(10, records(10, 5))
+        self.assertEqual([line.seq for line in archive.read_range(3, 12)], [3, 4, 10, 11])
+
+    def test_segments_are_gzip_files(self):
+        archive = SessionLogArchive(self.path)
+        archive.append(0, [(1.0, "a")])
+        archive.append(1, [(2.0, "b")])
+        segment = os.path.join(self.path, archive.segments[0])
+        with gzip.open(segment, "rt") as f:
+            self.assertEqual(f.read(), "1.000000\ta2.000000\tb")
+
+    def test_rotation_and_count_retention(self):
+        policy = ArchivePolicy(max_segment_bytes=1, max_segments=3, max_age_seconds=None)
+        archive = SessionLogArchive(self.path, policy)
+        for start in range(0, 50, 10):
+            archive.append(start, records(start, 10))
+
+        # Every chunk fills a segment; only the newest three survive
+        self.assertEqual(len(archive.segments), 3)
+        self.assertEqual(archive.first_seq, 20)
+        self.assertEqual(archive.read_range(0, 25)[0].seq, 20)
+        on_disk = sorted(n for n in os.listdir(self.path) if n.endswith(".gz"))
+        self.assertEqual(on_disk, archive.segments)
+
+    def test_age_retention(self):
+        policy = ArchivePolicy(max_segment_bytes=1, max_segments=100, max_age_seconds=60)
+        archive = SessionLogArchive(self.path, policy)
+        now = time.time()
+        archive.append(0, [(now - 3600, "old")])
+        archive.append(1, [(now, "new")])
+        self.assertEqual([line.text for line in archive.read_range(0, 2)], ["new"])
+
+    def test_reopen_loads_index(self):
+        archive = SessionLogArchive(self.path)
+        archive.append(0, records(0, 10))
+        reopened = SessionLogArchive(self.path)
+        self.assertEqual(reopened.next_seq, 10)
+        reopened.append(10, records(10, 5))
+        self.assertEqual(len(reopened.read_range(0, 15)), 15)
+        self.assertEqual(len(reopened.segments), 1)
+
+    def test_torn_index_line_is_ignored(self):
+        archive = SessionLogArchive(self.path)
+        archive.append(0, records(0, 10))
+        with open(archive.index_file, "a") as f:
+            f.write('{"segment": "segment_0')
+        reopened = SessionLogArchive(self.path)
+        self.assertEqual(len(reopened.read_range(0, 10)), 10)
+
+
+class TestPruneArchives(unittest.TestCase):
+    """Test retention for archives left by earlier runs."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.policy = ArchivePolicy(max_age_seconds=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _archive(self, name, ts):
+        archive = SessionLogArchive(os.path.join(self.temp_dir, name), self.policy)
+        archive.append(0, [(ts, "line")])
+        return archive
+
+    def test_expired_archives_removed(self):
+        now = time.time()
+        self._archive("archive_old_pane_1", now - 3600)
+        self._archive("archive_new_pane_2", now)
+
+        self.assertEqual(prune_archives(self.temp_dir, self.policy), 1)
+        self.assertEqual(os.listdir(self.temp_dir), ["archive_new_pane_2"])
+
+    def test_log_manager_prunes_at_startup(self):
+        self._archive("archive_old_pane_1", time.time() - 3600)
+        manager = ItermLogManager(
+            log_dir=self.temp_dir, enable_app_log=False, archive_policy=self.policy
+        )
+        try:
+            deadline = time.time() + 5
+            while os.path.exists(os.path.join(self.temp_dir, "archive_old_pane_1")):
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.01)
+        finally:
+            manager.writer.close()
+
+
+class TestReadSessionHistory(unittest.TestCase):
+    """Test reading history through ItermLogManager."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = ItermLogManager(
+            log_dir=self.temp_dir, enable_app_log=False, max_snapshot_lines=10
+        )
+
+    def tearDown(self):
+        self.manager.writer.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_history_beyond_scrollback(self):
+        logger = self.manager.get_session_logger("session-1", "pane")
+        logger.log_output("\n".join(f"out {i}" for i in range(100)))
+
+        lines = self.manager.read_session_history("session-1", start_line=5, end_line=8)
+        self.assertEqual([line.text for line in lines], ["out 5", "out 6", "out 7"])
+
+        newest = self.manager.read_session_history("session-1", max_lines=2)
+        self.assertEqual([line.seq for line in newest], [98, 99])
+
+        # An explicit start pages forward instead of jumping to the end
+        page = self.manager.read_session_history("session-1", start_line=0, end_line=100, max_lines=10)
+        self.assertEqual([line.seq for line in page], list(range(10)))
+        page = self.manager.read_session_history("session-1", start_line=10, max_lines=10)
+        self.assertEqual([line.seq for line in page], list(range(10, 20)))
+
+        self.assertIsNone(self.manager.read_session_history("missing"))
+
+    def test_history_by_time(self):
+        logger = self.manager.get_session_logger("session-1", "pane")
+        before = time.time()
+        logger.log_output("hello")
+        lines = self.manager.read_session_history("session-1", start_time=before)
+        self.assertEqual([line.text for line in lines], ["hello"])
+        self.assertEqual(
+            self.manager.read_session_history("session-1", end_time=before - 1), []
+        )
+
+    def test_async_readers_run_off_the_loop(self):
+        """Test that the async variants flush and read on a worker thread."""
+        logger = self.manager.get_session_logger("session-1", "pane")
+        logger.log_output("one\ntwo")
+        loop_thread = threading.get_ident()
+        drained_on = []
+        drain = logger.drain
+        logger.drain = lambda **kw: drained_on.append(threading.get_ident()) or drain(**kw)
+
+        async def read():
+            lines = await self.manager.read_session_history_async("session-1", max_lines=1)
+            snapshot = await self.manager.get_snapshot_async("session-1")
+            return lines, snapshot
+
+        lines, snapshot = asyncio.run(read())
+        self.assertEqual([line.text for line in lines], ["two"])
+        self.assertEqual(snapshot, "one\ntwo")
+        self.assertTrue(drained_on)
+        self.assertNotIn(loop_thread, drained_on)
+
+
+if __name__ == "__main__":
+    unittest.main()
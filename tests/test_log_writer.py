@@ -0,0 +1,240 @@
+"""Tests for the buffered background session log writer."""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from utils.logging import (
+    DROPPED_LINE_PLACEHOLDER,
+    ItermLogManager,
+    ItermSessionLogger,
+    LogWriter,
+)
+
+
+class TestBufferedSessionLogger(unittest.TestCase):
+    """Test buffering, coalesced snapshots and backpressure."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        # Long intervals so only explicit flushes write
+        self.writer = LogWriter(flush_interval=60, snapshot_interval=60)
+        self.logger = ItermSessionLogger(
+            session_id="session-1234",
+            session_name="pane",
+            log_dir=self.temp_dir,
+            writer=self.writer,
+        )
+        self.writer.register(self.logger)
+
+    def tearDown(self):
+        self.writer.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_log_output_does_not_write(self):
+        """Test that log_output only buffers when a writer is attached."""
+        self.logger.log_output("hello\nworld")
+        self.assertFalse(os.path.exists(self.logger.snapshot_file))
+        self.assertEqual(self.logger.log_queue_depth, 2)
+        self.assertEqual(self.logger.latest_output, ["hello", "world"])
+
+        self.writer.flush()
+        self.assertEqual(self.logger.log_queue_depth, 0)
+        self.assertEqual(self._read(self.logger.snapshot_file), "hello\nworld")
+        log = self._read(self.logger.log_file)
+        self.assertIn("OUTPUT: hello", log)
+        self.assertIn("OUTPUT: world", log)
+
+    def test_snapshot_writes_are_coalesced(self):
+        """Test that many outputs within the interval produce one snapshot write."""
+        self.writer.snapshot_interval = 0.2
+        for i in range(50):
+            self.logger.log_output(f"line {i}")
+            self.logger.drain()
+        self.assertEqual(self.logger.snapshot_writes, 1)
+        self.assertTrue(self.logger._snapshot_dirty)
+
+        time.sleep(0.25)
+        self.logger.drain()
+        self.assertEqual(self.logger.snapshot_writes, 2)
+        self.assertTrue(self._read(self.logger.snapshot_file).endswith("line 49"))
+
+    def test_bounded_queue_drops_and_counts(self):
+        """Test that lines beyond the bound are dropped and counted."""
+        self.logger.max_pending_lines = 10
+        self.logger.log_output("\n".join(f"line {i}" for i in range(25)))
+        self.assertEqual(self.logger.log_queue_depth, 10)
+        self.assertEqual(self.logger.dropped_lines, 15)
+
+        # latest_output is in memory and unaffected by the bound
+        self.assertEqual(len(self.logger.latest_output), 25)
+
+    def test_dropped_lines_are_archived(self):
+        """Test that dropped lines reach the archive, or leave a marked gap."""
+        self.logger.max_snapshot_lines = 12
+        self.logger.max_pending_lines = 10
+        self.logger.log_output("\n".join(f"line {i}" for i in range(25)))
+        self.writer.flush()
+
+        lines = self.logger.archive.read_range(0, 25)
+        self.assertEqual([line.seq for line in lines], list(range(25)))
+        # Lines 10-12 left the scrollback before the drain
+        self.assertEqual({line.text for line in lines[10:13]}, {DROPPED_LINE_PLACEHOLDER})
+        self.assertEqual(lines[13].text, "line 13")
+        self.assertEqual(lines[24].text, "line 24")
+        self.assertIn("DROPPED: 15 output lines from line 10", self._read(self.logger.log_file))
+
+    def test_filters_applied_by_writer(self):
+        """Test that output filters still decide what is logged as OUTPUT."""
+        self.logger.add_output_filter("ERROR")
+        self.logger.log_output("ok\nERROR: boom")
+        self.writer.flush()
+        log = self._read(self.logger.log_file)
+        self.assertIn("OUTPUT: ERROR: boom", log)
+        self.assertIn("FILTERED: ok", log)
+        self.assertNotIn("OUTPUT: ok", log)
+
+    def test_lines_archived_in_one_chunk_per_drain(self):
+        """Test that a drain archives queued lines as a single chunk."""
+        self.logger.max_snapshot_lines = 3
+        self.logger.log_output("a\nb\nc")
+        self.logger.log_output("d\ne")
+        self.writer.flush()
+
+        self.assertEqual(len(self.logger.archive.segments), 1)
+        self.assertEqual(
+            [line.text for line in self.logger.archive.read_range(0, 5)],
+            ["a", "b", "c", "d", "e"],
+        )
+
+    def test_text_log_written_once_per_drain(self):
+        """Test that a drain appends its lines with one write and one flush."""
+        self.logger.log_output("\n".join(f"line {i}" for i in range(20)))
+        handler = self.logger._file_handler
+        with patch.object(handler, "emit") as emit, \
+                patch.object(handler.stream, "write", wraps=handler.stream.write) as write:
+            self.writer.flush()
+        emit.assert_not_called()
+        self.assertEqual(write.call_count, 1)
+        log = self._read(self.logger.log_file)
+        self.assertIn("OUTPUT: line 0", log)
+        self.assertIn("OUTPUT: line 19", log)
+
+    def test_text_log_rotates_within_a_drain(self):
+        """Test that a large drain still rolls the text log over."""
+        handler = self.logger._file_handler
+        handler.maxBytes = 500
+        self.logger.log_output("\n".join(f"line {i:03d}" for i in range(40)))
+        self.writer.flush()
+        self.assertTrue(os.path.exists(self.logger.log_file + ".1"))
+        self.assertLess(os.path.getsize(self.logger.log_file), 500)
+        log = self._read(self.logger.log_file + ".1") + self._read(self.logger.log_file)
+        self.assertIn("OUTPUT: line 039", log)
+
+    def test_background_thread_drains(self):
+        """Test that the writer thread drains without an explicit flush."""
+        writer = LogWriter(flush_interval=0.01, snapshot_interval=0)
+        logger = ItermSessionLogger(
+            session_id="session-5678",
+            session_name="bg",
+            log_dir=self.temp_dir,
+            writer=writer,
+        )
+        writer.register(logger)
+        try:
+            logger.log_output("from the loop")
+            deadline = time.time() + 2
+            while not os.path.exists(logger.snapshot_file) and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self._read(logger.snapshot_file), "from the loop")
+        finally:
+            writer.close()
+
+
+class TestUnbufferedSessionLogger(unittest.TestCase):
+    """Test that a logger without a writer keeps writing synchronously."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_writes_immediately(self):
+        logger = ItermSessionLogger("session-1", "plain", log_dir=self.temp_dir)
+        logger.log_output("now")
+        with open(logger.snapshot_file) as f:
+            self.assertEqual(f.read(), "now")
+
+
+class TestLogManagerTelemetry(unittest.TestCase):
+    """Test backpressure metrics in get_session_telemetry."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = ItermLogManager(log_dir=self.temp_dir, enable_app_log=False)
+        self.manager.writer.flush_interval = 60
+
+    def tearDown(self):
+        self.manager.writer.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_telemetry_reports_queue(self):
+        logger = self.manager.get_session_logger("session-1", "pane")
+        logger.max_pending_lines = 2
+        logger.log_output("a\nb\nc")
+
+        telemetry = self.manager.get_session_telemetry()["session-1"]
+        self.assertEqual(telemetry["log_queue_depth"], 2)
+        self.assertEqual(telemetry["log_dropped_lines"], 1)
+
+        self.manager.flush()
+        telemetry = self.manager.get_session_telemetry()["session-1"]
+        self.assertEqual(telemetry["log_queue_depth"], 0)
+        self.assertEqual(telemetry["snapshot_writes"], 1)
+
+    def test_get_snapshot_sees_buffered_output(self):
+        """Test that get_snapshot flushes the logger before reading."""
+        logger = self.manager.get_session_logger("session-1", "pane")
+        logger.log_output("buffered")
+        self.assertEqual(self.manager.get_snapshot("session-1"), "buffered")
+
+    def test_remove_session_logger_flushes(self):
+        logger = self.manager.get_session_logger("session-1", "pane")
+        logger.log_output("last words")
+        self.manager.remove_session_logger("session-1")
+        self.manager.writer.flush()
+        with open(logger.snapshot_file) as f:
+            self.assertEqual(f.read(), "last words")
+
+    def test_remove_session_logger_does_not_wait_for_writer(self):
+        """Test that the final drain is left to the writer thread."""
+        logger = self.manager.get_session_logger("session-1", "pane")
+        logger.log_output("last words")
+        writer = self.manager.writer
+        with writer._drain_lock:
+            # Would block if the drain ran on the caller
+            done = threading.Event()
+            threading.Thread(
+                target=lambda: (self.manager.remove_session_logger("session-1"), done.set())
+            ).start()
+            self.assertTrue(done.wait(2))
+            self.assertFalse(os.path.exists(logger.snapshot_file))
+
+        deadline = time.time() + 2
+        while not os.path.exists(logger.snapshot_file) and time.time() < deadline:
+            time.sleep(0.01)
+        with open(logger.snapshot_file) as f:
+            self.assertEqual(f.read(), "last words")
+
+
+if __name__ == "__main__":
+    unittest.main()
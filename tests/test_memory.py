@@ -1,18 +1,26 @@
 """Tests for the cross-agent memory store implementations."""
 
 import asyncio
+import json
 import os
 import shutil
+import sqlite3
 import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
+from unittest.mock import patch
 
 from core.memory import (
     Memory,
+    CachedMemoryStore,
     FileMemoryStore,
+    RetentionPolicy,
     SQLiteMemoryStore,
     get_memory_store,
 )
+from core.memory_index import NUMPY_AVAILABLE
 
 
 class TestMemoryModel(unittest.TestCase):
@@ -236,6 +244,151 @@ class TestFileMemoryStore(unittest.TestCase):
         asyncio.run(run_test())
 
 
+class TestFileMemoryStoreLog(unittest.TestCase):
+    """Tests for the FileMemoryStore operation log and snapshot compaction."""
+
+    def setUp(self):
+        """Create a temporary directory for test storage."""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "memories.json")
+        self.store = FileMemoryStore(file_path=self.path)
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    @staticmethod
+    def contents(store):
+        return {
+            ns: {key: data["value"] for key, data in memories.items()}
+            for ns, memories in store._data.items()
+        }
+
+    def test_write_appends_without_rewriting_snapshot(self):
+        """Test that writes only grow the log."""
+        async def run_test():
+            await self.store.store(("proj",), "a", "x" * 100)
+            await self.store.close()
+            snapshot = os.path.getsize(self.path)
+
+            store = FileMemoryStore(file_path=self.path)
+            await store.store(("proj",), "b", "y")
+            first = os.path.getsize(store.log_path)
+            await store.store(("proj",), "c", "z")
+            self.assertEqual(os.path.getsize(self.path), snapshot)
+            # The second append costs about as much as the first
+            self.assertAlmostEqual(os.path.getsize(store.log_path), 2 * first, delta=4)
+
+        asyncio.run(run_test())
+
+    def test_recovers_at_every_truncation_point(self):
+        """Test that a torn log loads the state of the last complete write."""
+        async def run_test():
+            await self.store.store(("proj",), "base", 0)
+            await self.store.close()
+
+            store = FileMemoryStore(file_path=self.path)
+            await store.store(("proj",), "a", {"n": 1})
+            await store.store_many(("proj", "sub"), [{"key": "b", "value": 2}, {"key": "c", "value": 3}])
+            await store.delete(("proj",), "base")
+            await store.store(("proj",), "a", "überschrieben")
+            await store.delete_many(("proj", "sub"), ["b", "missing"])
+            await store.clear_namespace(("proj", "sub"))
+            with open(self.path, "rb") as f:
+                snapshot = f.read()
+            with open(store.log_path, "rb") as f:
+                log = f.read()
+
+            # The state after each complete line, keyed by the line's end offset
+            ends = [0] + [i + 1 for i, byte in enumerate(log) if byte == ord("\n")]
+            self.assertEqual(len(ends), 7)
+            expected = {}
+            for end in ends:
+                partial = FileMemoryStore.__new__(FileMemoryStore)
+                partial._data = json.loads(snapshot)
+                for line in log[:end].splitlines():
+                    partial._apply(json.loads(line))
+                expected[end] = self.contents(partial)
+            self.assertEqual(expected[len(log)], self.contents(store))
+
+            probe = os.path.join(self.test_dir, "probe")
+            os.mkdir(probe)
+            for cut in range(len(log) + 1):
+                path = os.path.join(probe, f"m{cut}.json")
+                with open(path, "wb") as f:
+                    f.write(snapshot)
+                with open(path + ".log", "wb") as f:
+                    f.write(log[:cut])
+                recovered = FileMemoryStore(file_path=path)
+                last_complete = max(end for end in ends if end <= cut)
+                self.assertEqual(self.contents(recovered), expected[last_complete], f"cut at byte {cut}")
+                self.assertEqual(os.path.getsize(path + ".log"), last_complete)
+
+                # Writes after recovery start on a clean line
+                await recovered.store(("after",), "k", cut)
+                reloaded = FileMemoryStore(file_path=path)
+                self.assertEqual(reloaded._data["after"]["k"]["value"], cut)
+
+        asyncio.run(run_test())
+
+    def test_replay_after_interrupted_compaction(self):
+        """Test that a log left behind by a compaction replays to the same data."""
+        async def run_test():
+            await self.store.store(("proj",), "a", 1)
+            await self.store.store(("proj",), "b", 2)
+            await self.store.delete(("proj",), "a")
+            with open(self.store.log_path, "rb") as f:
+                log = f.read()
+            # Crash after the snapshot was replaced but before the log was emptied
+            await self.store.close()
+            with open(self.store.log_path, "wb") as f:
+                f.write(log)
+            with open(self.path + ".tmp", "w") as f:
+                f.write("{not json")
+
+            store = FileMemoryStore(file_path=self.path)
+            self.assertEqual(self.contents(store), {"proj": {"b": 2}})
+
+        asyncio.run(run_test())
+
+    def test_compacts_when_log_outgrows_snapshot(self):
+        """Test that the snapshot is rewritten and the log emptied."""
+        async def run_test():
+            with patch("core.memory.FILE_LOG_COMPACT_MIN_BYTES", 512):
+                for i in range(50):
+                    await self.store.store(("proj",), "counter", i)
+            self.assertGreater(self.store.compactions, 0)
+            self.assertLess(os.path.getsize(self.store.log_path), 1024)
+            self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+            stats = await self.store.get_stats()
+            self.assertEqual(stats["compactions"], self.store.compactions)
+            store = FileMemoryStore(file_path=self.path)
+            self.assertEqual(self.contents(store), {"proj": {"counter": 49}})
+
+        asyncio.run(run_test())
+
+    def test_compaction_runs_off_the_loop(self):
+        """Test that the snapshot is written on a worker thread."""
+        async def run_test():
+            threads = []
+            write_snapshot = self.store._write_snapshot
+
+            def record_thread():
+                threads.append(threading.current_thread())
+                write_snapshot()
+
+            with patch.object(self.store, "_write_snapshot", record_thread), \
+                    patch("core.memory.FILE_LOG_COMPACT_MIN_BYTES", 512):
+                for i in range(50):
+                    await self.store.store(("proj",), "counter", i)
+                await self.store.close()
+            self.assertTrue(threads)
+            self.assertNotIn(threading.current_thread(), threads)
+
+        asyncio.run(run_test())
+
+
 class TestSQLiteMemoryStore(unittest.TestCase):
     """Tests for the SQLiteMemoryStore implementation."""
 
@@ -418,6 +571,724 @@ class TestSQLiteMemoryStore(unittest.TestCase):
         asyncio.run(run_test())
 
 
+class TestSQLiteMemoryPool(unittest.TestCase):
+    """Tests for the pooled, executor-backed SQLite access layer."""
+
+    def setUp(self):
+        """Create a temporary directory for test storage."""
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, "pool.db")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_wal_mode_enabled(self):
+        """Test that the database is switched to WAL journaling."""
+        SQLiteMemoryStore(db_path=self.db_path)
+        with sqlite3.connect(self.db_path) as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_reads_do_not_block_event_loop(self):
+        """Test that a slow query leaves the event loop free."""
+        async def run_test():
+            store = SQLiteMemoryStore(db_path=self.db_path)
+            await store.store(("ns",), "k", "v")
+
+            def slow_fetch(conn):
+                time.sleep(0.2)
+                return "done"
+
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await store._pool.read(slow_fetch)
+            task.cancel()
+            self.assertEqual(result, "done")
+            self.assertGreater(ticks, 5)
+            await store.close()
+
+        asyncio.run(run_test())
+
+    def test_concurrent_readers_with_writer(self):
+        """Test that many concurrent reads and writes all complete correctly."""
+        async def run_test():
+            store = SQLiteMemoryStore(db_path=self.db_path)
+            await asyncio.gather(*(
+                store.store(("team",), f"key{i}", {"n": i}) for i in range(50)
+            ))
+            memories = await asyncio.gather(*(
+                store.retrieve(("team",), f"key{i}") for i in range(50)
+            ))
+            self.assertEqual([m.value["n"] for m in memories], list(range(50)))
+            await store.close()
+
+        asyncio.run(run_test())
+
+    def test_fts_tracks_updates_and_deletes(self):
+        """Test that the external-content index follows row changes."""
+        async def run_test():
+            store = SQLiteMemoryStore(db_path=self.db_path)
+            await store.store(("ns",), "k", "alpha bravo")
+            await store.store(("ns",), "k", "charlie delta")
+            self.assertEqual(await store.search(("ns",), "alpha"), [])
+            results = await store.search(("ns",), "charlie")
+            self.assertEqual(len(results), 1)
+            self.assertIn("<b>charlie</b>", results[0].match_context)
+
+            await store.delete(("ns",), "k")
+            self.assertEqual(await store.search(("ns",), "charlie"), [])
+            await store.close()
+
+        asyncio.run(run_test())
+
+    def test_migrates_standalone_fts_table(self):
+        """Test that an old standalone FTS table is rebuilt from existing rows."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE memories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    metadata TEXT DEFAULT '{}',
+                    UNIQUE(namespace, key)
+                )
+            """)
+            conn.execute(
+                "CREATE VIRTUAL TABLE memories_fts USING fts5(key, value_text, metadata_text, namespace)"
+            )
+            conn.execute(
+                "INSERT INTO memories (namespace, key, value, timestamp, metadata) VALUES (?, ?, ?, ?, ?)",
+                ("legacy", "old", '"migrated text"', datetime.now().isoformat(), "{}")
+            )
+
+        async def run_test():
+            store = SQLiteMemoryStore(db_path=self.db_path)
+            results = await store.search(("legacy",), "migrated")
+            self.assertEqual([r.memory.key for r in results], ["old"])
+            await store.close()
+
+        asyncio.run(run_test())
+
+    def test_periodic_fts_optimize(self):
+        """Test that the FTS index is optimized after enough row changes."""
+        async def run_test():
+            store = SQLiteMemoryStore(db_path=self.db_path)
+            with patch("core.memory.FTS_OPTIMIZE_INTERVAL", 5):
+                for i in range(12):
+                    await store.store(("ns",), f"k{i}", "text")
+            self.assertGreaterEqual(store.fts_optimizations, 1)
+            stats = await store.get_stats()
+            self.assertEqual(stats["fts_optimizations"], store.fts_optimizations)
+            await store.close()
+
+        asyncio.run(run_test())
+
+
+class BatchOperationsMixin:
+    """Batch and JSONL export/import tests shared by both backends."""
+
+    def make_store(self, name):
+        raise NotImplementedError
+
+    def setUp(self):
+        """Create a temporary directory for test storage."""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = self.make_store("batch")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_store_many_and_retrieve_many(self):
+        """Test storing a batch and reading part of it back."""
+        async def run_test():
+            items = [
+                {"key": f"fact{i}", "value": {"n": i}, "metadata": {"i": i}}
+                for i in range(5)
+            ]
+            self.assertEqual(await self.store.store_many(("proj",), items), 5)
+
+            found = await self.store.retrieve_many(("proj",), ["fact1", "fact3", "missing"])
+            self.assertEqual(set(found), {"fact1", "fact3"})
+            self.assertEqual(found["fact3"].value, {"n": 3})
+            self.assertEqual(found["fact3"].metadata, {"i": 3})
+            self.assertEqual(found["fact3"].namespace, ("proj",))
+
+        asyncio.run(run_test())
+
+    def test_store_many_requires_key_and_value(self):
+        """Test that malformed items are rejected before anything is stored."""
+        async def run_test():
+            with self.assertRaises(ValueError):
+                await self.store.store_many(("proj",), [{"key": "a", "value": 1}, {"key": "b"}])
+            self.assertEqual(await self.store.list_keys(("proj",)), [])
+
+        asyncio.run(run_test())
+
+    def test_delete_many(self):
+        """Test deleting a batch of keys."""
+        async def run_test():
+            await self.store.store_many(("proj",), [
+                {"key": k, "value": k} for k in ("a", "b", "c")
+            ])
+            self.assertEqual(await self.store.delete_many(("proj",), ["a", "c", "zzz"]), 2)
+            self.assertEqual(await self.store.list_keys(("proj",)), ["b"])
+
+        asyncio.run(run_test())
+
+    def test_export_import_round_trip(self):
+        """Test exporting a namespace subtree and importing it into a fresh store."""
+        async def run_test():
+            await self.store.store(("proj",), "root", "r")
+            await self.store.store(("proj", "agent"), "child", {"x": 1}, {"tag": "t"})
+            await self.store.store(("project",), "sibling", "s")
+            original = await self.store.retrieve(("proj", "agent"), "child")
+
+            path = os.path.join(self.test_dir, "export.jsonl")
+            self.assertEqual(await self.store.export_jsonl(path, ("proj",)), 2)
+
+            target = self.make_store("target")
+            self.assertEqual(await target.import_jsonl(path), 2)
+            imported = await target.retrieve(("proj", "agent"), "child")
+            self.assertEqual(imported.value, {"x": 1})
+            self.assertEqual(imported.metadata, {"tag": "t"})
+            self.assertEqual(imported.timestamp, original.timestamp)
+            self.assertIsNone(await target.retrieve(("project",), "sibling"))
+
+        asyncio.run(run_test())
+
+    def test_import_rejects_malformed_line(self):
+        """Test that a bad line reports its line number."""
+        async def run_test():
+            path = os.path.join(self.test_dir, "bad.jsonl")
+            with open(path, "w") as f:
+                f.write('{"namespace": ["a"], "key": "k", "value": 1}\n')
+                f.write('{"namespace": ["a"]}\n')
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                await self.store.import_jsonl(path)
+
+        asyncio.run(run_test())
+
+    def test_import_rejects_unsafe_names(self):
+        """Test that imported namespaces and keys are validated like stores."""
+        async def run_test():
+            for bad in ('{"namespace": ["a/b"], "key": "k", "value": 1}',
+                        '{"namespace": ["a"], "key": "bad key!", "value": 1}'):
+                path = os.path.join(self.test_dir, "unsafe.jsonl")
+                with open(path, "w") as f:
+                    f.write('{"namespace": ["a"], "key": "ok", "value": 1}\n')
+                    f.write(bad + "\n")
+                with self.assertRaisesRegex(ValueError, "line 2"):
+                    await self.store.import_jsonl(path)
+                # The whole import is rejected
+                self.assertIsNone(await self.store.retrieve(("a",), "ok"))
+
+        asyncio.run(run_test())
+
+
+class TestFileMemoryStoreBatch(BatchOperationsMixin, unittest.TestCase):
+    """Batch operations on FileMemoryStore."""
+
+    def make_store(self, name):
+        return FileMemoryStore(file_path=os.path.join(self.test_dir, f"{name}.json"))
+
+    def test_store_many_writes_file_once(self):
+        """Test that a batch is persisted with a single log append."""
+        async def run_test():
+            with patch.object(self.store, "_append", wraps=self.store._append) as append:
+                await self.store.store_many(("proj",), [
+                    {"key": f"k{i}", "value": i} for i in range(20)
+                ])
+            self.assertEqual(append.call_count, 1)
+
+        asyncio.run(run_test())
+
+
+class TestSQLiteMemoryStoreBatch(BatchOperationsMixin, unittest.TestCase):
+    """Batch operations on SQLiteMemoryStore."""
+
+    def make_store(self, name):
+        return SQLiteMemoryStore(db_path=os.path.join(self.test_dir, f"{name}.db"))
+
+    def test_retrieve_many_beyond_variable_limit(self):
+        """Test that large key lists are split across queries."""
+        async def run_test():
+            await self.store.store_many(("big",), [
+                {"key": f"k{i}", "value": i} for i in range(1200)
+            ])
+            found = await self.store.retrieve_many(("big",), [f"k{i}" for i in range(1200)])
+            self.assertEqual(len(found), 1200)
+
+        asyncio.run(run_test())
+
+
+class TestCachedMemoryStoreBatch(BatchOperationsMixin, unittest.TestCase):
+    """Batch operations through CachedMemoryStore."""
+
+    def make_store(self, name):
+        return CachedMemoryStore(
+            SQLiteMemoryStore(db_path=os.path.join(self.test_dir, f"{name}.db"))
+        )
+
+
+class TestCachedMemoryStore(unittest.TestCase):
+    """Tests for the LRU read-through cache."""
+
+    def setUp(self):
+        """Create a temporary directory and a cached SQLite store."""
+        self.test_dir = tempfile.mkdtemp()
+        self.inner = SQLiteMemoryStore(db_path=os.path.join(self.test_dir, "cache.db"))
+        self.store = CachedMemoryStore(self.inner)
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_retrieve_served_from_cache(self):
+        """Test that repeated retrieves (hits and misses) skip the backend."""
+        async def run_test():
+            await self.store.store(("proj",), "k", {"v": 1})
+            with patch.object(self.inner, "retrieve", wraps=self.inner.retrieve) as retrieve:
+                for _ in range(3):
+                    self.assertEqual((await self.store.retrieve(("proj",), "k")).value, {"v": 1})
+                    self.assertIsNone(await self.store.retrieve(("proj",), "absent"))
+            self.assertEqual(retrieve.await_count, 2)
+            stats = self.store.get_cache_stats()
+            self.assertEqual(stats["retrieve_hits"], 4)
+            self.assertEqual(stats["retrieve_misses"], 2)
+
+        asyncio.run(run_test())
+
+    def test_writes_invalidate_key(self):
+        """Test that store and delete drop the cached value."""
+        async def run_test():
+            await self.store.store(("proj",), "k", "old")
+            self.assertEqual((await self.store.retrieve(("proj",), "k")).value, "old")
+            await self.store.store(("proj",), "k", "new")
+            self.assertEqual((await self.store.retrieve(("proj",), "k")).value, "new")
+            await self.store.delete(("proj",), "k")
+            self.assertIsNone(await self.store.retrieve(("proj",), "k"))
+
+        asyncio.run(run_test())
+
+    def test_clear_namespace_invalidates_all_keys(self):
+        """Test that clearing a namespace drops every cached key in it."""
+        async def run_test():
+            await self.store.store_many(("proj",), [{"key": f"k{i}", "value": i} for i in range(3)])
+            await self.store.store(("other",), "k0", "kept")
+            await self.store.retrieve_many(("proj",), ["k0", "k1", "k2"])
+            await self.store.retrieve(("other",), "k0")
+
+            await self.store.clear_namespace(("proj",))
+            self.assertEqual(await self.store.retrieve_many(("proj",), ["k0", "k1", "k2"]), {})
+            with patch.object(self.inner, "retrieve", wraps=self.inner.retrieve) as retrieve:
+                self.assertEqual((await self.store.retrieve(("other",), "k0")).value, "kept")
+            retrieve.assert_not_awaited()
+
+        asyncio.run(run_test())
+
+    def test_search_invalidated_by_write_under_prefix(self):
+        """Test that a write below a searched prefix refreshes the search."""
+        async def run_test():
+            await self.store.store(("proj", "a"), "k1", "alpha note")
+            self.assertEqual(len(await self.store.search(("proj",), "note")), 1)
+
+            with patch.object(self.inner, "search", wraps=self.inner.search) as search:
+                self.assertEqual(len(await self.store.search(("proj",), "note")), 1)
+                search.assert_not_awaited()
+
+                # An unrelated namespace leaves the cached search valid
+                await self.store.store(("elsewhere",), "k", "note")
+                await self.store.search(("proj",), "note")
+                search.assert_not_awaited()
+
+                await self.store.store(("proj", "b"), "k2", "beta note")
+                self.assertEqual(len(await self.store.search(("proj",), "note")), 2)
+                self.assertEqual(search.await_count, 1)
+
+        asyncio.run(run_test())
+
+    def test_import_invalidates_everything(self):
+        """Test that an import drops cached retrieves and searches."""
+        async def run_test():
+            await self.store.store(("proj",), "k", "before")
+            await self.store.retrieve(("proj",), "k")
+            path = os.path.join(self.test_dir, "export.jsonl")
+            await self.store.export_jsonl(path)
+            await self.store.store(("proj",), "k", "after")
+            await self.store.retrieve(("proj",), "k")
+
+            await self.store.import_jsonl(path)
+            self.assertEqual((await self.store.retrieve(("proj",), "k")).value, "before")
+
+        asyncio.run(run_test())
+
+    def test_bounded_by_entries_and_bytes(self):
+        """Test LRU eviction by entry count and by size."""
+        async def run_test():
+            store = CachedMemoryStore(self.inner, max_entries=3)
+            for i in range(5):
+                await store.store(("proj",), f"k{i}", i)
+                await store.retrieve(("proj",), f"k{i}")
+            stats = store.get_cache_stats()
+            self.assertEqual(stats["entries"], 3)
+            self.assertEqual(stats["evictions"], 2)
+
+            small = CachedMemoryStore(self.inner, max_bytes=4096)
+            await small.store(("proj",), "big", "x" * 3000)
+            await small.store(("proj",), "huge", "x" * 10000)
+            await small.retrieve(("proj",), "big")
+            await small.retrieve(("proj",), "huge")
+            stats = small.get_cache_stats()
+            self.assertEqual(stats["entries"], 1)
+            self.assertLessEqual(stats["bytes"], 4096)
+
+        asyncio.run(run_test())
+
+    def test_stats_include_cache(self):
+        """Test that get_stats reports backend and cache statistics."""
+        async def run_test():
+            await self.store.store(("proj",), "k", 1)
+            await self.store.retrieve(("proj",), "k")
+            await self.store.retrieve(("proj",), "k")
+            stats = await self.store.get_stats()
+            self.assertEqual(stats["total_memories"], 1)
+            self.assertEqual(stats["cache"]["retrieve_hit_rate"], 0.5)
+
+        asyncio.run(run_test())
+
+
+class RetentionMixin:
+    """TTL, quota and sweeper tests shared by both backends."""
+
+    def make_store(self, name):
+        raise NotImplementedError
+
+    def setUp(self):
+        """Create a temporary directory for test storage."""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = self.make_store("retention")
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def later(self, seconds):
+        """Patch the clock used for TTL checks forward."""
+        return patch("core.memory.time.time", return_value=time.time() + seconds)
+
+    def test_ttl_hides_then_sweeps(self):
+        """Test that expired memories vanish at once and are deleted by a sweep."""
+        async def run_test():
+            await self.store.set_retention_policy(("scratch",), RetentionPolicy(ttl_seconds=60))
+            await self.store.store(("scratch", "agent"), "note", "temporary")
+            await self.store.store(("kept",), "note", "forever")
+            self.assertIsNotNone(await self.store.retrieve(("scratch", "agent"), "note"))
+
+            with self.later(120):
+                self.assertIsNone(await self.store.retrieve(("scratch", "agent"), "note"))
+                self.assertEqual(await self.store.search(("scratch",), "temporary"), [])
+                self.assertEqual(await self.store.sweep(), 1)
+            self.assertEqual(await self.store.list_keys(("scratch", "agent")), [])
+            self.assertIsNotNone(await self.store.retrieve(("kept",), "note"))
+
+            stats = await self.store.get_stats()
+            self.assertEqual(stats["namespace_usage"]["scratch/agent"]["expired"], 1)
+            self.assertEqual(stats["namespace_usage"]["kept"]["entries"], 1)
+            self.assertEqual(stats["retention"]["policies"]["scratch"], {"ttl_seconds": 60.0, "eviction": "lru"})
+
+        asyncio.run(run_test())
+
+    def test_max_entries_evicts_least_recently_retrieved(self):
+        """Test LRU eviction ordered by retrieves."""
+        async def run_test():
+            await self.store.set_retention_policy(("team",), RetentionPolicy(max_entries=3))
+            for i in range(5):
+                await self.store.store(("team",), f"k{i}", i)
+            await self.store.retrieve(("team",), "k0")
+            await self.store.retrieve(("team",), "k1")
+
+            self.assertEqual(await self.store.sweep(), 2)
+            self.assertEqual(sorted(await self.store.list_keys(("team",))), ["k0", "k1", "k4"])
+            stats = await self.store.get_stats()
+            self.assertEqual(stats["namespace_usage"]["team"]["evicted"], 2)
+
+        asyncio.run(run_test())
+
+    def test_lfu_evicts_least_frequently_retrieved(self):
+        """Test LFU eviction ordered by retrieve counts."""
+        async def run_test():
+            await self.store.set_retention_policy(("team",), RetentionPolicy(max_entries=2, eviction="lfu"))
+            for i in range(3):
+                await self.store.store(("team",), f"k{i}", i)
+            for _ in range(3):
+                await self.store.retrieve(("team",), "k0")
+            await self.store.retrieve_many(("team",), ["k2"])
+            await self.store.retrieve(("team",), "k2")
+            await self.store.retrieve(("team",), "k1")
+
+            self.assertEqual(await self.store.sweep(), 1)
+            self.assertEqual(sorted(await self.store.list_keys(("team",))), ["k0", "k2"])
+
+        asyncio.run(run_test())
+
+    def test_max_bytes_quota(self):
+        """Test that a namespace is trimmed below its byte quota."""
+        async def run_test():
+            await self.store.set_retention_policy(("blobs",), RetentionPolicy(max_bytes=2500))
+            for i in range(4):
+                await self.store.store(("blobs",), f"b{i}", "x" * 1000)
+            await self.store.sweep()
+            self.assertEqual(sorted(await self.store.list_keys(("blobs",))), ["b2", "b3"])
+            stats = await self.store.get_stats()
+            self.assertLessEqual(stats["namespace_usage"]["blobs"]["bytes"], 2500)
+
+        asyncio.run(run_test())
+
+    def test_sweep_is_incremental(self):
+        """Test that each pass removes at most its budget and later passes finish."""
+        async def run_test():
+            await self.store.set_retention_policy(("a",), RetentionPolicy(max_entries=1))
+            await self.store.set_retention_policy(("b",), RetentionPolicy(max_entries=1))
+            for ns in ("a", "b"):
+                await self.store.store_many((ns,), [{"key": f"k{i}", "value": i} for i in range(6)])
+
+            removed = []
+            while True:
+                count = await self.store.sweep(max_removals=3)
+                if not count:
+                    break
+                self.assertLessEqual(count, 3)
+                removed.append(count)
+            self.assertEqual(sum(removed), 10)
+            self.assertEqual(len(await self.store.list_keys(("a",))), 1)
+            self.assertEqual(len(await self.store.list_keys(("b",))), 1)
+
+        asyncio.run(run_test())
+
+    def test_background_sweeper(self):
+        """Test that the sweeper enforces policies and stops on close."""
+        async def run_test():
+            await self.store.set_retention_policy(("team",), RetentionPolicy(max_entries=2))
+            await self.store.store_many(("team",), [{"key": f"k{i}", "value": i} for i in range(5)])
+            evicted = []
+            self.store.add_eviction_listener(lambda ns_key, keys: evicted.extend(keys))
+
+            self.store.start_sweeper(interval=0.01)
+            await asyncio.sleep(0.1)
+            self.assertEqual(len(evicted), 3)
+            self.assertTrue((await self.store.get_stats())["retention"]["sweeper_running"])
+            await self.store.stop_sweeper()
+            self.assertFalse((await self.store.get_stats())["retention"]["sweeper_running"])
+            await self.store.close()
+
+        asyncio.run(run_test())
+
+
+class TestFileMemoryStoreRetention(RetentionMixin, unittest.TestCase):
+    """Retention on FileMemoryStore."""
+
+    def make_store(self, name):
+        return FileMemoryStore(file_path=os.path.join(self.test_dir, f"{name}.json"))
+
+
+class TestSQLiteMemoryStoreRetention(RetentionMixin, unittest.TestCase):
+    """Retention on SQLiteMemoryStore."""
+
+    def make_store(self, name):
+        return SQLiteMemoryStore(db_path=os.path.join(self.test_dir, f"{name}.db"))
+
+    def test_policies_persist(self):
+        """Test that policies survive reopening the database."""
+        async def run_test():
+            await self.store.set_retention_policy(("team",), RetentionPolicy(max_entries=5, eviction="lfu"))
+            reopened = self.make_store("retention")
+            policy = reopened.get_retention_policy(("team", "child"))
+            self.assertEqual((policy.max_entries, policy.eviction), (5, "lfu"))
+
+            await reopened.set_retention_policy(("team",), None)
+            self.assertIsNone(self.make_store("retention").get_retention_policy(("team",)))
+
+        asyncio.run(run_test())
+
+    def test_access_flush_does_not_reindex(self):
+        """Test that recording reads leaves the FTS index untouched."""
+        async def run_test():
+            await self.store.set_retention_policy(("team",), RetentionPolicy(max_entries=10))
+            await self.store.store(("team",), "k", "searchable words")
+            await self.store.retrieve(("team",), "k")
+
+            with sqlite3.connect(self.store.db_path) as conn:
+                before = conn.execute("SELECT COUNT(*) FROM memories_fts_data").fetchone()[0]
+            await self.store.sweep()
+            with sqlite3.connect(self.store.db_path) as conn:
+                after = conn.execute("SELECT COUNT(*) FROM memories_fts_data").fetchone()[0]
+                access_count = conn.execute("SELECT access_count FROM memories").fetchone()[0]
+            self.assertEqual(before, after)
+            self.assertEqual(access_count, 1)
+            self.assertEqual(len(await self.store.search(("team",), "searchable")), 1)
+
+        asyncio.run(run_test())
+
+    def test_cache_follows_sweeps_and_ttl(self):
+        """Test that a cache in front drops swept and expired memories."""
+        async def run_test():
+            cached = CachedMemoryStore(self.store)
+            await cached.set_retention_policy(("team",), RetentionPolicy(max_entries=1, ttl_seconds=60))
+            await cached.store(("team",), "old", 1)
+            await cached.store(("team",), "new", 2)
+            await cached.retrieve(("team",), "old")
+            await cached.retrieve(("team",), "new")
+            await cached.retrieve(("team",), "new")  # cache hit still counts as a read
+
+            await cached.sweep()
+            self.assertIsNone(await cached.retrieve(("team",), "old"))
+            self.assertIsNotNone(await cached.retrieve(("team",), "new"))
+            with self.later(120):
+                self.assertIsNone(await cached.retrieve(("team",), "new"))
+
+        asyncio.run(run_test())
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class VectorSearchMixin:
+    """Vector and hybrid search tests shared by both backends."""
+
+    def make_store(self, name):
+        raise NotImplementedError
+
+    def setUp(self):
+        """Create a temporary directory and seed a few memories."""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = self.make_store("vectors")
+
+        async def seed():
+            await self.store.store_many(("proj", "ops"), [
+                {"key": "incident", "value": "The deployment failed because the staging database timed out"},
+                {"key": "standup", "value": "Team standup moved to ten o'clock"},
+            ])
+            await self.store.store(("proj", "dev"), "retro", "Deploy failures: add retries to database migrations")
+            await self.store.store(("other",), "incident", "Deployment of docs site failed")
+
+        asyncio.run(seed())
+
+    def tearDown(self):
+        """Clean up temporary directory."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def keys(self, results):
+        return [(r.memory.namespace, r.memory.key) for r in results]
+
+    def test_vector_finds_different_phrasing(self):
+        """Test that vector mode matches related wording that text search misses."""
+        async def run_test():
+            self.assertEqual(await self.store.search(("proj",), "failing deploys", mode="text"), [])
+            results = await self.store.search(("proj",), "failing deploys", mode="vector")
+            self.assertEqual(
+                set(self.keys(results)[:2]),
+                {(("proj", "ops"), "incident"), (("proj", "dev"), "retro")}
+            )
+            self.assertNotIn((("other",), "incident"), self.keys(results))
+
+        asyncio.run(run_test())
+
+    def test_index_follows_writes(self):
+        """Test incremental index updates on store, delete and clear."""
+        async def run_test():
+            await self.store.search(("proj",), "warmup", mode="vector")
+
+            await self.store.store(("proj", "ops"), "pager", "Pager alert: disk almost full")
+            results = await self.store.search(("proj",), "disk full alert", mode="vector", limit=1)
+            self.assertEqual(self.keys(results), [(("proj", "ops"), "pager")])
+
+            await self.store.delete(("proj", "ops"), "pager")
+            await self.store.clear_namespace(("proj", "dev"))
+            results = await self.store.search(("proj",), "disk full alert retries", mode="vector")
+            self.assertNotIn((("proj", "ops"), "pager"), self.keys(results))
+            self.assertNotIn((("proj", "dev"), "retro"), self.keys(results))
+
+            stats = await self.store.get_stats()
+            self.assertTrue(stats["vector_index"]["built"])
+            self.assertEqual(stats["vector_index"]["entries"], 3)
+
+        asyncio.run(run_test())
+
+    def test_hybrid_blends_rankings(self):
+        """Test that hybrid mode returns text and vector matches with blended scores."""
+        async def run_test():
+            results = await self.store.search(("proj",), "standup", mode="hybrid")
+            self.assertEqual(self.keys(results)[0], (("proj", "ops"), "standup"))
+            self.assertLessEqual(results[0].score, 1.0)
+
+        asyncio.run(run_test())
+
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected."""
+        with self.assertRaises(ValueError):
+            asyncio.run(self.store.search(("proj",), "x", mode="fuzzy"))
+
+
+class TestFileMemoryStoreVectorSearch(VectorSearchMixin, unittest.TestCase):
+    """Vector search on FileMemoryStore."""
+
+    def make_store(self, name):
+        return FileMemoryStore(file_path=os.path.join(self.test_dir, f"{name}.json"))
+
+    def test_index_built_off_the_loop(self):
+        """Test that the first vector search builds the index on a worker thread."""
+        async def run_test():
+            built_on = []
+            build = self.store._build_vector_index
+
+            def record_build():
+                built_on.append(threading.get_ident())
+                return build()
+
+            self.store._build_vector_index = record_build
+            await self.store.search(("proj",), "deploy", mode="vector")
+            await self.store.search(("proj",), "deploy", mode="hybrid")
+            self.assertEqual(len(built_on), 1)
+            self.assertNotEqual(built_on[0], threading.get_ident())
+
+        asyncio.run(run_test())
+
+
+class TestSQLiteMemoryStoreVectorSearch(VectorSearchMixin, unittest.TestCase):
+    """Vector search on SQLiteMemoryStore."""
+
+    def make_store(self, name):
+        return SQLiteMemoryStore(db_path=os.path.join(self.test_dir, f"{name}.db"))
+
+    def test_sweep_and_import_update_index(self):
+        """Test that sweeper removals and imports reach the index."""
+        async def run_test():
+            await self.store.search(("proj",), "warmup", mode="vector")
+            await self.store.set_retention_policy(("other",), RetentionPolicy(max_entries=1))
+            await self.store.store(("other",), "newer", "Deployment retried")
+            await self.store.sweep()
+            self.assertEqual((await self.store.get_stats())["vector_index"]["entries"], 4)
+
+            path = os.path.join(self.test_dir, "export.jsonl")
+            await self.store.export_jsonl(path)
+            await self.make_store("vectors").clear_namespace(("proj", "ops"))
+            await self.store.import_jsonl(path)
+            self.assertFalse((await self.store.get_stats())["vector_index"]["built"])
+            results = await self.store.search(("proj",), "staging database", mode="vector", limit=1)
+            self.assertEqual(self.keys(results), [(("proj", "ops"), "incident")])
+
+        asyncio.run(run_test())
+
+
 class TestMemoryStoreFactory(unittest.TestCase):
     """Tests for the get_memory_store factory function."""
 
@@ -445,6 +1316,16 @@ class TestMemoryStoreFactory(unittest.TestCase):
         )
         self.assertIsInstance(store, SQLiteMemoryStore)
 
+    def test_get_cached_store(self):
+        """Test wrapping a store in the LRU cache."""
+        store = get_memory_store(
+            "sqlite",
+            cache=True,
+            db_path=os.path.join(self.test_dir, "test.db")
+        )
+        self.assertIsInstance(store, CachedMemoryStore)
+        self.assertIsInstance(store.backend, SQLiteMemoryStore)
+
     def test_invalid_store_type(self):
         """Test that invalid store type raises error."""
         with self.assertRaises(ValueError):
@@ -0,0 +1,106 @@
+"""Tests for the hashed n-gram vector index behind memory similarity search."""
+
+import random
+import unittest
+
+from core.memory_index import NUMPY_AVAILABLE, HashingVectorizer, MemoryVectorIndex, memory_text
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+class TestMemoryText(unittest.TestCase):
+    """Tests for the text memories are embedded from."""
+
+    def test_includes_key_value_and_metadata(self):
+        text = memory_text("build-notes", {"status": "green"}, {"tags": ["ci"]})
+        for part in ("build-notes", "green", "ci"):
+            self.assertIn(part, text)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class TestHashingVectorizer(unittest.TestCase):
+    """Tests for the deterministic vectorizer."""
+
+    def test_deterministic_and_normalized(self):
+        vectorizer = HashingVectorizer(dimensions=64)
+        first = vectorizer.vector("deploy the staging cluster")
+        second = HashingVectorizer(dimensions=64).vector("deploy the staging cluster")
+        self.assertEqual(first.dtype, np.float32)
+        np.testing.assert_array_equal(first, second)
+        self.assertAlmostEqual(float(np.linalg.norm(first)), 1.0, places=5)
+
+    def test_empty_text(self):
+        self.assertFalse(HashingVectorizer().vector("  ... ").any())
+
+    def test_shared_subwords_are_similar(self):
+        vectorizer = HashingVectorizer()
+        query = vectorizer.vector("deployment failed")
+        related = vectorizer.vector("the deploy failure on friday")
+        unrelated = vectorizer.vector("lunch menu options")
+        self.assertGreater(float(query @ related), float(query @ unrelated))
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class TestMemoryVectorIndex(unittest.TestCase):
+    """Tests for incremental updates and top-k search."""
+
+    def setUp(self):
+        self.index = MemoryVectorIndex(dimensions=128)
+        self.index.upsert("proj/a", "deploy", "deploy the staging cluster")
+        self.index.upsert("proj/a", "lunch", "team lunch on friday")
+        self.index.upsert("proj/b", "rollout", "staging deployment rollout plan")
+        self.index.upsert("other", "deploy", "deploy docs site")
+
+    def test_ranks_similar_memories_first(self):
+        results = self.index.search("staging deploy", limit=2)
+        self.assertEqual({key for _, key, _ in results}, {"deploy", "rollout"})
+        self.assertGreaterEqual(results[0][2], results[1][2])
+
+    def test_namespace_prefix_filter(self):
+        results = self.index.search("deploy", ns_prefix="proj", limit=10)
+        self.assertTrue(results)
+        self.assertTrue(all(ns.startswith("proj") for ns, _, _ in results))
+
+    def test_upsert_replaces(self):
+        self.index.upsert("proj/a", "lunch", "staging cluster lunch deploy")
+        self.assertEqual(len(self.index), 4)
+        keys = [key for _, key, _ in self.index.search("staging cluster", ns_prefix="proj/a")]
+        self.assertIn("lunch", keys)
+
+    def test_remove_keeps_rows_contiguous(self):
+        self.assertTrue(self.index.remove("proj/a", "deploy"))
+        self.assertFalse(self.index.remove("proj/a", "deploy"))
+        self.assertEqual(len(self.index), 3)
+        found = {(ns, key) for ns, key, _ in self.index.search("deploy staging lunch docs", limit=10)}
+        self.assertNotIn(("proj/a", "deploy"), found)
+        self.assertIn(("other", "deploy"), found)
+
+        self.assertEqual(self.index.remove_namespace("proj/b"), 1)
+        self.assertEqual(len(self.index), 2)
+
+    def test_top_k_matches_full_sort(self):
+        rng = random.Random(7)
+        words = ["build", "deploy", "cache", "retry", "timeout", "shell", "agent", "merge"]
+        index = MemoryVectorIndex(dimensions=64)
+        for i in range(500):
+            index.upsert(f"ns{i % 5}", f"k{i}", " ".join(rng.choices(words, k=6)))
+
+        results = index.search("deploy timeout retry", limit=20)
+        scores = [score for _, _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+        rows = len(index)
+        query = {key: score for _, key, score in index.search("deploy timeout retry", limit=rows)}
+        best = sorted(query.values(), reverse=True)[:20]
+        np.testing.assert_allclose(scores, best, rtol=1e-6)
+
+    def test_grows_past_initial_capacity(self):
+        index = MemoryVectorIndex(dimensions=32)
+        index.upsert_many((f"ns", f"k{i}", f"note number {i}") for i in range(3000))
+        self.assertEqual(len(index), 3000)
+        self.assertGreaterEqual(index.stats()["bytes"], 3000 * 32 * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for the adaptive paste pipeline used for long commands."""
+
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from core.session import (
+    BRACKETED_PASTE_END,
+    BRACKETED_PASTE_START,
+    PASTE_CHUNK_CHARS,
+    ItermSession,
+)
+
+
+class FakeScreen:
+    """Minimal stand-in for iterm2.ScreenContents."""
+
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    @property
+    def number_of_lines(self):
+        return len(self._lines)
+
+    def line(self, index):
+        line = MagicMock()
+        line.string = self._lines[index]
+        return line
+
+
+class FakeTerminal:
+    """Pane whose screen shows a paste only after a number of screen reads."""
+
+    def __init__(self, reads_until_shown, shown):
+        self.reads_until_shown = reads_until_shown
+        self.shown = shown
+        self.sent = []
+        self.reads = 0
+
+    async def send(self, text):
+        self.sent.append(text)
+
+    async def screen(self):
+        self.reads += 1
+        pasted = self.sent and self.reads > self.reads_until_shown
+        return FakeScreen(["$ "] + (self.shown if pasted else []))
+
+
+def make_session(terminal):
+    iterm_session = MagicMock()
+    iterm_session.session_id = "session-1"
+    iterm_session.name = "agent"
+    iterm_session.async_send_text = AsyncMock(side_effect=terminal.send)
+    iterm_session.async_get_screen_contents = AsyncMock(side_effect=terminal.screen)
+    return ItermSession(iterm_session)
+
+
+class TestPastePipeline(unittest.IsolatedAsyncioTestCase):
+    """Test chunked bracketed pastes and Enter confirmation."""
+
+    def setUp(self):
+        self.payload = "\n".join(f"line {i}: " + "x" * 70 for i in range(120)) + "\nend of prompt"
+
+    async def test_enter_follows_echo(self):
+        terminal = FakeTerminal(reads_until_shown=2, shown=["$ ...", "end of prompt"])
+        session = make_session(terminal)
+
+        # The fixed delay for this payload would be much longer
+        with patch("core.session.calculate_text_delay", return_value=5.0):
+            start = time.monotonic()
+            await session.execute_command(self.payload)
+            elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(terminal.sent[0], BRACKETED_PASTE_START)
+        self.assertEqual(terminal.sent[-2:], [BRACKETED_PASTE_END, "\r"])
+        body = terminal.sent[1:-2]
+        self.assertEqual("".join(body), self.payload)
+        self.assertTrue(all(len(chunk) <= PASTE_CHUNK_CHARS for chunk in body))
+        self.assertEqual(session.paste_stats["confirmed"], 1)
+
+    async def test_settled_placeholder_confirms(self):
+        terminal = FakeTerminal(reads_until_shown=1, shown=["[Pasted text #1 +120 lines]"])
+        session = make_session(terminal)
+
+        with patch("core.session.calculate_text_delay", return_value=5.0):
+            start = time.monotonic()
+            await session.execute_command(self.payload)
+            elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(terminal.sent[-1], "\r")
+        self.assertEqual(session.paste_stats["confirmed"], 1)
+
+    async def test_falls_back_to_fixed_delay(self):
+        terminal = FakeTerminal(reads_until_shown=10**6, shown=[])
+        session = make_session(terminal)
+        session.bracketed_paste = False
+
+        with patch("core.session.calculate_text_delay", return_value=0.2):
+            start = time.monotonic()
+            await session.execute_command(self.payload)
+            elapsed = time.monotonic() - start
+
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertEqual("".join(terminal.sent[:-1]), self.payload)
+        self.assertEqual(session.paste_stats["fallbacks"], 1)
+
+    async def test_short_commands_skip_pipeline(self):
+        terminal = FakeTerminal(reads_until_shown=0, shown=[])
+        session = make_session(terminal)
+        await session.execute_command("ls -la")
+        self.assertEqual(terminal.sent, ["ls -la", "\r"])
+        self.assertEqual(terminal.reads, 0)
+        self.assertEqual(session.paste_stats["pastes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
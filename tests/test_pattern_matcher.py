@@ -0,0 +1,226 @@
+"""Tests for the combined multi-pattern matcher and its users."""
+
+import re
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from core.flows import EventBus, ListenerRegistry
+from core.pattern_matcher import PatternMatcher, rescan_offset
+from core.session import ExpectTimeout, ItermSession
+
+
+class TestPatternMatcher(unittest.TestCase):
+    """Test the matcher on its own."""
+
+    def test_search_prefers_earlier_pattern(self):
+        matcher = PatternMatcher()
+        matcher.add("prompt", r"\$ $")
+        matcher.add("error", r"error: \w+")
+
+        # The error appears first in the text, but the prompt was added first
+        key, match = matcher.search("error: boom\n$ ")
+        self.assertEqual(key, "prompt")
+        self.assertEqual(match.group(0), "$ ")
+
+        key, match = matcher.search("error: boom\n")
+        self.assertEqual((key, match.group(0)), ("error", "error: boom"))
+
+    def test_earlier_pattern_inside_consumed_span(self):
+        """Test that a match hidden inside another pattern's match is found."""
+        matcher = PatternMatcher()
+        matcher.add("word", r"timeout")
+        matcher.add("line", r"error: .*")
+        key, _ = matcher.search("error: connection timeout")
+        self.assertEqual(key, "word")
+
+    def test_no_match_is_one_scan(self):
+        matcher = PatternMatcher()
+        for i in range(200):
+            matcher.add(i, rf"pattern-{i}\b")
+        self.assertIsNone(matcher.search("nothing interesting here"))
+        self.assertEqual(matcher.search_all("still nothing"), [])
+        self.assertEqual(matcher.prefilter_skips, 2)
+
+    def test_match_objects_are_per_pattern(self):
+        """Test that groups are numbered as in the original pattern."""
+        matcher = PatternMatcher()
+        matcher.add("a", r"(\d+) passed")
+        matcher.add("b", r"(\d+) failed")
+        results = dict(matcher.search_all("3 passed, 1 failed"))
+        self.assertEqual(results["a"].group(1), "3")
+        self.assertEqual(results["b"].group(1), "1")
+
+    def test_standalone_patterns(self):
+        """Test patterns that cannot join the alternation still match."""
+        matcher = PatternMatcher()
+        matcher.add("flags", re.compile("ERROR", re.IGNORECASE))
+        matcher.add("named", r"(?P<code>\d{3}) response")
+        matcher.add("backref", r"(\w)\1")
+        matcher.add("plain", r"xyz")
+        results = dict(matcher.search_all("error: 500 response, aa"))
+        self.assertEqual(sorted(results), ["backref", "flags", "named"])
+        self.assertEqual(results["named"].group("code"), "500")
+
+    def test_min_end_skips_context_matches(self):
+        matcher = PatternMatcher()
+        matcher.add("err", r"error")
+        text = "error (old)\nerror (new)"
+        boundary = text.index("\n") + 1
+        [(_, match)] = matcher.search_all(text, min_end=boundary)
+        self.assertEqual(match.start(), boundary)
+        self.assertEqual(matcher.search_all("error\nok", min_end=6), [])
+
+    def test_remove(self):
+        matcher = PatternMatcher()
+        matcher.add("a", "foo")
+        self.assertTrue(matcher.remove("a"))
+        self.assertFalse(matcher.remove("a"))
+        self.assertIsNone(matcher.search("foo"))
+        self.assertEqual(len(matcher), 0)
+
+
+class TestRescanOffset(unittest.TestCase):
+    """Test where incremental scans resume."""
+
+    def test_appended_line(self):
+        old = "line 1\nline 2"
+        new = old + "\nline 3"
+        self.assertEqual(rescan_offset(old, new, overlap=0), new.index("line 3"))
+        self.assertEqual(rescan_offset(old, new, overlap=2), new.index("line 3") - 2)
+
+    def test_scrolled_output(self):
+        old = "one\ntwo\nthree"
+        new = "two\nthree\nfour"
+        self.assertEqual(rescan_offset(old, new, overlap=0), new.index("four"))
+
+    def test_edited_last_line(self):
+        self.assertEqual(rescan_offset("a\n$ ma", "a\n$ make", overlap=0), 2)
+
+    def test_no_previous_text(self):
+        self.assertEqual(rescan_offset("", "anything"), 0)
+
+
+class FakeScreen:
+    """Minimal stand-in for iterm2.ScreenContents."""
+
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    @property
+    def number_of_lines(self):
+        return len(self._lines)
+
+    def line(self, index):
+        line = MagicMock()
+        line.string = self._lines[index]
+        return line
+
+
+class TestExpectScanning(unittest.IsolatedAsyncioTestCase):
+    """Test that expect() scans only changed output."""
+
+    async def asyncSetUp(self):
+        self.screens = [["$ make"], ["$ make", "building"], ["$ make", "building", "done"]]
+        iterm_session = MagicMock()
+        iterm_session.session_id = "session-1"
+        iterm_session.name = "pane"
+        iterm_session.async_get_screen_contents = AsyncMock(
+            side_effect=lambda: FakeScreen(
+                self.screens.pop(0) if len(self.screens) > 1 else self.screens[0]
+            )
+        )
+        self.session = ItermSession(iterm_session)
+
+    async def test_expect_matches_appended_output(self):
+        result = await self.session.expect(
+            [r"\bdone$", r"error"], timeout=2, poll_interval=0.01
+        )
+        self.assertEqual(result.match_index, 0)
+        self.assertEqual(result.before, "$ make\nbuilding\n")
+
+    async def test_expect_reports_list_index(self):
+        result = await self.session.expect(
+            [ExpectTimeout(2), "nope", re.compile("BUILD", re.IGNORECASE)],
+            poll_interval=0.01
+        )
+        self.assertEqual(result.match_index, 2)
+        self.assertEqual(result.matched_text, "build")
+
+
+class TestEventBusPatterns(unittest.IsolatedAsyncioTestCase):
+    """Test pattern subscriptions on the event bus."""
+
+    async def asyncSetUp(self):
+        self.bus = EventBus(registry=ListenerRegistry())
+        self.matches = []
+
+        async def on_match(text, match):
+            self.matches.append(text)
+
+        self.on_match = on_match
+
+    async def test_each_subscription_triggers_once(self):
+        ids = [
+            await self.bus.subscribe_to_pattern(rf"job {i} done", self.on_match)
+            for i in range(50)
+        ]
+        triggered = await self.bus.process_terminal_output("s1", "job 7 done\njob 42 done")
+        self.assertEqual(triggered, [ids[7], ids[42]])
+
+        # Earlier output is context only and does not trigger again
+        triggered = await self.bus.process_terminal_output("s1", "idle")
+        self.assertEqual(triggered, [])
+        self.assertEqual(self.matches, ["job 7 done", "job 42 done"])
+
+    async def test_match_spanning_chunks(self):
+        await self.bus.subscribe_to_pattern(r"Traceback.*\n.*Error", self.on_match)
+        await self.bus.process_terminal_output("s1", "Traceback (most recent call last):")
+        self.assertEqual(self.matches, [])
+        await self.bus.process_terminal_output("s1", "ValueError: bad")
+        self.assertEqual(len(self.matches), 1)
+
+        # Another session has its own context
+        await self.bus.process_terminal_output("s2", "ValueError: bad")
+        self.assertEqual(len(self.matches), 1)
+
+    async def test_anchored_pattern_binds_at_each_chunk(self):
+        sub_id = await self.bus.subscribe_to_pattern(r"^ERROR", self.on_match)
+        self.assertEqual(await self.bus.process_terminal_output("s1", "ERROR: first"), [sub_id])
+        self.assertEqual(await self.bus.process_terminal_output("s1", "ERROR: second"), [sub_id])
+        self.assertEqual(await self.bus.process_terminal_output("s1", "ok ERROR"), [])
+
+        start_id = await self.bus.subscribe_to_pattern(r"\Abuild", self.on_match)
+        triggered = await self.bus.process_terminal_output("s1", "build ok")
+        self.assertEqual(triggered, [start_id])
+        self.assertEqual(self.matches, ["ERROR", "ERROR", "build"])
+
+    async def test_unsubscribe(self):
+        sub_id = await self.bus.subscribe_to_pattern("ping", self.on_match)
+        self.assertTrue(await self.bus.unsubscribe_from_pattern(sub_id))
+        self.assertEqual(await self.bus.process_terminal_output("s1", "ping"), [])
+
+    async def test_session_context_released(self):
+        """Test that output tails are dropped for closed sessions and unsubscribes."""
+        sub_id = await self.bus.subscribe_to_pattern(r"Traceback.*\n.*Error", self.on_match)
+        await self.bus.process_terminal_output("s1", "Traceback (most recent call last):")
+        await self.bus.process_terminal_output("s2", "Traceback (most recent call last):")
+
+        self.bus.forget_session("s1")
+        await self.bus.process_terminal_output("s1", "ValueError: bad")
+        self.assertEqual(self.matches, [])
+        self.assertEqual(list(self.bus._output_tails), ["s2", "s1"])
+
+        await self.bus.unsubscribe_from_pattern(sub_id)
+        self.assertEqual(self.bus._output_tails, {})
+
+    async def test_failing_callback_is_isolated(self):
+        async def broken(text, match):
+            raise RuntimeError("boom")
+
+        await self.bus.subscribe_to_pattern("ping", broken)
+        ok_id = await self.bus.subscribe_to_pattern("ping", self.on_match)
+        self.assertEqual(await self.bus.process_terminal_output("s1", "ping"), [ok_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -97,6 +97,9 @@ class TestPersistentSessions(unittest.TestCase):
         async def test_impl():
             # Get the persistent ID
             persistent_id = self.test_session.persistent_id
+
+            # Registrations are written in the background; flush them now
+            self.terminal.log_manager.flush()
             
             # Check if the persistent sessions file was created
             persistent_sessions_file = os.path.join(self.temp_dir, "persistent_sessions.json")
@@ -146,6 +149,9 @@ class TestPersistentSessions(unittest.TestCase):
             await self.test_session.send_text(f"echo '{unique_marker}'\n")
             await asyncio.sleep(1)
             
+            # Persist the registry as a shutdown would
+            self.terminal.log_manager.flush()
+
             # Create a new terminal manager (simulating a new connection)
             new_terminal = ItermTerminal(
                 connection=self.connection,
@@ -0,0 +1,149 @@
+"""Tests for the batched persistent-session store."""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+from utils.logging import ItermLogManager, PersistentSessionStore
+
+
+class TestPersistentSessionStore(unittest.IsolatedAsyncioTestCase):
+    """Test dirty tracking, the reverse index and coalesced flushing."""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "persistent_sessions.json")
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read_file(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    async def test_registrations_are_coalesced(self):
+        """Test that many registrations produce a single background write."""
+        store = PersistentSessionStore(self.path, flush_delay=0.01)
+        for i in range(50):
+            store.register(f"session-{i}", f"persistent-{i}", f"pane-{i}")
+
+        self.assertEqual(store.write_count, 0)
+        self.assertTrue(store.is_dirty)
+
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(store.write_count, 1)
+        self.assertFalse(store.is_dirty)
+        self.assertEqual(len(self._read_file()), 50)
+
+    async def test_reverse_index(self):
+        """Test session_id → persistent_id lookups, including re-binding."""
+        store = PersistentSessionStore(self.path, flush_delay=60)
+        store.register("session-a", "p-1", "pane")
+        self.assertEqual(store.find_persistent_id("session-a"), "p-1")
+
+        # The persistent ID reconnects to a new iTerm2 session
+        store.register("session-b", "p-1", "pane")
+        self.assertEqual(store.find_persistent_id("session-b"), "p-1")
+        self.assertIsNone(store.find_persistent_id("session-a"))
+        store.flush()
+
+    async def test_unchanged_registration_is_clean(self):
+        """Test that re-registering an unchanged session does not dirty the store."""
+        store = PersistentSessionStore(self.path, flush_delay=60)
+        store.register("session-a", "p-1", "pane")
+        store.flush()
+
+        store.register("session-a", "p-1", "pane")
+        self.assertFalse(store.is_dirty)
+
+        store.register("session-a", "p-1", "renamed")
+        self.assertTrue(store.is_dirty)
+        store.flush()
+
+    async def test_flush_is_atomic_and_reloadable(self):
+        """Test that flush leaves no temp files and round-trips through load."""
+        store = PersistentSessionStore(self.path, flush_delay=60)
+        store.register("session-a", "p-1", "pane")
+        self.assertTrue(store.flush())
+
+        self.assertEqual(os.listdir(self.temp_dir), ["persistent_sessions.json"])
+        reloaded = PersistentSessionStore(self.path)
+        self.assertEqual(reloaded.get("p-1")["session_id"], "session-a")
+        self.assertEqual(reloaded.find_persistent_id("session-a"), "p-1")
+
+    async def test_stale_snapshot_does_not_overwrite(self):
+        """Test that an older snapshot is skipped once a newer one is written."""
+        store = PersistentSessionStore(self.path, flush_delay=60)
+        store.register("session-a", "p-1", "old")
+        old_snapshot, old_generation = dict(store.sessions), store._generation
+        store.register("session-a", "p-1", "new")
+        store.flush()
+
+        store._write(old_snapshot, old_generation)
+        self.assertEqual(self._read_file()["p-1"]["name"], "new")
+
+    async def test_refresh_cost_independent_of_history(self):
+        """Test that re-registering live panes costs no writes at any history size."""
+        for history_size in (10, 5000):
+            path = os.path.join(self.temp_dir, f"history_{history_size}.json")
+            history = {
+                str(uuid.uuid4()): {
+                    "session_id": f"old-{i}",
+                    "name": f"old-{i}",
+                    "last_seen": "2020-01-01T00:00:00",
+                }
+                for i in range(history_size)
+            }
+            with open(path, "w") as f:
+                json.dump(history, f)
+
+            store = PersistentSessionStore(path, flush_delay=60)
+            for i in range(50):
+                store.register(f"live-{i}", f"p-live-{i}", f"pane-{i}")
+            store.flush()
+            writes_after_first_listing = store.write_count
+
+            # Subsequent refreshes see the same panes and cost nothing
+            for _ in range(10):
+                for i in range(50):
+                    store.register(f"live-{i}", f"p-live-{i}", f"pane-{i}")
+            self.assertFalse(store.is_dirty)
+            self.assertEqual(store.write_count, writes_after_first_listing)
+
+
+class TestLogManagerPersistence(unittest.TestCase):
+    """Test ItermLogManager's use of the store outside an event loop."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_get_session_logger_reuses_persistent_id(self):
+        """Test that a known session ID maps back to its persistent ID."""
+        manager = ItermLogManager(log_dir=self.temp_dir, enable_app_log=False)
+        logger = manager.get_session_logger("session-a", "pane")
+        manager.remove_session_logger("session-a")
+
+        again = manager.get_session_logger("session-a", "pane")
+        self.assertEqual(again.persistent_id, logger.persistent_id)
+        self.assertEqual(manager.find_persistent_id("session-a"), logger.persistent_id)
+
+    def test_flush_persists_registry(self):
+        """Test that flush() writes the registry for the next manager."""
+        manager = ItermLogManager(log_dir=self.temp_dir, enable_app_log=False)
+        manager.register_persistent_session("session-a", "p-1", "pane")
+        manager.flush()
+
+        reloaded = ItermLogManager(log_dir=self.temp_dir, enable_app_log=False)
+        self.assertEqual(reloaded.get_persistent_session("p-1")["session_id"], "session-a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for the line-level screen diff engine."""
+
+import unittest
+
+from core.screen_diff import ScreenSnapshot, detect_scroll, diff_screens
+
+
+def snap(version, *lines):
+    """Build a snapshot with the given lines."""
+    return ScreenSnapshot(version=version, lines=tuple(lines), captured_at=0.0)
+
+
+class TestDetectScroll(unittest.TestCase):
+    """Test scroll (shift) detection."""
+
+    def test_no_scroll(self):
+        old = snap(1, "a", "b", "c")
+        new = snap(2, "a", "b", "x")
+        self.assertEqual(detect_scroll(old.hashes, new.hashes), 0)
+
+    def test_scroll_by_several_lines(self):
+        old = snap(1, "a", "b", "c", "d", "e")
+        new = snap(2, "c", "d", "e", "f", "g")
+        self.assertEqual(detect_scroll(old.hashes, new.hashes), 2)
+
+    def test_repeated_lines_prefer_best_alignment(self):
+        old = snap(1, "$ ls", "a", "$ ls", "b", "$ ls", "c")
+        new = snap(2, "$ ls", "b", "$ ls", "c", "$ ls", "d")
+        self.assertEqual(detect_scroll(old.hashes, new.hashes), 2)
+
+    def test_blank_lines_are_not_anchors(self):
+        old = snap(1, "", "", "a", "")
+        new = snap(2, "", "", "b", "")
+        self.assertEqual(detect_scroll(old.hashes, new.hashes), 0)
+
+
+class TestDiffScreens(unittest.TestCase):
+    """Test the deltas produced by diff_screens."""
+
+    def test_first_snapshot_is_all_new(self):
+        delta = diff_screens(None, snap(1, "a", "", "b"))
+        self.assertEqual(delta.lines, ("a", "b"))
+        self.assertEqual(delta.from_version, 0)
+
+    def test_identical_screens(self):
+        old = snap(3, "a", "b")
+        self.assertTrue(diff_screens(old, old).is_empty)
+        self.assertTrue(diff_screens(old, snap(4, "a", "b")).is_empty)
+
+    def test_output_filling_blank_rows(self):
+        delta = diff_screens(snap(1, "$ ls", "", ""), snap(2, "$ ls", "file", "$ "))
+        self.assertEqual(delta.scrolled, 0)
+        self.assertEqual(delta.changed, ((1, "file"), (2, "$ ")))
+        self.assertEqual(delta.text(), "file\n$ ")
+        self.assertEqual(delta.ranges, [(1, 3)])
+
+    def test_scroll_reports_only_appended_lines(self):
+        old = snap(1, *[f"line {i}" for i in range(40)], "$ make")
+        new = snap(2, *[f"line {i}" for i in range(3, 40)], "$ make", "ok", "done", "$ ")
+        delta = diff_screens(old, new)
+        self.assertEqual(delta.scrolled, 3)
+        self.assertEqual(delta.changed, ())
+        self.assertEqual(delta.appended, ("ok", "done", "$ "))
+        self.assertEqual(delta.ranges, [(38, 41)])
+
+    def test_scroll_with_in_place_change(self):
+        old = snap(1, "a", "b", "c", "$ run")
+        new = snap(2, "b", "c", "$ run ok", "$ ")
+        delta = diff_screens(old, new)
+        self.assertEqual(delta.scrolled, 1)
+        self.assertEqual(delta.changed, ((2, "$ run ok"),))
+        self.assertEqual(delta.appended, ("$ ",))
+
+    def test_cleared_screen(self):
+        delta = diff_screens(snap(1, "a", "b"), snap(2, "", ""))
+        self.assertFalse(delta.is_empty)
+        self.assertEqual(delta.lines, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Tests for streaming and adaptive-polling screen monitoring."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from core.session import ItermSession
+
+
+class FakeScreen:
+    """Minimal stand-in for iterm2.ScreenContents."""
+
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    @property
+    def number_of_lines(self):
+        return len(self._lines)
+
+    def line(self, index):
+        line = MagicMock()
+        line.string = self._lines[index]
+        return line
+
+
+class FakeStreamer:
+    """Stand-in for iterm2.ScreenStreamer driven by a queue of notifications."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.updates = asyncio.Queue()
+
+    async def __aenter__(self):
+        if self.fail:
+            raise RuntimeError("subscription refused")
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def async_get(self):
+        await self.updates.get()
+
+
+class MonitoringTestCase(unittest.IsolatedAsyncioTestCase):
+    """Shared fixture: a session whose screen is a mutable list of lines."""
+
+    async def asyncSetUp(self):
+        self.screen = ["$ ", "", ""]
+        self.iterm_session = MagicMock()
+        self.iterm_session.session_id = "session-1"
+        self.iterm_session.name = "pane"
+        self.iterm_session.async_get_screen_contents = AsyncMock(
+            side_effect=lambda: FakeScreen(self.screen)
+        )
+        self.iterm_session.async_send_text = AsyncMock()
+        self.streamer = FakeStreamer()
+        self.iterm_session.get_screen_streamer = MagicMock(return_value=self.streamer)
+        self.session = ItermSession(self.iterm_session)
+
+        self.received = []
+        self.delivered = asyncio.Event()
+
+        async def callback(content):
+            self.received.append(content)
+            self.delivered.set()
+
+        self.session.add_monitor_callback(callback)
+
+    async def asyncTearDown(self):
+        await self.session.stop_monitoring()
+
+    @property
+    def fetches(self):
+        return self.iterm_session.async_get_screen_contents.await_count
+
+    async def wait_for_delivery(self):
+        await asyncio.wait_for(self.delivered.wait(), timeout=1.0)
+        self.delivered.clear()
+
+
+class TestStreamingMonitor(MonitoringTestCase):
+    """Test notification-driven monitoring."""
+
+    async def test_idle_stream_makes_no_reads(self):
+        """Test that an idle streamed session costs no screen reads."""
+        await self.session.start_monitoring(update_interval=0.01)
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.session.monitor_mode, "stream")
+
+        baseline = self.fetches
+        await asyncio.sleep(0.2)
+        self.assertEqual(self.fetches, baseline)
+        self.assertEqual(self.received, [])
+
+    async def test_notification_delivers_changed_lines(self):
+        """Test that callbacks receive only the lines that changed."""
+        await self.session.start_monitoring(update_interval=0.01)
+        await asyncio.sleep(0.05)
+
+        self.screen = ["$ echo hi", "hi", ""]
+        self.streamer.updates.put_nowait(None)
+        await self.wait_for_delivery()
+        self.assertEqual(self.received, ["$ echo hi\nhi"])
+
+        self.screen = ["$ echo hi", "hi", "$ "]
+        self.streamer.updates.put_nowait(None)
+        await self.wait_for_delivery()
+        self.assertEqual(self.received[-1], "$ ")
+
+    async def test_scrolled_output_delivers_only_new_lines(self):
+        """Test that scrolling output is not re-delivered as a whole screen."""
+        self.screen = ["one", "two", "three"]
+        await self.session.start_monitoring(update_interval=0.01)
+        await asyncio.sleep(0.05)
+
+        deltas = []
+
+        async def delta_callback(delta):
+            deltas.append(delta)
+
+        self.session.add_monitor_callback(delta_callback, want_delta=True)
+
+        self.screen = ["two", "three", "four"]
+        self.streamer.updates.put_nowait(None)
+        await self.wait_for_delivery()
+        self.assertEqual(self.received, ["four"])
+        self.assertEqual(deltas[-1].scrolled, 1)
+        self.assertEqual(deltas[-1].appended, ("four",))
+
+    async def test_catch_up_after_missed_notification(self):
+        """Test that output after the last notification is still delivered."""
+        await self.session.start_monitoring(update_interval=0.01)
+        await asyncio.sleep(0.05)
+
+        self.screen = ["$ make", "", ""]
+        self.streamer.updates.put_nowait(None)
+        await self.wait_for_delivery()
+
+        # The streamer drops this update; the catch-up read finds it
+        self.screen = ["$ make", "done", ""]
+        await self.wait_for_delivery()
+        self.assertEqual(self.received[-1], "done")
+
+    async def test_falls_back_to_polling(self):
+        """Test that a failed subscription switches to polling in auto mode."""
+        self.streamer.fail = True
+        await self.session.start_monitoring(update_interval=0.01)
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.session.monitor_mode, "poll")
+
+        self.screen = ["$ ls", "file.txt", ""]
+        await self.wait_for_delivery()
+        self.assertEqual(self.received, ["$ ls\nfile.txt"])
+
+
+class TestAdaptivePolling(MonitoringTestCase):
+    """Test the polling fallback."""
+
+    async def test_idle_polling_backs_off(self):
+        """Test that polls thin out while the screen stays the same."""
+        await self.session.start_monitoring(update_interval=0.01, mode="poll")
+        await asyncio.sleep(0.5)
+
+        # A fixed 10ms interval would poll ~50 times
+        self.assertLess(self.session.monitor_stats["polls"], 15)
+        self.assertGreater(self.session.monitor_stats["polls"], 0)
+
+    async def test_input_wakes_poller(self):
+        """Test that sending input tightens polling immediately."""
+        await self.session.start_monitoring(update_interval=0.01, mode="poll")
+        await asyncio.sleep(0.5)
+
+        self.screen = ["$ pwd", "/tmp", ""]
+        await self.session.send_text("pwd")
+        await asyncio.wait_for(self.delivered.wait(), timeout=0.2)
+        self.assertEqual(self.received, ["$ pwd\n/tmp"])
+
+    async def test_stop_monitoring(self):
+        """Test that stopping ends the poll loop."""
+        await self.session.start_monitoring(update_interval=0.01, mode="poll")
+        self.assertTrue(self.session.is_monitoring)
+        await self.session.stop_monitoring()
+        self.assertFalse(self.session.is_monitoring)
+        self.assertIsNone(self.session.monitor_mode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""Tests for the shared screen-snapshot cache on ItermSession."""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from core.session import ItermSession, ScreenSnapshot
+
+
+class FakeScreen:
+    """Minimal stand-in for iterm2.ScreenContents."""
+
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    @property
+    def number_of_lines(self):
+        return len(self._lines)
+
+    def line(self, index):
+        line = MagicMock()
+        line.string = self._lines[index]
+        return line
+
+
+class TestScreenSnapshotCache(unittest.IsolatedAsyncioTestCase):
+    """Test single-flight fetching, freshness and versioning."""
+
+    async def asyncSetUp(self):
+        self.screen = ["$ echo hi", "hi", "", "$"]
+        self.fetch_delay = 0.0
+
+        async def get_contents():
+            screen = FakeScreen(self.screen)
+            if self.fetch_delay:
+                await asyncio.sleep(self.fetch_delay)
+            return screen
+
+        self.iterm_session = MagicMock()
+        self.iterm_session.session_id = "session-1"
+        self.iterm_session.name = "pane"
+        self.iterm_session.async_get_screen_contents = AsyncMock(side_effect=get_contents)
+        self.iterm_session.async_send_text = AsyncMock()
+        self.session = ItermSession(self.iterm_session)
+
+    @property
+    def fetches(self):
+        return self.iterm_session.async_get_screen_contents.await_count
+
+    async def test_concurrent_readers_share_one_fetch(self):
+        """Test that readers in the same tick share one in-flight fetch."""
+        self.fetch_delay = 0.02
+        results = await asyncio.gather(*[
+            self.session.get_screen_contents() for _ in range(10)
+        ])
+        self.assertEqual(self.fetches, 1)
+        self.assertEqual(set(results), {"$ echo hi\nhi\n$"})
+        self.assertEqual(self.session.snapshot_stats["shared_fetches"], 9)
+
+    async def test_fresh_snapshot_served_from_cache(self):
+        """Test that readers within the freshness window skip the API."""
+        await self.session.get_screen_contents()
+        await self.session.get_screen_contents(max_lines=20)
+        self.assertEqual(self.fetches, 1)
+
+        await self.session.get_screen_contents(max_age=0)
+        self.assertEqual(self.fetches, 2)
+
+    async def test_max_lines_matches_previous_rendering(self):
+        """Test that max_lines counts screen lines and drops empty ones."""
+        self.assertEqual(await self.session.get_screen_contents(max_lines=2), "$ echo hi\nhi")
+        self.assertEqual(await self.session.get_screen_contents(max_lines=3), "$ echo hi\nhi")
+
+    async def test_version_changes_only_with_content(self):
+        """Test that the version is bumped only when the screen changes."""
+        first = await self.session.get_screen_snapshot(max_age=0)
+        same = await self.session.get_screen_snapshot(max_age=0)
+        self.assertEqual(first.version, same.version)
+
+        self.screen = self.screen + ["new output"]
+        changed = await self.session.get_screen_snapshot(max_age=0)
+        self.assertEqual(changed.version, first.version + 1)
+
+    async def test_newer_than_bypasses_cache(self):
+        """Test asking for a snapshot newer than a known version."""
+        first = await self.session.get_screen_snapshot()
+        cached = await self.session.get_screen_snapshot(newer_than=first.version - 1)
+        self.assertIs(cached, first)
+        self.assertEqual(self.fetches, 1)
+
+        self.screen = ["changed"]
+        newer = await self.session.get_screen_snapshot(newer_than=first.version)
+        self.assertEqual(self.fetches, 2)
+        self.assertGreater(newer.version, first.version)
+
+    async def test_input_invalidates_cache(self):
+        """Test that sending input forces the next reader to fetch again."""
+        await self.session.get_screen_contents()
+        await self.session.send_text("ls", execute=False)
+        await self.session.get_screen_contents()
+        self.assertEqual(self.fetches, 2)
+
+    async def test_stale_fetch_does_not_replace_newer_snapshot(self):
+        """Test that a fetch detached by invalidation cannot overwrite a newer one."""
+        self.fetch_delay = 0.05
+        slow = asyncio.ensure_future(self.session.get_screen_snapshot())
+        await asyncio.sleep(0)
+
+        self.session.invalidate_screen_snapshot()
+        self.fetch_delay = 0.0
+        self.screen = ["after input"]
+        fresh = await self.session.get_screen_snapshot()
+
+        await slow
+        self.assertIs(self.session.screen_snapshot, fresh)
+        self.assertEqual(fresh.lines, ("after input",))
+
+    async def test_fetch_in_flight_at_invalidation_is_not_cached(self):
+        """Test that a screen read before input is never served as fresh."""
+        self.fetch_delay = 0.05
+        slow = asyncio.ensure_future(self.session.get_screen_snapshot())
+        await asyncio.sleep(0)
+
+        self.session.invalidate_screen_snapshot()
+        self.screen = ["after input"]
+        await slow
+
+        self.fetch_delay = 0.0
+        current = await self.session.get_screen_snapshot()
+        self.assertEqual(self.fetches, 2)
+        self.assertEqual(current.lines, ("after input",))
+
+    async def test_logger_receives_only_new_lines(self):
+        """Test that repeated reads do not log the same screen again."""
+        self.session.logger = MagicMock()
+        await self.session.get_screen_contents()
+        await self.session.get_screen_contents(max_age=0)
+
+        self.screen = ["hi", "", "$", "$ ls", "file"]
+        await self.session.get_screen_contents(max_age=0)
+
+        logged = [c.args[0] for c in self.session.logger.log_output.call_args_list]
+        self.assertEqual(logged, ["$ echo hi\nhi\n$", "$ ls\nfile"])
+
+    async def test_fetch_errors_propagate_and_reset(self):
+        """Test that a failed fetch reaches all readers and is not cached."""
+        self.iterm_session.async_get_screen_contents.side_effect = RuntimeError("boom")
+        with self.assertRaises(RuntimeError):
+            await self.session.get_screen_contents()
+        self.assertIsNone(self.session.screen_snapshot)
+
+        self.iterm_session.async_get_screen_contents.side_effect = None
+        self.iterm_session.async_get_screen_contents.return_value = FakeScreen(["ok"])
+        self.assertEqual(await self.session.get_screen_contents(), "ok")
+
+
+class TestScreenSnapshot(unittest.TestCase):
+    """Test the ScreenSnapshot value object."""
+
+    def test_text(self):
+        snapshot = ScreenSnapshot(version=1, lines=("a", "", "b"), captured_at=0.0)
+        self.assertEqual(snapshot.text(), "a\nb")
+        self.assertEqual(snapshot.text(1), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
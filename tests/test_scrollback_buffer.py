@@ -0,0 +1,93 @@
+"""Tests for the scrollback ring buffer and sequence-based command markers."""
+
+import shutil
+import tempfile
+import unittest
+
+from utils.logging import ItermSessionLogger, ScrollbackBuffer
+
+
+class TestScrollbackBuffer(unittest.TestCase):
+    """Test the ring buffer itself."""
+
+    def test_sequence_numbers_survive_wraparound(self):
+        buf = ScrollbackBuffer(3)
+        self.assertEqual(buf.extend(["a", "b"]), [])
+        self.assertEqual(buf.extend(["c", "d", "e"]), ["a", "b"])
+
+        self.assertEqual(buf.first_seq, 2)
+        self.assertEqual(buf.next_seq, 5)
+        self.assertEqual(len(buf), 3)
+        self.assertEqual(list(buf), ["c", "d", "e"])
+        self.assertEqual(buf.read(3, 5), ["d", "e"])
+
+    def test_read_clamps_to_retained_range(self):
+        buf = ScrollbackBuffer(4)
+        buf.extend([str(i) for i in range(10)])
+        self.assertEqual(buf.read(0), ["6", "7", "8", "9"])
+        self.assertEqual(buf.read(8, 100), ["8", "9"])
+        self.assertEqual(buf.read(10), [])
+
+    def test_batch_larger_than_capacity(self):
+        buf = ScrollbackBuffer(2)
+        buf.extend(["x"])
+        self.assertEqual(buf.extend(["a", "b", "c"]), ["x", "a"])
+        self.assertEqual(buf.tail(), ["b", "c"])
+
+    def test_tail(self):
+        buf = ScrollbackBuffer(5)
+        buf.extend(["a", "b", "c", "d", "e", "f"])
+        self.assertEqual(buf.tail(2), ["e", "f"])
+        self.assertEqual(buf.tail(50), ["b", "c", "d", "e", "f"])
+
+    def test_resize_keeps_sequence_numbers(self):
+        buf = ScrollbackBuffer(5)
+        buf.extend(["a", "b", "c", "d", "e", "f", "g"])
+        self.assertEqual(buf.resize(2), ["c", "d", "e"])
+        self.assertEqual(buf.tail(), ["f", "g"])
+        self.assertEqual(buf.first_seq, 5)
+
+        buf.resize(4)
+        buf.extend(["h"])
+        self.assertEqual(buf.tail(), ["f", "g", "h"])
+        self.assertEqual(buf.read(6), ["g", "h"])
+
+
+class TestCommandMarkers(unittest.TestCase):
+    """Test get_output_since_last_command across trimming."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = ItermSessionLogger(
+            "session-1", "pane", log_dir=self.temp_dir, max_snapshot_lines=5
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_output_since_command_after_trimming(self):
+        """Test that the command marker stays correct when old lines are evicted."""
+        self.logger.log_output("old 1\nold 2\nold 3")
+        self.logger.log_command("make")
+        self.logger.log_output("new 1\nnew 2")
+        self.logger.log_output("new 3")
+
+        # Five lines retained: old 2, old 3, new 1..3; the marker still points at new 1
+        self.assertEqual(
+            self.logger.get_output_since_last_command(), "new 1\nnew 2\nnew 3"
+        )
+        self.assertEqual(
+            self.logger.get_output_since_last_command(max_lines=2), "new 2\nnew 3"
+        )
+
+    def test_marker_older_than_retained_output(self):
+        """Test that output beyond the scrollback is clamped, not misaligned."""
+        self.logger.log_command("seq 10")
+        self.logger.log_output("\n".join(str(i) for i in range(10)))
+        self.assertEqual(
+            self.logger.get_output_since_last_command(), "5\n6\n7\n8\n9"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
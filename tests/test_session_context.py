@@ -0,0 +1,246 @@
+"""Tests for cwd tracking, the background context watcher and list_sessions context gathering."""
+
+import asyncio
+import logging
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from core.iterm_path_monitor import PathMonitor
+from core.session import ItermSession
+
+
+class FakeScreen:
+    """Minimal stand-in for iterm2.ScreenContents."""
+
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    @property
+    def number_of_lines(self):
+        return len(self._lines)
+
+    def line(self, index):
+        line = MagicMock()
+        line.string = self._lines[index]
+        return line
+
+
+class FakeMonitor:
+    """Stand-in for iterm2.ScreenStreamer and iterm2.VariableMonitor."""
+
+    def __init__(self):
+        self.updates = asyncio.Queue()
+        self.open = False
+
+    async def __aenter__(self):
+        self.open = True
+        return self
+
+    async def __aexit__(self, *exc):
+        self.open = False
+        return False
+
+    async def async_get(self):
+        return await self.updates.get()
+
+
+def make_session(screen, path="/work/repo"):
+    """Build an ItermSession over a mocked iTerm2 session."""
+    iterm_session = MagicMock()
+    iterm_session.session_id = "session-1"
+    iterm_session.name = "pane"
+    iterm_session.async_get_screen_contents = AsyncMock(side_effect=lambda: FakeScreen(screen))
+    iterm_session.async_get_variable = AsyncMock(return_value=path)
+    iterm_session.async_send_text = AsyncMock()
+    streamer = FakeMonitor()
+    iterm_session.get_screen_streamer = MagicMock(return_value=streamer)
+    return ItermSession(iterm_session), iterm_session, streamer
+
+
+def extract_last(text):
+    lines = [line for line in text.split("\n") if line]
+    return lines[-1] if lines else None
+
+
+class TestContextWatcher(unittest.IsolatedAsyncioTestCase):
+    """Test that watched sessions answer listing queries without API calls."""
+
+    async def asyncSetUp(self):
+        self.screen = ["$ make", "building"]
+        self.session, self.iterm_session, self.streamer = make_session(self.screen)
+        self.path_monitor = FakeMonitor()
+        patcher = patch("core.session.iterm2.VariableMonitor", return_value=self.path_monitor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.session.stop_watching_context()
+
+    async def start_watching(self):
+        self.session.watch_context()
+        await asyncio.sleep(0.01)
+        self.assertTrue(self.session.is_watching_context)
+
+    async def test_pushed_cwd_does_not_expire(self):
+        await self.start_watching()
+        self.iterm_session.async_get_variable.reset_mock()
+
+        with patch("core.session.time.time", return_value=10 ** 9):
+            self.assertEqual(await self.session.get_cwd(), "/work/repo")
+        self.iterm_session.async_get_variable.assert_not_awaited()
+
+        self.path_monitor.updates.put_nowait("/work/other")
+        await asyncio.sleep(0.01)
+        self.assertEqual(await self.session.get_cwd(), "/work/other")
+        self.iterm_session.async_get_variable.assert_not_awaited()
+
+    async def test_last_message_cached_until_screen_changes(self):
+        await self.start_watching()
+        self.assertEqual(await self.session.get_last_message(extract_last), "building")
+        self.assertEqual(await self.session.get_last_message(extract_last), "building")
+        self.assertEqual(self.iterm_session.async_get_screen_contents.await_count, 1)
+
+        self.screen.append("done")
+        self.streamer.updates.put_nowait(None)
+        await asyncio.sleep(0.01)
+        self.assertEqual(await self.session.get_last_message(extract_last), "done")
+        self.assertEqual(self.iterm_session.async_get_screen_contents.await_count, 2)
+
+    async def test_unwatched_session_reads_snapshot(self):
+        extract = MagicMock(side_effect=extract_last)
+        self.assertEqual(await self.session.get_last_message(extract), "building")
+        self.assertEqual(await self.session.get_last_message(extract), "building")
+        # Same snapshot version, so the message is not extracted again
+        self.assertEqual(extract.call_count, 1)
+
+    async def test_stop_closes_monitors(self):
+        await self.start_watching()
+        await self.session.stop_watching_context()
+        self.assertFalse(self.session.is_watching_context)
+        self.assertFalse(self.streamer.open)
+        self.assertFalse(self.path_monitor.open)
+
+    async def test_shares_streamer_with_monitoring(self):
+        await self.start_watching()
+        await self.session.start_monitoring(update_interval=0.01)
+        try:
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.iterm_session.get_screen_streamer.call_count, 1)
+
+            self.screen.append("done")
+            self.streamer.updates.put_nowait(None)
+            await asyncio.sleep(0.05)
+            self.assertEqual(await self.session.get_last_message(extract_last), "done")
+        finally:
+            await self.session.stop_monitoring()
+        # Still open for the context watcher
+        self.assertTrue(self.streamer.open)
+
+    async def test_watcher_stops_when_no_longer_used(self):
+        with patch("core.session.CONTEXT_WATCH_IDLE_SECONDS", 0.05):
+            await self.start_watching()
+            await asyncio.sleep(0.03)
+            self.session.watch_context()
+            await asyncio.sleep(0.03)
+            self.assertTrue(self.session.is_watching_context)
+            await asyncio.sleep(0.1)
+        self.assertFalse(self.session.is_watching_context)
+        self.assertFalse(self.streamer.open)
+        self.assertFalse(self.path_monitor.open)
+
+
+class TestCwdFeeds(unittest.IsolatedAsyncioTestCase):
+    """Test pushed cwd values, hit/miss counters and the PathMonitor feed."""
+
+    async def asyncSetUp(self):
+        self.session, self.iterm_session, _ = make_session(["$ ls"])
+
+    async def test_pushed_cwd_valid_only_while_attached(self):
+        self.session.attach_cwd_feed()
+        self.session.push_cwd("/pushed")
+        with patch("core.session.time.time", return_value=10 ** 9):
+            self.assertEqual(await self.session.get_cwd(), "/pushed")
+        self.iterm_session.async_get_variable.assert_not_awaited()
+
+        self.session.detach_cwd_feed()
+        with patch("core.session.time.time", return_value=10 ** 10):
+            self.assertEqual(await self.session.get_cwd(), "/work/repo")
+        self.assertEqual(self.session.cwd_stats["hits"], 1)
+        self.assertEqual(self.session.cwd_stats["misses"], 1)
+        self.assertEqual(self.session.cwd_stats["pushes"], 1)
+
+    async def test_prompt_fallback_counted(self):
+        self.iterm_session.async_get_variable = AsyncMock(return_value=None)
+        self.screen = ["user@host:/srv/app$"]
+        self.iterm_session.async_get_screen_contents = AsyncMock(
+            side_effect=lambda: FakeScreen(self.screen)
+        )
+        self.assertEqual(await self.session.get_cwd(), "/srv/app")
+        self.assertEqual(await self.session.get_cwd(), "/srv/app")
+        self.assertEqual(self.session.cwd_stats["prompt_parses"], 1)
+        self.assertEqual(self.session.cwd_stats["hits"], 1)
+
+    async def test_path_monitor_feeds_session(self):
+        terminal = MagicMock()
+        terminal.sessions = {self.session.id: self.session}
+        hook_manager = MagicMock()
+        hook_manager.on_path_changed = AsyncMock(return_value=MagicMock(
+            style_applied=False, team_assigned=None, session_id_passed=False
+        ))
+        hook_manager.agent_registry = None
+        monitor = PathMonitor(MagicMock(), hook_manager=hook_manager, terminal=terminal)
+
+        await monitor._handle_path_change(self.session.id, "/from/monitor")
+        self.assertTrue(self.session.has_cwd_feed)
+        self.assertEqual(await self.session.get_cwd(), "/from/monitor")
+        self.iterm_session.async_get_variable.assert_not_awaited()
+
+        # The context watcher does not open a second path subscription
+        with patch("core.session.iterm2.VariableMonitor") as variable_monitor:
+            self.session.watch_context()
+            await asyncio.sleep(0.01)
+            variable_monitor.assert_not_called()
+        await self.session.stop_watching_context()
+
+
+class TestGatherSessionContext(unittest.IsolatedAsyncioTestCase):
+    """Test the concurrent context stage of list_sessions."""
+
+    async def test_gathers_concurrently_under_limit(self):
+        from iterm_mcpy.fastmcp_server import _gather_session_context
+
+        active = 0
+        peak = 0
+
+        async def slow_path(_name):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return "/work/repo"
+
+        sessions = []
+        for _ in range(20):
+            session, iterm_session, _ = make_session(["$ ls"])
+            iterm_session.async_get_variable = AsyncMock(side_effect=slow_path)
+            iterm_session.connection = None
+            sessions.append(session)
+
+        semaphore = asyncio.Semaphore(5)
+        logger = logging.getLogger("test")
+        start = asyncio.get_running_loop().time()
+        results = await asyncio.gather(*(
+            _gather_session_context(s, False, semaphore, logger) for s in sessions
+        ))
+        elapsed = asyncio.get_running_loop().time() - start
+
+        self.assertEqual(results, [("/work/repo", None)] * 20)
+        self.assertLessEqual(peak, 5)
+        self.assertLess(elapsed, 0.05 * 20 / 2)
+        for session in sessions:
+            await session.stop_watching_context()
+
+
+if __name__ == "__main__":
+    unittest.main()
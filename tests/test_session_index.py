@@ -0,0 +1,217 @@
+"""Tests for the incremental session index in ItermTerminal."""
+
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, PropertyMock
+
+from core.terminal import ItermTerminal, SessionIndex
+from core.session import ItermSession
+
+
+def make_iterm_session(session_id: str, name: str) -> MagicMock:
+    """Create a mock iTerm2 session object."""
+    session = MagicMock()
+    session.session_id = session_id
+    session.name = name
+    return session
+
+
+def make_app(sessions) -> MagicMock:
+    """Create a mock app with one window and one tab holding the sessions."""
+    tab = MagicMock()
+    tab.sessions = list(sessions)
+    window = MagicMock()
+    window.tabs = [tab]
+    app = MagicMock()
+    app.windows = [window]
+    return app
+
+
+class TestSessionIndex(unittest.TestCase):
+    """Test the SessionIndex maps."""
+
+    def setUp(self):
+        self.index = SessionIndex()
+        self.a = ItermSession(make_iterm_session("a", "alpha"), persistent_id="p-a")
+        self.b = ItermSession(make_iterm_session("b", "beta"), persistent_id="p-b")
+        self.index.add(self.a)
+        self.index.add(self.b)
+
+    def test_lookups(self):
+        """Test lookups by id, name and persistent id."""
+        self.assertIs(self.index.get("a"), self.a)
+        self.assertIs(self.index.get_by_name("beta"), self.b)
+        self.assertIs(self.index.get_by_persistent_id("p-a"), self.a)
+        self.assertIsNone(self.index.get("missing"))
+        self.assertIsNone(self.index.get_by_name("missing"))
+
+    def test_duplicate_names_first_wins(self):
+        """Test that the first session with a name is returned."""
+        dup = ItermSession(make_iterm_session("c", "alpha"))
+        self.index.add(dup)
+        self.assertIs(self.index.get_by_name("alpha"), self.a)
+
+        self.index.remove("a")
+        self.assertIs(self.index.get_by_name("alpha"), dup)
+
+    def test_rename_detected(self):
+        """Test that renamed wrappers are found under their new name."""
+        self.a._name = "renamed"
+        self.assertIs(self.index.get_by_name("renamed"), self.a)
+        self.assertIsNone(self.index.get_by_name("alpha"))
+
+    def test_remove(self):
+        """Test that removal clears every map."""
+        self.assertIs(self.index.remove("a"), self.a)
+        self.assertNotIn("a", self.index)
+        self.assertIsNone(self.index.get_by_persistent_id("p-a"))
+        self.assertIsNone(self.index.get_by_name("alpha"))
+        self.assertIsNone(self.index.remove("a"))
+
+
+class TestIncrementalRefresh(unittest.IsolatedAsyncioTestCase):
+    """Test that ItermTerminal reconciles the index incrementally."""
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.terminal = ItermTerminal(
+            connection=MagicMock(),
+            log_dir=self.temp_dir,
+            enable_logging=True,
+        )
+        self.s1 = make_iterm_session("s1", "one")
+        self.s2 = make_iterm_session("s2", "two")
+        self.terminal.app = make_app([self.s1, self.s2])
+
+    async def asyncTearDown(self):
+        await self.terminal.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _set_layout(self, sessions):
+        self.terminal.app.windows[0].tabs[0].sessions = list(sessions)
+        self.terminal._index_dirty = True
+
+    async def test_wrappers_are_reused(self):
+        """Test that lookups keep the same wrapper and logger."""
+        first = await self.terminal.get_session_by_id("s1")
+        first.update_cwd_cache("/tmp/project")
+        second = await self.terminal.get_session_by_id("s1")
+
+        self.assertIs(first, second)
+        self.assertEqual(second.cached_cwd, "/tmp/project")
+        self.assertIsNotNone(second.logger)
+
+    async def test_new_pane_added_and_closed_pane_evicted(self):
+        """Test that layout changes only add and evict the affected panes."""
+        one = await self.terminal.get_session_by_id("s1")
+
+        s3 = make_iterm_session("s3", "three")
+        self._set_layout([self.s1, s3])
+
+        three = await self.terminal.get_session_by_name("three")
+        self.assertIsNotNone(three)
+        self.assertIs(await self.terminal.get_session_by_id("s1"), one)
+        self.assertIsNone(await self.terminal.get_session_by_id("s2"))
+        self.assertNotIn("s2", self.terminal.log_manager.session_loggers)
+
+    async def test_fresh_index_skips_layout_walk(self):
+        """Test that lookups on a fresh index do not touch the app."""
+        await self.terminal.get_sessions()
+
+        # Simulate running watchers with no pending notifications
+        self.terminal._watch_tasks = [asyncio.create_task(asyncio.Event().wait())]
+        self.terminal._index_dirty = False
+
+        windows = PropertyMock(return_value=self.terminal.app.windows)
+        type(self.terminal.app).windows = windows
+
+        for _ in range(40):
+            self.assertIsNotNone(await self.terminal.get_session_by_id("s1"))
+            self.assertIsNotNone(await self.terminal.get_session_by_name("two"))
+        self.assertEqual(windows.call_count, 0)
+
+        # A notification marks the index stale and forces one reconcile
+        self.terminal._index_dirty = True
+        await self.terminal.get_session_by_id("s1")
+        self.assertEqual(windows.call_count, 1)
+
+    async def test_miss_reconciles_once(self):
+        """Test that a miss reconciles before giving up."""
+        self.terminal._watch_tasks = [asyncio.create_task(asyncio.Event().wait())]
+        await self.terminal._refresh_sessions()
+
+        # New pane arrives before its notification is processed
+        s3 = make_iterm_session("s3", "three")
+        self.terminal.app.windows[0].tabs[0].sessions.append(s3)
+
+        found = await self.terminal.get_session_by_id("s3")
+        self.assertIsNotNone(found)
+        self.assertEqual(found.id, "s3")
+
+    async def test_pending_created_sessions_survive_reconcile(self):
+        """Test that sessions created locally are kept until the app reports them."""
+        await self.terminal._refresh_sessions()
+
+        created = ItermSession(make_iterm_session("new", "fresh"))
+        self.terminal._track_session(created)
+        await self.terminal._refresh_sessions()
+        self.assertIs(self.terminal.sessions.get("new"), created)
+
+        # Once reported by the app it is a normal indexed pane
+        self._set_layout([self.s1, self.s2, created.session])
+        await self.terminal._refresh_sessions()
+        self.assertNotIn("new", self.terminal._pending_ids)
+        self.assertIs(self.terminal.sessions.get("new"), created)
+
+    async def test_persistent_id_lookup(self):
+        """Test lookup by persistent id."""
+        one = await self.terminal.get_session_by_id("s1")
+        found = await self.terminal.get_session_by_persistent_id(one.persistent_id)
+        self.assertIs(found, one)
+
+    async def test_termination_evicts(self):
+        """Test that a termination notification evicts the pane."""
+        await self.terminal._refresh_sessions()
+        evicted = await self.terminal._evict_session("s2")
+        self.assertEqual(evicted.id, "s2")
+        self.assertNotIn("s2", self.terminal.sessions)
+
+    async def test_eviction_callbacks(self):
+        """Test that eviction callbacks get the ID, and a failing one is isolated."""
+        await self.terminal._refresh_sessions()
+        seen = []
+        self.terminal.add_eviction_callback(MagicMock(side_effect=RuntimeError("boom")))
+        self.terminal.add_eviction_callback(seen.append)
+
+        await self.terminal._evict_session("s2")
+        await self.terminal._evict_session("missing")
+        self.assertEqual(seen, ["s2"])
+
+    async def test_external_rename_found_by_name(self):
+        """Test that a pane renamed in iTerm is found under its new name."""
+        self.terminal._watch_tasks = [asyncio.create_task(asyncio.Event().wait())]
+        one = await self.terminal.get_session_by_id("s1")
+
+        self.s1.name = "renamed-in-iterm"
+        self.assertIs(await self.terminal.get_session_by_name("renamed-in-iterm"), one)
+        self.assertEqual(one.name, "renamed-in-iterm")
+        self.assertIsNone(await self.terminal.get_session_by_name("one"))
+
+    async def test_close_session_releases_resources(self):
+        """Test that closing a pane stops its monitors and drops its logger."""
+        self.s2.async_close = AsyncMock()
+        two = await self.terminal.get_session_by_id("s2")
+        two.stop_watching_context = AsyncMock()
+
+        await self.terminal.close_session("s2")
+
+        self.s2.async_close.assert_awaited_once()
+        two.stop_watching_context.assert_awaited_once()
+        self.assertNotIn("s2", self.terminal.sessions)
+        self.assertNotIn("s2", self.terminal.log_manager.session_loggers)
+
+
+if __name__ == "__main__":
+    unittest.main()
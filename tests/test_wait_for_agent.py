@@ -4,14 +4,21 @@ This module tests the wait_for_agent MCP tool that allows orchestrators
 to wait for subagents to complete with graceful timeout handling.
 """
 
+import asyncio
 import json
 import shutil
 import tempfile
 import unittest
 from unittest.mock import AsyncMock, MagicMock
 
-from core.models import WaitForAgentRequest, WaitResult
+from core.models import (
+    WaitForAgentRequest,
+    WaitForAgentsRequest,
+    WaitForAgentsResult,
+    WaitResult,
+)
 from core.agents import AgentRegistry
+from core.completion import IdleTracker
 
 
 class TestWaitForAgentScenarios(unittest.TestCase):
@@ -427,6 +434,15 @@ class TestWaitForAgentRealImplementation(unittest.IsolatedAsyncioTestCase):
         self.mock_session = AsyncMock()
         self.mock_terminal = AsyncMock()
         self.mock_terminal.get_session_by_id = AsyncMock(return_value=self.mock_session)
+
+        # Idle detection as in ItermSession, driven by the mock's is_processing
+        async def wait_until_idle(timeout):
+            tracker = IdleTracker(quiet_period=0.01)
+            return await tracker.wait_idle(
+                timeout, is_processing=lambda: self.mock_session.is_processing
+            )
+
+        self.mock_session.wait_until_idle = AsyncMock(side_effect=wait_until_idle)
         
         # Create mock notification manager
         self.mock_notification_manager = AsyncMock()
@@ -678,8 +694,8 @@ class TestWaitForAgentRealImplementation(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(result.timed_out)
         self.assertIsNone(result.summary)  # Summary should be None
 
-    async def test_polling_interval_and_output_stabilization(self):
-        """Test that polling detects output stabilization correctly."""
+    async def test_waits_for_session_idle(self):
+        """Test that completion comes from the session's idle signal."""
         # Register agent
         self.agent_registry.register_agent(
             name="stabilizing-agent",
@@ -687,39 +703,34 @@ class TestWaitForAgentRealImplementation(unittest.IsolatedAsyncioTestCase):
             teams=[],
             metadata={}
         )
-        
-        # Mock session - not processing, but output changes then stabilizes
-        self.mock_session.is_processing = False
-        
-        call_count = 0
-        async def get_changing_output():
-            nonlocal call_count
-            call_count += 1
-            if call_count <= 2:
-                return f"Output changing {call_count}"
-            else:
-                # Stabilizes after 2 calls
-                return "Output stable"
-        
-        self.mock_session.get_screen_contents = get_changing_output
-        
+
+        # Busy at first; the output settles once the process finishes
+        self.mock_session.is_processing = True
+        self.mock_session.get_screen_contents = AsyncMock(return_value="Output changing")
+
+        async def finish():
+            await asyncio.sleep(0.1)
+            self.mock_session.get_screen_contents.return_value = "Output stable"
+            self.mock_session.is_processing = False
+
+        finisher = asyncio.create_task(finish())
+
         request = WaitForAgentRequest(
             agent="stabilizing-agent",
             wait_up_to=5,
             return_output=True
         )
-        
+
         result_json = await self.wait_for_agent(request, self.mock_ctx)
         result = WaitResult.model_validate_json(result_json)
-        
-        # Should complete when output stabilizes
+        await finisher
+
         self.assertTrue(result.completed)
         self.assertFalse(result.timed_out)
         self.assertEqual(result.status, "idle")
         self.assertIn("stable", result.output)
-        
-        # Should have called get_screen_contents multiple times
-        self.assertGreater(call_count, 2)
+        self.assertLess(result.elapsed_seconds, 5)
+        self.mock_session.wait_until_idle.assert_awaited_once_with(5)
 
     async def test_completion_notification(self):
         """Test that success notification is added when agent completes."""
@@ -762,5 +773,82 @@ class TestWaitForAgentRealImplementation(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(last_call.kwargs["agent"], "timeout-agent")
 
 
+
+class TestWaitForAgents(unittest.IsolatedAsyncioTestCase):
+    """Tests for the multi-agent wait_for_agents tool."""
+
+    async def asyncSetUp(self):
+        from iterm_mcpy.fastmcp_server import wait_for_agents
+        self.wait_for_agents = wait_for_agents
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.agent_registry = AgentRegistry(data_dir=self.temp_dir)
+
+        # Each agent goes idle after its own delay
+        self.sessions = {}
+        for name, delay in (("fast", 0.05), ("slow", 10)):
+            session = AsyncMock()
+            session.id = f"session-{name}"
+            session.get_screen_contents = AsyncMock(return_value=f"{name} output")
+
+            async def wait_until_idle(timeout, delay=delay):
+                await asyncio.sleep(min(delay, timeout))
+                return delay <= timeout
+
+            session.wait_until_idle = AsyncMock(side_effect=wait_until_idle)
+            self.sessions[session.id] = session
+            self.agent_registry.register_agent(
+                name=name, session_id=session.id, teams=[], metadata={}
+            )
+
+        terminal = AsyncMock()
+        terminal.get_session_by_id = AsyncMock(side_effect=lambda sid: self.sessions.get(sid))
+        self.ctx = MagicMock()
+        self.ctx.request_context.lifespan_context = {
+            "terminal": terminal,
+            "agent_registry": self.agent_registry,
+            "notification_manager": AsyncMock(),
+            "logger": MagicMock(),
+        }
+
+    async def asyncTearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def test_wait_any(self):
+        request = WaitForAgentsRequest(agents=["slow", "fast"], mode="any", wait_up_to=5)
+        result = WaitForAgentsResult.model_validate_json(
+            await self.wait_for_agents(request, self.ctx)
+        )
+        self.assertTrue(result.completed)
+        self.assertLess(result.elapsed_seconds, 1)
+        by_agent = {r.agent: r for r in result.results}
+        self.assertEqual([r.agent for r in result.results], ["slow", "fast"])
+        self.assertTrue(by_agent["fast"].completed)
+        self.assertFalse(by_agent["slow"].completed)
+        # Still busy when the wait ended, not out of time
+        self.assertFalse(result.timed_out)
+        self.assertFalse(by_agent["slow"].timed_out)
+        self.assertEqual(by_agent["slow"].status, "running")
+        self.assertTrue(by_agent["slow"].can_continue_waiting)
+
+    async def test_wait_all_times_out(self):
+        request = WaitForAgentsRequest(agents=["fast", "slow"], wait_up_to=1)
+        result = WaitForAgentsResult.model_validate_json(
+            await self.wait_for_agents(request, self.ctx)
+        )
+        self.assertFalse(result.completed)
+        self.assertTrue(result.timed_out)
+        self.assertTrue(result.results[0].completed)
+        self.assertTrue(result.results[1].timed_out)
+
+    async def test_unknown_agent_reported(self):
+        request = WaitForAgentsRequest(agents=["fast", "ghost"], wait_up_to=1)
+        result = WaitForAgentsResult.model_validate_json(
+            await self.wait_for_agents(request, self.ctx)
+        )
+        self.assertTrue(result.completed)
+        self.assertEqual(result.results[1].status, "unknown")
+
+
 if __name__ == "__main__":
     unittest.main()
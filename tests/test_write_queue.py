@@ -0,0 +1,201 @@
+"""Tests for per-session write queues."""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from core.models import SessionMessage, SessionTarget, WriteToSessionsRequest
+from core.session import ItermSession
+from core.write_queue import WriteQueue
+
+
+class RecordingPane:
+    """Stand-in for a pane that records sends and can be slow to accept them."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, text):
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+
+class TestWriteQueue(unittest.IsolatedAsyncioTestCase):
+    """Test the queue on its own."""
+
+    async def test_actions_do_not_interleave(self):
+        pane = RecordingPane(delay=0.01)
+        queue = WriteQueue(pane.send)
+
+        async def command(text):
+            await pane.send(text)
+            await pane.send("\r")
+
+        await asyncio.gather(
+            queue.submit(lambda: command("ls")),
+            queue.submit(lambda: command("pwd")),
+        )
+        self.assertEqual(pane.sent, ["ls", "\r", "pwd", "\r"])
+
+    async def test_adjacent_text_is_coalesced(self):
+        pane = RecordingPane(delay=0.01)
+        queue = WriteQueue(pane.send)
+        futures = [queue.submit_text(chunk) for chunk in ("a", "b", "c")]
+        futures.append(queue.submit(lambda: pane.send("!")))
+        futures.append(queue.submit_text("d"))
+        await asyncio.gather(*futures)
+
+        # The first chunk starts sending alone; the rest queue up behind it
+        self.assertEqual("".join(pane.sent), "abc!d")
+        self.assertLess(queue.stats["sends"], queue.stats["writes"])
+        self.assertEqual(queue.stats["writes"], 5)
+
+    async def test_failure_reaches_only_its_writer(self):
+        pane = RecordingPane()
+        queue = WriteQueue(pane.send)
+
+        async def broken():
+            raise RuntimeError("connection lost")
+
+        failed = queue.submit(broken)
+        ok = queue.submit_text("next")
+        with self.assertRaises(RuntimeError):
+            await failed
+        await ok
+        self.assertEqual(pane.sent, ["next"])
+
+    async def test_cancelled_write_is_skipped(self):
+        pane = RecordingPane(delay=0.01)
+        queue = WriteQueue(pane.send)
+        first = queue.submit(lambda: pane.send("first"))
+        dropped = queue.submit(lambda: pane.send("dropped"))
+        dropped.cancel()
+        await first
+        await queue.join()
+        self.assertEqual(pane.sent, ["first"])
+
+    async def test_write_from_inside_action(self):
+        pane = RecordingPane()
+        queue = WriteQueue(pane.send)
+
+        async def nested():
+            await queue.submit_text("inner")
+            await pane.send("outer")
+
+        await asyncio.wait_for(queue.submit(nested), timeout=1)
+        self.assertEqual(pane.sent, ["inner", "outer"])
+
+
+def make_session(session_id, delay=0.0):
+    """ItermSession over a mock pane whose sends take delay seconds."""
+    pane = RecordingPane(delay=delay)
+    iterm_session = MagicMock()
+    iterm_session.session_id = session_id
+    iterm_session.name = session_id
+    iterm_session.async_send_text = AsyncMock(side_effect=pane.send)
+    session = ItermSession(iterm_session)
+    return session, pane
+
+
+class TestSessionWrites(unittest.IsolatedAsyncioTestCase):
+    """Test that ItermSession writes go through its queue."""
+
+    async def test_concurrent_commands_keep_enter_with_text(self):
+        session, pane = make_session("s1", delay=0.005)
+        await asyncio.gather(
+            session.execute_command("make build"),
+            session.send_text("echo done"),
+            session.send_control_character("c"),
+        )
+        self.assertEqual(pane.sent, ["make build", "\r", "echo done", "\r", "\x03"])
+
+    async def test_submit_text_returns_future(self):
+        session, pane = make_session("s1")
+        session.invalidate_screen_snapshot = MagicMock()
+        future = session.submit_text("partial", execute=False)
+        self.assertIsInstance(future, asyncio.Future)
+        await future
+        self.assertEqual(pane.sent, ["partial"])
+        session.invalidate_screen_snapshot.assert_called_once()
+
+
+class TestExecuteWriteRequest(unittest.IsolatedAsyncioTestCase):
+    """Test execute_write_request scheduling across panes."""
+
+    async def test_sequential_mode_runs_panes_in_parallel(self):
+        from iterm_mcpy.fastmcp_server import execute_write_request
+
+        panes = dict(make_session(f"s{i}", delay=0.1) for i in range(4))
+        sessions = {session.id: session for session in panes}
+        registry = MagicMock()
+        registry.get_active_agent.return_value = None
+        registry.get_agent_by_session.return_value = None
+
+        terminal = MagicMock()
+        terminal.get_session_by_id = AsyncMock(side_effect=lambda sid: sessions.get(sid))
+        terminal.get_session_by_name = AsyncMock(return_value=None)
+
+        messages = [
+            SessionMessage(
+                content=f"step {n}",
+                targets=[SessionTarget(session_id=sid) for sid in sessions],
+                execute=False,
+            )
+            for n in range(2)
+        ]
+        request = WriteToSessionsRequest(messages=messages, parallel=False)
+
+        start = time.monotonic()
+        response = await execute_write_request(request, terminal, registry, MagicMock())
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(response.sent_count, 8)
+        # Two writes per pane at 0.1s each; serial across panes would be 0.8s
+        self.assertLess(elapsed, 0.5)
+        for pane in panes.values():
+            self.assertEqual(pane.sent, ["step 0", "step 1"])
+        self.assertEqual(
+            [r.session_id for r in response.results],
+            ["s0", "s1", "s2", "s3"] * 2
+        )
+
+    async def test_parallel_mode_keeps_request_order_per_pane(self):
+        from iterm_mcpy.fastmcp_server import execute_write_request
+
+        session, pane = make_session("s0", delay=0.01)
+        registry = MagicMock()
+        registry.get_active_agent.return_value = None
+        registry.get_agent_by_session.return_value = None
+
+        # The first message's condition check is slower than the second's
+        screens = iter([0.05, 0.0])
+
+        async def get_screen_contents(**kwargs):
+            await asyncio.sleep(next(screens))
+            return "ready"
+
+        session.get_screen_contents = get_screen_contents
+        terminal = MagicMock()
+        terminal.get_session_by_id = AsyncMock(return_value=session)
+        terminal.get_session_by_name = AsyncMock(return_value=None)
+
+        messages = [
+            SessionMessage(
+                content=f"step {n}",
+                targets=[SessionTarget(session_id="s0")],
+                execute=False,
+                condition="ready",
+            )
+            for n in range(2)
+        ]
+        request = WriteToSessionsRequest(messages=messages, parallel=True)
+        response = await execute_write_request(request, terminal, registry, MagicMock())
+
+        self.assertEqual(response.sent_count, 2)
+        self.assertEqual("".join(pane.sent), "step 0step 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,371 @@
+"""Segmented, compressed archive of session output.
+
+Each session's output is stored as a series of segment files. A segment is a
+sequence of independently gzip-compressed chunks (so a whole segment is also a
+valid .gz file), and a sidecar index records, per chunk, its byte range and the
+line sequence numbers and timestamps it covers. Reads use the index to find the
+few chunks they need and decompress only those, via mmap.
+"""
+
+import bisect
+import gzip
+import json
+import mmap
+import os
+import shutil
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional, Tuple
+
+# Start a new segment once the active one reaches this many compressed bytes
+ARCHIVE_SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+# Segments kept per session; the oldest are deleted beyond this
+ARCHIVE_MAX_SEGMENTS = 16
+
+# Segments whose newest line is older than this are deleted (None keeps them)
+ARCHIVE_MAX_AGE_SECONDS: Optional[float] = 7 * 24 * 3600
+
+INDEX_FILE_NAME = "index.jsonl"
+
+# Session archive directories are named archive_<timestamp>_<name>_<id>
+ARCHIVE_DIR_PREFIX = "archive_"
+
+
+@dataclass(frozen=True)
+class ArchivePolicy:
+    """Rotation and retention settings for a session archive.
+
+    Attributes:
+        max_segment_bytes: Compressed size at which the active segment is rotated
+        max_segments: Number of segments retained
+        max_age_seconds: Age after which whole segments are deleted (None keeps them)
+    """
+    max_segment_bytes: int = ARCHIVE_SEGMENT_MAX_BYTES
+    max_segments: int = ARCHIVE_MAX_SEGMENTS
+    max_age_seconds: Optional[float] = ARCHIVE_MAX_AGE_SECONDS
+
+
+@dataclass(frozen=True)
+class ArchivedLine:
+    """A line read back from the archive."""
+    seq: int
+    timestamp: float
+    text: str
+
+
+@dataclass(frozen=True)
+class ChunkIndexEntry:
+    """Location and coverage of one compressed chunk."""
+    segment: str
+    offset: int
+    length: int
+    first_seq: int
+    count: int
+    first_ts: float
+    last_ts: float
+
+    @property
+    def end_seq(self) -> int:
+        """Sequence number just past the chunk's last line."""
+        return self.first_seq + self.count
+
+
+class SessionLogArchive:
+    """Append-only, rotating archive of one session's output lines.
+
+    Appends are expected from a single writer thread; reads may come from any
+    thread. Lines are addressed by the sequence numbers assigned by the
+    session's scrollback, so gaps (dropped lines) are allowed.
+    """
+
+    def __init__(self, directory: str, policy: Optional[ArchivePolicy] = None):
+        """Open (or create) an archive directory and load its index.
+
+        Args:
+            directory: Directory holding the segments and index
+            policy: Rotation and retention settings
+        """
+        self.directory = directory
+        self.policy = policy or ArchivePolicy()
+        os.makedirs(directory, exist_ok=True)
+        self.index_file = os.path.join(directory, INDEX_FILE_NAME)
+
+        self._lock = threading.Lock()
+        self._entries: List[ChunkIndexEntry] = []
+        # first_seq and last_ts of each entry, kept in step for bisecting
+        self._starts: List[int] = []
+        self._ends: List[float] = []
+        self._active_segment: Optional[str] = None
+        self._active_size = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Read the sidecar index, ignoring a torn final line."""
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file) as f:
+            for line in f:
+                try:
+                    self._entries.append(ChunkIndexEntry(**json.loads(line)))
+                except (ValueError, TypeError):
+                    break
+        self._reindex()
+        if self._entries:
+            last = self._entries[-1]
+            self._active_segment = last.segment
+            self._active_size = last.offset + last.length
+
+    def _reindex(self) -> None:
+        """Rebuild the bisect keys from the entries."""
+        self._starts = [entry.first_seq for entry in self._entries]
+        self._ends = [entry.last_ts for entry in self._entries]
+
+    @property
+    def first_seq(self) -> Optional[int]:
+        """Sequence number of the oldest archived line."""
+        with self._lock:
+            return self._entries[0].first_seq if self._entries else None
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number just past the newest archived line."""
+        with self._lock:
+            return self._entries[-1].end_seq if self._entries else 0
+
+    @property
+    def segments(self) -> List[str]:
+        """Segment file names, oldest first."""
+        with self._lock:
+            return self._segment_names()
+
+    def _segment_names(self) -> List[str]:
+        names: List[str] = []
+        for entry in self._entries:
+            if not names or names[-1] != entry.segment:
+                names.append(entry.segment)
+        return names
+
+    def size_bytes(self) -> int:
+        """Total compressed size of the retained segments."""
+        with self._lock:
+            return sum(entry.length for entry in self._entries)
+
+    def append(self, first_seq: int, records: List[Tuple[float, str]]) -> None:
+        """Compress records into one chunk and append it to the active segment.
+
+        Args:
+            first_seq: Sequence number of the first record
+            records: (timestamp, line) pairs with consecutive sequence numbers
+        """
+        if not records:
+            return
+        payload = "\n".join(f"{ts:.6f}\t{line}" for ts, line in records)
+        data = gzip.compress(payload.encode("utf-8"), compresslevel=6)
+
+        with self._lock:
+            if (
+                self._active_segment is None
+                or self._active_size >= self.policy.max_segment_bytes
+            ):
+                self._active_segment = f"segment_{first_seq:012d}.log.gz"
+                self._active_size = 0
+
+            with open(os.path.join(self.directory, self._active_segment), "ab") as f:
+                f.write(data)
+            entry = ChunkIndexEntry(
+                segment=self._active_segment,
+                offset=self._active_size,
+                length=len(data),
+                first_seq=first_seq,
+                count=len(records),
+                first_ts=records[0][0],
+                last_ts=records[-1][0],
+            )
+            # The index line is written after the chunk, so it never points at missing data
+            with open(self.index_file, "a") as f:
+                f.write(json.dumps(asdict(entry)) + "\n")
+            self._entries.append(entry)
+            self._starts.append(entry.first_seq)
+            self._ends.append(entry.last_ts)
+            self._active_size += len(data)
+
+            if self._active_size >= self.policy.max_segment_bytes:
+                self._apply_retention()
+
+    def _apply_retention(self, keep_active: bool = True) -> None:
+        """Delete segments beyond the count or age limits (lock held).
+
+        Args:
+            keep_active: Never expire the segment being written by age
+        """
+        names = self._segment_names()
+        expired = set(names[:max(0, len(names) - self.policy.max_segments)])
+
+        if self.policy.max_age_seconds is not None:
+            cutoff = time.time() - self.policy.max_age_seconds
+            newest: dict = {}
+            for entry in self._entries:
+                newest[entry.segment] = entry.last_ts
+            expired.update(
+                name for name, last_ts in newest.items()
+                if last_ts < cutoff and not (keep_active and name == self._active_segment)
+            )
+
+        if not expired:
+            return
+        for name in expired:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+        self._entries = [e for e in self._entries if e.segment not in expired]
+        self._reindex()
+        if self._active_segment in expired:
+            self._active_segment = None
+            self._active_size = 0
+
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            for entry in self._entries:
+                f.write(json.dumps(asdict(entry)) + "\n")
+        os.replace(tmp_path, self.index_file)
+
+    def enforce_retention(self, keep_active: bool = True) -> None:
+        """Apply the retention policy now (it otherwise runs on rotation).
+
+        Args:
+            keep_active: Never expire the segment being written by age; pass
+                False for archives no longer written to
+        """
+        with self._lock:
+            self._apply_retention(keep_active=keep_active)
+
+    def _read_chunks(self, entries: List[ChunkIndexEntry]) -> List[ArchivedLine]:
+        """Decompress the given chunks, mapping each segment once."""
+        lines: List[ArchivedLine] = []
+        mapped_name: Optional[str] = None
+        mapped: Optional[mmap.mmap] = None
+        try:
+            for entry in entries:
+                if entry.segment != mapped_name:
+                    if mapped is not None:
+                        mapped.close()
+                        mapped = None
+                    mapped_name = entry.segment
+                    try:
+                        with open(os.path.join(self.directory, entry.segment), "rb") as f:
+                            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (FileNotFoundError, ValueError):
+                        # Deleted by retention, or empty
+                        continue
+                if mapped is None:
+                    continue
+
+                raw = zlib.decompress(
+                    mapped[entry.offset:entry.offset + entry.length], wbits=31
+                )
+                for offset, record in enumerate(raw.decode("utf-8").split("\n")):
+                    ts, _, text = record.partition("\t")
+                    lines.append(ArchivedLine(entry.first_seq + offset, float(ts), text))
+        finally:
+            if mapped is not None:
+                mapped.close()
+        return lines
+
+    def read_range(self, start_seq: int, end_seq: int) -> List[ArchivedLine]:
+        """Read archived lines with sequence numbers in [start_seq, end_seq).
+
+        Args:
+            start_seq: First sequence number to read
+            end_seq: Sequence number to stop before
+
+        Returns:
+            The archived lines in the range, oldest first
+        """
+        with self._lock:
+            first = max(0, bisect.bisect_right(self._starts, start_seq) - 1)
+            entries = [
+                entry for entry in self._entries[first:]
+                if entry.first_seq < end_seq and entry.end_seq > start_seq
+            ]
+        return [
+            line for line in self._read_chunks(entries)
+            if start_seq <= line.seq < end_seq
+        ]
+
+    def read_between(
+        self,
+        start_time: float,
+        end_time: float,
+        limit: Optional[int] = None
+    ) -> List[ArchivedLine]:
+        """Read archived lines received between two times.
+
+        Args:
+            start_time: Earliest timestamp (seconds since the epoch, inclusive)
+            end_time: Latest timestamp (inclusive)
+            limit: Optional maximum number of lines, oldest first
+
+        Returns:
+            The archived lines in the interval, oldest first
+        """
+        with self._lock:
+            # Chunks are appended in arrival order, so last_ts is non-decreasing
+            first = bisect.bisect_left(self._ends, start_time)
+            entries = []
+            for entry in self._entries[first:]:
+                if entry.first_ts > end_time:
+                    break
+                entries.append(entry)
+
+        lines: List[ArchivedLine] = []
+        for line in self._read_chunks(entries):
+            if start_time <= line.timestamp <= end_time:
+                lines.append(line)
+                if limit is not None and len(lines) >= limit:
+                    break
+        return lines
+
+
+def prune_archives(
+    log_dir: str,
+    policy: Optional[ArchivePolicy] = None,
+    directories: Optional[Iterable[str]] = None
+) -> int:
+    """Apply retention to archives left behind by earlier runs.
+
+    Archives are otherwise only pruned when their own segment rotates, which
+    never happens again once the session that wrote them is gone. Every
+    segment of these archives is subject to the age limit, and directories
+    left with no segments are removed.
+
+    Args:
+        log_dir: Directory holding the archive_* directories
+        policy: Rotation and retention settings
+        directories: Archive directory names to prune (default: all in log_dir)
+
+    Returns:
+        Number of archive directories removed
+    """
+    if directories is None:
+        try:
+            directories = [
+                name for name in os.listdir(log_dir) if name.startswith(ARCHIVE_DIR_PREFIX)
+            ]
+        except FileNotFoundError:
+            return 0
+
+    removed = 0
+    for name in directories:
+        path = os.path.join(log_dir, name)
+        if not os.path.isdir(path):
+            continue
+        archive = SessionLogArchive(path, policy=policy)
+        archive.enforce_retention(keep_active=False)
+        if archive.first_seq is None:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
@@ -1,15 +1,182 @@
 """Logging utilities for iTerm MCP."""
 
+import asyncio
+import atexit
 import datetime
+import functools
 import json
 import logging
+import logging.handlers
 import os
 import re
 import sys
+import tempfile
+import threading
+import time
 import uuid
+import weakref
 from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Pattern, Union
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple, Union
+
+from utils.log_archive import (
+    ARCHIVE_DIR_PREFIX,
+    ArchivedLine,
+    ArchivePolicy,
+    SessionLogArchive,
+    prune_archives,
+)
+
+
+# Delay before dirty persistent-session state is written to disk; registrations
+# that arrive within the window are coalesced into a single write
+PERSISTENT_FLUSH_DELAY_SECONDS = 1.0
+
+# Re-registering an unchanged session only refreshes last_seen on disk when
+# the stored value is older than this
+LAST_SEEN_RESOLUTION_SECONDS = 60.0
+
+# How often the background log writer drains buffered session output
+LOG_FLUSH_INTERVAL_SECONDS = 0.25
+
+# Each session's snapshot file is rewritten at most this often
+SNAPSHOT_WRITE_INTERVAL_SECONDS = 1.0
+
+# Output lines a session may have waiting for the writer before new lines are dropped
+MAX_PENDING_LOG_LINES = 10_000
+
+# Archived in place of dropped lines that left the scrollback before the writer ran
+DROPPED_LINE_PLACEHOLDER = "[output dropped: log queue full]"
+
+# Rotation for each session's text log
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+_module_logger = logging.getLogger("iterm-mcp-logging")
+
+
+def _write_atomically(path: str, data: str) -> None:
+    """Replace a file's contents via write-temp-then-rename."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class ScrollbackBuffer:
+    """Fixed-capacity ring of output lines addressed by absolute sequence numbers.
+
+    Every appended line gets the next sequence number, starting at 0. Once the
+    buffer is full, appending evicts the oldest line, so the retained lines are
+    always the sequence range [first_seq, next_seq). Appends are O(1) and
+    reading k lines is O(k) regardless of how much output has passed through.
+    """
+
+    def __init__(self, capacity: int):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of lines retained
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._capacity = capacity
+        self._lines: List[Optional[str]] = [None] * capacity
+        self._first_seq = 0
+        self._next_seq = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of lines retained."""
+        return self._capacity
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next appended line will get."""
+        return self._next_seq
+
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained line."""
+        return self._first_seq
+
+    def __len__(self) -> int:
+        return self._next_seq - self.first_seq
+
+    def __iter__(self):
+        return iter(self.read(self.first_seq))
+
+    def extend(self, lines: List[str]) -> List[str]:
+        """Append lines, returning the lines evicted to make room (oldest first)."""
+        evicted: List[str] = []
+        capacity = self._capacity
+        for line in lines:
+            slot = self._next_seq % capacity
+            if self._next_seq - self._first_seq == capacity:
+                evicted.append(self._lines[slot])
+                self._first_seq += 1
+            self._lines[slot] = line
+            self._next_seq += 1
+        return evicted
+
+    def read(self, start_seq: int, end_seq: Optional[int] = None) -> List[str]:
+        """Read the retained lines in [start_seq, end_seq).
+
+        Sequence numbers outside the retained range are clamped to it.
+
+        Args:
+            start_seq: First sequence number to read
+            end_seq: Sequence number to stop before (default: next_seq)
+
+        Returns:
+            The lines, oldest first
+        """
+        start = max(start_seq, self.first_seq)
+        end = self._next_seq if end_seq is None else min(end_seq, self._next_seq)
+        if start >= end:
+            return []
+        capacity = self._capacity
+        first_slot = start % capacity
+        last_slot = (end - 1) % capacity
+        if first_slot <= last_slot:
+            return self._lines[first_slot:last_slot + 1]
+        return self._lines[first_slot:] + self._lines[:last_slot + 1]
+
+    def tail(self, count: Optional[int] = None) -> List[str]:
+        """Read the newest count lines (all retained lines if count is None)."""
+        if count is None:
+            return self.read(self.first_seq)
+        return self.read(self._next_seq - count)
+
+    def resize(self, capacity: int) -> List[str]:
+        """Change the capacity, keeping sequence numbers.
+
+        Args:
+            capacity: New maximum number of lines
+
+        Returns:
+            Lines evicted because the buffer shrank, oldest first
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        retained = self.tail()
+        evicted = retained[:max(0, len(retained) - capacity)]
+        kept = retained[len(evicted):]
+
+        self._capacity = capacity
+        self._lines = [None] * capacity
+        self._first_seq = self._next_seq - len(kept)
+        for offset, line in enumerate(kept):
+            self._lines[(self._first_seq + offset) % capacity] = line
+        return evicted
 
 
 class ItermSessionLogger:
@@ -23,6 +190,11 @@ class ItermSessionLogger:
     Logs are stored in the user's home directory under .iterm_mcp_logs/
     
     The logger can be configured with regex filters to only capture specific output patterns.
+
+    Output is buffered in memory by log_output(). With a LogWriter attached the
+    buffer is written by the writer's background thread; without one it is
+    written before log_output() returns. Every output line is also stored in a
+    compressed SessionLogArchive that can be read back by sequence number or time.
     """
     
     def __init__(
@@ -31,7 +203,10 @@ class ItermSessionLogger:
         session_name: str,
         log_dir: Optional[str] = None,
         max_snapshot_lines: int = 1000,
-        persistent_id: Optional[str] = None
+        persistent_id: Optional[str] = None,
+        writer: Optional["LogWriter"] = None,
+        max_pending_lines: int = MAX_PENDING_LOG_LINES,
+        archive_policy: Optional[ArchivePolicy] = None
     ):
         """Initialize the session logger.
         
@@ -41,11 +216,29 @@ class ItermSessionLogger:
             log_dir: Optional override for the log directory
             max_snapshot_lines: Maximum number of lines to keep in snapshot
             persistent_id: Optional persistent ID for this session
+            writer: Optional background writer that drains this logger
+            max_pending_lines: Bound on output lines waiting to be written
+            archive_policy: Rotation and retention for the output archive
         """
         self.session_id = session_id
         self.session_name = session_name
         self.persistent_id = persistent_id
-        self.max_snapshot_lines = max_snapshot_lines
+        self.writer = writer
+        self.max_pending_lines = max_pending_lines
+
+        # Output waiting for the writer, guarded by _buffer_lock
+        self._buffer_lock = threading.Lock()
+        # (sequence number, arrival time, line) for each queued output line
+        self._pending: List[Tuple[int, float, str]] = []
+        # (first sequence number, count, arrival time) of lines the queue dropped
+        self._dropped: List[Tuple[int, int, float]] = []
+        self._snapshot_dirty = False
+        self._snapshot_limit: Optional[int] = None
+        self._snapshot_written_at = float("-inf")
+
+        # Backpressure counters
+        self.dropped_lines = 0
+        self.snapshot_writes = 0
 
         # Telemetry counters
         self.command_count = 0
@@ -74,25 +267,30 @@ class ItermSessionLogger:
             f"latest_{safe_name}_{session_id[:8]}.txt"
         )
         
-        # Create overflow file for additional output beyond what's shown
-        self.overflow_file = os.path.join(
-            self.log_dir,
-            f"overflow_{safe_name}_{session_id[:8]}.txt"
+        # Compressed archive of all output, addressable by line sequence number
+        self.archive = SessionLogArchive(
+            os.path.join(self.log_dir, f"archive_{timestamp}_{safe_name}_{session_id[:8]}"),
+            policy=archive_policy,
         )
         
         # Initialize with no filters
         self.output_filters = []
-        self.latest_output = []  # Store recent output for snapshots
+        # Recent output for snapshots; older output is read from the archive
+        self._scrollback = ScrollbackBuffer(max_snapshot_lines)
 
-        # Track the index of the last command for output retrieval
-        self._last_command_index = None  # Index in latest_output where last command was logged
+        # Sequence number of the first output line after the last command
+        self._last_command_seq: Optional[int] = None
         
         # Set up file logger
         self.logger = logging.getLogger(f"session_{session_id}")
         self.logger.setLevel(logging.DEBUG)
         
-        # Add file handler
-        file_handler = logging.FileHandler(self.log_file)
+        # Add file handler, rotated so the text log stays bounded
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.log_file,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+        )
         file_handler.setLevel(logging.DEBUG)
         
         # Create formatter
@@ -103,6 +301,7 @@ class ItermSessionLogger:
         
         # Add handler to logger
         self.logger.addHandler(file_handler)
+        self._file_handler = file_handler
         
         # Add a header to the log file
         self.logger.info(
@@ -119,8 +318,9 @@ class ItermSessionLogger:
         if len(command) > 500:
             command = command[:497] + "..."
 
-        # Mark the current position in latest_output as the last command
-        self._last_command_index = len(self.latest_output)
+        # Mark the current position in the scrollback as the last command
+        with self._buffer_lock:
+            self._last_command_seq = self._scrollback.next_seq
 
         self.command_count += 1
         self.last_command_at = datetime.datetime.utcnow().isoformat()
@@ -163,6 +363,9 @@ class ItermSessionLogger:
 
     def log_output(self, output: str, max_lines: Optional[int] = None) -> None:
         """Log output received from the session.
+
+        Only updates in-memory state and queues the lines; files are written
+        by drain().
         
         Args:
             output: The output text
@@ -171,47 +374,187 @@ class ItermSessionLogger:
         # Only log the output if it's not too large
         if len(output) > 2000:
             output = output[:1997] + "..."
-        
-        # Store in latest output cache (up to max_snapshot_lines)
+
         lines = output.split('\n')
-        self.latest_output.extend(lines)
+        now = time.time()
 
-        self.output_line_count += len(lines)
-        self.last_output_at = datetime.datetime.utcnow().isoformat()
-        
-        # If we have more lines than max_snapshot_lines, move extras to overflow
-        if len(self.latest_output) > self.max_snapshot_lines:
-            overflow_lines = self.latest_output[:-self.max_snapshot_lines]
-            self.latest_output = self.latest_output[-self.max_snapshot_lines:]
-            
-            # Write overflow to file
+        with self._buffer_lock:
+            # Store in the scrollback; evicted lines are already archived
+            first_seq = self._scrollback.next_seq
+            self._scrollback.extend(lines)
+            self.output_line_count += len(lines)
+            self.last_output_at = datetime.datetime.utcnow().isoformat()
+
+            # Bounded queue: lines that do not fit are dropped and their range
+            # recorded, so drain() can archive them from the scrollback
+            room = max(0, self.max_pending_lines - len(self._pending))
+            accepted = lines[:room]
+            self._pending.extend(
+                (first_seq + offset, now, line) for offset, line in enumerate(accepted)
+            )
+            dropped = len(lines) - len(accepted)
+            if dropped:
+                self.dropped_lines += dropped
+                start = first_seq + len(accepted)
+                last = self._dropped[-1] if self._dropped else None
+                if last is not None and last[0] + last[1] == start:
+                    self._dropped[-1] = (last[0], last[1] + dropped, last[2])
+                else:
+                    self._dropped.append((start, dropped, now))
+
+            self._snapshot_dirty = True
+            self._snapshot_limit = max_lines
+
+        if self.writer is None:
+            self.drain(force_snapshot=True)
+
+    @property
+    def max_snapshot_lines(self) -> int:
+        """Number of recent output lines kept in memory for snapshots."""
+        return self._scrollback.capacity
+
+    @max_snapshot_lines.setter
+    def max_snapshot_lines(self, max_lines: int) -> None:
+        with self._buffer_lock:
+            self._scrollback.resize(max_lines)
+            self._snapshot_dirty = True
+
+    @property
+    def latest_output(self) -> List[str]:
+        """Copy of the recent output lines, oldest first."""
+        with self._buffer_lock:
+            return self._scrollback.tail()
+
+    @property
+    def log_queue_depth(self) -> int:
+        """Number of output lines waiting to be written."""
+        return len(self._pending)
+
+    def drain(self, force_snapshot: bool = False) -> None:
+        """Write buffered output to the archive, log and snapshot files.
+
+        Queued lines are archived as one compressed chunk per contiguous run.
+        Lines the queue dropped are archived from the scrollback if it still
+        holds them, and as DROPPED_LINE_PLACEHOLDER otherwise. The snapshot file is
+        rewritten only if it changed and the writer's snapshot interval has
+        passed since the last rewrite, unless force_snapshot is set.
+
+        Args:
+            force_snapshot: Write a pending snapshot regardless of the interval
+        """
+        interval = self.writer.snapshot_interval if self.writer else 0.0
+        with self._buffer_lock:
+            pending, self._pending = self._pending, []
+            dropped, self._dropped = self._dropped, []
+
+            # Recover dropped lines; evicted ones are the oldest of each range
+            recovered: List[Tuple[int, float, str]] = []
+            for start, count, created in dropped:
+                kept = self._scrollback.read(start, start + count)
+                missing = count - len(kept)
+                recovered.extend((start + i, created, DROPPED_LINE_PLACEHOLDER) for i in range(missing))
+                recovered.extend(
+                    (start + missing + i, created, line) for i, line in enumerate(kept)
+                )
+
+            snapshot_lines: Optional[List[str]] = None
+            now = time.monotonic()
+            if self._snapshot_dirty and (
+                force_snapshot or now - self._snapshot_written_at >= interval
+            ):
+                snapshot_lines = self._scrollback.tail(self._snapshot_limit)
+                self._snapshot_dirty = False
+                self._snapshot_written_at = now
+
+        # Archive each run of consecutive sequence numbers as one chunk
+        archived = sorted(pending + recovered) if recovered else pending
+        run_start = 0
+        for i in range(1, len(archived) + 1):
+            if i == len(archived) or archived[i][0] != archived[i - 1][0] + 1:
+                run = archived[run_start:i]
+                try:
+                    self.archive.append(run[0][0], [(ts, line) for _, ts, line in run])
+                except Exception as e:
+                    self.logger.error(f"ARCHIVE_ERROR: Failed to archive output: {str(e)}")
+                run_start = i
+
+        records = [
+            self._output_record(
+                logging.WARNING,
+                f"DROPPED: {count} output lines from line {start} (log queue full)",
+                created,
+            )
+            for start, count, created in dropped
+        ]
+
+        # Write to snapshot file
+        if snapshot_lines is not None:
             try:
-                with open(self.overflow_file, 'a') as f:
-                    f.write('\n'.join(overflow_lines) + '\n')
+                _write_atomically(self.snapshot_file, '\n'.join(snapshot_lines))
+                self.snapshot_writes += 1
             except Exception as e:
-                self.logger.error(f"OVERFLOW_ERROR: Failed to write overflow: {str(e)}")
-        
-        # Limit snapshot to max_lines if specified
-        snapshot_lines = self.latest_output
-        if max_lines is not None and max_lines < len(self.latest_output):
-            snapshot_lines = self.latest_output[-max_lines:]
-        
-        # Write to snapshot file
+                self.logger.error(f"SNAPSHOT_ERROR: Failed to write snapshot: {str(e)}")
+
+        # Only log lines that match filters, stamped with when they were received
+        for _, created, line in pending:
+            if not line.strip():  # Skip empty lines
+                continue
+            if self.matches_filters(line):
+                records.append(self._output_record(logging.INFO, f"OUTPUT: {line}", created))
+            else:
+                # Debug log showing filtered out content
+                records.append(self._output_record(logging.DEBUG, f"FILTERED: {line}", created))
+        self._write_output_records([record for record in records if record is not None])
+
+    def _output_record(self, level: int, message: str, created: float) -> Optional[logging.LogRecord]:
+        """Build a log record with its creation time set to when output arrived."""
+        if not self.logger.isEnabledFor(level):
+            return None
+        record = self.logger.makeRecord(
+            self.logger.name, level, __file__, 0, message, None, None
+        )
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return record
+
+    def _write_output_records(self, records: List[logging.LogRecord]) -> None:
+        """Append records to the text log with one write and flush per file.
+
+        The log is rotated between records as RotatingFileHandler would.
+        Records still propagate to ancestor handlers one at a time.
+        """
+        if not records:
+            return
+        handler = self._file_handler
+        handler.acquire()
         try:
-            with open(self.snapshot_file, 'w') as f:
-                f.write('\n'.join(snapshot_lines))
-        except Exception as e:
-            self.logger.error(f"SNAPSHOT_ERROR: Failed to write snapshot: {str(e)}")
-        
-        # Process each line separately for filtering
-        for line in output.split('\n'):
-            if line.strip():  # Skip empty lines
-                # Only log if it matches filters
-                if self.matches_filters(line):
-                    self.logger.info(f"OUTPUT: {line}")
-                else:
-                    # Debug log showing filtered out content
-                    self.logger.debug(f"FILTERED: {line}")
+            if handler.stream is None:
+                handler.stream = handler._open()
+            handler.stream.seek(0, 2)
+            size = handler.stream.tell()
+            parts: List[str] = []
+            for record in records:
+                if record.levelno < handler.level:
+                    continue
+                text = handler.format(record) + handler.terminator
+                if handler.maxBytes > 0 and size and size + len(text) >= handler.maxBytes:
+                    handler.stream.write("".join(parts))
+                    parts = []
+                    handler.doRollover()
+                    size = 0
+                parts.append(text)
+                size += len(text)
+            handler.stream.write("".join(parts))
+            handler.stream.flush()
+        except Exception:
+            handler.handleError(records[-1])
+        finally:
+            handler.release()
+
+        parent = self.logger.parent
+        if self.logger.propagate and parent is not None and parent.hasHandlers():
+            for record in records:
+                parent.handle(record)
 
     def log_error(self, message: str) -> None:
         """Capture an error for telemetry while logging it."""
@@ -257,6 +600,8 @@ class ItermSessionLogger:
     def get_output_since_last_command(self, max_lines: Optional[int] = None) -> str:
         """Get output that has been logged since the last command was executed.
 
+        Output that has already left the scrollback is not included.
+
         Args:
             max_lines: Optional maximum number of lines to return
 
@@ -264,19 +609,327 @@ class ItermSessionLogger:
             The output since the last command, or empty string if no command has been executed
         """
         # If no command has been executed yet, return empty string
-        if self._last_command_index is None:
+        if self._last_command_seq is None:
             return ""
 
-        # Get output from the last command index to the end
-        output_lines = self.latest_output[self._last_command_index:]
-
-        # Apply max_lines limit if specified
-        if max_lines is not None and len(output_lines) > max_lines:
-            output_lines = output_lines[-max_lines:]
+        with self._buffer_lock:
+            start = self._last_command_seq
+            # Apply max_lines limit if specified
+            if max_lines is not None:
+                start = max(start, self._scrollback.next_seq - max_lines)
+            output_lines = self._scrollback.read(start)
 
         return '\n'.join(output_lines)
 
 
+class PersistentSessionStore:
+    """Registry mapping persistent IDs to iTerm2 session details.
+
+    Keeps a session_id → persistent_id reverse index so lookups are O(1), and
+    tracks changes in memory. Dirty state is written by a coalesced background
+    flush (write-temp-then-rename) instead of rewriting the file on every
+    registration. Call flush() on shutdown to persist anything still pending.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_delay: float = PERSISTENT_FLUSH_DELAY_SECONDS
+    ):
+        """Initialize the store and load any existing mapping.
+
+        Args:
+            path: Path of the JSON file backing the store
+            flush_delay: Seconds to wait before writing dirty state
+        """
+        self.path = path
+        self.flush_delay = flush_delay
+
+        self._sessions: Dict[str, Dict[str, str]] = {}
+        self._by_session_id: Dict[str, str] = {}
+        self._dirty = False
+        # Bumped on every change so an older snapshot never overwrites a newer one
+        self._generation = 0
+        self._written_generation = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_inflight = False
+        self._write_lock = threading.Lock()
+
+        # Counters for monitoring write amplification
+        self.write_count = 0
+        self.last_write_error: Optional[str] = None
+
+        self._load()
+
+    def _load(self) -> None:
+        """Load the mapping from disk and rebuild the reverse index."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading persistent sessions: {str(e)}")
+            return
+
+        self._sessions = data if isinstance(data, dict) else {}
+        for persistent_id, details in self._sessions.items():
+            session_id = details.get("session_id")
+            if session_id:
+                self._by_session_id[session_id] = persistent_id
+
+    @property
+    def sessions(self) -> Dict[str, Dict[str, str]]:
+        """The live persistent ID → details mapping (do not mutate)."""
+        return self._sessions
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether there are changes that have not been written yet."""
+        return self._dirty
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, persistent_id: object) -> bool:
+        return persistent_id in self._sessions
+
+    def get(self, persistent_id: str) -> Optional[Dict[str, str]]:
+        """Get the details registered for a persistent ID."""
+        return self._sessions.get(persistent_id)
+
+    def find_persistent_id(self, session_id: str) -> Optional[str]:
+        """Get the persistent ID registered for an iTerm2 session ID."""
+        return self._by_session_id.get(session_id)
+
+    def register(self, session_id: str, persistent_id: str, session_name: str) -> None:
+        """Register or refresh a persistent session.
+
+        Only marks the store dirty when the mapping changes or last_seen is
+        older than LAST_SEEN_RESOLUTION_SECONDS.
+
+        Args:
+            session_id: iTerm2 session ID
+            persistent_id: Persistent session ID
+            session_name: Session name
+        """
+        now = datetime.datetime.now()
+        existing = self._sessions.get(persistent_id)
+
+        if existing is not None:
+            unchanged = (
+                existing.get("session_id") == session_id
+                and existing.get("name") == session_name
+            )
+            if unchanged and not self._last_seen_expired(existing, now):
+                return
+            old_session_id = existing.get("session_id")
+            if old_session_id and old_session_id != session_id:
+                if self._by_session_id.get(old_session_id) == persistent_id:
+                    del self._by_session_id[old_session_id]
+
+        # Replace rather than mutate so background writers see a consistent dict
+        self._sessions[persistent_id] = {
+            "session_id": session_id,
+            "name": session_name,
+            "last_seen": now.isoformat()
+        }
+        self._by_session_id[session_id] = persistent_id
+        self.mark_dirty()
+
+    @staticmethod
+    def _last_seen_expired(details: Dict[str, str], now: datetime.datetime) -> bool:
+        try:
+            last_seen = datetime.datetime.fromisoformat(details.get("last_seen", ""))
+        except ValueError:
+            return True
+        return (now - last_seen).total_seconds() >= LAST_SEEN_RESOLUTION_SECONDS
+
+    def mark_dirty(self) -> None:
+        """Mark the store dirty and schedule a coalesced flush."""
+        self._dirty = True
+        self._generation += 1
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Schedule a background flush if one is not already pending.
+
+        Without a running event loop there is nothing to coalesce with, so the
+        state is written immediately.
+        """
+        if self._flush_handle is not None or self._flush_inflight:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_handle = loop.call_later(self.flush_delay, self._start_background_flush)
+
+    def _start_background_flush(self) -> None:
+        """Snapshot dirty state on the loop and write it on a worker thread."""
+        self._flush_handle = None
+        if not self._dirty:
+            return
+
+        loop = asyncio.get_running_loop()
+        snapshot = dict(self._sessions)
+        self._dirty = False
+        self._flush_inflight = True
+        future = loop.run_in_executor(None, self._write, snapshot, self._generation)
+
+        def on_done(fut: "asyncio.Future[bool]") -> None:
+            self._flush_inflight = False
+            if fut.cancelled() or fut.exception() is not None or not fut.result():
+                self._dirty = True
+            # Changes made while the write was in flight get their own flush
+            if self._dirty:
+                self._schedule_flush()
+
+        future.add_done_callback(on_done)
+
+    def flush(self) -> bool:
+        """Write any dirty state to disk synchronously.
+
+        Returns:
+            True if the store is clean afterwards, False if the write failed
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty:
+            return True
+        self._dirty = False
+        if not self._write(dict(self._sessions), self._generation):
+            self._dirty = True
+            return False
+        return True
+
+    def _write(self, snapshot: Dict[str, Dict[str, str]], generation: int) -> bool:
+        """Atomically replace the backing file with the given snapshot."""
+        with self._write_lock:
+            if generation <= self._written_generation:
+                return True
+            try:
+                _write_atomically(self.path, json.dumps(snapshot))
+            except Exception as e:
+                self.last_write_error = str(e)
+                print(f"Error saving persistent sessions: {str(e)}")
+                return False
+            self._written_generation = generation
+            self.write_count += 1
+            return True
+
+
+class LogWriter:
+    """Background thread that writes buffered session output in batches.
+
+    Session loggers attached to the writer only buffer output on the calling
+    thread. Every flush_interval the writer drains them: queued lines are
+    appended with one write per file, and snapshot files are rewritten at
+    most once per snapshot_interval.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = LOG_FLUSH_INTERVAL_SECONDS,
+        snapshot_interval: float = SNAPSHOT_WRITE_INTERVAL_SECONDS
+    ):
+        """Initialize the writer; the thread starts with the first logger.
+
+        Args:
+            flush_interval: Seconds between drains
+            snapshot_interval: Minimum seconds between rewrites of a snapshot file
+        """
+        self.flush_interval = flush_interval
+        self.snapshot_interval = snapshot_interval
+
+        self._loggers: Set[ItermSessionLogger] = set()
+        # Unregistered loggers waiting for their final drain
+        self._retiring: List[ItermSessionLogger] = []
+        self._registry_lock = threading.Lock()
+        # Serializes drains between the writer thread and flush() callers
+        self._drain_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.drain_count = 0
+
+    def register(self, logger: ItermSessionLogger) -> None:
+        """Start draining a session logger."""
+        with self._registry_lock:
+            self._loggers.add(logger)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="iterm-mcp-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def unregister(self, logger: ItermSessionLogger) -> None:
+        """Stop draining a session logger after writing what it has buffered.
+
+        The final drain is handed to the writer thread, so callers on the
+        event loop do not wait for file I/O. Without a running thread it is
+        done inline.
+        """
+        with self._registry_lock:
+            self._loggers.discard(logger)
+            if self._thread is not None and not self._closed:
+                self._retiring.append(logger)
+                self._wakeup.set()
+                return
+        with self._drain_lock:
+            logger.drain(force_snapshot=True)
+
+    def _run(self) -> None:
+        """Writer thread loop."""
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain(force_snapshot=False)
+
+    def _drain(self, force_snapshot: bool, logger: Optional[ItermSessionLogger] = None) -> None:
+        """Drain one logger, or every registered logger."""
+        retiring: List[ItermSessionLogger] = []
+        if logger is not None:
+            loggers = [logger]
+        else:
+            with self._registry_lock:
+                loggers = list(self._loggers)
+                retiring, self._retiring = self._retiring, []
+        with self._drain_lock:
+            for item in loggers + retiring:
+                try:
+                    item.drain(force_snapshot=force_snapshot or item in retiring)
+                except Exception as e:
+                    _module_logger.error(f"Error writing log for session {item.session_id}: {e}")
+            self.drain_count += 1
+
+    def flush(self, logger: Optional[ItermSessionLogger] = None) -> None:
+        """Write everything buffered now, including pending snapshots.
+
+        Args:
+            logger: Only flush this logger (default: all registered loggers)
+        """
+        self._drain(force_snapshot=True, logger=logger)
+
+    def close(self) -> None:
+        """Stop the writer thread after a final flush."""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5.0)
+        self.flush()
+
+
+def _flush_at_exit(target_ref: "weakref.ReferenceType[Any]") -> None:
+    """atexit hook that flushes a store or writer if it is still alive."""
+    target = target_ref()
+    if target is not None:
+        target.flush()
+
+
 class ItermLogManager:
     """Manager for iTerm2 session loggers."""
     
@@ -285,7 +938,8 @@ class ItermLogManager:
         log_dir: Optional[str] = None,
         enable_app_log: bool = True,
         max_snapshot_lines: int = 1000,
-        default_max_lines: int = 50
+        default_max_lines: int = 50,
+        archive_policy: Optional[ArchivePolicy] = None
     ):
         """Initialize the log manager.
         
@@ -294,6 +948,7 @@ class ItermLogManager:
             enable_app_log: Whether to enable application-level logging
             max_snapshot_lines: Maximum number of lines to keep in memory for snapshots
             default_max_lines: Default number of lines to show per session
+            archive_policy: Rotation and retention for session output archives
         """
         self.log_dir = log_dir or os.path.expanduser("~/.iterm_mcp_logs")
         os.makedirs(self.log_dir, exist_ok=True)
@@ -301,32 +956,48 @@ class ItermLogManager:
         # Dictionary of session loggers
         self.session_loggers: Dict[str, ItermSessionLogger] = {}
         
-        # Persistent session mapping
+        # Persistent session mapping, flushed in the background and at exit
         self.persistent_sessions_file = os.path.join(self.log_dir, "persistent_sessions.json")
-        self.persistent_sessions: Dict[str, Dict[str, str]] = self._load_persistent_sessions()
+        self.persistent_store = PersistentSessionStore(self.persistent_sessions_file)
+        atexit.register(_flush_at_exit, weakref.ref(self.persistent_store))
+
+        # Background writer shared by all session loggers
+        self.writer = LogWriter()
+        atexit.register(_flush_at_exit, weakref.ref(self.writer))
         
         # Settings
         self.max_snapshot_lines = max_snapshot_lines
         self.default_max_lines = default_max_lines
+        self.archive_policy = archive_policy or ArchivePolicy()
+
+        # Archives from earlier runs are never rotated again, so prune them here
+        old_archives = [
+            name for name in os.listdir(self.log_dir) if name.startswith(ARCHIVE_DIR_PREFIX)
+        ]
+        if old_archives:
+            threading.Thread(
+                target=self._prune_old_archives, args=(old_archives,),
+                name="iterm-mcp-archive-prune", daemon=True,
+            ).start()
         
         # Set up application logger if enabled
         if enable_app_log:
             self.setup_app_logger()
             
-    def _load_persistent_sessions(self) -> Dict[str, Dict[str, str]]:
-        """Load persistent session mapping from file.
-        
-        Returns:
-            Dictionary mapping persistent IDs to session metadata
-        """
-        if os.path.exists(self.persistent_sessions_file):
-            try:
-                with open(self.persistent_sessions_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading persistent sessions: {str(e)}")
-        return {}
-    
+    def _prune_old_archives(self, directories: List[str]) -> None:
+        """Apply archive retention to directories left by earlier runs."""
+        try:
+            removed = prune_archives(self.log_dir, self.archive_policy, directories)
+            if removed:
+                _module_logger.info(f"Removed {removed} expired session archives")
+        except Exception as e:
+            _module_logger.error(f"Error pruning session archives: {e}")
+
+    @property
+    def persistent_sessions(self) -> Dict[str, Dict[str, str]]:
+        """Mapping of persistent IDs to session metadata."""
+        return self.persistent_store.sessions
+
     def setup_app_logger(self) -> None:
         """Set up the application-level logger."""
         # Get app logger
@@ -364,12 +1035,14 @@ class ItermLogManager:
         self.app_logger = app_logger
     
     def save_persistent_sessions(self) -> None:
-        """Save persistent session mapping to file."""
-        try:
-            with open(self.persistent_sessions_file, 'w') as f:
-                json.dump(self.persistent_sessions, f)
-        except Exception as e:
-            print(f"Error saving persistent sessions: {str(e)}")
+        """Write the persistent session mapping to file immediately."""
+        self.persistent_store.mark_dirty()
+        self.persistent_store.flush()
+
+    def flush(self) -> None:
+        """Write buffered session output and pending persistent-session changes."""
+        self.writer.flush()
+        self.persistent_store.flush()
             
     def register_persistent_session(
         self, 
@@ -384,12 +1057,7 @@ class ItermLogManager:
             persistent_id: Persistent session ID
             session_name: Session name
         """
-        self.persistent_sessions[persistent_id] = {
-            "session_id": session_id,
-            "name": session_name,
-            "last_seen": datetime.datetime.now().isoformat()
-        }
-        self.save_persistent_sessions()
+        self.persistent_store.register(session_id, persistent_id, session_name)
         
     def get_persistent_session(self, persistent_id: str) -> Optional[Dict[str, Any]]:
         """Get persistent session details.
@@ -400,7 +1068,18 @@ class ItermLogManager:
         Returns:
             Session details or None if not found
         """
-        return self.persistent_sessions.get(persistent_id)
+        return self.persistent_store.get(persistent_id)
+
+    def find_persistent_id(self, session_id: str) -> Optional[str]:
+        """Get the persistent ID registered for a session ID.
+
+        Args:
+            session_id: iTerm2 session ID
+
+        Returns:
+            The persistent ID or None if the session was never registered
+        """
+        return self.persistent_store.find_persistent_id(session_id)
     
     def get_session_logger(
         self,
@@ -418,17 +1097,9 @@ class ItermLogManager:
         Returns:
             The session logger
         """
-        # Generate a persistent ID if not provided
+        # Generate a persistent ID if not provided, reusing an existing mapping
         if not persistent_id:
-            # Check if there's an existing mapping
-            for p_id, details in self.persistent_sessions.items():
-                if details.get("session_id") == session_id:
-                    persistent_id = p_id
-                    break
-            
-            # Create new if not found
-            if not persistent_id:
-                persistent_id = str(uuid.uuid4())
+            persistent_id = self.find_persistent_id(session_id) or str(uuid.uuid4())
                 
         # Register the persistent session
         self.register_persistent_session(session_id, persistent_id, session_name)
@@ -440,8 +1111,11 @@ class ItermLogManager:
                 session_name=session_name,
                 log_dir=self.log_dir,
                 max_snapshot_lines=self.max_snapshot_lines,
-                persistent_id=persistent_id
+                persistent_id=persistent_id,
+                writer=self.writer,
+                archive_policy=self.archive_policy
             )
+            self.writer.register(self.session_loggers[session_id])
         
         return self.session_loggers[session_id]
     
@@ -452,8 +1126,9 @@ class ItermLogManager:
             session_id: The unique ID of the session
         """
         if session_id in self.session_loggers:
-            self.session_loggers[session_id].log_session_closed()
-            del self.session_loggers[session_id]
+            logger = self.session_loggers.pop(session_id)
+            logger.log_session_closed()
+            self.writer.unregister(logger)
     
     def log_app_event(self, event_type: str, message: str) -> None:
         """Log an application-level event.
@@ -492,6 +1167,8 @@ class ItermLogManager:
             
         logger = self.session_loggers[session_id]
         try:
+            # Make sure buffered output is in the snapshot file
+            self.writer.flush(logger)
             if os.path.exists(logger.snapshot_file):
                 with open(logger.snapshot_file, 'r') as f:
                     content = f.read()
@@ -508,6 +1185,94 @@ class ItermLogManager:
             self.log_app_event("ERROR", f"Failed to read snapshot for session {session_id}: {str(e)}")
             return None
             
+    def read_session_history(
+        self,
+        session_id: str,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        max_lines: int = 500
+    ) -> Optional[List[ArchivedLine]]:
+        """Read archived output for a session by line range or time range.
+
+        Line numbers are the session's output sequence numbers (0 is the first
+        line ever logged). If start_time or end_time is given the read is by
+        time; otherwise it is by line range. Without start_line the newest
+        max_lines before end_line are returned; with it, the first max_lines
+        from start_line.
+
+        Args:
+            session_id: The session ID
+            start_line: First line sequence number (inclusive)
+            end_line: Line sequence number to stop before
+            start_time: Earliest arrival time, seconds since the epoch
+            end_time: Latest arrival time, seconds since the epoch
+            max_lines: Maximum number of lines to return
+
+        Returns:
+            The archived lines, oldest first, or None if the session is unknown
+        """
+        logger = self.session_loggers.get(session_id)
+        if logger is None:
+            return None
+
+        # Make sure queued output is in the archive
+        self.writer.flush(logger)
+        archive = logger.archive
+
+        if start_time is not None or end_time is not None:
+            return archive.read_between(
+                start_time if start_time is not None else 0.0,
+                end_time if end_time is not None else float("inf"),
+                limit=max_lines,
+            )
+
+        if end_line is None:
+            end_line = archive.next_seq
+        if start_line is None:
+            start_line = max(end_line - max_lines, 0)
+        else:
+            # Page forward from an explicit start
+            start_line = max(start_line, 0)
+            end_line = min(end_line, start_line + max_lines)
+        return archive.read_range(start_line, end_line)
+
+    async def get_snapshot_async(
+        self,
+        session_id: str,
+        max_lines: Optional[int] = None,
+        persistent_id: Optional[str] = None
+    ) -> Optional[str]:
+        """Like get_snapshot, but flushes and reads on a worker thread.
+
+        The flush waits for the writer thread's drain lock, so event-loop
+        callers should use this rather than get_snapshot.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.get_snapshot, session_id, max_lines, persistent_id)
+        )
+
+    async def read_session_history_async(
+        self,
+        session_id: str,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        max_lines: int = 500
+    ) -> Optional[List[ArchivedLine]]:
+        """Like read_session_history, but flushes and decompresses on a worker thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                self.read_session_history, session_id, start_line, end_line,
+                start_time, end_time, max_lines
+            ),
+        )
+
     def set_output_filter(self, session_id: str, pattern: str) -> bool:
         """Set an output filter for a session.
         
@@ -619,6 +1384,11 @@ class ItermLogManager:
                 "recent_errors": list(logger.recent_errors),
                 "last_command_at": logger.last_command_at,
                 "last_output_at": logger.last_output_at,
+                "log_queue_depth": logger.log_queue_depth,
+                "log_dropped_lines": logger.dropped_lines,
+                "snapshot_writes": logger.snapshot_writes,
+                "archive_segments": len(logger.archive.segments),
+                "archive_bytes": logger.archive.size_bytes(),
             }
 
         return telemetry